@@ -0,0 +1,3 @@
+"""
+Suite de benchmarks del Sistema de Cálculo de Bombeo
+"""
@@ -0,0 +1,394 @@
+"""
+Benchmarks del motor de cálculo
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_calculos --salida resultados.json
+    python -m benchmarks.bench_calculos --guardar-base benchmarks/base_calculos.json
+    python -m benchmarks.bench_calculos --base benchmarks/base_calculos.json --umbral 0.15
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from dataclasses import replace
+from typing import Callable, Dict
+
+from src.calculations import (
+    CalculadoraBombeo, CalculadoraCurvas, CalculadoraEnergia, CalculadoraEstacion,
+    CalculadoraHidraulica, DataLoader, ResultadosBombeo,
+    EspacioEscenarios, ProgramadorBombas, Tanque, TarifaHoraria, barrido_punto_operacion,
+    comparar_alternativas, nucleos_disponibles, obtener_nucleo, perfil_tipico, verificar_paridad
+)
+from src.models import CurvaBomba, EstacionBombeo
+from src.persistencia import (
+    EXTENSION_ALMACEN, AlmacenResultados, abrir_almacen, abrir_proyecto, exportar_barrido, exportar_inp, exportar_resultados, guardar_proyecto,
+    importar_inp, red_desde_sistema
+)
+
+from src.calculations.resultados import desempaquetar, empaquetar
+
+from .comun import agregar_argumentos_comunes, ejecutar_suite
+from .escenarios import generar_caudales, generar_sistema
+
+TAMANOS_SISTEMA = (1, 100, 10_000, 100_000)
+PUNTOS_BARRIDO = 100
+PUNTOS_CURVAS = (2_000, 1_000_000)
+FILAS_PROYECTO = 1_000_000
+FILAS_ALMACEN = 10_000_000
+NUM_ESCENARIOS = 36
+ENLACES_EPANET = 100_000
+ALTERNATIVAS_ENERGIA = 2_000
+HORAS_PROGRAMACION = (24, 168)
+BOMBAS_ESTACION = 8
+DEMANDAS_ESTACION = 10_000
+PASOS_CONTINUACION = 1_000
+REGISTROS_RESULTADOS = 100_000
+PUNTOS_NUCLEOS = 1_000_000
+
+
+def benchmarks_primitivas() -> Dict[str, Callable[[], object]]:
+    """Primitivas escalares de CalculadoraHidraulica"""
+    hidraulica = CalculadoraHidraulica(generar_sistema(10))
+    return {
+        'hidraulica.area_seccion': lambda: hidraulica.calcular_area_seccion(0.1),
+        'hidraulica.velocidad': lambda: hidraulica.calcular_velocidad(0.01, 0.1),
+        'hidraulica.reynolds': lambda: hidraulica.calcular_numero_reynolds(1.27, 0.1),
+        'hidraulica.factor_friccion_turbulento': lambda: hidraulica.calcular_factor_friccion(1.2e5),
+        'hidraulica.factor_friccion_laminar': lambda: hidraulica.calcular_factor_friccion(1.5e3),
+        'hidraulica.perdidas_totales': hidraulica.calcular_perdidas_totales,
+        'hidraulica.carga_total_bomba': hidraulica.calcular_carga_total_bomba,
+    }
+
+
+def benchmarks_catalogo() -> Dict[str, Callable[[], object]]:
+    """Carga del catálogo CSV y consultas paginadas"""
+    loader = DataLoader()
+    loader.catalogo  # construir el catálogo fuera de la medición
+    return {
+        'catalogo.cargar_constantes': loader.cargar_constantes,
+        'catalogo.cargar_accesorios': loader.cargar_accesorios,
+        'catalogo.cargar_fluidos': loader.cargar_fluidos,
+        'catalogo.consultar_accesorios': lambda: loader.consultar_accesorios(norma='ISO', limite=50),
+        'catalogo.construir_sqlite': lambda: DataLoader().catalogo,
+    }
+
+
+def benchmarks_sistemas() -> Dict[str, Callable[[], object]]:
+    """Resultados completos para sistemas sintéticos de distinto tamaño"""
+    benchmarks = {}
+    for num_tramos in TAMANOS_SISTEMA:
+        sistema = generar_sistema(num_tramos, semilla=num_tramos)
+        benchmarks[f'bombeo.resultados_completos[{num_tramos}]'] = (
+            lambda s=sistema: CalculadoraBombeo(s).obtener_resultados_completos()
+        )
+    return benchmarks
+
+
+def benchmarks_nucleos() -> Dict[str, Callable[[], object]]:
+    """Curva del sistema con cada núcleo disponible (tras comprobar que coinciden)"""
+    verificar_paridad()
+    sistema = generar_sistema(100, semilla=7)
+    caudales = generar_caudales(PUNTOS_NUCLEOS)
+    benchmarks = {}
+    for nombre in nucleos_disponibles():
+        hidraulica = CalculadoraHidraulica(sistema, nucleo=obtener_nucleo(nombre))
+        hidraulica.calcular_curva_sistema(caudales[:10])  # Numba compila fuera de la medición
+        benchmarks[f'nucleos.curva_sistema[{nombre},{PUNTOS_NUCLEOS}]'] = (
+            lambda h=hidraulica: h.calcular_curva_sistema(caudales)
+        )
+    return benchmarks
+
+
+def benchmarks_resultados() -> Dict[str, Callable[[], object]]:
+    """Registro compacto de resultados frente al diccionario"""
+    calculadora = CalculadoraBombeo(generar_sistema(1))
+    diccionario = calculadora.obtener_resultados_completos()
+    registro = calculadora.calcular_resultados()
+    registros = [registro] * REGISTROS_RESULTADOS
+    bloque = empaquetar(registros)
+    return {
+        'resultados.calcular_registro': calculadora.calcular_resultados,
+        'resultados.a_dict': registro.a_dict,
+        'resultados.desde_dict': lambda: ResultadosBombeo.desde_dict(diccionario),
+        'resultados.a_bytes': registro.a_bytes,
+        f'resultados.empaquetar[{REGISTROS_RESULTADOS}]': lambda: empaquetar(registros),
+        f'resultados.desempaquetar[{REGISTROS_RESULTADOS}]': lambda: desempaquetar(bloque),
+    }
+
+
+def benchmarks_barrido() -> Dict[str, Callable[[], object]]:
+    """Barrido de caudal evaluando el sistema punto por punto"""
+    sistema = generar_sistema(100, semilla=7)
+    caudales = generar_caudales(PUNTOS_BARRIDO)
+
+    def barrido():
+        resultados = []
+        for caudal in caudales:
+            sistema.caudal = caudal
+            resultados.append(CalculadoraBombeo(sistema).obtener_resultados_completos())
+        return resultados
+
+    return {
+        f'barrido.caudal[{PUNTOS_BARRIDO}]': barrido,
+        f'barrido.columnas[{PUNTOS_BARRIDO}]': (
+            lambda: CalculadoraBombeo(sistema).barrido_caudal(caudales)
+        ),
+    }
+
+
+def benchmarks_curvas() -> Dict[str, Callable[[], object]]:
+    """Curvas del sistema y de la bomba evaluadas sobre todo el rango de caudales"""
+    sistema = generar_sistema(100, semilla=7)
+    resultados = CalculadoraBombeo(sistema).obtener_resultados_completos()
+    bomba = CurvaBomba.desde_punto_diseno(sistema.caudal, resultados['carga_total_bomba'],
+                                          sistema.eficiencia_bomba, npsh_requerido=3.0)
+    calculadora = CalculadoraCurvas(sistema, bomba)
+    benchmarks = {}
+    for puntos in PUNTOS_CURVAS:
+        benchmarks[f'curvas.calcular[{puntos}]'] = (
+            lambda p=puntos: calculadora.calcular_curvas(puntos=p)
+        )
+    curvas = calculadora.calcular_curvas(puntos=PUNTOS_CURVAS[-1])
+    benchmarks[f'curvas.punto_operacion[{PUNTOS_CURVAS[-1]}]'] = (
+        lambda: calculadora.punto_operacion(curvas)
+    )
+    return benchmarks
+
+
+def benchmarks_proyecto() -> Dict[str, Callable[[], object]]:
+    """Guardar y abrir un proyecto con 100k tramos y un barrido de 1M filas"""
+    sistema = generar_sistema(100_000, semilla=7)
+    resultados = CalculadoraBombeo(sistema).obtener_resultados_completos()
+    barrido = CalculadoraCurvas(sistema).calcular_curvas(puntos=FILAS_PROYECTO)
+    ruta = os.path.join(tempfile.mkdtemp(prefix='bench_proyecto_'), 'bench.bombeo')
+    guardar_proyecto(ruta, sistema, resultados, barrido)
+
+    def abrir_barrido():
+        proyecto = abrir_proyecto(ruta)
+        return proyecto.resultados, proyecto.barrido['carga_sistema']
+
+    return {
+        f'proyecto.guardar[{FILAS_PROYECTO}]': (
+            lambda: guardar_proyecto(ruta, sistema, resultados, barrido)
+        ),
+        f'proyecto.abrir_barrido[{FILAS_PROYECTO}]': abrir_barrido,
+        'proyecto.abrir_sistema[100000]': lambda: abrir_proyecto(ruta).sistema,
+    }
+
+
+def benchmarks_almacen() -> Dict[str, Callable[[], object]]:
+    """Almacén de resultados de 10M filas × 21 columnas: escritura, apertura y cortes"""
+    sistema = generar_sistema(100, semilla=7)
+    bloque = CalculadoraBombeo(sistema).barrido_caudal(generar_caudales(PUNTOS_BARRIDO))
+    # Bloques de 64k filas repitiendo el barrido (el costo medido es el del almacén)
+    repeticiones = -(-65536 // PUNTOS_BARRIDO)
+    bloque = {clave: columna * repeticiones for clave, columna in bloque.items()}
+    resultados = [clave for clave in bloque if clave != 'caudal']
+    directorio = tempfile.mkdtemp(prefix='bench_almacen_')
+    contador = iter(range(1_000_000))
+
+    def escribir():
+        ruta = os.path.join(directorio, f'escritura{next(contador)}{EXTENSION_ALMACEN}')
+        almacen = AlmacenResultados.crear(ruta, ['caudal'], resultados)
+        with almacen.escritor() as escritor:
+            while escritor.filas < FILAS_ALMACEN:
+                escritor.agregar(bloque)
+        shutil.rmtree(ruta)
+
+    ruta = os.path.join(directorio, 'lectura' + EXTENSION_ALMACEN)
+    with AlmacenResultados.crear(ruta, ['caudal'], resultados).escritor() as escritor:
+        while escritor.filas < FILAS_ALMACEN:
+            escritor.agregar(bloque)
+    almacen = abrir_almacen(ruta)
+    mitad = FILAS_ALMACEN // 2
+    return {
+        f'almacen.escribir[{FILAS_ALMACEN}]': escribir,
+        f'almacen.abrir[{FILAS_ALMACEN}]': lambda: abrir_almacen(ruta)['NPSHa'],
+        f'almacen.corte[{FILAS_ALMACEN},100k]': (
+            lambda: almacen.corte(mitad, mitad + 100_000, ['caudal', 'NPSHa'])
+        ),
+    }
+
+
+def benchmarks_exportacion() -> Dict[str, Callable[[], object]]:
+    """Exportación en flujo de un barrido de 1M filas y del resumen PDF"""
+    sistema = generar_sistema(100, semilla=7)
+    resultados = CalculadoraBombeo(sistema).obtener_resultados_completos()
+    barrido = CalculadoraCurvas(sistema).calcular_curvas(puntos=FILAS_PROYECTO)
+    directorio = tempfile.mkdtemp(prefix='bench_exportacion_')
+    benchmarks = {}
+    for extension in ('.csv', '.xlsx'):
+        ruta = os.path.join(directorio, 'barrido' + extension)
+        benchmarks[f'exportar.barrido{extension}[{FILAS_PROYECTO}]'] = (
+            lambda r=ruta: exportar_barrido(r, barrido)
+        )
+    ruta_pdf = os.path.join(directorio, 'resumen.pdf')
+    benchmarks[f'exportar.resumen.pdf[{FILAS_PROYECTO}]'] = (
+        lambda: exportar_resultados(ruta_pdf, resultados, sistema, barrido)
+    )
+    return benchmarks
+
+
+def benchmarks_escenarios() -> Dict[str, Callable[[], object]]:
+    """Comparación de escenarios (variantes de diámetro y fluido de un sistema)"""
+    espacio = EspacioEscenarios()
+    espacio.agregar('base', generar_sistema(1_000, semilla=7))
+    fluidos = list(espacio.fluidos)
+    for i in range(1, NUM_ESCENARIOS):
+        if i % 2:
+            espacio.variante_diametro('base', f'd{i}', 0.05 + 0.01 * i)
+        else:
+            espacio.variante_fluido('base', f'f{i}', fluidos[i % len(fluidos)])
+
+    def evaluar_todos():
+        for escenario in espacio:
+            espacio.actualizar(escenario.nombre, escenario.sistema)
+        return espacio.evaluar()
+
+    return {
+        f'escenarios.evaluar[{NUM_ESCENARIOS}]': evaluar_todos,
+        f'escenarios.cache[{NUM_ESCENARIOS}]': espacio.evaluar,
+    }
+
+
+def benchmarks_epanet() -> Dict[str, Callable[[], object]]:
+    """Lectura y escritura en flujo de una red EPANET de 100k enlaces"""
+    sistema = generar_sistema(ENLACES_EPANET, semilla=7)
+    carga = CalculadoraBombeo(sistema).obtener_resultados_completos()['carga_total_bomba']
+    # La bomba agrega un enlace a las tuberías: se omite el último tramo
+    red = red_desde_sistema(replace(sistema, tramos=sistema.tramos[:-1]), carga)
+    directorio = tempfile.mkdtemp(prefix='bench_epanet_')
+    ruta = os.path.join(directorio, 'red.inp')
+    exportar_inp(ruta, red)
+    red_importada = importar_inp(ruta)
+    return {
+        f'epanet.importar[{ENLACES_EPANET}]': lambda: importar_inp(ruta),
+        f'epanet.a_sistema[{ENLACES_EPANET}]': red_importada.a_sistema,
+        f'epanet.exportar[{ENLACES_EPANET}]': (
+            lambda: exportar_inp(os.path.join(directorio, 'copia.inp'), red_importada)
+        ),
+    }
+
+
+def benchmarks_energia() -> Dict[str, Callable[[], object]]:
+    """Costo anual (8760 horas) con tarifa por periodos, de un sistema y de 2000 alternativas"""
+    sistema = generar_sistema(100, semilla=7)
+    constantes = DataLoader().cargar_constantes()
+    perfil = perfil_tipico(sistema.caudal, [0.0] * 6 + [1.2] * 6 + [1.0] * 6 + [1.5] * 4 + [0.5] * 2)
+    tarifa = TarifaHoraria.por_periodos(
+        {'base': 0.08, 'intermedio': 0.12, 'punta': 0.25},
+        ['base'] * 7 + ['intermedio'] * 11 + ['punta'] * 4 + ['intermedio'] * 2,
+        ['base'] * 24, periodos_demanda=['punta'], cargo_demanda=12.0
+    )
+    alternativas = [
+        replace(sistema, tramos=[replace(t, diametro=0.05 + 1e-4 * i) for t in sistema.tramos])
+        for i in range(ALTERNATIVAS_ENERGIA)
+    ]
+    calculadora = CalculadoraEnergia(sistema, constantes=constantes)
+    return {
+        'energia.simular[8760]': lambda: calculadora.simular(perfil, tarifa),
+        f'energia.comparar[{ALTERNATIVAS_ENERGIA}]': (
+            lambda: comparar_alternativas(alternativas, perfil, tarifa, constantes)
+        ),
+    }
+
+
+def benchmarks_programacion() -> Dict[str, Callable[[], object]]:
+    """Programa óptimo de tres bombas (dos iguales) a tres velocidades con un tanque"""
+    sistema = generar_sistema(20, semilla=7)
+    curva = CalculadoraHidraulica(sistema).calcular_curva_sistema([sistema.caudal])
+    carga = curva['carga_total_bomba'][0]
+    principal = CurvaBomba.desde_punto_diseno(sistema.caudal, carga + 5.0, 0.75)
+    auxiliar = CurvaBomba.desde_punto_diseno(sistema.caudal / 2, carga + 8.0, 0.70, nombre="Auxiliar")
+    tanque = Tanque(area=20.0, nivel_minimo=0.5, nivel_maximo=5.0, nivel_inicial=2.5)
+    programador = ProgramadorBombas(sistema, [principal, principal, auxiliar], tanque,
+                                    velocidades=(0.8, 0.9, 1.0))
+    factores = [0.4] * 7 + [1.0] * 15 + [0.4] * 2
+    precios = [0.08] * 7 + [0.12] * 11 + [0.25] * 4 + [0.12] * 2
+    benchmarks = {}
+    for horas in HORAS_PROGRAMACION:
+        demandas = [sistema.caudal * factores[h % 24] for h in range(horas)]
+        tarifa = [precios[h % 24] for h in range(horas)]
+        benchmarks[f'programacion.programar[{horas}h]'] = (
+            lambda d=demandas, p=tarifa: programador.programar(d, p)
+        )
+    return benchmarks
+
+
+def benchmarks_estacion() -> Dict[str, Callable[[], object]]:
+    """Estación de 8 bombas distintas (255 combinaciones) en paralelo y en serie"""
+    sistema = generar_sistema(20, semilla=7)
+    curva = CalculadoraHidraulica(sistema).calcular_curva_sistema([sistema.caudal])
+    carga = curva['carga_total_bomba'][0]
+    bombas = [
+        CurvaBomba.desde_punto_diseno(sistema.caudal * (0.2 + 0.1 * i), carga * (0.6 + 0.1 * i),
+                                      0.60 + 0.03 * i, nombre=f"Bomba {i + 1}")
+        for i in range(BOMBAS_ESTACION)
+    ]
+    demandas = [2.0 * sistema.caudal * i / (DEMANDAS_ESTACION - 1) for i in range(DEMANDAS_ESTACION)]
+    benchmarks = {}
+    for disposicion in ('paralelo', 'serie'):
+        estacion = EstacionBombeo(bombas, disposicion)
+        calculadora = CalculadoraEstacion(sistema, estacion)
+        benchmarks[f'estacion.mallas[{disposicion}]'] = (
+            lambda e=estacion: CalculadoraEstacion(sistema, e)
+        )
+        benchmarks[f'estacion.puntos_operacion[{disposicion}]'] = calculadora.puntos_operacion
+        benchmarks[f'estacion.escalonar[{disposicion},{DEMANDAS_ESTACION}]'] = (
+            lambda c=calculadora: c.escalonar(demandas)
+        )
+    return benchmarks
+
+
+def benchmarks_continuacion() -> Dict[str, Callable[[], object]]:
+    """Barridos del punto de operación en frío y con continuación"""
+    sistema = generar_sistema(20, semilla=3)
+    curva = CalculadoraHidraulica(sistema).calcular_curva_sistema([sistema.caudal])
+    bomba = CurvaBomba.desde_punto_diseno(sistema.caudal, curva['carga_total_bomba'][0], 0.75)
+    barridos = {
+        'elevacion_punto2': [sistema.elevacion_punto2 * (0.8 + 0.4 * i / PASOS_CONTINUACION)
+                             for i in range(PASOS_CONTINUACION)],
+        'velocidad': [0.8 + 0.4 * i / PASOS_CONTINUACION for i in range(PASOS_CONTINUACION)],
+    }
+    benchmarks = {}
+    for parametro, valores in barridos.items():
+        for continuacion in (False, True):
+            modo = 'continuacion' if continuacion else 'frio'
+            benchmarks[f'continuacion.barrido[{parametro},{modo},{PASOS_CONTINUACION}]'] = (
+                lambda p=parametro, v=valores, c=continuacion:
+                barrido_punto_operacion(sistema, bomba, p, v, continuacion=c)
+            )
+    return benchmarks
+
+
+def todos_los_benchmarks() -> Dict[str, Callable[[], object]]:
+    benchmarks = {}
+    benchmarks.update(benchmarks_primitivas())
+    benchmarks.update(benchmarks_catalogo())
+    benchmarks.update(benchmarks_sistemas())
+    benchmarks.update(benchmarks_resultados())
+    benchmarks.update(benchmarks_nucleos())
+    benchmarks.update(benchmarks_barrido())
+    benchmarks.update(benchmarks_curvas())
+    benchmarks.update(benchmarks_proyecto())
+    benchmarks.update(benchmarks_almacen())
+    benchmarks.update(benchmarks_exportacion())
+    benchmarks.update(benchmarks_escenarios())
+    benchmarks.update(benchmarks_epanet())
+    benchmarks.update(benchmarks_energia())
+    benchmarks.update(benchmarks_programacion())
+    benchmarks.update(benchmarks_estacion())
+    benchmarks.update(benchmarks_continuacion())
+    return benchmarks
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks del motor de cálculo")
+    agregar_argumentos_comunes(parser)
+    args = parser.parse_args(argv)
+    return ejecutar_suite('calculos', todos_los_benchmarks(), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
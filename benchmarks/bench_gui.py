@@ -0,0 +1,361 @@
+"""
+Benchmarks de renderizado de la interfaz con la plataforma Qt offscreen
+
+No requiere pantalla: se ejecuta en cualquier máquina Linux sin servidor
+gráfico. Mide la construcción de la escena de SystemViewer (sobre una
+escena vacía en cada medición), fitInView, la edición de un tramo en un
+sistema de 5000 tramos, el pintado al desplazar y hacer zoom en sistemas muy grandes (modo por
+lotes), la exportación de diagramas a PNG/SVG, el llenado de la tabla de
+resultados, la tabla de barridos con millones de filas, el gráfico de
+curvas con millones de puntos, el mapa de cavitación de 1000×1000, el editor de tramos con 100k filas y la
+construcción de los paneles.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_gui --salida reporte_gui.json
+    python -m benchmarks.bench_gui --base benchmarks/base_gui.json
+"""
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+from array import array
+from dataclasses import replace
+from itertools import cycle
+from typing import Callable, Dict
+
+# Debe configurarse antes de importar PyQt6
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+
+from src.calculations import CalculadoraBombeo
+from src.gui.curves_panel import CurvesPanel
+from src.gui.diagram_export import DiagramExporter
+from src.gui.input_panel import InputPanel
+from src.gui.results_panel import ResultsPanel
+from src.gui.system_viewer import SystemViewer
+
+from .comun import agregar_argumentos_comunes, ejecutar_suite
+from .escenarios import generar_caudales, generar_sistema
+
+TAMANOS_ESCENA = (10, 100, 1_000, 5_000)
+TRAMOS_EDICION = 5_000
+TAMANO_NAVEGACION = 100_000
+FILAS_BARRIDO = 1_000_000
+PUNTOS_CURVAS = 1_000_000
+TRAMOS_EDITOR = 100_000
+PUNTOS_CAVITACION = 1_000
+
+
+@contextlib.contextmanager
+def _sin_salida():
+    """Descarta la salida estándar durante la medición"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def benchmarks_escena() -> Dict[str, Callable[[], object]]:
+    """Construcción de la escena, ajuste de la vista y edición de un tramo"""
+    benchmarks = {}
+    viewer = SystemViewer()
+    viewer.resize(800, 600)
+
+    for num_tramos in TAMANOS_ESCENA:
+        sistema = generar_sistema(num_tramos, semilla=num_tramos)
+
+        def construir(s=sistema):
+            # Escena vacía en cada medición: con la sincronización incremental,
+            # redibujar el mismo sistema sobre la escena anterior no haría nada
+            viewer.clear_system()
+            viewer.sistema = s
+            viewer.draw_system()
+
+        def preparar_ajuste(s=sistema):
+            # fitInView se mide sobre una escena ya construida del mismo tamaño
+            construir(s)
+            return lambda: viewer.graphics_view.fitInView(
+                viewer.graphics_scene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio
+            )
+
+        benchmarks[f'viewer.draw_system[{num_tramos}]'] = construir
+        benchmarks[f'viewer.fitInView[{num_tramos}]'] = _PreparadoPerezoso(preparar_ajuste)
+
+    benchmarks[f'viewer.editar_tramo[{TRAMOS_EDICION}]'] = _PreparadoPerezoso(_preparar_edicion)
+    return benchmarks
+
+
+def _preparar_edicion() -> Callable[[], object]:
+    """Alterna entre dos sistemas que difieren en la longitud de un tramo central"""
+    viewer = SystemViewer()
+    viewer.resize(800, 600)
+    sistema = generar_sistema(TRAMOS_EDICION, semilla=TRAMOS_EDICION)
+    tramos = list(sistema.tramos)
+    medio = len(tramos) // 2
+    tramos[medio] = replace(tramos[medio], longitud=tramos[medio].longitud + 1.0)
+    versiones = cycle([replace(sistema, tramos=tramos), sistema])
+    viewer.update_system(sistema)
+    return lambda: viewer.update_system(next(versiones))
+
+
+class _PreparadoPerezoso:
+    """Ejecuta la preparación una sola vez, justo antes de la primera medición"""
+
+    def __init__(self, preparar: Callable[[], Callable[[], object]]):
+        self._preparar = preparar
+        self._funcion = None
+
+    def __call__(self):
+        if self._funcion is None:
+            self._funcion = self._preparar()
+        return self._funcion()
+
+
+def benchmarks_navegacion() -> Dict[str, Callable[[], object]]:
+    """Pintado de la vista al ajustar, desplazar y hacer zoom (modo por lotes)"""
+    viewer = SystemViewer()
+    viewer.resize(1200, 800)
+    viewer.show()
+    vista = viewer.graphics_view
+    sistema = generar_sistema(TAMANO_NAVEGACION, semilla=1)
+
+    def construir():
+        viewer.sistema = sistema
+        viewer.draw_system()
+
+    def preparar(funcion):
+        # La escena se construye una vez; luego solo se mide el pintado
+        construir()
+        QApplication.processEvents()
+        return funcion
+
+    def pintar():
+        vista.viewport().repaint()
+
+    def pintar_ajustado():
+        viewer.reset_view()
+        pintar()
+
+    def desplazar():
+        barra = vista.horizontalScrollBar()
+        barra.setValue(barra.value() + 40 if barra.value() < barra.maximum() - 40 else 0)
+        pintar()
+
+    def preparar_desplazamiento():
+        preparar(desplazar)
+        vista.resetTransform()
+        viewer.update_cache_modes()
+        vista.centerOn(5_000, 0)
+        return desplazar
+
+    def zoom():
+        viewer.zoom_in()
+        pintar()
+        viewer.zoom_out()
+        pintar()
+
+    n = TAMANO_NAVEGACION
+    return {
+        f'viewer.draw_system[{n}]': construir,
+        f'viewer.pintar_ajustado[{n}]': _PreparadoPerezoso(lambda: preparar(pintar_ajustado)),
+        f'viewer.desplazar[{n}]': _PreparadoPerezoso(preparar_desplazamiento),
+        f'viewer.zoom[{n}]': _PreparadoPerezoso(lambda: preparar(zoom)),
+    }
+
+
+def benchmarks_exportacion() -> Dict[str, Callable[[], object]]:
+    """Exportación de diagramas de reporte alternando entre sistemas distintos"""
+    exportador = DiagramExporter(width=1200)
+    sistemas = [generar_sistema(10, semilla=i) for i in range(20)]
+    carpeta = tempfile.mkdtemp(prefix='bench_diagramas_')
+    indice = [0]
+
+    def exportar(formato):
+        def funcion():
+            indice[0] = (indice[0] + 1) % len(sistemas)
+            exportador.export(sistemas[indice[0]], os.path.join(carpeta, f'diagrama.{formato}'))
+        return funcion
+
+    return {
+        'exportar.png': exportar('png'),
+        'exportar.svg': exportar('svg'),
+    }
+
+
+def benchmarks_paneles() -> Dict[str, Callable[[], object]]:
+    """Construcción de widgets y llenado de la tabla de resultados"""
+    resultados = CalculadoraBombeo(generar_sistema(10)).obtener_resultados_completos()
+    panel = ResultsPanel()
+    return {
+        'results.populate_results_table': lambda: panel.populate_results_table(resultados),
+        'results.update_results': lambda: panel.update_results(resultados),
+        'construir.InputPanel': InputPanel,
+        'construir.ResultsPanel': ResultsPanel,
+        'construir.SystemViewer': SystemViewer,
+    }
+
+
+def benchmarks_tabla_barrido() -> Dict[str, Callable[[], object]]:
+    """Tabla de barrido por columnas: carga, desplazamiento, orden y filtro"""
+    caudales = generar_caudales(FILAS_BARRIDO)
+    columnas = {
+        'caudal': array('d', caudales),
+        'velocidad': array('d', (q * 127.3 for q in caudales)),
+    }
+    panel = ResultsPanel()
+    panel.resize(800, 600)
+    panel.show()
+    panel.update_sweep_results(columnas)
+    tabla = panel.sweep_table
+    modelo = panel.sweep_model
+
+    def desplazar():
+        barra = tabla.verticalScrollBar()
+        barra.setValue(barra.maximum() - barra.value())
+        tabla.viewport().repaint()
+
+    return {
+        f'barrido.tabla_cargar[{FILAS_BARRIDO}]': lambda: panel.update_sweep_results(columnas),
+        f'barrido.tabla_desplazar[{FILAS_BARRIDO}]': desplazar,
+        f'barrido.tabla_ordenar[{FILAS_BARRIDO}]': lambda: modelo.sort(1, Qt.SortOrder.DescendingOrder),
+        f'barrido.tabla_filtrar[{FILAS_BARRIDO}]': lambda: modelo.set_range_filter('velocidad', 1.0, 2.0),
+    }
+
+
+def benchmarks_curvas() -> Dict[str, Callable[[], object]]:
+    """Gráfico de curvas: pintar, desplazar y hacer zoom con millones de puntos"""
+    sistema = generar_sistema(100, semilla=7)
+    resultados = CalculadoraBombeo(sistema).obtener_resultados_completos()
+    panel = CurvesPanel()
+    panel.resize(1200, 700)
+    panel.show()
+    panel.points_spin.setValue(PUNTOS_CURVAS)
+    panel.update_curves(sistema, resultados)
+    QApplication.processEvents()
+    # El gráfico es hijo del panel: se guarda la referencia al panel para que viva
+    estado = {'paso': 0, 'panel': panel}
+    grafico = panel.chart
+    x_min, x_max = grafico.x_range()
+
+    def desplazar():
+        estado['paso'] = (estado['paso'] + 1) % 20
+        desplazamiento = (x_max - x_min) * 0.01 * estado['paso']
+        grafico.set_x_range(x_min + desplazamiento, x_max + desplazamiento)
+        grafico.repaint()
+
+    def zoom():
+        estado['paso'] = (estado['paso'] + 1) % 10
+        grafico.set_x_range(x_min, x_min + (x_max - x_min) / 1.5 ** estado['paso'])
+        grafico.repaint()
+
+    def pintar():
+        grafico.reset_view()
+        grafico.repaint()
+
+    return {
+        f'curvas.pintar_ajustado[{PUNTOS_CURVAS}]': pintar,
+        f'curvas.desplazar[{PUNTOS_CURVAS}]': desplazar,
+        f'curvas.zoom[{PUNTOS_CURVAS}]': zoom,
+    }
+
+
+def benchmarks_cavitacion() -> Dict[str, Callable[[], object]]:
+    """Mapa de cavitación de 1000 caudales × 1000 niveles: calcular y pintar"""
+    sistema = generar_sistema(100, semilla=7)
+    resultados = CalculadoraBombeo(sistema).obtener_resultados_completos()
+    panel = CurvesPanel()
+    panel.resize(1200, 700)
+    panel.show()
+    panel.view_tabs.setCurrentWidget(panel.cavitation_panel)
+    cavitacion = panel.cavitation_panel
+    cavitacion.points_spin.setValue(PUNTOS_CAVITACION)
+    panel.update_curves(sistema, resultados)
+    QApplication.processEvents()
+    estado = {'panel': panel}
+    mapa = cavitacion.map
+
+    def calcular_y_pintar():
+        cavitacion.refresh()
+        mapa.repaint()
+        return estado
+
+    def pintar():
+        mapa.set_map(cavitacion.mapa)
+        mapa.repaint()
+
+    n = PUNTOS_CAVITACION
+    return {
+        f'cavitacion.calcular_y_pintar[{n}x{n}]': calcular_y_pintar,
+        f'cavitacion.pintar[{n}x{n}]': pintar,
+    }
+
+
+def benchmarks_tramos() -> Dict[str, Callable[[], object]]:
+    """Editor de tramos: importar un CSV grande y construir el sistema desde la tabla"""
+    sistema = generar_sistema(TRAMOS_EDITOR, semilla=3)
+    directorio = tempfile.mkdtemp(prefix='bench_tramos_')
+    ruta = os.path.join(directorio, 'tramos.csv')
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write("longitud,orientacion,diametro\n")
+        for tramo in sistema.tramos:
+            archivo.write(f"{tramo.longitud},{tramo.orientacion},{tramo.diametro}\n")
+
+    panel = InputPanel()
+    panel.resize(800, 900)
+    panel.show()
+    panel.pipes_editor.load_csv(ruta)
+    QApplication.processEvents()
+    modelo = panel.pipes_model
+    estado = {'fila': 0, 'panel': panel}
+
+    def editar_y_construir():
+        # Un cambio descarta solo el tramo de su fila
+        estado['fila'] = (estado['fila'] + 7919) % TRAMOS_EDITOR
+        modelo.setData(modelo.index(estado['fila'], 0), 12.5)
+        return panel.create_sistema_from_inputs()
+
+    n = TRAMOS_EDITOR
+    return {
+        f'tramos.importar_csv[{n}]': lambda: panel.pipes_editor.load_csv(ruta),
+        f'tramos.construir_sistema[{n}]': editar_y_construir,
+    }
+
+
+def todos_los_benchmarks() -> Dict[str, Callable[[], object]]:
+    benchmarks = {}
+    benchmarks.update(benchmarks_paneles())
+    benchmarks.update(benchmarks_tabla_barrido())
+    benchmarks.update(benchmarks_escena())
+    benchmarks.update(benchmarks_navegacion())
+    benchmarks.update(benchmarks_exportacion())
+    benchmarks.update(benchmarks_curvas())
+    benchmarks.update(benchmarks_cavitacion())
+    benchmarks.update(benchmarks_tramos())
+    return benchmarks
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de renderizado de la GUI (offscreen)")
+    agregar_argumentos_comunes(parser)
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    with _sin_salida():
+        benchmarks = todos_los_benchmarks()
+    # Los mensajes de depuración del visualizador no forman parte del reporte
+    benchmarks = {nombre: _silenciar(funcion) for nombre, funcion in benchmarks.items()}
+    codigo = ejecutar_suite('gui', benchmarks, args)
+    app.processEvents()
+    return codigo
+
+
+def _silenciar(funcion: Callable[[], object]) -> Callable[[], object]:
+    def envoltura():
+        with _sin_salida():
+            return funcion()
+    return envoltura
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Utilidades comunes de medición, reporte y comparación contra línea base
+"""
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+
+def medir(funcion: Callable[[], object], repeticiones: int = 5, minimo_s: float = 0.05) -> Dict[str, float]:
+    """Mide el tiempo por llamada de una función
+
+    Cada repetición ejecuta la función las veces necesarias para superar
+    ``minimo_s`` segundos, de modo que operaciones muy rápidas también
+    se midan con resolución suficiente.
+
+    Returns:
+        Dict con mediana, mínimo y máximo en segundos por llamada
+    """
+    # Calibración: número de llamadas por repetición
+    llamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        duracion = time.perf_counter() - inicio
+        if duracion >= minimo_s or llamadas >= 1_000_000:
+            break
+        llamadas *= 10 if duracion < minimo_s / 10 else 2
+
+    tiempos = [duracion / llamadas]
+    for _ in range(repeticiones - 1):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        tiempos.append((time.perf_counter() - inicio) / llamadas)
+
+    return {
+        'mediana_s': statistics.median(tiempos),
+        'minimo_s': min(tiempos),
+        'maximo_s': max(tiempos),
+        'llamadas': llamadas,
+        'repeticiones': repeticiones
+    }
+
+
+def crear_reporte(suite: str, resultados: Dict[str, Dict[str, float]]) -> Dict:
+    """Empaqueta los resultados con metadatos del entorno"""
+    return {
+        'suite': suite,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'resultados': resultados
+    }
+
+
+def guardar_reporte(reporte: Dict, ruta: str):
+    """Escribe el reporte en formato JSON"""
+    with open(ruta, 'w', encoding='utf-8') as file:
+        json.dump(reporte, file, indent=2, ensure_ascii=False)
+
+
+def cargar_reporte(ruta: str) -> Dict:
+    """Lee un reporte JSON previamente guardado"""
+    with open(ruta, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def comparar_con_base(reporte: Dict, base: Dict, umbral: float = 0.10) -> List[Dict]:
+    """Compara un reporte contra la línea base
+
+    Args:
+        reporte: Reporte actual
+        base: Reporte de referencia
+        umbral: Aumento relativo de la mediana tolerado (0.10 = 10%)
+
+    Returns:
+        Lista con una entrada por benchmark común a ambos reportes,
+        indicando la razón actual/base y si es una regresión
+    """
+    comparacion = []
+    actuales = reporte['resultados']
+    for nombre, referencia in base['resultados'].items():
+        if nombre not in actuales:
+            continue
+        razon = actuales[nombre]['mediana_s'] / referencia['mediana_s']
+        comparacion.append({
+            'benchmark': nombre,
+            'base_s': referencia['mediana_s'],
+            'actual_s': actuales[nombre]['mediana_s'],
+            'razon': razon,
+            'regresion': razon > 1.0 + umbral
+        })
+    return comparacion
+
+
+def formatear_tiempo(segundos: float) -> str:
+    """Formatea un tiempo con la unidad más legible"""
+    if segundos < 1e-6:
+        return f"{segundos * 1e9:.1f} ns"
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:.1f} µs"
+    if segundos < 1:
+        return f"{segundos * 1e3:.2f} ms"
+    return f"{segundos:.3f} s"
+
+
+def imprimir_comparacion(comparacion: List[Dict]) -> int:
+    """Imprime la comparación y retorna el número de regresiones"""
+    regresiones = 0
+    for entrada in comparacion:
+        marca = "REGRESIÓN" if entrada['regresion'] else "ok"
+        if entrada['regresion']:
+            regresiones += 1
+        print(f"{entrada['benchmark']:<45} {formatear_tiempo(entrada['base_s']):>12} -> "
+              f"{formatear_tiempo(entrada['actual_s']):>12}  x{entrada['razon']:.2f}  {marca}")
+    return regresiones
+
+
+def ejecutar_suite(suite: str, benchmarks: Dict[str, Callable[[], object]], args) -> int:
+    """Ejecuta un conjunto de benchmarks con las opciones estándar de línea de comandos
+
+    Returns:
+        Código de salida: 1 si hubo regresiones respecto a la línea base
+    """
+    resultados = {}
+    for nombre, funcion in benchmarks.items():
+        if args.filtro and args.filtro not in nombre:
+            continue
+        resultados[nombre] = medir(funcion, repeticiones=args.repeticiones)
+        print(f"{nombre:<45} {formatear_tiempo(resultados[nombre]['mediana_s']):>12}")
+
+    reporte = crear_reporte(suite, resultados)
+    if args.salida:
+        guardar_reporte(reporte, args.salida)
+    if args.guardar_base:
+        guardar_reporte(reporte, args.guardar_base)
+
+    if args.base:
+        print("\nComparación con línea base:")
+        regresiones = imprimir_comparacion(
+            comparar_con_base(reporte, cargar_reporte(args.base), args.umbral)
+        )
+        if regresiones:
+            print(f"\n{regresiones} regresión(es) por encima del {args.umbral:.0%}")
+            return 1
+    return 0
+
+
+def agregar_argumentos_comunes(parser):
+    """Agrega las opciones de línea de comandos compartidas por las suites"""
+    parser.add_argument('--salida', help='Ruta del reporte JSON de resultados')
+    parser.add_argument('--base', help='Reporte JSON de línea base para comparar')
+    parser.add_argument('--guardar-base', help='Guarda los resultados como nueva línea base')
+    parser.add_argument('--umbral', type=float, default=0.10,
+                        help='Aumento relativo tolerado antes de marcar regresión (default 0.10)')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--filtro', help='Ejecuta solo los benchmarks cuyo nombre contiene este texto')
+    return parser
@@ -0,0 +1,69 @@
+"""
+Generadores reproducibles de escenarios sintéticos para benchmarks
+
+Todos los generadores reciben una semilla, de modo que dos ejecuciones
+con los mismos parámetros producen exactamente el mismo sistema.
+"""
+import random
+from typing import List
+
+from src.calculations import DataLoader
+from src.models import SistemaTuberias, TramoTuberia
+
+# Catálogo compartido por todos los escenarios (se lee una sola vez)
+_loader = DataLoader()
+_FLUIDOS = _loader.cargar_fluidos()
+_ACCESORIOS = _loader.cargar_accesorios()
+
+
+def generar_sistema(num_tramos: int, semilla: int = 0, fluido: str = 'agua',
+                    caudal: float = 0.010, num_accesorios: int = 6) -> SistemaTuberias:
+    """Genera un sistema de tuberías sintético con diámetro constante
+
+    Args:
+        num_tramos: Número de tramos de tubería
+        semilla: Semilla del generador aleatorio
+        fluido: Nombre del fluido del catálogo
+        caudal: Caudal en m³/s
+        num_accesorios: Número de tipos de accesorio a incluir
+    """
+    rng = random.Random(semilla)
+    diametro = rng.choice([0.050, 0.080, 0.100, 0.150, 0.200])
+
+    sistema = SistemaTuberias(
+        fluido=_FLUIDOS[fluido],
+        caudal=caudal,
+        eficiencia_bomba=rng.uniform(0.55, 0.85),
+        elevacion_punto1=rng.uniform(0.0, 5.0),
+        elevacion_punto2=rng.uniform(5.0, 40.0)
+    )
+    sistema.tramos = [
+        TramoTuberia(
+            longitud=round(rng.uniform(0.5, 50.0), 1),
+            orientacion='vertical' if rng.random() < 0.2 else 'horizontal',
+            diametro=diametro
+        )
+        for _ in range(num_tramos)
+    ]
+
+    tipos = sorted(_ACCESORIOS)
+    for tipo in rng.sample(tipos, min(num_accesorios, len(tipos))):
+        base = _ACCESORIOS[tipo]
+        sistema.agregar_accesorio(type(base)(
+            tipo=base.tipo,
+            coeficiente_K=base.coeficiente_K,
+            longitud_equivalente=base.longitud_equivalente,
+            norma=base.norma,
+            fabricante=base.fabricante,
+            cantidad=rng.randint(1, 4)
+        ))
+    return sistema
+
+
+def generar_caudales(num_puntos: int, caudal_min: float = 0.001,
+                     caudal_max: float = 0.100) -> List[float]:
+    """Genera una malla uniforme de caudales (m³/s) para barridos"""
+    if num_puntos == 1:
+        return [caudal_min]
+    paso = (caudal_max - caudal_min) / (num_puntos - 1)
+    return [caudal_min + i * paso for i in range(num_puntos)]
@@ -2,7 +2,30 @@
 Módulo de cálculos del sistema de bombeo
 """
 from .data_loader import DataLoader
+from .catalogo import CatalogoSQLite
 from .hidraulica import CalculadoraHidraulica
+from .nucleos import (
+    NucleoHidraulico, nucleos_disponibles, obtener_nucleo, seleccionar_nucleo, verificar_paridad
+)
+from .resultados import ResultadosBombeo
 from .bombeo import CalculadoraBombeo
+from .curvas import CalculadoraCurvas
+from .escenarios import EspacioEscenarios, Escenario, ResultadoEscenario
+from .energia import (
+    CalculadoraEnergia, ResultadoEnergia, TarifaHoraria, comparar_alternativas, perfil_tipico
+)
+from .estacion import CalculadoraEstacion
+from .cavitacion import CalculadoraCavitacion, MapaCavitacion, propiedades_agua
+from .programacion import ProgramadorBombas, ProgramaBombeo, Tanque
+from .continuacion import EstadoSolver, resolver_punto_operacion, barrido_punto_operacion
+from .cancelacion import TokenCancelacion, CalculoCancelado, reportar_avance
 
-__all__ = ['DataLoader', 'CalculadoraHidraulica', 'CalculadoraBombeo']
+__all__ = ['DataLoader', 'CatalogoSQLite', 'CalculadoraHidraulica', 'NucleoHidraulico',
+           'nucleos_disponibles', 'obtener_nucleo', 'seleccionar_nucleo', 'verificar_paridad',
+           'CalculadoraBombeo', 'ResultadosBombeo',
+           'CalculadoraCurvas', 'EspacioEscenarios', 'Escenario', 'ResultadoEscenario',
+           'CalculadoraEnergia', 'ResultadoEnergia', 'TarifaHoraria', 'comparar_alternativas',
+           'perfil_tipico', 'CalculadoraEstacion', 'CalculadoraCavitacion', 'MapaCavitacion', 'propiedades_agua',
+           'ProgramadorBombas', 'ProgramaBombeo', 'Tanque',
+           'EstadoSolver', 'resolver_punto_operacion', 'barrido_punto_operacion',
+           'TokenCancelacion', 'CalculoCancelado', 'reportar_avance']
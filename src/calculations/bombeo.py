@@ -2,29 +2,39 @@
 Módulo de cálculos específicos para bombeo
 """
 import math
-from typing import Dict, List, Tuple
+from array import array
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 from ..models import SistemaTuberias
+from .cancelacion import TokenCancelacion, reportar_avance
 from .hidraulica import CalculadoraHidraulica
+from .instrumentacion import span
+from .resultados import CAMPOS, ResultadosBombeo
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional (ver calcular_curva_NPSHa)
+    np = None
 
 class CalculadoraBombeo:
     """Clase para realizar cálculos específicos de bombeo"""
     
-    def __init__(self, sistema: SistemaTuberias):
+    def __init__(self, sistema: SistemaTuberias, constantes: Optional[Dict[str, float]] = None):
         self.sistema = sistema
-        self.hidraulica = CalculadoraHidraulica(sistema)
+        self.hidraulica = CalculadoraHidraulica(sistema, constantes)
     
-    def calcular_potencia_hidraulica(self, Ht: float) -> float:
-        """Calcula la potencia hidráulica requerida"""
-        Q = self.sistema.caudal
+    def calcular_potencia_hidraulica(self, Ht: float, caudal: Optional[float] = None) -> float:
+        """Calcula la potencia hidráulica requerida (con el caudal del sistema si no se indica otro)"""
+        Q = self.sistema.caudal if caudal is None else caudal
         rho = self.sistema.fluido.densidad
         g = self.hidraulica.G
         
         Wh = Q * rho * g * Ht
         return Wh
     
-    def calcular_potencia_bomba(self, Wh: float) -> float:
-        """Calcula la potencia que debe suministrar la bomba"""
-        eta = self.sistema.eficiencia_bomba
+    def calcular_potencia_bomba(self, Wh: float, eficiencia: Optional[float] = None) -> float:
+        """Calcula la potencia que debe suministrar la bomba (con la eficiencia del sistema si no se indica otra)"""
+        eta = self.sistema.eficiencia_bomba if eficiencia is None else eficiencia
         return Wh / eta
     
     def calcular_NPSHa(self, longitud_sucursal: float, elevacion_fluido_sucursal: float) -> float:
@@ -67,6 +77,13 @@ class CalculadoraBombeo:
         hf_major_suc = f * (longitud_sucursal / diametro) * hv
         
         # Pérdidas menores en succión (accesorios típicos de succión)
+        hf_minor_suc = self._K_sucursal() * hv
+        hf_total_suc = hf_major_suc + hf_minor_suc
+        
+        return hf_total_suc
+    
+    def _K_sucursal(self) -> float:
+        """Suma de K de los accesorios típicos de la línea de succión"""
         accesorios_sucursal = [
             "entrada_tanque", "codo_90_radio_largo", "codo_90_radio_corto", 
             "codo_45", "tee_flujo_directo", "tee_flujo_ramal", 
@@ -77,11 +94,41 @@ class CalculadoraBombeo:
         for accesorio in self.sistema.accesorios:
             if accesorio.tipo.value in accesorios_sucursal:
                 K_suc_total += accesorio.K_total
+        return K_suc_total
+    
+    def calcular_curva_NPSHa(self, curva_sistema: Dict[str, Sequence[float]],
+                             longitud_sucursal: float = 5.0,
+                             elevacion_fluido_sucursal: float = 1.0) -> Sequence[float]:
+        """
+        NPSH disponible para todos los caudales de una curva del sistema
         
-        hf_minor_suc = K_suc_total * hv
-        hf_total_suc = hf_major_suc + hf_minor_suc
+        Args:
+            curva_sistema: Columnas de CalculadoraHidraulica.calcular_curva_sistema
+            longitud_sucursal: Longitud de la línea de succión (m)
+            elevacion_fluido_sucursal: Elevación del fluido respecto a la bomba (m)
+        """
+        rho_g = self.sistema.fluido.densidad * self.hidraulica.G
+        h_disponible = (self.sistema.presion_punto1 / rho_g
+                        - self.sistema.fluido.presion_vapor / rho_g
+                        + elevacion_fluido_sucursal)
+        velocidades = curva_sistema['velocidad']
+        if not self.sistema.tramos:
+            return [h_disponible] * len(velocidades)
         
-        return hf_total_suc
+        diametro = self.sistema.tramos[0].diametro
+        K_suc = self._K_sucursal()
+        L_sobre_D = longitud_sucursal / diametro
+        G2 = 2 * self.hidraulica.G
+        factores = curva_sistema['factor_friccion']
+        if np is not None:
+            v = np.asarray(velocidades, dtype=float)
+            hv = v ** 2 / G2
+            f = np.nan_to_num(np.asarray(factores, dtype=float))
+            return h_disponible - (f * L_sobre_D * hv + K_suc * hv)
+        return array('d', (
+            h_disponible - ((f * L_sobre_D if v else 0.0) + K_suc) * (v * v / G2)
+            for v, f in zip(velocidades, factores)
+        ))
     
     def calcular_alturas_sucursal_descarga(self) -> Tuple[float, float]:
         """Calcula las alturas de succión y descarga"""
@@ -94,67 +141,128 @@ class CalculadoraBombeo:
         return H_suc, H_desc
     
     def obtener_resultados_completos(self, longitud_sucursal: float = 5.0, 
-                                   elevacion_fluido_sucursal: float = 1.0) -> Dict[str, float]:
+                                   elevacion_fluido_sucursal: float = 1.0,
+                                   progreso: Optional[Callable[[int], None]] = None,
+                                   cancelacion: Optional[TokenCancelacion] = None) -> Dict[str, float]:
         """
         Obtiene todos los resultados del cálculo de bombeo
         
         Args:
             longitud_sucursal: Longitud de la línea de succión (m)
             elevacion_fluido_sucursal: Elevación del fluido respecto a la bomba (m)
+            progreso: Función opcional que recibe el porcentaje completado
+            cancelacion: Token opcional; entre etapas se lanza CalculoCancelado si fue cancelado
+        
+        Returns: diccionario con las claves de resultados.CAMPOS (ver calcular_resultados)
+        """
+        return self.calcular_resultados(longitud_sucursal, elevacion_fluido_sucursal,
+                                        progreso, cancelacion).a_dict()
+    
+    def calcular_resultados(self, longitud_sucursal: float = 5.0,
+                            elevacion_fluido_sucursal: float = 1.0,
+                            progreso: Optional[Callable[[int], None]] = None,
+                            cancelacion: Optional[TokenCancelacion] = None) -> ResultadosBombeo:
+        """Como obtener_resultados_completos, pero como registro compacto (sin diccionario)"""
+        with span('bombeo.total'):
+            return self._resultados_completos(longitud_sucursal, elevacion_fluido_sucursal,
+                                              progreso, cancelacion)
+    
+    def barrido_caudal(self, caudales: Sequence[float], longitud_sucursal: float = 5.0,
+                       elevacion_fluido_sucursal: float = 1.0,
+                       progreso: Optional[Callable[[int], None]] = None,
+                       cancelacion: Optional[TokenCancelacion] = None) -> Dict[str, array]:
+        """
+        Evalúa los resultados completos para una serie de caudales
+        
+        Los resultados se devuelven por columnas (un array('d') por clave de
+        obtener_resultados_completos, más 'caudal'), lo que ocupa 8 bytes por
+        valor y se puede mostrar directamente en una tabla por columnas.
+        
+        Args:
+            caudales: Caudales a evaluar (m³/s, positivos)
+            longitud_sucursal: Longitud de la línea de succión (m)
+            elevacion_fluido_sucursal: Elevación del fluido respecto a la bomba (m)
+            progreso: Función opcional que recibe el porcentaje completado
+            cancelacion: Token opcional; se verifica periódicamente
         """
+        # Copia superficial: el caudal varía sin modificar el sistema original
+        calculadora = CalculadoraBombeo(replace(self.sistema), self.hidraulica.constantes)
+        sistema = calculadora.sistema
+        total = len(caudales)
+        paso = max(1, total // 100)
+        columnas = {'caudal': array('d', caudales)}
+        columnas.update((campo, array('d')) for campo in CAMPOS)
+        # Columnas en el orden de CAMPOS: cada registro se reparte sin buscar claves
+        destinos = [columnas[campo].append for campo in CAMPOS]
+        
+        with span('bombeo.barrido'):
+            for i, caudal in enumerate(caudales):
+                if i % paso == 0:
+                    reportar_avance(100 * i // total, progreso, cancelacion)
+                sistema.caudal = caudal
+                resultados = calculadora._resultados_completos(longitud_sucursal,
+                                                               elevacion_fluido_sucursal)
+                for agregar, valor in zip(destinos, resultados):
+                    agregar(valor)
+        reportar_avance(100, progreso, cancelacion)
+        return columnas
+    
+    def _resultados_completos(self, longitud_sucursal: float,
+                              elevacion_fluido_sucursal: float,
+                              progreso=None, cancelacion=None) -> ResultadosBombeo:
+        """Calcula los resultados por etapas (cada etapa es un span de instrumentación)"""
         # Parámetros del flujo
-        parametros_flujo = self.hidraulica.obtener_parametros_flujo()
+        with span('bombeo.flujo'):
+            parametros_flujo = self.hidraulica.obtener_parametros_flujo()
+        reportar_avance(20, progreso, cancelacion)
         
         # Pérdidas
-        hf_major, hf_minor, hf_total = self.hidraulica.calcular_perdidas_totales()
+        with span('bombeo.perdidas'):
+            hf_major, hf_minor, hf_total = self.hidraulica.calcular_perdidas_totales()
+        reportar_avance(40, progreso, cancelacion)
         
         # Alturas
-        h_elev = self.hidraulica.calcular_altura_elevacion()
-        h_presion = self.hidraulica.calcular_altura_presion()
-        Ht = self.hidraulica.calcular_carga_total_bomba()
-        
-        # Alturas de succión y descarga
-        H_suc, H_desc = self.calcular_alturas_sucursal_descarga()
+        with span('bombeo.alturas'):
+            h_elev = self.hidraulica.calcular_altura_elevacion()
+            h_presion = self.hidraulica.calcular_altura_presion()
+            Ht = self.hidraulica.calcular_carga_total_bomba()
+            
+            # Alturas de succión y descarga
+            H_suc, H_desc = self.calcular_alturas_sucursal_descarga()
+        reportar_avance(60, progreso, cancelacion)
         
         # NPSHa
-        NPSHa = self.calcular_NPSHa(longitud_sucursal, elevacion_fluido_sucursal)
+        with span('bombeo.npsha'):
+            NPSHa = self.calcular_NPSHa(longitud_sucursal, elevacion_fluido_sucursal)
+            perdidas_sucursal = self._calcular_perdidas_sucursal(longitud_sucursal)
+        reportar_avance(80, progreso, cancelacion)
         
         # Potencias
-        Wh = self.calcular_potencia_hidraulica(Ht)
-        Wb = self.calcular_potencia_bomba(Wh)
+        with span('bombeo.potencia'):
+            Wh = self.calcular_potencia_hidraulica(Ht)
+            Wb = self.calcular_potencia_bomba(Wh)
+        reportar_avance(100, progreso, cancelacion)
         
         # Presiones de referencia
         h_presion_inicial = self.sistema.presion_punto1 / (self.sistema.fluido.densidad * self.hidraulica.G)
         h_presion_vapor = self.sistema.fluido.presion_vapor / (self.sistema.fluido.densidad * self.hidraulica.G)
         
-        return {
+        return ResultadosBombeo(
             # Parámetros del flujo
-            'velocidad': parametros_flujo.get('velocidad', 0),
-            'numero_reynolds': parametros_flujo.get('numero_reynolds', 0),
-            'factor_friccion': parametros_flujo.get('factor_friccion', 0),
+            parametros_flujo.get('velocidad', 0),
+            parametros_flujo.get('numero_reynolds', 0),
+            parametros_flujo.get('factor_friccion', 0),
             
             # Pérdidas
-            'perdidas_mayores': hf_major,
-            'perdidas_menores': hf_minor,
-            'perdidas_totales': hf_total,
+            hf_major, hf_minor, hf_total,
             
             # Alturas
-            'altura_elevacion': h_elev,
-            'altura_presion': h_presion,
-            'carga_total_bomba': Ht,
-            'altura_sucursal': H_suc,
-            'altura_descarga': H_desc,
+            h_elev, h_presion, Ht, H_suc, H_desc,
             
             # NPSH
-            'NPSHa': NPSHa,
-            'presion_inicial_m': h_presion_inicial,
-            'presion_vapor_m': h_presion_vapor,
-            'elevacion_fluido_sucursal': elevacion_fluido_sucursal,
-            'perdidas_sucursal': self._calcular_perdidas_sucursal(longitud_sucursal),
+            NPSHa, h_presion_inicial, h_presion_vapor, elevacion_fluido_sucursal,
+            perdidas_sucursal,
             
             # Potencias
-            'potencia_hidraulica_W': Wh,
-            'potencia_bomba_W': Wb,
-            'potencia_hidraulica_kW': Wh / 1000,
-            'potencia_bomba_kW': Wb / 1000
-        }
+            Wh, Wb, Wh / 1000, Wb / 1000,
+        )
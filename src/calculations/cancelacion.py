@@ -0,0 +1,43 @@
+"""
+Cancelación cooperativa de cálculos largos
+
+Los cálculos que se ejecutan fuera del hilo de la interfaz reciben un
+TokenCancelacion y lo consultan entre etapas; al detectar la cancelación
+lanzan CalculoCancelado para abandonar el trabajo de forma ordenada.
+"""
+import threading
+from typing import Callable, Optional
+
+
+class CalculoCancelado(Exception):
+    """Se lanza cuando un cálculo detecta que fue cancelado"""
+
+
+class TokenCancelacion:
+    """Bandera de cancelación compartida entre el solicitante y el cálculo"""
+
+    def __init__(self):
+        self._evento = threading.Event()
+
+    def cancelar(self):
+        """Solicita la cancelación del cálculo"""
+        self._evento.set()
+
+    @property
+    def cancelado(self) -> bool:
+        """Indica si se solicitó la cancelación"""
+        return self._evento.is_set()
+
+    def verificar(self):
+        """Lanza CalculoCancelado si se solicitó la cancelación"""
+        if self._evento.is_set():
+            raise CalculoCancelado()
+
+
+def reportar_avance(porcentaje: int, progreso: Optional[Callable[[int], None]] = None,
+                    cancelacion: Optional[TokenCancelacion] = None):
+    """Verifica la cancelación y reporta el avance (ambos opcionales)"""
+    if cancelacion is not None:
+        cancelacion.verificar()
+    if progreso is not None:
+        progreso(porcentaje)
@@ -0,0 +1,281 @@
+"""
+Catálogo de componentes respaldado por SQLite
+
+Permite trabajar con bibliotecas de fabricantes de cientos de miles de
+accesorios y fluidos sin cargarlas completas en memoria. Las consultas
+son paginadas y usan índices por tipo de accesorio, norma, fabricante y
+nombre/temperatura de fluido.
+
+Un catálogo guardado en archivo recuerda la firma (fecha de modificación y
+tamaño) de los CSV de los que se importó y se vuelve a importar cuando
+cambian.
+"""
+import csv
+import os
+import sqlite3
+import threading
+from contextlib import nullcontext
+from typing import Iterable, List, Optional, Tuple
+from ..models.accesorio import Accesorio, TipoAccesorio
+from ..models.fluido import Fluido
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS accesorios (
+    id INTEGER PRIMARY KEY,
+    tipo_accesorio TEXT NOT NULL,
+    coeficiente_K REAL NOT NULL,
+    longitud_equivalente_mm REAL NOT NULL,
+    norma TEXT NOT NULL,
+    fabricante TEXT NOT NULL,
+    descripcion TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_accesorios_tipo ON accesorios (tipo_accesorio);
+CREATE INDEX IF NOT EXISTS idx_accesorios_norma ON accesorios (norma);
+CREATE INDEX IF NOT EXISTS idx_accesorios_fabricante ON accesorios (fabricante);
+
+CREATE TABLE IF NOT EXISTS fluidos (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    densidad REAL NOT NULL,
+    viscosidad REAL NOT NULL,
+    presion_vapor REAL NOT NULL,
+    temperatura_C REAL,
+    descripcion TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_fluidos_nombre_temperatura ON fluidos (nombre, temperatura_C);
+CREATE INDEX IF NOT EXISTS idx_fluidos_temperatura ON fluidos (temperatura_C);
+
+CREATE TABLE IF NOT EXISTS metadatos (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+"""
+
+_COLUMNAS_ACCESORIO = "tipo_accesorio, coeficiente_K, longitud_equivalente_mm, norma, fabricante"
+_COLUMNAS_FLUIDO = "nombre, densidad, viscosidad, presion_vapor, temperatura_C"
+
+
+class CatalogoSQLite:
+    """Catálogo de accesorios y fluidos almacenado en una base SQLite
+
+    Cada hilo obtiene su propia conexión, por lo que el mismo catálogo
+    puede consultarse desde la interfaz y desde hilos de cálculo. Solo la
+    base en memoria, que usa una única conexión compartida, serializa los
+    accesos con un bloqueo.
+    """
+
+    def __init__(self, ruta: str = ":memory:"):
+        self.ruta = ruta
+        self._local = threading.local()
+        # Una base en memoria no se comparte entre conexiones: se usa una sola
+        self._conexion_compartida = None
+        self._bloqueo = nullcontext()
+        if ruta == ":memory:":
+            self._conexion_compartida = sqlite3.connect(ruta, check_same_thread=False)
+            self._bloqueo = threading.Lock()
+        with self._bloqueo:
+            self._conexion().executescript(_ESQUEMA)
+
+    def _conexion(self) -> sqlite3.Connection:
+        """Retorna la conexión del hilo actual"""
+        if self._conexion_compartida is not None:
+            return self._conexion_compartida
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.ruta)
+            self._local.conexion = conexion
+        return conexion
+
+    def _ejecutar(self, sql: str, parametros: Iterable = ()) -> List[tuple]:
+        with self._bloqueo:
+            return self._conexion().execute(sql, tuple(parametros)).fetchall()
+
+    def cerrar(self):
+        """Cierra la conexión del hilo actual"""
+        if self._conexion_compartida is not None:
+            self._conexion_compartida.close()
+            self._conexion_compartida = None
+            return
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is not None:
+            conexion.close()
+            self._local.conexion = None
+
+    # ------------------------------------------------------------------
+    # Importación
+    # ------------------------------------------------------------------
+
+    def esta_vacio(self) -> bool:
+        """Indica si el catálogo no tiene accesorios ni fluidos"""
+        filas = self._ejecutar(
+            "SELECT (SELECT COUNT(*) FROM accesorios) + (SELECT COUNT(*) FROM fluidos)"
+        )
+        return filas[0][0] == 0
+
+    def leer_metadato(self, clave: str) -> Optional[str]:
+        """Valor guardado con guardar_metadato (None si no existe)"""
+        filas = self._ejecutar("SELECT valor FROM metadatos WHERE clave = ?", (clave,))
+        return filas[0][0] if filas else None
+
+    def guardar_metadato(self, clave: str, valor: str):
+        """Guarda un valor de texto asociado al catálogo (p. ej. la firma de los CSV)"""
+        self._insertar("INSERT OR REPLACE INTO metadatos (clave, valor) VALUES (?, ?)",
+                       [(clave, valor)])
+
+    def vaciar(self):
+        """Elimina todos los accesorios y fluidos"""
+        with self._bloqueo:
+            conexion = self._conexion()
+            with conexion:
+                conexion.execute("DELETE FROM accesorios")
+                conexion.execute("DELETE FROM fluidos")
+
+    def importar_accesorios_csv(self, filepath: str) -> int:
+        """Importa accesorios desde un CSV con el formato de accesorios.csv"""
+        with open(filepath, 'r', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            filas = (
+                (row['tipo_accesorio'], float(row['coeficiente_K']),
+                 float(row['longitud_equivalente_mm']), row['norma'],
+                 row['fabricante'], row.get('descripcion', ''))
+                for row in reader
+            )
+            return self._insertar(
+                "INSERT INTO accesorios (tipo_accesorio, coeficiente_K, longitud_equivalente_mm, "
+                "norma, fabricante, descripcion) VALUES (?, ?, ?, ?, ?, ?)",
+                filas
+            )
+
+    def importar_fluidos_csv(self, filepath: str) -> int:
+        """Importa fluidos desde un CSV con el formato de fluidos.csv"""
+        with open(filepath, 'r', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            filas = (
+                (row['nombre'], float(row['densidad']), float(row['viscosidad']),
+                 float(row['presion_vapor']),
+                 float(row['temperatura_C']) if row.get('temperatura_C') else None,
+                 row.get('descripcion', ''))
+                for row in reader
+            )
+            return self._insertar(
+                "INSERT INTO fluidos (nombre, densidad, viscosidad, presion_vapor, "
+                "temperatura_C, descripcion) VALUES (?, ?, ?, ?, ?, ?)",
+                filas
+            )
+
+    def _insertar(self, sql: str, filas: Iterable[tuple]) -> int:
+        with self._bloqueo:
+            conexion = self._conexion()
+            with conexion:
+                cursor = conexion.executemany(sql, filas)
+            return cursor.rowcount
+
+    # ------------------------------------------------------------------
+    # Consultas paginadas
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _filtros_accesorios(tipo: Optional[str], norma: Optional[str],
+                            fabricante: Optional[str]) -> Tuple[str, list]:
+        condiciones = []
+        parametros = []
+        for columna, valor in (('tipo_accesorio', tipo), ('norma', norma), ('fabricante', fabricante)):
+            if valor is not None:
+                condiciones.append(f"{columna} = ?")
+                parametros.append(valor)
+        where = f" WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        return where, parametros
+
+    def consultar_accesorios(self, tipo: str = None, norma: str = None, fabricante: str = None,
+                             limite: int = 100, desplazamiento: int = 0) -> List[Accesorio]:
+        """Retorna una página de accesorios que cumplen los filtros"""
+        where, parametros = self._filtros_accesorios(tipo, norma, fabricante)
+        filas = self._ejecutar(
+            f"SELECT {_COLUMNAS_ACCESORIO} FROM accesorios{where} ORDER BY id LIMIT ? OFFSET ?",
+            parametros + [limite, desplazamiento]
+        )
+        return [self._fila_a_accesorio(fila) for fila in filas]
+
+    def contar_accesorios(self, tipo: str = None, norma: str = None, fabricante: str = None) -> int:
+        """Cuenta los accesorios que cumplen los filtros"""
+        where, parametros = self._filtros_accesorios(tipo, norma, fabricante)
+        return self._ejecutar(f"SELECT COUNT(*) FROM accesorios{where}", parametros)[0][0]
+
+    def consultar_fluidos(self, nombre: str = None, temperatura_min: float = None,
+                          temperatura_max: float = None, limite: int = 100,
+                          desplazamiento: int = 0) -> List[Fluido]:
+        """Retorna una página de fluidos filtrados por nombre y rango de temperatura"""
+        condiciones = []
+        parametros = []
+        if nombre is not None:
+            condiciones.append("nombre = ?")
+            parametros.append(nombre)
+        if temperatura_min is not None:
+            condiciones.append("temperatura_C >= ?")
+            parametros.append(temperatura_min)
+        if temperatura_max is not None:
+            condiciones.append("temperatura_C <= ?")
+            parametros.append(temperatura_max)
+        where = f" WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        filas = self._ejecutar(
+            f"SELECT {_COLUMNAS_FLUIDO} FROM fluidos{where} ORDER BY id LIMIT ? OFFSET ?",
+            parametros + [limite, desplazamiento]
+        )
+        return [self._fila_a_fluido(fila) for fila in filas]
+
+    def valores_distintos(self, columna: str) -> List[str]:
+        """Lista los valores distintos de norma, fabricante o tipo de accesorio"""
+        if columna not in ('tipo_accesorio', 'norma', 'fabricante'):
+            raise ValueError(f"Columna '{columna}' no indexada en el catálogo")
+        filas = self._ejecutar(f"SELECT DISTINCT {columna} FROM accesorios ORDER BY {columna}")
+        return [fila[0] for fila in filas]
+
+    @staticmethod
+    def _fila_a_accesorio(fila: tuple) -> Accesorio:
+        tipo, K, leq_mm, norma, fabricante = fila
+        return Accesorio(
+            tipo=TipoAccesorio(tipo),
+            coeficiente_K=K,
+            longitud_equivalente=leq_mm / 1000.0,
+            norma=norma,
+            fabricante=fabricante
+        )
+
+    @staticmethod
+    def _fila_a_fluido(fila: tuple) -> Fluido:
+        nombre, densidad, viscosidad, presion_vapor, temperatura = fila
+        return Fluido(
+            nombre=nombre,
+            densidad=densidad,
+            viscosidad=viscosidad,
+            presion_vapor=presion_vapor,
+            temperatura_C=temperatura if temperatura is not None else 20.0
+        )
+
+
+def _firma_csv(*rutas: str) -> str:
+    """Fecha de modificación y tamaño de cada archivo (cambia si se edita alguno)"""
+    partes = []
+    for ruta in rutas:
+        estado = os.stat(ruta)
+        partes.append(f"{os.path.basename(ruta)}:{estado.st_mtime_ns}:{estado.st_size}")
+    return ";".join(partes)
+
+
+def crear_catalogo_desde_csv(data_dir: str, ruta: str = ":memory:") -> CatalogoSQLite:
+    """
+    Crea (o reutiliza) un catálogo SQLite poblado con los CSV del directorio de datos
+
+    Una base existente se reutiliza solo si se importó de los mismos CSV
+    (misma firma); si alguno cambió, se vacía y se vuelve a importar.
+    """
+    accesorios_csv = os.path.join(data_dir, 'accesorios.csv')
+    fluidos_csv = os.path.join(data_dir, 'fluidos.csv')
+    firma = _firma_csv(accesorios_csv, fluidos_csv)
+    catalogo = CatalogoSQLite(ruta)
+    if catalogo.esta_vacio() or catalogo.leer_metadato('firma_csv') != firma:
+        catalogo.vaciar()
+        catalogo.importar_accesorios_csv(accesorios_csv)
+        catalogo.importar_fluidos_csv(fluidos_csv)
+        catalogo.guardar_metadato('firma_csv', firma)
+    return catalogo
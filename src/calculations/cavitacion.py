@@ -0,0 +1,237 @@
+"""
+Módulo de cavitación: mapa de NPSH disponible contra requerido
+
+calcular_NPSHa evalúa un solo punto (un caudal, una elevación del fluido en
+la succión y las propiedades del fluido a su temperatura). Aquí se evalúa
+una malla completa caudal × nivel del tanque de succión × temperatura:
+
+    NPSHa(Q, z, T) = P1/(ρ(T)·g) − Pv(T)/(ρ(T)·g) + z − hf_succión(Q, T)
+
+El nivel z solo suma una constante y la temperatura solo cambia ρ, μ y Pv,
+así que las pérdidas se calculan una vez por (T, Q) y la malla se arma por
+difusión de arreglos. Comparando con el NPSHr de la bomba se obtiene el
+margen en cada punto y la envolvente de operación segura: el nivel mínimo
+del tanque para cada caudal y el caudal máximo para cada nivel.
+"""
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from ..models import CurvaBomba, SistemaTuberias
+from .bombeo import CalculadoraBombeo
+from .instrumentacion import span
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él la malla se arma fila por fila
+    np = None
+
+# Margen mínimo NPSHa − NPSHr considerado seguro (m)
+MARGEN_SEGURIDAD = 0.5
+
+
+def propiedades_agua(temperatura_C: float) -> Dict[str, float]:
+    """
+    Densidad, viscosidad y presión de vapor del agua entre 1 y 100 °C
+
+    Densidad de Thiesen, viscosidad de Vogel y presión de vapor de Antoine.
+
+    Returns: {'densidad': kg/m³, 'viscosidad': Pa·s, 'presion_vapor': Pa}
+    """
+    if not 1.0 <= temperatura_C <= 100.0:
+        raise ValueError("Las propiedades del agua se conocen entre 1 y 100 °C")
+    T = temperatura_C
+    densidad = 1000.0 * (1.0 - (T + 288.9414) / (508929.2 * (T + 68.12963)) * (T - 3.9863) ** 2)
+    viscosidad = 2.939e-5 * math.exp(507.88 / (T + 273.15 - 149.3))
+    presion_vapor = 133.322 * 10.0 ** (8.07131 - 1730.63 / (233.426 + T))
+    return {'densidad': densidad, 'viscosidad': viscosidad, 'presion_vapor': presion_vapor}
+
+
+@dataclass
+class MapaCavitacion:
+    """NPSH disponible y margen sobre una malla temperatura × nivel × caudal
+
+    NPSHa[t][k][i] y margen[t][k][i] corresponden a temperaturas[t],
+    niveles[k] y caudales[i] (arreglos de NumPy de 3 dimensiones, o listas
+    de listas de array('d') sin NumPy). El margen es NaN fuera de la curva
+    de la bomba.
+
+    Envolvente de operación segura (margen ≥ margen_seguridad):
+        nivel_minimo[t][i]: Nivel mínimo del tanque de succión para el caudal i
+        caudal_maximo[t][k]: Mayor caudal seguro desde Q = 0 con el nivel k
+                             (NaN si ni el primer caudal es seguro)
+    """
+    caudales: Sequence[float]
+    niveles: Sequence[float]
+    temperaturas: Sequence[float]
+    NPSHa: object
+    NPSHr: Sequence[float]
+    margen: object
+    nivel_minimo: object
+    caudal_maximo: object
+    margen_seguridad: float = MARGEN_SEGURIDAD
+
+    def corte(self, indice_temperatura: int = 0):
+        """Margen (niveles × caudales) a una temperatura, listo para un mapa de calor"""
+        return self.margen[indice_temperatura]
+
+    def fraccion_segura(self, indice_temperatura: int = 0) -> float:
+        """Fracción de la malla niveles × caudales con margen suficiente"""
+        margen = self.corte(indice_temperatura)
+        if np is not None:
+            with np.errstate(invalid='ignore'):
+                return float(np.mean(margen >= self.margen_seguridad))
+        total = sum(len(fila) for fila in margen)
+        seguros = sum(1 for fila in margen for m in fila if m >= self.margen_seguridad)
+        return seguros / total if total else 0.0
+
+
+class CalculadoraCavitacion:
+    """Mapa de cavitación de un sistema con una bomba
+
+    Args:
+        sistema: Sistema de tuberías (la succión usa el primer tramo y sus accesorios de succión)
+        bomba: Curva de la bomba con NPSH requerido
+        constantes: Constantes físicas compartidas (opcional)
+    """
+
+    def __init__(self, sistema: SistemaTuberias, bomba: CurvaBomba,
+                 constantes: Optional[Dict[str, float]] = None):
+        if not bomba.npsh_requerido:
+            raise ValueError("La curva de la bomba no tiene NPSH requerido")
+        self.sistema = sistema
+        self.bomba = bomba
+        self.bombeo = CalculadoraBombeo(sistema, constantes)
+
+    def propiedades(self, temperaturas: Optional[Sequence[float]]) -> List[Dict[str, float]]:
+        """Propiedades del fluido en cada temperatura (la del fluido si es None)
+
+        Solo el agua tiene propiedades en función de la temperatura; para los
+        demás fluidos se usan las del catálogo.
+        """
+        fluido = self.sistema.fluido
+        if temperaturas is None:
+            return [{'temperatura_C': fluido.temperatura_C, 'densidad': fluido.densidad,
+                     'viscosidad': fluido.viscosidad, 'presion_vapor': fluido.presion_vapor}]
+        if fluido.nombre != 'agua':
+            raise ValueError("Solo se conocen las propiedades del agua en función de la temperatura")
+        return [dict(propiedades_agua(T), temperatura_C=T) for T in temperaturas]
+
+    def calcular_mapa(self, caudales: Sequence[float], niveles: Sequence[float],
+                      temperaturas: Optional[Sequence[float]] = None,
+                      longitud_sucursal: float = 5.0,
+                      margen_seguridad: float = MARGEN_SEGURIDAD) -> MapaCavitacion:
+        """
+        Evalúa NPSHa y el margen sobre toda la malla
+
+        Args:
+            caudales: Caudales crecientes (m³/s)
+            niveles: Elevaciones del fluido en la succión respecto a la bomba (m);
+                     negativas si la bomba aspira por encima del tanque
+            temperaturas: Temperaturas del agua (°C); por defecto la del fluido
+            longitud_sucursal: Longitud de la línea de succión (m)
+            margen_seguridad: Margen mínimo NPSHa − NPSHr (m)
+        """
+        if not len(caudales) or not len(niveles):
+            raise ValueError("Se necesita al menos un caudal y un nivel")
+        propiedades = self.propiedades(temperaturas)
+        with span('cavitacion.mapa'):
+            if np is not None:
+                mapa = self._mapa_numpy(caudales, niveles, propiedades, longitud_sucursal,
+                                        margen_seguridad)
+            else:
+                mapa = self._mapa_python(caudales, niveles, propiedades, longitud_sucursal,
+                                         margen_seguridad)
+        return mapa
+
+    def _coeficientes_succion(self, longitud_sucursal: float):
+        """Diámetro de succión, L/D y K de los accesorios de succión (como _calcular_perdidas_sucursal)"""
+        if not self.sistema.tramos:
+            return None, 0.0, 0.0
+        diametro = self.sistema.tramos[0].diametro
+        return diametro, longitud_sucursal / diametro, self.bombeo._K_sucursal()
+
+    def _perdidas_succion(self, caudales, propiedades: Dict[str, float], longitud_sucursal: float):
+        """Pérdidas de la succión con el fluido a una temperatura (None si no hay tramos)
+
+        Las evalúa el núcleo de cálculo activo, con las mismas expresiones que
+        la curva del sistema.
+        """
+        diametro, L_sobre_D, K_suc = self._coeficientes_succion(longitud_sucursal)
+        if diametro is None:
+            return None
+        hidraulica = self.bombeo.hidraulica
+        return hidraulica.nucleo_activo().curva_sistema(
+            caudales, diametro, L_sobre_D, K_suc, propiedades['densidad'],
+            propiedades['viscosidad'], hidraulica.G)
+
+    def _mapa_numpy(self, caudales, niveles, propiedades, longitud_sucursal,
+                    margen_seguridad) -> MapaCavitacion:
+        G = self.bombeo.hidraulica.G
+        P1 = self.sistema.presion_punto1
+        Q = np.asarray(caudales, dtype=float)
+        z = np.asarray(niveles, dtype=float)
+        rho = np.array([p['densidad'] for p in propiedades])[:, None]
+        Pv = np.array([p['presion_vapor'] for p in propiedades])[:, None]
+
+        # Pérdidas en la succión por temperatura y caudal (T × Q), una fila por temperatura
+        perdidas = np.zeros((len(propiedades), len(Q)))
+        for fila, p in zip(perdidas, propiedades):
+            curva = self._perdidas_succion(Q, p, longitud_sucursal)
+            if curva is not None:
+                np.add(curva['perdidas_mayores'], curva['perdidas_menores'], out=fila)
+
+        # Carga disponible sin nivel ni pérdidas (T × Q), la malla es T × niveles × Q
+        base = (P1 - Pv) / (rho * G) - perdidas
+        NPSHa = base[:, None, :] + z[None, :, None]
+        NPSHr = np.interp(Q, self.bomba.caudales, self.bomba.npsh_requerido,
+                          left=np.nan, right=np.nan)
+        margen = NPSHa - NPSHr
+        nivel_minimo = NPSHr + margen_seguridad - base
+
+        # Caudal máximo: el anterior al primer caudal inseguro (NaN cuenta como inseguro)
+        with np.errstate(invalid='ignore'):
+            seguro = margen >= margen_seguridad
+        primero_inseguro = np.where(seguro.all(axis=-1), len(Q), np.argmin(seguro, axis=-1))
+        caudal_maximo = np.where(primero_inseguro > 0, Q[np.maximum(primero_inseguro - 1, 0)],
+                                 np.nan)
+        return MapaCavitacion(Q, z, np.array([p['temperatura_C'] for p in propiedades]),
+                              NPSHa, NPSHr, margen, nivel_minimo, caudal_maximo, margen_seguridad)
+
+    def _mapa_python(self, caudales, niveles, propiedades, longitud_sucursal,
+                     margen_seguridad) -> MapaCavitacion:
+        G = self.bombeo.hidraulica.G
+        P1 = self.sistema.presion_punto1
+        nan = float('nan')
+        NPSHr = array('d', map(self.bomba.npshr, caudales))
+
+        NPSHa, margen, nivel_minimo, caudal_maximo = [], [], [], []
+        for p in propiedades:
+            rho = p['densidad']
+            h0 = (P1 - p['presion_vapor']) / (rho * G)
+            curva = self._perdidas_succion(caudales, p, longitud_sucursal)
+            if curva is None:
+                base = array('d', [h0]) * len(caudales)
+            else:
+                base = array('d', (h0 - mayores - menores for mayores, menores
+                                   in zip(curva['perdidas_mayores'], curva['perdidas_menores'])))
+            filas_npsha, filas_margen, maximos = [], [], array('d')
+            for z in niveles:
+                fila = array('d', (b + z for b in base))
+                fila_margen = array('d', (a - r for a, r in zip(fila, NPSHr)))
+                filas_npsha.append(fila)
+                filas_margen.append(fila_margen)
+                maximo = nan
+                for q, m in zip(caudales, fila_margen):
+                    if not m >= margen_seguridad:
+                        break
+                    maximo = q
+                maximos.append(maximo)
+            NPSHa.append(filas_npsha)
+            margen.append(filas_margen)
+            nivel_minimo.append(array('d', (r + margen_seguridad - b for r, b in zip(NPSHr, base))))
+            caudal_maximo.append(maximos)
+        return MapaCavitacion(array('d', caudales), array('d', niveles),
+                              array('d', (p['temperatura_C'] for p in propiedades)),
+                              NPSHa, NPSHr, margen, nivel_minimo, caudal_maximo, margen_seguridad)
@@ -0,0 +1,255 @@
+"""
+Módulo de continuación: arranque en caliente de resoluciones sucesivas
+
+Los barridos, las simulaciones por periodos y la edición interactiva
+resuelven una serie de problemas casi iguales. EstadoSolver guarda el valor
+convergido de cada resolución (por clave) y la trayectoria reciente a lo
+largo del parámetro del barrido, de modo que la siguiente resolución parte
+de una predicción en lugar de empezar de cero:
+
+    predictor: Q* = Q₁ + (Q₁ − Q₀) / (p₁ − p₀) · (p − p₁)
+    corrector: secante sobre H_bomba(Q) − H_sistema(Q) desde Q*, con la
+               pendiente convergida de la resolución anterior como primer paso
+
+El estado también cuenta resoluciones e iteraciones (evaluaciones de la
+función), lo que permite comparar el arranque en frío con el continuado.
+"""
+import math
+from dataclasses import dataclass, field, fields, replace
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..models import CurvaBomba, SistemaTuberias
+from .hidraulica import CalculadoraHidraulica
+from .instrumentacion import span
+
+# Puntos de la trayectoria que se conservan por clave (el predictor usa los dos últimos)
+LONGITUD_TRAYECTORIA = 2
+
+# Parámetro de barrido que escala la bomba con las leyes de afinidad (Q ∝ n, H ∝ n²)
+VELOCIDAD = 'velocidad'
+
+
+@dataclass
+class EstadoSolver:
+    """Valores convergidos que se arrastran de una resolución a la siguiente
+
+    Atributos:
+        valores: clave -> último valor convergido
+        trayectoria: clave -> últimos (parámetro, valor) convergidos
+        pendientes: clave -> última pendiente de la función (primer paso de la secante)
+        resoluciones: Resoluciones registradas
+        iteraciones: Evaluaciones de la función en todas ellas
+    """
+    valores: Dict[str, float] = field(default_factory=dict)
+    trayectoria: Dict[str, List[Tuple[float, float]]] = field(default_factory=dict)
+    pendientes: Dict[str, float] = field(default_factory=dict)
+    resoluciones: int = 0
+    iteraciones: int = 0
+
+    @property
+    def iteraciones_promedio(self) -> float:
+        return self.iteraciones / self.resoluciones if self.resoluciones else 0.0
+
+    def inicial(self, clave: str, parametro: Optional[float] = None) -> Optional[float]:
+        """Valor de arranque: extrapolación lineal en el parámetro o el último valor"""
+        puntos = self.trayectoria.get(clave, ())
+        if parametro is not None and len(puntos) >= 2:
+            (p0, v0), (p1, v1) = puntos[-2], puntos[-1]
+            if p1 != p0:
+                return v1 + (v1 - v0) / (p1 - p0) * (parametro - p1)
+        return self.valores.get(clave)
+
+    def registrar(self, clave: str, valor: float, iteraciones: int,
+                  parametro: Optional[float] = None, pendiente: Optional[float] = None):
+        """Guarda un valor convergido (los NaN solo cuentan las iteraciones)"""
+        self.resoluciones += 1
+        self.iteraciones += iteraciones
+        if not math.isfinite(valor):
+            return
+        self.valores[clave] = valor
+        if pendiente is not None and math.isfinite(pendiente) and pendiente != 0:
+            self.pendientes[clave] = pendiente
+        if parametro is not None:
+            puntos = self.trayectoria.setdefault(clave, [])
+            puntos.append((parametro, valor))
+            del puntos[:-LONGITUD_TRAYECTORIA]
+
+    def reiniciar(self):
+        """Olvida los valores y los contadores (p. ej. al cambiar de sistema)"""
+        self.valores.clear()
+        self.trayectoria.clear()
+        self.pendientes.clear()
+        self.resoluciones = 0
+        self.iteraciones = 0
+
+
+def resolver_punto_operacion(hidraulica: CalculadoraHidraulica, bomba: CurvaBomba,
+                             estado: Optional[EstadoSolver] = None,
+                             clave: str = 'punto_operacion', parametro: Optional[float] = None,
+                             velocidad: float = 1.0, tolerancia: float = 1e-10,
+                             max_iteraciones: int = 60) -> Dict[str, float]:
+    """
+    Punto de operación de una bomba con la curva del sistema
+
+    Resuelve H_bomba(Q) = H_sistema(Q) por secante desde el valor de arranque
+    del estado (o desde el centro de la curva si no hay estado). Si la secante
+    sale de la curva o no converge, se cambia a regula falsi (Illinois) sobre
+    toda la curva de la bomba.
+
+    Args:
+        hidraulica: Calculadora del sistema
+        bomba: Curva de la bomba
+        estado: Estado compartido entre resoluciones (opcional)
+        clave: Clave del valor en el estado
+        parametro: Valor del parámetro del barrido (activa el predictor)
+        velocidad: Velocidad relativa de la bomba (leyes de afinidad)
+        tolerancia: Tolerancia en caudal (m³/s)
+        max_iteraciones: Evaluaciones máximas de la función
+
+    Returns: {'caudal', 'altura', 'iteraciones', 'convergio'} (NaN si las
+             curvas no se cruzan dentro de la curva de la bomba)
+    """
+    carga_sistema = hidraulica.funcion_carga_sistema()
+    escala = velocidad * velocidad
+
+    def diferencia(caudal: float) -> float:
+        return escala * bomba.altura(caudal / velocidad) - carga_sistema(caudal)
+
+    inferior = velocidad * bomba.caudales[0]
+    superior = velocidad * bomba.caudales[-1]
+    inicial = pendiente = None
+    if estado is not None:
+        inicial = estado.inicial(clave, parametro)
+        pendiente = estado.pendientes.get(clave)
+    if inicial is None or not inferior <= inicial <= superior:
+        inicial, pendiente = 0.5 * (inferior + superior), None
+
+    with span('continuacion.punto_operacion'):
+        caudal, iteraciones, pendiente = _secante(diferencia, inicial, pendiente, inferior,
+                                                  superior, tolerancia, max_iteraciones)
+        if caudal is None:
+            caudal, usadas = _illinois(diferencia, inferior, superior, tolerancia,
+                                       max_iteraciones)
+            iteraciones += usadas
+    if estado is not None:
+        estado.registrar(clave, caudal, iteraciones, parametro, pendiente)
+    convergio = math.isfinite(caudal)
+    return {
+        'caudal': caudal,
+        'altura': carga_sistema(caudal) if convergio else math.nan,
+        'iteraciones': iteraciones,
+        'convergio': convergio,
+    }
+
+
+def _secante(funcion: Callable[[float], float], x0: float, pendiente: Optional[float],
+             inferior: float, superior: float, tolerancia: float,
+             max_iteraciones: int) -> Tuple[Optional[float], int, Optional[float]]:
+    """Secante dentro de [inferior, superior]
+
+    Con una pendiente conocida el primer paso es de Newton y solo cuesta una
+    evaluación. Returns: (raíz o None si no converge, evaluaciones, última pendiente)
+    """
+    f0 = funcion(x0)
+    evaluaciones = 1
+    if pendiente is not None:
+        x1 = x0 - f0 / pendiente
+        if not inferior <= x1 <= superior:
+            x1 = None
+        elif abs(x1 - x0) <= tolerancia:
+            return x1, evaluaciones, pendiente
+    else:
+        x1 = None
+    if x1 is None:
+        paso = 1e-4 * (superior - inferior)
+        x1 = x0 + paso if x0 + paso <= superior else x0 - paso
+    f1 = funcion(x1)
+    evaluaciones += 1
+    while evaluaciones < max_iteraciones:
+        if f1 == f0 or not math.isfinite(f1):
+            return None, evaluaciones, None
+        pendiente = (f1 - f0) / (x1 - x0)
+        x2 = x1 - f1 / pendiente
+        if not inferior <= x2 <= superior:
+            return None, evaluaciones, None
+        if abs(x2 - x1) <= tolerancia:
+            return x2, evaluaciones, pendiente
+        x0, f0, x1 = x1, f1, x2
+        f1 = funcion(x1)
+        evaluaciones += 1
+    return None, evaluaciones, None
+
+
+def _illinois(funcion: Callable[[float], float], a: float, b: float, tolerancia: float,
+              max_iteraciones: int) -> Tuple[float, int]:
+    """Regula falsi con la modificación de Illinois; NaN si no hay cambio de signo"""
+    fa, fb = funcion(a), funcion(b)
+    evaluaciones = 2
+    if not fa * fb <= 0:
+        return math.nan, evaluaciones
+    anterior = a
+    while evaluaciones < max_iteraciones:
+        c = b - fb * (b - a) / (fb - fa) if fb != fa else 0.5 * (a + b)
+        fc = funcion(c)
+        evaluaciones += 1
+        if fc == 0 or abs(c - anterior) <= tolerancia:
+            return c, evaluaciones
+        if fc * fb < 0:
+            a, fa = b, fb
+        else:
+            # El extremo que se repite pierde la mitad de su peso
+            fa *= 0.5
+        b, fb, anterior = c, fc, c
+    return b, evaluaciones
+
+
+def barrido_punto_operacion(sistema: SistemaTuberias, bomba: CurvaBomba, parametro: str,
+                            valores: Sequence[float],
+                            constantes: Optional[Dict[str, float]] = None,
+                            estado: Optional[EstadoSolver] = None,
+                            continuacion: bool = True) -> Dict[str, list]:
+    """
+    Punto de operación a lo largo de un parámetro, con predictor-corrector
+
+    Args:
+        sistema: Sistema base (no se modifica)
+        bomba: Curva de la bomba
+        parametro: Campo numérico de SistemaTuberias (p. ej. 'elevacion_punto2')
+                   o 'velocidad' (velocidad relativa de la bomba)
+        valores: Valores del parámetro, en el orden del barrido
+        constantes: Constantes físicas compartidas (opcional)
+        estado: Estado a continuar (p. ej. el de un barrido anterior); por
+                defecto uno nuevo
+        continuacion: Si es False cada punto arranca en frío (para comparar)
+
+    Returns: columnas 'parametro', 'caudal', 'altura' e 'iteraciones' (los
+             totales quedan en el estado, si se pasó uno)
+    """
+    numericos = {f.name for f in fields(SistemaTuberias)
+                 if isinstance(getattr(sistema, f.name), (int, float))}
+    if parametro != VELOCIDAD and parametro not in numericos:
+        raise ValueError(f"Parámetro de barrido desconocido: {parametro}")
+    if estado is None:
+        estado = EstadoSolver()
+    if constantes is None:
+        constantes = CalculadoraHidraulica(sistema).constantes
+
+    columnas = {'parametro': list(valores), 'caudal': [], 'altura': [], 'iteraciones': []}
+    hidraulica = CalculadoraHidraulica(sistema, constantes)
+    with span('continuacion.barrido'):
+        for valor in valores:
+            velocidad = 1.0
+            if parametro == VELOCIDAD:
+                velocidad = valor
+            else:
+                hidraulica = CalculadoraHidraulica(replace(sistema, **{parametro: valor}), constantes)
+            punto = resolver_punto_operacion(
+                hidraulica, bomba, estado if continuacion else None,
+                clave=f'barrido.{parametro}', parametro=valor, velocidad=velocidad
+            )
+            if not continuacion:
+                estado.registrar(f'barrido.{parametro}', punto['caudal'], punto['iteraciones'])
+            columnas['caudal'].append(punto['caudal'])
+            columnas['altura'].append(punto['altura'])
+            columnas['iteraciones'].append(punto['iteraciones'])
+    return columnas
@@ -0,0 +1,161 @@
+"""
+Módulo de curvas características: sistema, bomba y punto de operación
+"""
+from array import array
+from typing import Dict, Optional, Sequence
+
+from ..models import CurvaBomba, SistemaTuberias
+from .bombeo import CalculadoraBombeo
+from .instrumentacion import span
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las curvas se evalúan punto por punto
+    np = None
+
+class CalculadoraCurvas:
+    """Evalúa la curva del sistema y la de una bomba sobre un rango de caudales
+
+    Todas las columnas se calculan de una vez para todo el rango (arreglos de
+    NumPy si está disponible, array('d') si no), de modo que graficar millones
+    de puntos no requiere llamar a las funciones escalares punto por punto.
+    """
+
+    def __init__(self, sistema: SistemaTuberias, bomba: Optional[CurvaBomba] = None,
+                 constantes: Optional[Dict[str, float]] = None):
+        self.sistema = sistema
+        self.bomba = bomba
+        self.bombeo = CalculadoraBombeo(sistema, constantes)
+
+    def caudal_maximo(self) -> float:
+        """Caudal máximo por defecto: el doble del de diseño o el final de la curva de la bomba"""
+        caudal_max = 2.0 * self.sistema.caudal
+        if self.bomba is not None:
+            caudal_max = max(caudal_max, self.bomba.caudal_maximo)
+        return caudal_max
+
+    def rango_caudales(self, puntos: int, caudal_max: Optional[float] = None) -> Sequence[float]:
+        """Malla uniforme de caudales entre 0 y caudal_max (m³/s)"""
+        if puntos < 2:
+            raise ValueError("Se necesitan al menos dos puntos")
+        if caudal_max is None:
+            caudal_max = self.caudal_maximo()
+        if np is not None:
+            return np.linspace(0.0, caudal_max, puntos)
+        paso = caudal_max / (puntos - 1)
+        return array('d', (i * paso for i in range(puntos)))
+
+    def calcular_curvas(self, caudales: Optional[Sequence[float]] = None, puntos: int = 2000,
+                        longitud_sucursal: float = 5.0,
+                        elevacion_fluido_sucursal: float = 1.0) -> Dict[str, Sequence[float]]:
+        """
+        Calcula todas las curvas para un rango de caudales
+
+        Args:
+            caudales: Caudales crecientes a evaluar; por defecto rango_caudales(puntos)
+            puntos: Número de puntos si no se indican los caudales
+            longitud_sucursal: Longitud de la línea de succión (m)
+            elevacion_fluido_sucursal: Elevación del fluido respecto a la bomba (m)
+
+        Returns: columnas 'caudal', 'carga_sistema' y 'NPSHa'; con bomba además
+                 'altura_bomba', 'eficiencia_bomba', 'npsh_requerido',
+                 'margen_npsh' y 'potencia_bomba_kW' (NaN fuera de su curva)
+        """
+        if caudales is None:
+            caudales = self.rango_caudales(puntos)
+
+        with span('curvas.total'):
+            with span('curvas.sistema'):
+                sistema = self.bombeo.hidraulica.calcular_curva_sistema(caudales)
+                NPSHa = self.bombeo.calcular_curva_NPSHa(sistema, longitud_sucursal,
+                                                         elevacion_fluido_sucursal)
+            curvas = {
+                'caudal': sistema['caudal'],
+                'carga_sistema': sistema['carga_total_bomba'],
+                'NPSHa': NPSHa,
+            }
+            if self.bomba is not None:
+                with span('curvas.bomba'):
+                    curvas.update(self._curvas_bomba(sistema['caudal'], NPSHa))
+        return curvas
+
+    def _curvas_bomba(self, caudales, NPSHa) -> Dict[str, Sequence[float]]:
+        """Columnas de la bomba interpoladas en los caudales dados"""
+        bomba = self.bomba
+        rho_g = self.sistema.fluido.densidad * self.bombeo.hidraulica.G
+        nan = float('nan')
+
+        if np is not None:
+            def interpolar(valores):
+                if not valores:
+                    return np.full(len(caudales), np.nan)
+                return np.interp(caudales, bomba.caudales, valores, left=np.nan, right=np.nan)
+
+            altura = interpolar(bomba.alturas)
+            eficiencia = interpolar(bomba.eficiencias)
+            npshr = interpolar(bomba.npsh_requerido)
+            margen = NPSHa - npshr
+            potencia = rho_g * caudales * altura / eficiencia / 1000
+        else:
+            altura = array('d', map(bomba.altura, caudales))
+            eficiencia = array('d', map(bomba.eficiencia, caudales))
+            npshr = array('d', map(bomba.npshr, caudales))
+            margen = array('d', (a - r for a, r in zip(NPSHa, npshr)))
+            potencia = array('d', (
+                rho_g * q * h / eta / 1000 if eta == eta and eta > 0 else nan
+                for q, h, eta in zip(caudales, altura, eficiencia)
+            ))
+
+        return {
+            'altura_bomba': altura,
+            'eficiencia_bomba': eficiencia,
+            'npsh_requerido': npshr,
+            'margen_npsh': margen,
+            'potencia_bomba_kW': potencia,
+        }
+
+    def punto_operacion(self, curvas: Dict[str, Sequence[float]]) -> Optional[Dict[str, float]]:
+        """
+        Intersección entre la curva de la bomba y la del sistema
+
+        Busca el primer cambio de signo de altura_bomba − carga_sistema y lo
+        interpola linealmente. Retorna None si no hay bomba o no se cruzan.
+        """
+        if 'altura_bomba' not in curvas:
+            return None
+        caudales = curvas['caudal']
+        diferencia = _restar(curvas['altura_bomba'], curvas['carga_sistema'])
+
+        i = _primer_cruce(diferencia)
+        if i is None:
+            return None
+        d1, d2 = diferencia[i], diferencia[i + 1]
+        t = d1 / (d1 - d2) if d1 != d2 else 0.0
+        caudal = caudales[i] + t * (caudales[i + 1] - caudales[i])
+        return {
+            'caudal': float(caudal),
+            'altura': float(self.bomba.altura(caudal)),
+            'eficiencia': float(self.bomba.eficiencia(caudal)),
+            'NPSHr': float(self.bomba.npshr(caudal)),
+        }
+
+
+def _restar(a, b):
+    if np is not None:
+        return np.asarray(a, dtype=float) - np.asarray(b, dtype=float)
+    return array('d', (x - y for x, y in zip(a, b)))
+
+
+def _primer_cruce(diferencia) -> Optional[int]:
+    """Índice i del primer tramo [i, i+1] donde la diferencia cambia de signo"""
+    if np is not None:
+        signo = np.sign(diferencia)
+        # NaN (fuera de la curva de la bomba) nunca forma un cruce
+        cruces = np.flatnonzero((signo[:-1] * signo[1:] <= 0) &
+                                np.isfinite(diferencia[:-1]) & np.isfinite(diferencia[1:]))
+        return int(cruces[0]) if len(cruces) else None
+    for i in range(len(diferencia) - 1):
+        d1, d2 = diferencia[i], diferencia[i + 1]
+        if d1 == d1 and d2 == d2 and d1 * d2 <= 0:
+            return i
+    return None
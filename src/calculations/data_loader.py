@@ -6,12 +6,15 @@ import os
 import sys
 from typing import Dict, List
 from ..models.accesorio import Accesorio, TipoAccesorio
+from ..models.bomba import CurvaBomba
 from ..models.fluido import Fluido
+from .catalogo import CatalogoSQLite, crear_catalogo_desde_csv
+from .instrumentacion import span
 
 class DataLoader:
     """Clase para cargar datos desde archivos CSV"""
     
-    def __init__(self, data_dir: str = None):
+    def __init__(self, data_dir: str = None, catalogo_db: str = None):
         if data_dir is None:
             # Detectar si estamos en un ejecutable PyInstaller
             if getattr(sys, 'frozen', False):
@@ -23,13 +26,58 @@ class DataLoader:
                 self.data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
         else:
             self.data_dir = data_dir
+        
+        # Catálogo SQLite (se crea al primer uso de las consultas paginadas)
+        self.catalogo_db = catalogo_db
+        self._catalogo = None
+    
+    @property
+    def catalogo(self) -> CatalogoSQLite:
+        """Catálogo indexado; si no se indicó una base, se crea en memoria desde los CSV"""
+        if self._catalogo is None:
+            with span('datos.crear_catalogo'):
+                self._catalogo = crear_catalogo_desde_csv(self.data_dir, self.catalogo_db or ":memory:")
+        return self._catalogo
+    
+    def consultar_accesorios(self, tipo: str = None, norma: str = None, fabricante: str = None,
+                             limite: int = 100, desplazamiento: int = 0) -> List[Accesorio]:
+        """Consulta paginada de accesorios filtrada por tipo, norma y fabricante"""
+        return self.catalogo.consultar_accesorios(tipo, norma, fabricante, limite, desplazamiento)
+    
+    def contar_accesorios(self, tipo: str = None, norma: str = None, fabricante: str = None) -> int:
+        """Cuenta los accesorios del catálogo que cumplen los filtros"""
+        return self.catalogo.contar_accesorios(tipo, norma, fabricante)
+    
+    def consultar_fluidos(self, nombre: str = None, temperatura_min: float = None,
+                          temperatura_max: float = None, limite: int = 100,
+                          desplazamiento: int = 0) -> List[Fluido]:
+        """Consulta paginada de fluidos filtrada por nombre y temperatura"""
+        return self.catalogo.consultar_fluidos(nombre, temperatura_min, temperatura_max,
+                                               limite, desplazamiento)
+    
+    def accesorios_por_tipo(self, norma: str = None, fabricante: str = None) -> Dict[str, Accesorio]:
+        """Primer accesorio del catálogo de cada tipo que cumple los filtros (una página por tipo)"""
+        accesorios = {}
+        for tipo in self.catalogo.valores_distintos('tipo_accesorio'):
+            pagina = self.catalogo.consultar_accesorios(tipo, norma, fabricante, limite=1)
+            if pagina:
+                accesorios[tipo] = pagina[0]
+        return accesorios
+    
+    def listar_normas(self) -> List[str]:
+        """Normas distintas presentes en el catálogo"""
+        return self.catalogo.valores_distintos('norma')
+    
+    def listar_fabricantes(self) -> List[str]:
+        """Fabricantes distintos presentes en el catálogo"""
+        return self.catalogo.valores_distintos('fabricante')
     
     def cargar_constantes(self) -> Dict[str, float]:
         """Carga constantes físicas desde CSV"""
         constantes = {}
         filepath = os.path.join(self.data_dir, 'constantes.csv')
         
-        with open(filepath, 'r', encoding='utf-8') as file:
+        with span('datos.cargar_constantes'), open(filepath, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
             for row in reader:
                 constantes[row['constante']] = float(row['valor'])
@@ -41,7 +89,7 @@ class DataLoader:
         accesorios = {}
         filepath = os.path.join(self.data_dir, 'accesorios.csv')
         
-        with open(filepath, 'r', encoding='utf-8') as file:
+        with span('datos.cargar_accesorios'), open(filepath, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
             for row in reader:
                 # Convertir longitud equivalente de mm a metros
@@ -63,19 +111,39 @@ class DataLoader:
         fluidos = {}
         filepath = os.path.join(self.data_dir, 'fluidos.csv')
         
-        with open(filepath, 'r', encoding='utf-8') as file:
+        with span('datos.cargar_fluidos'), open(filepath, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
             for row in reader:
                 fluido = Fluido(
                     nombre=row['nombre'],
                     densidad=float(row['densidad']),
                     viscosidad=float(row['viscosidad']),
-                    presion_vapor=float(row['presion_vapor'])
+                    presion_vapor=float(row['presion_vapor']),
+                    temperatura_C=float(row.get('temperatura_C') or 20.0)
                 )
                 fluidos[row['nombre']] = fluido
         
         return fluidos
     
+    def cargar_curva_bomba(self, filepath: str) -> CurvaBomba:
+        """
+        Carga la curva de una bomba desde un CSV con columnas caudal (m³/s) y
+        altura (m), y opcionalmente eficiencia (decimal) y npsh_requerido (m)
+        """
+        caudales, alturas, eficiencias, npshr = [], [], [], []
+        with span('datos.cargar_curva_bomba'), open(filepath, 'r', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                caudales.append(float(row['caudal']))
+                alturas.append(float(row['altura']))
+                if row.get('eficiencia'):
+                    eficiencias.append(float(row['eficiencia']))
+                if row.get('npsh_requerido'):
+                    npshr.append(float(row['npsh_requerido']))
+        
+        nombre = os.path.splitext(os.path.basename(filepath))[0]
+        return CurvaBomba(nombre, caudales, alturas, eficiencias, npshr)
+    
     def obtener_fluido_por_nombre(self, nombre: str) -> Fluido:
         """Obtiene un fluido específico por nombre"""
         fluidos = self.cargar_fluidos()
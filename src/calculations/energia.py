@@ -0,0 +1,378 @@
+"""
+Módulo de energía: consumo y costo anual del bombeo con tarifas horarias
+
+La potencia de calcular_potencia_bomba corresponde a un solo instante; aquí
+se evalúan las 8760 horas de un año con un perfil de caudales y una tarifa
+por horario (precio de la energía en cada hora, cargo por demanda máxima
+mensual y cargo fijo). La hidráulica de todas las horas se calcula en una
+sola pasada sobre arreglos, y comparar_alternativas evalúa muchos sistemas
+a la vez (una matriz alternativas × horas por bloque).
+"""
+import math
+from array import array
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional, Sequence
+
+from ..models import CurvaBomba, SistemaTuberias
+from . import nucleos
+from .cancelacion import TokenCancelacion, reportar_avance
+from .hidraulica import CalculadoraHidraulica
+from .instrumentacion import span
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las horas se evalúan una por una
+    np = None
+
+HORAS_ANIO = 8760
+DIAS_POR_MES = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+# Hora del año en que empieza cada mes (y el final del año)
+INICIO_MES = tuple(24 * dias for dias in accumulate((0,) + DIAS_POR_MES))
+
+# Alternativas evaluadas por bloque en comparar_alternativas (acota la memoria de la matriz)
+BLOQUE_ALTERNATIVAS = 128
+
+
+@dataclass
+class TarifaHoraria:
+    """Tarifa eléctrica por horario para un año de 8760 horas
+
+    Atributos:
+        precios: Precio de la energía ($/kWh) en cada hora del año
+        cargo_demanda: $/kW por mes sobre la potencia máxima del mes
+        horas_demanda: Horas en que se mide la demanda máxima (todas si es None)
+        cargo_fijo_mensual: $ por mes
+    """
+    precios: Sequence[float]
+    cargo_demanda: float = 0.0
+    horas_demanda: Optional[Sequence[bool]] = None
+    cargo_fijo_mensual: float = 0.0
+    nombre: str = "Tarifa"
+
+    def __post_init__(self):
+        if len(self.precios) != HORAS_ANIO:
+            raise ValueError(f"La tarifa necesita un precio por hora ({HORAS_ANIO})")
+        if self.horas_demanda is not None and len(self.horas_demanda) != HORAS_ANIO:
+            raise ValueError(f"Las horas de demanda deben cubrir las {HORAS_ANIO} horas del año")
+        if self.cargo_demanda < 0 or self.cargo_fijo_mensual < 0:
+            raise ValueError("Los cargos no pueden ser negativos")
+
+    @classmethod
+    def plana(cls, precio: float, cargo_demanda: float = 0.0,
+              cargo_fijo_mensual: float = 0.0) -> "TarifaHoraria":
+        """Tarifa con el mismo precio en todas las horas"""
+        return cls(array('d', [precio]) * HORAS_ANIO, cargo_demanda, None,
+                   cargo_fijo_mensual, "Tarifa plana")
+
+    @classmethod
+    def por_periodos(cls, precios: Dict[str, float], horario_laborable: Sequence[str],
+                     horario_fin_semana: Optional[Sequence[str]] = None,
+                     periodos_demanda: Optional[Sequence[str]] = None,
+                     cargo_demanda: float = 0.0, cargo_fijo_mensual: float = 0.0,
+                     primer_dia_semana: int = 0, nombre: str = "Tarifa horaria") -> "TarifaHoraria":
+        """
+        Tarifa por periodos horarios (p. ej. punta, intermedio y base)
+
+        Args:
+            precios: periodo -> $/kWh
+            horario_laborable: Periodo de cada hora (24) de lunes a viernes
+            horario_fin_semana: Periodo de cada hora los sábados y domingos;
+                                por defecto el mismo que los días laborables
+            periodos_demanda: Periodos en que se mide la demanda máxima
+                              (todos si es None)
+            cargo_demanda: $/kW por mes
+            cargo_fijo_mensual: $ por mes
+            primer_dia_semana: Día de la semana del 1 de enero (0 = lunes)
+        """
+        horario_fin_semana = horario_fin_semana if horario_fin_semana is not None else horario_laborable
+        for horario in (horario_laborable, horario_fin_semana):
+            if len(horario) != 24:
+                raise ValueError("Cada horario debe asignar un periodo a las 24 horas del día")
+            desconocidos = set(horario) - set(precios)
+            if desconocidos:
+                raise ValueError(f"Periodos sin precio: {', '.join(sorted(desconocidos))}")
+
+        precios_dia = [array('d', (precios[p] for p in horario))
+                       for horario in (horario_laborable, horario_fin_semana)]
+        horas_precio = array('d')
+        for dia in range(HORAS_ANIO // 24):
+            horas_precio.extend(precios_dia[(primer_dia_semana + dia) % 7 >= 5])
+
+        horas_demanda = None
+        if periodos_demanda is not None:
+            medidos = set(periodos_demanda)
+            demanda_dia = [[p in medidos for p in horario]
+                           for horario in (horario_laborable, horario_fin_semana)]
+            horas_demanda = []
+            for dia in range(HORAS_ANIO // 24):
+                horas_demanda.extend(demanda_dia[(primer_dia_semana + dia) % 7 >= 5])
+        return cls(horas_precio, cargo_demanda, horas_demanda, cargo_fijo_mensual, nombre)
+
+
+def perfil_tipico(caudal_medio: float, factores_horarios: Sequence[float],
+                  factores_mensuales: Optional[Sequence[float]] = None) -> array:
+    """
+    Perfil anual de caudales (m³/s por hora) a partir de factores de consumo
+
+    Args:
+        caudal_medio: Caudal de referencia (m³/s)
+        factores_horarios: Multiplicador de cada hora del día (24); 0 = bomba apagada
+        factores_mensuales: Multiplicador de cada mes (12); 1 por defecto
+    """
+    if len(factores_horarios) != 24:
+        raise ValueError("Se necesita un factor por hora del día (24)")
+    factores_mensuales = factores_mensuales if factores_mensuales is not None else [1.0] * 12
+    if len(factores_mensuales) != 12:
+        raise ValueError("Se necesita un factor por mes (12)")
+    perfil = array('d')
+    for mes, dias in enumerate(DIAS_POR_MES):
+        dia = array('d', (caudal_medio * factores_mensuales[mes] * f for f in factores_horarios))
+        perfil.extend(dia * dias)
+    return perfil
+
+
+@dataclass
+class ResultadoEnergia:
+    """Consumo y costo anual de un sistema"""
+    energia_kWh: float
+    volumen_m3: float
+    horas_operacion: int
+    potencia_maxima_kW: float
+    costo_energia: float
+    costo_demanda: float
+    costo_fijo: float
+    energia_mensual_kWh: List[float] = field(default_factory=list)
+    demanda_mensual_kW: List[float] = field(default_factory=list)
+    costo_mensual: List[float] = field(default_factory=list)
+
+    @property
+    def costo_total(self) -> float:
+        return self.costo_energia + self.costo_demanda + self.costo_fijo
+
+    @property
+    def energia_especifica_kWh_m3(self) -> float:
+        """Energía por volumen bombeado (kWh/m³)"""
+        return self.energia_kWh / self.volumen_m3 if self.volumen_m3 > 0 else float('nan')
+
+    @property
+    def costo_por_m3(self) -> float:
+        return self.costo_total / self.volumen_m3 if self.volumen_m3 > 0 else float('nan')
+
+    def resumen(self) -> Dict[str, float]:
+        """Valores anuales en un diccionario plano (para tablas y exportación)"""
+        return {
+            'energia_kWh': self.energia_kWh,
+            'volumen_m3': self.volumen_m3,
+            'horas_operacion': float(self.horas_operacion),
+            'potencia_maxima_kW': self.potencia_maxima_kW,
+            'costo_energia': self.costo_energia,
+            'costo_demanda': self.costo_demanda,
+            'costo_fijo': self.costo_fijo,
+            'costo_total': self.costo_total,
+            'energia_especifica_kWh_m3': self.energia_especifica_kWh_m3,
+            'costo_por_m3': self.costo_por_m3,
+        }
+
+
+class CalculadoraEnergia:
+    """Simulación horaria del consumo y costo de energía de un sistema
+
+    La carga de la bomba en cada hora sale de la curva del sistema evaluada
+    sobre el perfil completo (calcular_curva_sistema); las horas con caudal
+    cero no consumen energía. Si se indica una curva de bomba con
+    eficiencias, la eficiencia de cada hora se interpola en ella; si no, se
+    usa la eficiencia del sistema.
+    """
+
+    def __init__(self, sistema: SistemaTuberias, bomba: Optional[CurvaBomba] = None,
+                 constantes: Optional[Dict[str, float]] = None):
+        self.sistema = sistema
+        self.bomba = bomba
+        self.hidraulica = CalculadoraHidraulica(sistema, constantes)
+
+    def potencia_horaria(self, perfil_caudal: Sequence[float]) -> Sequence[float]:
+        """Potencia eléctrica de la bomba (kW) en cada hora del perfil"""
+        curva = self.hidraulica.calcular_curva_sistema(perfil_caudal)
+        rho_g = self.sistema.fluido.densidad * self.hidraulica.G
+        eficiencias = self._eficiencias(perfil_caudal)
+        if np is not None:
+            Q = np.asarray(perfil_caudal, dtype=float)
+            potencia = rho_g * Q * np.maximum(curva['carga_total_bomba'], 0.0) / eficiencias / 1000.0
+            return np.where(Q > 0, potencia, 0.0)
+        return array('d', (
+            rho_g * q * max(h, 0.0) / eta / 1000.0 if q > 0 else 0.0
+            for q, h, eta in zip(perfil_caudal, curva['carga_total_bomba'], eficiencias)
+        ))
+
+    def simular(self, perfil_caudal: Sequence[float], tarifa: TarifaHoraria) -> ResultadoEnergia:
+        """
+        Simula un año de operación
+
+        Args:
+            perfil_caudal: Caudal (m³/s) de cada una de las 8760 horas
+            tarifa: Tarifa horaria
+
+        Returns: ResultadoEnergia con totales anuales y valores mensuales
+        """
+        _validar_perfil(perfil_caudal)
+        with span('energia.simular'):
+            potencia = self.potencia_horaria(perfil_caudal)
+            return _agregar(potencia, perfil_caudal, tarifa)
+
+    def _eficiencias(self, perfil_caudal: Sequence[float]):
+        eta = self.sistema.eficiencia_bomba
+        bomba = self.bomba
+        if bomba is None or not bomba.eficiencias:
+            return eta if np is not None else [eta] * len(perfil_caudal)
+        # Fuera de la curva se toma la eficiencia del extremo más cercano
+        if np is not None:
+            return np.interp(np.asarray(perfil_caudal, dtype=float), bomba.caudales, bomba.eficiencias)
+        q_min, q_max = bomba.caudales[0], bomba.caudales[-1]
+        return [bomba.eficiencia(min(max(q, q_min), q_max)) for q in perfil_caudal]
+
+
+def _validar_perfil(perfil_caudal: Sequence[float]) -> None:
+    if len(perfil_caudal) != HORAS_ANIO:
+        raise ValueError(f"El perfil debe tener un caudal por hora ({HORAS_ANIO})")
+
+
+def _agregar(potencia, perfil_caudal, tarifa: TarifaHoraria) -> ResultadoEnergia:
+    """Totales anuales y mensuales de una serie horaria de potencia (kW)"""
+    if np is not None:
+        P = np.asarray(potencia, dtype=float)
+        Q = np.asarray(perfil_caudal, dtype=float)
+        limites = np.array(INICIO_MES[:-1])
+        energia_mensual = np.add.reduceat(P, limites)
+        medida = P if tarifa.horas_demanda is None else np.where(tarifa.horas_demanda, P, 0.0)
+        demanda_mensual = np.maximum.reduceat(medida, limites)
+        costo_energia_mensual = np.add.reduceat(P * np.asarray(tarifa.precios, dtype=float), limites)
+        volumen = float(Q.sum()) * 3600.0
+        horas = int(np.count_nonzero(Q > 0))
+        potencia_maxima = float(P.max())
+        energia_mensual, demanda_mensual, costo_energia_mensual = (
+            energia_mensual.tolist(), demanda_mensual.tolist(), costo_energia_mensual.tolist())
+    else:
+        energia_mensual, demanda_mensual, costo_energia_mensual = [], [], []
+        horas_demanda = tarifa.horas_demanda
+        for inicio, fin in zip(INICIO_MES, INICIO_MES[1:]):
+            tramo = potencia[inicio:fin]
+            energia_mensual.append(math.fsum(tramo))
+            costo_energia_mensual.append(math.fsum(p * c for p, c in zip(tramo, tarifa.precios[inicio:fin])))
+            if horas_demanda is None:
+                demanda_mensual.append(max(tramo))
+            else:
+                demanda_mensual.append(max((p for p, medida in zip(tramo, horas_demanda[inicio:fin])
+                                            if medida), default=0.0))
+        volumen = math.fsum(perfil_caudal) * 3600.0
+        horas = sum(1 for q in perfil_caudal if q > 0)
+        potencia_maxima = max(potencia)
+
+    costo_mensual = [energia + tarifa.cargo_demanda * demanda + tarifa.cargo_fijo_mensual
+                     for energia, demanda in zip(costo_energia_mensual, demanda_mensual)]
+    return ResultadoEnergia(
+        energia_kWh=math.fsum(energia_mensual),
+        volumen_m3=volumen,
+        horas_operacion=horas,
+        potencia_maxima_kW=potencia_maxima,
+        costo_energia=math.fsum(costo_energia_mensual),
+        costo_demanda=tarifa.cargo_demanda * math.fsum(demanda_mensual),
+        costo_fijo=12.0 * tarifa.cargo_fijo_mensual,
+        energia_mensual_kWh=energia_mensual,
+        demanda_mensual_kW=demanda_mensual,
+        costo_mensual=costo_mensual,
+    )
+
+
+COLUMNAS_COMPARACION = ('energia_kWh', 'potencia_maxima_kW', 'costo_energia', 'costo_demanda',
+                        'costo_total', 'energia_especifica_kWh_m3', 'costo_por_m3')
+
+
+def comparar_alternativas(sistemas: Sequence[SistemaTuberias], perfil_caudal: Sequence[float],
+                          tarifa: TarifaHoraria, constantes: Optional[Dict[str, float]] = None,
+                          progreso: Optional[Callable[[int], None]] = None,
+                          cancelacion: Optional[TokenCancelacion] = None) -> Dict[str, Sequence[float]]:
+    """
+    Costo anual de muchas alternativas con el mismo perfil y la misma tarifa
+
+    Con NumPy cada bloque de alternativas se evalúa como una matriz
+    alternativas × 8760 horas: cada fila de pérdidas la calcula el núcleo
+    seleccionado (como en calcular_curva_sistema) y el costo de la energía
+    es un producto matriz-vector con los precios horarios.
+
+    Returns: columnas COLUMNAS_COMPARACION, una fila por alternativa
+    """
+    _validar_perfil(perfil_caudal)
+    if constantes is None:
+        from .data_loader import DataLoader
+        constantes = DataLoader().cargar_constantes()
+    total = len(sistemas)
+    with span('energia.comparar'):
+        if np is None:
+            columnas = {clave: array('d') for clave in COLUMNAS_COMPARACION}
+            for i, sistema in enumerate(sistemas):
+                reportar_avance(100 * i // max(total, 1), progreso, cancelacion)
+                resumen = CalculadoraEnergia(sistema, constantes=constantes).simular(
+                    perfil_caudal, tarifa).resumen()
+                for clave in COLUMNAS_COMPARACION:
+                    columnas[clave].append(resumen[clave])
+            reportar_avance(100, progreso, cancelacion)
+            return columnas
+        return _comparar_numpy(sistemas, perfil_caudal, tarifa, constantes, progreso, cancelacion)
+
+
+def _comparar_numpy(sistemas, perfil_caudal, tarifa, constantes, progreso, cancelacion):
+    g = constantes.get('gravedad', 9.81)
+    nucleo = nucleos.obtener_nucleo()
+    Q = np.asarray(perfil_caudal, dtype=float)
+    con_flujo = Q > 0
+    precios = np.asarray(tarifa.precios, dtype=float)
+    limites = np.array(INICIO_MES[:-1])
+    medida = None if tarifa.horas_demanda is None else np.asarray(tarifa.horas_demanda, dtype=bool)
+    volumen = float(Q.sum()) * 3600.0
+
+    total = len(sistemas)
+    columnas = {clave: np.empty(total) for clave in COLUMNAS_COMPARACION}
+    for inicio in range(0, total, BLOQUE_ALTERNATIVAS):
+        reportar_avance(100 * inicio // max(total, 1), progreso, cancelacion)
+        bloque = sistemas[inicio:inicio + BLOQUE_ALTERNATIVAS]
+        # Coeficientes de cada alternativa como columnas (n × 1) para combinarlos con las horas
+        coeficientes = np.array([_coeficientes(s, constantes) for s in bloque])
+        perdidas = np.empty((len(bloque), len(Q)))
+        for fila, (_, diametro, L_sobre_D, K_total, rho, mu, _) in zip(perdidas, coeficientes):
+            curva = nucleo.curva_sistema(Q, diametro, L_sobre_D, K_total, rho, mu, g)
+            np.add(curva['perdidas_mayores'], curva['perdidas_menores'], out=fila)
+        estatica, rho, eta = (coeficientes[:, [i]] for i in (0, 4, 6))
+        carga = np.maximum(estatica + perdidas, 0.0)
+        P = np.where(con_flujo, rho * g * Q * carga / eta / 1000.0, 0.0)
+
+        fin = inicio + len(bloque)
+        energia = P.sum(axis=1)
+        demanda = np.maximum.reduceat(P if medida is None else np.where(medida, P, 0.0),
+                                      limites, axis=1).sum(axis=1)
+        costo_energia = P @ precios
+        costo_demanda = tarifa.cargo_demanda * demanda
+        costo_total = costo_energia + costo_demanda + 12 * tarifa.cargo_fijo_mensual
+        columnas['energia_kWh'][inicio:fin] = energia
+        columnas['potencia_maxima_kW'][inicio:fin] = P.max(axis=1)
+        columnas['costo_energia'][inicio:fin] = costo_energia
+        columnas['costo_demanda'][inicio:fin] = costo_demanda
+        columnas['costo_total'][inicio:fin] = costo_total
+        columnas['energia_especifica_kWh_m3'][inicio:fin] = energia / volumen if volumen > 0 else np.nan
+        columnas['costo_por_m3'][inicio:fin] = costo_total / volumen if volumen > 0 else np.nan
+    reportar_avance(100, progreso, cancelacion)
+    return columnas
+
+
+def _coeficientes(sistema: SistemaTuberias, constantes: Dict[str, float]):
+    """Carga estática, diámetro, ΣL/D, K total, densidad, viscosidad y eficiencia"""
+    hidraulica = CalculadoraHidraulica(sistema, constantes)
+    estatica = hidraulica.calcular_altura_elevacion() + hidraulica.calcular_altura_presion()
+    if sistema.tramos:
+        diametro, L_sobre_D, K_total = hidraulica._coeficientes_perdidas()
+    else:
+        # Sin tramos no hay pérdidas (como en calcular_curva_sistema)
+        diametro, L_sobre_D, K_total = 1.0, 0.0, 0.0
+    return (estatica, diametro, L_sobre_D, K_total, sistema.fluido.densidad,
+            sistema.fluido.viscosidad, sistema.eficiencia_bomba)
+
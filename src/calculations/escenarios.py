@@ -0,0 +1,194 @@
+"""
+Módulo de escenarios: comparación de varias alternativas de un sistema
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from ..models import SistemaTuberias
+from .cancelacion import TokenCancelacion
+from .curvas import CalculadoraCurvas
+from .data_loader import DataLoader
+from .instrumentacion import span
+
+
+@dataclass
+class Escenario:
+    """Alternativa de un sistema con nombre propio
+
+    El sistema se trata como inmutable: para modificarlo se reemplaza con
+    EspacioEscenarios.actualizar (p. ej. con dataclasses.replace), lo que
+    invalida sus resultados en caché.
+    """
+    nombre: str
+    sistema: SistemaTuberias
+
+
+@dataclass
+class ResultadoEscenario:
+    """Resultados de un escenario: el punto de diseño y su curva del sistema"""
+    resultados: Dict[str, float]
+    curvas: Dict[str, Sequence[float]] = field(default_factory=dict)
+
+
+class EspacioEscenarios:
+    """Conjunto de escenarios que comparten catálogo, fluidos y constantes
+
+    El catálogo, los fluidos, los accesorios y las constantes físicas se
+    cargan una sola vez; las variantes reutilizan los mismos objetos Fluido,
+    Accesorio y TramoTuberia en lugar de copiarlos. Los escenarios se evalúan
+    en un grupo de hilos y sus resultados se guardan hasta que cambia el
+    sistema, de modo que recalcular solo evalúa los escenarios modificados.
+    """
+
+    PUNTOS_CURVA = 200
+
+    def __init__(self, loader: Optional[DataLoader] = None, max_hilos: Optional[int] = None):
+        self.loader = loader if loader is not None else DataLoader()
+        self.constantes = self.loader.cargar_constantes()
+        self.max_hilos = max_hilos
+        self._fluidos = None
+        self._escenarios: Dict[str, Escenario] = {}
+        # nombre -> (sistema evaluado, resultado)
+        self._cache: Dict[str, tuple] = {}
+
+    @property
+    def fluidos(self):
+        """Fluidos del catálogo, compartidos por todos los escenarios"""
+        if self._fluidos is None:
+            self._fluidos = self.loader.cargar_fluidos()
+        return self._fluidos
+
+    # --- Escenarios ------------------------------------------------------
+
+    def agregar(self, nombre: str, sistema: SistemaTuberias) -> Escenario:
+        """Agrega un escenario; el nombre debe ser único"""
+        if not nombre:
+            raise ValueError("El escenario necesita un nombre")
+        if nombre in self._escenarios:
+            raise ValueError(f"Ya existe un escenario llamado '{nombre}'")
+        escenario = self._escenarios[nombre] = Escenario(nombre, sistema)
+        return escenario
+
+    def actualizar(self, nombre: str, sistema: SistemaTuberias) -> None:
+        """Reemplaza el sistema de un escenario (sus resultados se recalculan)"""
+        self[nombre].sistema = sistema
+        self._cache.pop(nombre, None)
+
+    def eliminar(self, nombre: str) -> None:
+        del self._escenarios[nombre]
+        self._cache.pop(nombre, None)
+
+    def variante(self, base: str, nombre: str, **cambios) -> Escenario:
+        """Agrega una copia de un escenario con campos del sistema cambiados
+
+        Los campos no indicados (tramos, accesorios, fluido) se comparten
+        con el escenario base.
+        """
+        return self.agregar(nombre, replace(self[base].sistema, **cambios))
+
+    def variante_diametro(self, base: str, nombre: str, diametro: float) -> Escenario:
+        """Variante con todos los tramos en un mismo diámetro (m)"""
+        if diametro <= 0:
+            raise ValueError("El diámetro debe ser positivo")
+        tramos = [tramo if tramo.diametro == diametro else replace(tramo, diametro=diametro)
+                  for tramo in self[base].sistema.tramos]
+        return self.variante(base, nombre, tramos=tramos)
+
+    def variante_fluido(self, base: str, nombre: str, fluido: str) -> Escenario:
+        """Variante con otro fluido del catálogo"""
+        if fluido not in self.fluidos:
+            raise ValueError(f"Fluido desconocido: '{fluido}'")
+        return self.variante(base, nombre, fluido=self.fluidos[fluido])
+
+    def nombres(self) -> List[str]:
+        return list(self._escenarios)
+
+    def __getitem__(self, nombre: str) -> Escenario:
+        escenario = self._escenarios.get(nombre)
+        if escenario is None:
+            raise KeyError(f"No existe el escenario '{nombre}'")
+        return escenario
+
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self._escenarios
+
+    def __iter__(self) -> Iterator[Escenario]:
+        return iter(list(self._escenarios.values()))
+
+    def __len__(self) -> int:
+        return len(self._escenarios)
+
+    # --- Evaluación ------------------------------------------------------
+
+    def pendientes(self) -> List[str]:
+        """Escenarios sin resultados vigentes"""
+        return [nombre for nombre, escenario in self._escenarios.items()
+                if self._cache.get(nombre, (None,))[0] is not escenario.sistema]
+
+    def evaluar(self, nombres: Optional[Sequence[str]] = None,
+                progreso: Optional[Callable[[int], None]] = None,
+                cancelacion: Optional[TokenCancelacion] = None) -> Dict[str, ResultadoEscenario]:
+        """
+        Evalúa los escenarios (solo los que no tienen resultados vigentes)
+
+        Todas las curvas se calculan sobre la misma malla de caudales, de
+        modo que se pueden superponer y comparar punto por punto.
+
+        Args:
+            nombres: Escenarios a evaluar; por defecto todos
+            progreso: Función opcional que recibe el porcentaje completado
+            cancelacion: Token opcional; se verifica entre escenarios
+
+        Returns: nombre -> ResultadoEscenario, en el orden de los escenarios
+        """
+        nombres = self.nombres() if nombres is None else list(nombres)
+        escenarios = [self[nombre] for nombre in nombres]
+        caudales = self._malla_caudales(escenarios)
+        pendientes = [escenario for escenario in escenarios
+                      if not self._vigente(escenario, caudales)]
+
+        with span('escenarios.evaluar'):
+            if pendientes:
+                with ThreadPoolExecutor(max_workers=self.max_hilos) as grupo:
+                    futuros = [grupo.submit(self._evaluar_escenario, escenario.sistema,
+                                            caudales, cancelacion)
+                               for escenario in pendientes]
+                    try:
+                        for i, (escenario, futuro) in enumerate(zip(pendientes, futuros), start=1):
+                            self._cache[escenario.nombre] = (escenario.sistema, futuro.result())
+                            if progreso is not None:
+                                progreso(100 * i // len(pendientes))
+                    finally:
+                        for futuro in futuros:
+                            futuro.cancel()
+        if progreso is not None:
+            progreso(100)
+        return {escenario.nombre: self._cache[escenario.nombre][1] for escenario in escenarios}
+
+    def _evaluar_escenario(self, sistema: SistemaTuberias, caudales,
+                           cancelacion: Optional[TokenCancelacion]) -> ResultadoEscenario:
+        if cancelacion is not None:
+            cancelacion.verificar()
+        calculadora = CalculadoraCurvas(sistema, constantes=self.constantes)
+        resultados = calculadora.bombeo.obtener_resultados_completos()
+        curvas = calculadora.calcular_curvas(caudales) if caudales is not None else {}
+        return ResultadoEscenario(resultados, curvas)
+
+    def _malla_caudales(self, escenarios: Sequence[Escenario]):
+        """Malla común de caudales: de 0 al doble del mayor caudal de diseño"""
+        if not escenarios or not self.PUNTOS_CURVA:
+            return None
+        caudal_max = 2.0 * max(escenario.sistema.caudal for escenario in escenarios)
+        return CalculadoraCurvas(escenarios[0].sistema, constantes=self.constantes).rango_caudales(
+            self.PUNTOS_CURVA, caudal_max)
+
+    def _vigente(self, escenario: Escenario, caudales) -> bool:
+        """Hay resultados para este sistema calculados sobre la misma malla"""
+        sistema, resultado = self._cache.get(escenario.nombre, (None, None))
+        if sistema is not escenario.sistema:
+            return False
+        anteriores = resultado.curvas.get('caudal')
+        if caudales is None or anteriores is None:
+            return caudales is None and anteriores is None
+        return len(anteriores) == len(caudales) and anteriores[-1] == caudales[-1]
@@ -0,0 +1,338 @@
+"""
+Módulo de estaciones de bombeo: varias bombas en paralelo o en serie
+
+CalculadoraBombeo supone una sola bomba con una eficiencia fija. Aquí las
+curvas de las bombas de una EstacionBombeo se muestrean una vez sobre una
+malla común (alturas en paralelo, caudales en serie) y cada combinación de
+bombas encendidas se obtiene sumando filas de esa malla:
+
+    paralelo: Q(H) = Σ qᵢ(H)        serie: H(Q) = Σ hᵢ(Q)
+
+Las curvas combinadas se pasan a una misma malla de caudales, de modo que
+las 2^N − 1 combinaciones forman una matriz combinaciones × caudales con la
+que se calcula de una vez el punto de operación de cada una con la curva del
+sistema y, para cada demanda, la combinación de menor potencia capaz de
+entregarla (el exceso de altura se estrangula en la válvula de descarga).
+"""
+from array import array
+from bisect import bisect_right
+from typing import Dict, Optional, Sequence
+
+from ..models import CurvaBomba, EstacionBombeo, SistemaTuberias
+from .hidraulica import CalculadoraHidraulica
+from .instrumentacion import span
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las combinaciones se evalúan una por una
+    np = None
+
+# Puntos de la malla común de alturas (paralelo) o caudales (serie)
+PUNTOS_MALLA = 513
+
+# Demandas evaluadas por bloque en escalonar (acota la memoria de la matriz)
+BLOQUE_DEMANDAS = 4096
+
+
+class CalculadoraEstacion:
+    """Curvas combinadas, puntos de operación y escalonamiento de una estación
+
+    Args:
+        sistema: Sistema de tuberías que alimenta la estación
+        estacion: Bombas y su disposición
+        constantes: Constantes físicas compartidas (opcional)
+        puntos: Puntos de la malla de interpolación
+    """
+
+    def __init__(self, sistema: SistemaTuberias, estacion: EstacionBombeo,
+                 constantes: Optional[Dict[str, float]] = None, puntos: int = PUNTOS_MALLA):
+        if puntos < 2:
+            raise ValueError("Se necesitan al menos dos puntos")
+        self.sistema = sistema
+        self.estacion = estacion
+        self.hidraulica = CalculadoraHidraulica(sistema, constantes)
+        self.paralelo = estacion.disposicion == 'paralelo'
+        self.combinaciones = estacion.combinaciones()
+        with span('estacion.mallas'):
+            self._preparar_mallas(puntos)
+
+    def descripcion(self, indice: int) -> str:
+        """Texto de la combinación con ese índice (-1 = ninguna)"""
+        return self.estacion.descripcion(self.combinaciones[indice] if indice >= 0 else ())
+
+    # --- Mallas -------------------------------------------------------------
+
+    def _eficiencia(self, bomba: CurvaBomba, caudal: float) -> float:
+        if not bomba.eficiencias:
+            return self.sistema.eficiencia_bomba
+        return _interpolar(caudal, bomba.caudales, bomba.eficiencias)
+
+    def _preparar_mallas(self, puntos: int):
+        """Tablas de altura y potencia de cada combinación sobre una malla de caudales
+
+        Cada bomba se muestrea en su eje natural: en paralelo sobre alturas de
+        0 a la mayor altura a caudal cero (caudal de la bomba a cada altura, 0
+        si no la vence), en serie sobre caudales de 0 al mayor caudal máximo
+        (altura de la bomba, 0 más allá de su curva). Las filas de cada
+        combinación se suman en ese eje y, en paralelo, la curva combinada se
+        invierte una vez a la malla común de caudales.
+
+        alturas[c][k] y potencias[c][k] son NaN donde la combinación c sale de
+        la curva de alguna de sus bombas.
+        """
+        bombas = self.estacion.bombas
+        rho_g = self.sistema.fluido.densidad * self.hidraulica.G
+        if self.paralelo:
+            extremo = max(max(bomba.alturas) for bomba in bombas)
+        else:
+            extremo = max(bomba.caudal_maximo for bomba in bombas)
+        eje = [extremo * k / (puntos - 1) for k in range(puntos)]
+
+        valores, potencias, limites_bomba = [], [], []
+        for bomba in bombas:
+            fila_valores, fila_potencias = array('d'), array('d')
+            if self.paralelo:
+                # Envolvente no creciente: la curva se puede invertir aunque suba al inicio
+                alturas = list(bomba.alturas)
+                for i in range(1, len(alturas)):
+                    alturas[i] = min(alturas[i], alturas[i - 1])
+                alturas.reverse()
+                caudales = list(reversed(bomba.caudales))
+                for h in eje:
+                    q = _interpolar(h, alturas, caudales, bomba.caudal_maximo, 0.0)
+                    fila_valores.append(q)
+                    fila_potencias.append(rho_g * q * h / self._eficiencia(bomba, q) / 1000.0
+                                          if q > 0 else 0.0)
+                limites_bomba.append(alturas[0])  # por debajo, la bomba sale de su curva
+            else:
+                for q in eje:
+                    h = _interpolar(q, bomba.caudales, bomba.alturas, bomba.alturas[0], 0.0)
+                    fila_valores.append(h)
+                    fila_potencias.append(rho_g * q * h / self._eficiencia(bomba, q) / 1000.0
+                                          if q > 0 and h > 0 else 0.0)
+                limites_bomba.append(bomba.caudal_maximo)
+            valores.append(fila_valores)
+            potencias.append(fila_potencias)
+
+        # Altura mínima (paralelo) o caudal máximo (serie) de cada combinación
+        agregar = max if self.paralelo else min
+        limites = [agregar(limites_bomba[i] for i in c) for c in self.combinaciones]
+        if np is not None:
+            self._tablas_numpy(np.array(eje), np.array(valores), np.array(potencias),
+                               np.array(limites))
+        else:
+            self._tablas_python(eje, valores, potencias, limites)
+
+    def _tablas_numpy(self, eje, valores, potencias, limites):
+        seleccion = np.zeros((len(self.combinaciones), len(valores)))
+        for c, combinacion in enumerate(self.combinaciones):
+            seleccion[c, list(combinacion)] = 1.0
+        curvas = seleccion @ valores
+        potencias = seleccion @ potencias
+        if not self.paralelo:
+            self.caudales = eje
+            fuera = eje[None, :] > limites[:, None]
+            self.alturas = np.where(fuera, np.nan, curvas)
+            self.potencias = np.where(fuera, np.nan, potencias)
+            return
+        # Q(H) no crece con H: invertida por filas a la malla común de caudales
+        self.caudales = np.linspace(0.0, float(curvas[:, 0].max()), len(eje))
+        self.alturas = np.empty((len(curvas), len(eje)))
+        self.potencias = np.empty_like(self.alturas)
+        for c in range(len(curvas)):
+            q = curvas[c, ::-1]
+            self.alturas[c] = np.interp(self.caudales, q, eje[::-1], right=np.nan)
+            self.potencias[c] = np.interp(self.caudales, q, potencias[c, ::-1], right=np.nan)
+        fuera = ~(self.alturas >= limites[:, None])
+        self.alturas[fuera] = np.nan
+        self.potencias[fuera] = np.nan
+
+    def _tablas_python(self, eje, valores, potencias, limites):
+        nan = float('nan')
+        curvas = [array('d', map(sum, zip(*(valores[i] for i in c)))) for c in self.combinaciones]
+        sumas = [array('d', map(sum, zip(*(potencias[i] for i in c)))) for c in self.combinaciones]
+        if not self.paralelo:
+            self.caudales = array('d', eje)
+            self.alturas = [array('d', (h if q <= limite else nan for q, h in zip(eje, curva)))
+                            for curva, limite in zip(curvas, limites)]
+            self.potencias = [array('d', (p if q <= limite else nan for q, p in zip(eje, fila)))
+                              for fila, limite in zip(sumas, limites)]
+            return
+        caudal_maximo = max(curva[0] for curva in curvas)
+        self.caudales = array('d', (caudal_maximo * k / (len(eje) - 1) for k in range(len(eje))))
+        self.alturas, self.potencias = [], []
+        eje_invertido = eje[::-1]
+        for curva, fila, limite in zip(curvas, sumas, limites):
+            q = curva[::-1]
+            alturas = array('d', (_interpolar(x, q, eje_invertido, None, nan) for x in self.caudales))
+            fila_potencias = fila[::-1]
+            self.alturas.append(array('d', (h if h >= limite else nan for h in alturas)))
+            self.potencias.append(array('d', (
+                _interpolar(x, q, fila_potencias, None, nan) if h >= limite else nan
+                for x, h in zip(self.caudales, alturas)
+            )))
+
+    # --- Puntos de operación --------------------------------------------------
+
+    def puntos_operacion(self) -> Dict[str, Sequence[float]]:
+        """
+        Punto de operación de cada combinación con la curva del sistema
+
+        Returns: columnas 'caudal', 'altura' y 'potencia_kW', una fila por
+                 combinación (NaN si no se cruzan dentro de las curvas)
+        """
+        with span('estacion.puntos_operacion'):
+            sistema = self.hidraulica.calcular_curva_sistema(self.caudales)['carga_total_bomba']
+            if np is not None:
+                return self._puntos_operacion_numpy(np.asarray(sistema))
+            return self._puntos_operacion_python(sistema)
+
+    def _puntos_operacion_numpy(self, sistema) -> Dict[str, Sequence[float]]:
+        caudales, alturas, potencias = self.caudales, self.alturas, self.potencias
+        diferencia = alturas - sistema
+        filas = np.arange(len(self.combinaciones))
+        # Primer caudal donde la estación ya no supera al sistema (NaN nunca cruza)
+        with np.errstate(invalid='ignore'):
+            cruza = diferencia <= 0
+        j = np.argmax(cruza, axis=1)
+        valido = cruza[filas, j] & (j > 0)
+        j = np.maximum(j, 1)
+        d0, d1 = diferencia[filas, j - 1], diferencia[filas, j]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(d0 != d1, d0 / (d0 - d1), 0.0)
+        valido &= np.isfinite(d0)
+        caudal = caudales[j - 1] + t * (caudales[j] - caudales[j - 1])
+        altura = alturas[filas, j - 1] + t * (alturas[filas, j] - alturas[filas, j - 1])
+        potencia = potencias[filas, j - 1] + t * (potencias[filas, j] - potencias[filas, j - 1])
+        return {
+            'caudal': np.where(valido, caudal, np.nan),
+            'altura': np.where(valido, altura, np.nan),
+            'potencia_kW': np.where(valido, potencia, np.nan),
+        }
+
+    def _puntos_operacion_python(self, sistema) -> Dict[str, Sequence[float]]:
+        caudales = self.caudales
+        nan = float('nan')
+        columnas = {clave: array('d') for clave in ('caudal', 'altura', 'potencia_kW')}
+        for alturas, potencias in zip(self.alturas, self.potencias):
+            punto = (nan, nan, nan)
+            for j in range(1, len(caudales)):
+                d1 = alturas[j] - sistema[j]
+                if d1 <= 0:
+                    d0 = alturas[j - 1] - sistema[j - 1]
+                    if d0 > 0:
+                        t = d0 / (d0 - d1)
+                        punto = (caudales[j - 1] + t * (caudales[j] - caudales[j - 1]),
+                                 alturas[j - 1] + t * (alturas[j] - alturas[j - 1]),
+                                 potencias[j - 1] + t * (potencias[j] - potencias[j - 1]))
+                    break
+                if d1 != d1:
+                    break
+            for clave, valor in zip(('caudal', 'altura', 'potencia_kW'), punto):
+                columnas[clave].append(valor)
+        return columnas
+
+    # --- Escalonamiento -------------------------------------------------------
+
+    def escalonar(self, demandas: Sequence[float]) -> Dict[str, Sequence[float]]:
+        """
+        Combinación de menor potencia para cada demanda
+
+        Una combinación es factible si entrega el caudal demandado con al menos
+        la carga del sistema a ese caudal; la altura sobrante se estrangula.
+        Entre combinaciones de igual potencia se prefiere la de menos bombas.
+
+        Args:
+            demandas: Caudales demandados (m³/s, no negativos)
+
+        Returns: columnas 'caudal', 'carga_sistema', 'combinacion' (índice en
+                 self.combinaciones; -1 si ninguna es factible o la demanda es
+                 cero), 'bombas_encendidas', 'altura_estacion' y 'potencia_kW'
+                 (NaN si ninguna combinación es factible)
+        """
+        if any(q < 0 for q in demandas):
+            raise ValueError("Las demandas no pueden ser negativas")
+        with span('estacion.escalonar'):
+            cargas = self.hidraulica.calcular_curva_sistema(demandas)['carga_total_bomba']
+            if np is not None:
+                return self._escalonar_numpy(np.asarray(demandas, dtype=float), np.asarray(cargas))
+            return self._escalonar_python(demandas, cargas)
+
+    def _escalonar_numpy(self, demandas, cargas) -> Dict[str, Sequence[float]]:
+        caudales = self.caudales
+        n = len(caudales)
+        combinacion = np.full(len(demandas), -1, dtype=np.int64)
+        altura = np.full(len(demandas), np.nan)
+        potencia = np.full(len(demandas), np.nan)
+        for inicio in range(0, len(demandas), BLOQUE_DEMANDAS):
+            bloque = slice(inicio, inicio + BLOQUE_DEMANDAS)
+            q = demandas[bloque]
+            # Misma posición en la malla para todas las combinaciones
+            j = np.clip(np.searchsorted(caudales, q, 'right'), 1, n - 1)
+            t = (q - caudales[j - 1]) / (caudales[j] - caudales[j - 1])
+            alturas = self.alturas[:, j - 1] + t * (self.alturas[:, j] - self.alturas[:, j - 1])
+            potencias = self.potencias[:, j - 1] + t * (self.potencias[:, j] - self.potencias[:, j - 1])
+            with np.errstate(invalid='ignore'):
+                factible = (alturas >= cargas[bloque]) & (q <= caudales[-1])
+            costo = np.where(factible, potencias, np.inf)
+            mejor = np.argmin(costo, axis=0)
+            columnas = np.arange(len(q))
+            hay = np.isfinite(costo[mejor, columnas])
+            combinacion[bloque] = np.where(hay, mejor, -1)
+            altura[bloque] = np.where(hay, alturas[mejor, columnas], np.nan)
+            potencia[bloque] = np.where(hay, potencias[mejor, columnas], np.nan)
+        sin_demanda = demandas == 0
+        combinacion[sin_demanda] = -1
+        altura[sin_demanda] = 0.0
+        potencia[sin_demanda] = 0.0
+        tamanos = np.array([len(c) for c in self.combinaciones] + [0])
+        return {
+            'caudal': demandas,
+            'carga_sistema': cargas,
+            'combinacion': combinacion,
+            'bombas_encendidas': tamanos[combinacion],  # -1 toma el 0 del final
+            'altura_estacion': altura,
+            'potencia_kW': potencia,
+        }
+
+    def _escalonar_python(self, demandas, cargas) -> Dict[str, Sequence[float]]:
+        caudales = self.caudales
+        n = len(caudales)
+        nan = float('nan')
+        columnas = {'caudal': array('d', demandas), 'carga_sistema': array('d', cargas),
+                    'combinacion': array('q'), 'bombas_encendidas': array('q'),
+                    'altura_estacion': array('d'), 'potencia_kW': array('d')}
+        for q, carga in zip(demandas, cargas):
+            mejor = (-1, 0.0, 0.0) if q == 0 else (-1, nan, nan)
+            if 0 < q <= caudales[-1]:
+                j = min(max(bisect_right(caudales, q), 1), n - 1)
+                t = (q - caudales[j - 1]) / (caudales[j] - caudales[j - 1])
+                for c, (alturas, potencias) in enumerate(zip(self.alturas, self.potencias)):
+                    altura = alturas[j - 1] + t * (alturas[j] - alturas[j - 1])
+                    potencia = potencias[j - 1] + t * (potencias[j] - potencias[j - 1])
+                    # Con igual potencia se conserva la anterior (menos bombas)
+                    if altura >= carga and not potencia >= mejor[2]:
+                        mejor = (c, altura, potencia)
+            columnas['combinacion'].append(mejor[0])
+            columnas['bombas_encendidas'].append(len(self.combinaciones[mejor[0]])
+                                                 if mejor[0] >= 0 else 0)
+            columnas['altura_estacion'].append(mejor[1])
+            columnas['potencia_kW'].append(mejor[2])
+        return columnas
+
+
+def _interpolar(x: float, xs: Sequence[float], ys: Sequence[float],
+                izquierda: Optional[float] = None, derecha: Optional[float] = None) -> float:
+    """Interpolación lineal con xs no decreciente; fuera del rango, los valores dados
+
+    Por defecto fuera del rango se usa el valor del extremo (como np.interp).
+    """
+    if x < xs[0]:
+        return ys[0] if izquierda is None else izquierda
+    if x > xs[-1]:
+        return ys[-1] if derecha is None else derecha
+    i = min(max(bisect_right(xs, x), 1), len(xs) - 1)
+    x1, x2 = xs[i - 1], xs[i]
+    if x2 == x1:
+        return ys[i]
+    return ys[i - 1] + (x - x1) / (x2 - x1) * (ys[i] - ys[i - 1])
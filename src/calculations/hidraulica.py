@@ -1,16 +1,30 @@
 """
 Módulo de cálculos hidráulicos para sistemas de tuberías
+
+Las fórmulas viven en nucleos.py: los métodos escalares usan sus funciones
+y calcular_curva_sistema delega en el núcleo seleccionado (Python, NumPy o
+Numba).
 """
-import math
-from typing import Dict, List, Tuple
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 from ..models import SistemaTuberias, TramoTuberia
+from . import nucleos
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las curvas se evalúan punto por punto
+    np = None
 
 class CalculadoraHidraulica:
     """Clase para realizar cálculos hidráulicos en sistemas de tuberías"""
     
-    def __init__(self, sistema: SistemaTuberias):
+    def __init__(self, sistema: SistemaTuberias, constantes: Optional[Dict[str, float]] = None,
+                 nucleo: Optional[nucleos.NucleoHidraulico] = None):
         self.sistema = sistema
-        self.constantes = self._cargar_constantes()
+        # Las constantes se pueden compartir entre calculadoras para no releer el CSV
+        self.constantes = constantes if constantes is not None else self._cargar_constantes()
+        # Sin núcleo explícito se usa el seleccionado al momento de calcular
+        self.nucleo = nucleo
     
     def _cargar_constantes(self) -> Dict[str, float]:
         """Carga constantes físicas necesarias"""
@@ -28,38 +42,35 @@ class CalculadoraHidraulica:
         """Presión atmosférica estándar"""
         return self.constantes.get('presion_atmosferica', 101325.0)
     
+    def nucleo_activo(self) -> nucleos.NucleoHidraulico:
+        """Núcleo de esta calculadora o, si no se indicó uno, el seleccionado"""
+        return self.nucleo if self.nucleo is not None else nucleos.obtener_nucleo()
+    
     def calcular_area_seccion(self, diametro: float) -> float:
         """Calcula el área de la sección transversal de la tubería"""
-        return math.pi * (diametro ** 2) / 4.0
+        return nucleos.area_seccion(diametro)
     
     def calcular_velocidad(self, caudal: float, diametro: float) -> float:
         """Calcula la velocidad del fluido en la tubería"""
-        area = self.calcular_area_seccion(diametro)
-        return caudal / area
+        return nucleos.velocidad_flujo(caudal, diametro)
     
     def calcular_numero_reynolds(self, velocidad: float, diametro: float) -> float:
         """Calcula el número de Reynolds"""
-        rho = self.sistema.fluido.densidad
-        mu = self.sistema.fluido.viscosidad
-        return (rho * velocidad * diametro) / mu
+        fluido = self.sistema.fluido
+        return nucleos.numero_reynolds(velocidad, diametro, fluido.densidad, fluido.viscosidad)
     
     def calcular_factor_friccion(self, Re: float) -> float:
-        """Calcula el factor de fricción de Darcy-Weisbach"""
-        if Re < 2000:
-            # Flujo laminar
-            return 64.0 / Re
-        else:
-            # Flujo turbulento - Correlación de Blasius
-            return 0.3164 * (Re ** -0.25)
+        """Calcula el factor de fricción de Darcy-Weisbach (laminar o Blasius)"""
+        return nucleos.factor_friccion(Re)
     
     def calcular_altura_velocidad(self, velocidad: float) -> float:
         """Calcula la altura de velocidad (energía cinética por unidad de peso)"""
-        return (velocidad ** 2) / (2 * self.G)
+        return nucleos.altura_velocidad(velocidad, self.G)
     
     def calcular_perdidas_mayores_tramo(self, tramo: TramoTuberia, velocidad: float, f: float) -> float:
         """Calcula pérdidas mayores (fricción en tubería) para un tramo específico"""
         hv = self.calcular_altura_velocidad(velocidad)
-        return f * (tramo.longitud / tramo.diametro) * hv
+        return nucleos.perdida_friccion(f, tramo.longitud / tramo.diametro, hv)
     
     def calcular_perdidas_menores_totales(self, velocidad: float) -> float:
         """Calcula pérdidas menores totales (accesorios)"""
@@ -130,3 +141,75 @@ class CalculadoraHidraulica:
             'factor_friccion': f,
             'area_seccion': self.calcular_area_seccion(diametro)
         }
+    
+    def calcular_curva_sistema(self, caudales: Sequence[float]) -> Dict[str, Sequence[float]]:
+        """
+        Evalúa la curva del sistema para muchos caudales a la vez
+        
+        Usa las mismas expresiones que calcular_carga_total_bomba, aplicadas a
+        todo el rango de caudales por el núcleo de cálculo (ver nucleos.py).
+        Para caudal cero las pérdidas son nulas.
+        
+        Returns: columnas 'caudal', 'velocidad', 'numero_reynolds',
+                 'factor_friccion', 'perdidas_mayores', 'perdidas_menores',
+                 'perdidas_totales' y 'carga_total_bomba' (arreglos de NumPy o
+                 array('d'))
+        """
+        carga_estatica = self.calcular_altura_elevacion() + self.calcular_altura_presion()
+        claves = ('velocidad', 'numero_reynolds', 'factor_friccion',
+                  'perdidas_mayores', 'perdidas_menores')
+        
+        if not self.sistema.tramos:
+            ceros = [0.0] * len(caudales)
+            columnas = {clave: array('d', ceros) for clave in claves}
+        else:
+            diametro, L_sobre_D, K_total = self._coeficientes_perdidas()
+            columnas = self.nucleo_activo().curva_sistema(caudales, diametro, L_sobre_D, K_total,
+                                            self.sistema.fluido.densidad,
+                                            self.sistema.fluido.viscosidad, self.G)
+        
+        if np is not None:
+            columnas = {clave: np.asarray(valores, dtype=float) for clave, valores in columnas.items()}
+            columnas['caudal'] = np.array(caudales, dtype=float)
+            columnas['perdidas_totales'] = columnas['perdidas_mayores'] + columnas['perdidas_menores']
+            columnas['carga_total_bomba'] = carga_estatica + columnas['perdidas_totales']
+        else:
+            columnas['caudal'] = array('d', caudales)
+            columnas['perdidas_totales'] = array('d', map(sum, zip(columnas['perdidas_mayores'],
+                                                                   columnas['perdidas_menores'])))
+            columnas['carga_total_bomba'] = array('d', (carga_estatica + h
+                                                        for h in columnas['perdidas_totales']))
+        return columnas
+    
+    def funcion_carga_sistema(self) -> Callable[[float], float]:
+        """
+        Carga del sistema como función escalar del caudal
+        
+        Usa las mismas expresiones que calcular_curva_sistema, con los
+        coeficientes de pérdidas calculados una sola vez: pensada para
+        resolvedores iterativos que evalúan muchos caudales sueltos.
+        """
+        carga_estatica = self.calcular_altura_elevacion() + self.calcular_altura_presion()
+        if not self.sistema.tramos:
+            return lambda caudal: carga_estatica
+        diametro, L_sobre_D, K_total = self._coeficientes_perdidas()
+        rho_d_sobre_mu = self.sistema.fluido.densidad * diametro / self.sistema.fluido.viscosidad
+        area = self.calcular_area_seccion(diametro)
+        G2 = 2 * self.G
+        
+        def carga(caudal: float) -> float:
+            velocidad = caudal / area
+            Re = rho_d_sobre_mu * velocidad
+            hv = velocidad * velocidad / G2
+            if Re <= 0:
+                return carga_estatica + K_total * hv
+            f = nucleos.factor_friccion(Re)
+            return carga_estatica + (f * L_sobre_D + K_total) * hv
+        return carga
+    
+    def _coeficientes_perdidas(self) -> Tuple[float, float, float]:
+        """Diámetro de referencia, suma de L/D de los tramos y K total de accesorios"""
+        diametro = self.sistema.tramos[0].diametro
+        longitud_sobre_diametro = sum(tramo.longitud / tramo.diametro for tramo in self.sistema.tramos)
+        K_total = sum(acc.K_total for acc in self.sistema.accesorios)
+        return diametro, longitud_sobre_diametro, K_total
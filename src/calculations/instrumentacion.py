@@ -0,0 +1,192 @@
+"""
+Instrumentación ligera de las etapas de cálculo y renderizado
+
+Las etapas se marcan con spans de tipo context manager::
+
+    with span('bombeo.perdidas'):
+        ...
+
+Cuando la instrumentación está deshabilitada, ``span`` retorna un context
+manager nulo compartido, por lo que el costo es una llamada a función.
+Se habilita con ``instrumentacion.habilitar()`` o con la variable de
+entorno ``SISTEMA_BOMBEO_INSTRUMENTACION=1``.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+
+# Máximo de duraciones conservadas por span para calcular percentiles
+MAX_MUESTRAS = 10_000
+# Máximo de eventos conservados para la traza en formato Chrome
+MAX_EVENTOS = 100_000
+
+
+class _SpanNulo:
+    """Context manager que no hace nada (instrumentación deshabilitada)"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_SPAN_NULO = _SpanNulo()
+
+
+class _Span:
+    """Mide la duración de un bloque y la registra al salir"""
+    __slots__ = ('_registro', '_nombre', '_inicio')
+
+    def __init__(self, registro: 'Instrumentacion', nombre: str):
+        self._registro = registro
+        self._nombre = nombre
+        self._inicio = 0.0
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._registro.registrar(self._nombre, self._inicio, time.perf_counter())
+        return False
+
+
+class _Estadistica:
+    """Acumulado de un span: conteo, total y últimas muestras"""
+    __slots__ = ('conteo', 'total', 'maximo', 'muestras')
+
+    def __init__(self):
+        self.conteo = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.muestras = deque(maxlen=MAX_MUESTRAS)
+
+
+def _percentil(ordenadas: List[float], p: float) -> float:
+    """Percentil por interpolación lineal sobre una lista ordenada"""
+    if not ordenadas:
+        return 0.0
+    posicion = (len(ordenadas) - 1) * p / 100.0
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(ordenadas) - 1)
+    fraccion = posicion - inferior
+    return ordenadas[inferior] + (ordenadas[superior] - ordenadas[inferior]) * fraccion
+
+
+class Instrumentacion:
+    """Registro de spans con agregados y exportación a JSON o traza de Chrome"""
+
+    def __init__(self, habilitada: bool = False):
+        self.habilitada = habilitada
+        self._bloqueo = threading.Lock()
+        self._estadisticas: Dict[str, _Estadistica] = {}
+        self._eventos = deque(maxlen=MAX_EVENTOS)
+        self._origen = time.perf_counter()
+
+    def habilitar(self):
+        """Habilita el registro de spans"""
+        self.habilitada = True
+
+    def deshabilitar(self):
+        """Deshabilita el registro de spans"""
+        self.habilitada = False
+
+    def reiniciar(self):
+        """Descarta todos los datos acumulados"""
+        with self._bloqueo:
+            self._estadisticas.clear()
+            self._eventos.clear()
+            self._origen = time.perf_counter()
+
+    def span(self, nombre: str):
+        """Retorna un context manager que mide el bloque con el nombre dado"""
+        if not self.habilitada:
+            return _SPAN_NULO
+        return _Span(self, nombre)
+
+    def registrar(self, nombre: str, inicio: float, fin: float):
+        """Registra una duración medida externamente (tiempos de perf_counter)"""
+        duracion = fin - inicio
+        with self._bloqueo:
+            estadistica = self._estadisticas.get(nombre)
+            if estadistica is None:
+                estadistica = self._estadisticas[nombre] = _Estadistica()
+            estadistica.conteo += 1
+            estadistica.total += duracion
+            if duracion > estadistica.maximo:
+                estadistica.maximo = duracion
+            estadistica.muestras.append(duracion)
+            self._eventos.append((nombre, inicio, duracion, threading.get_ident()))
+
+    def resumen(self) -> Dict[str, Dict[str, float]]:
+        """Agregados por span: conteo, total, media, percentiles y máximo (segundos)"""
+        with self._bloqueo:
+            copia = {
+                nombre: (e.conteo, e.total, e.maximo, sorted(e.muestras))
+                for nombre, e in self._estadisticas.items()
+            }
+        resumen = {}
+        for nombre, (conteo, total, maximo, muestras) in copia.items():
+            resumen[nombre] = {
+                'conteo': conteo,
+                'total_s': total,
+                'media_s': total / conteo if conteo else 0.0,
+                'p50_s': _percentil(muestras, 50),
+                'p95_s': _percentil(muestras, 95),
+                'p99_s': _percentil(muestras, 99),
+                'maximo_s': maximo
+            }
+        return resumen
+
+    def ultima_duracion(self, nombre: str) -> float:
+        """Duración de la última ejecución del span (0 si nunca se ejecutó)"""
+        with self._bloqueo:
+            estadistica = self._estadisticas.get(nombre)
+            return estadistica.muestras[-1] if estadistica and estadistica.muestras else 0.0
+
+    def eventos_chrome(self) -> List[Dict]:
+        """Eventos en el formato de traza de Chrome (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        with self._bloqueo:
+            eventos = list(self._eventos)
+            origen = self._origen
+        return [
+            {
+                'name': nombre,
+                'cat': nombre.split('.', 1)[0],
+                'ph': 'X',
+                'ts': (inicio - origen) * 1e6,
+                'dur': duracion * 1e6,
+                'pid': pid,
+                'tid': tid
+            }
+            for nombre, inicio, duracion, tid in eventos
+        ]
+
+    def exportar_json(self, ruta: str):
+        """Exporta el resumen agregado en JSON"""
+        with open(ruta, 'w', encoding='utf-8') as file:
+            json.dump(self.resumen(), file, indent=2)
+
+    def exportar_chrome_trace(self, ruta: str):
+        """Exporta los eventos individuales en formato de traza de Chrome"""
+        with open(ruta, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': self.eventos_chrome(), 'displayTimeUnit': 'ms'}, file)
+
+
+# Registro global usado por el motor de cálculo y la interfaz
+instrumentacion = Instrumentacion(
+    habilitada=os.environ.get('SISTEMA_BOMBEO_INSTRUMENTACION', '') not in ('', '0')
+)
+
+
+def span(nombre: str):
+    """Atajo para ``instrumentacion.span(nombre)``"""
+    if not instrumentacion.habilitada:
+        return _SPAN_NULO
+    return _Span(instrumentacion, nombre)
@@ -0,0 +1,252 @@
+"""
+Núcleos de cálculo hidráulico intercambiables
+
+Las fórmulas de CalculadoraHidraulica (área, velocidad, Reynolds, factor de
+fricción y pérdidas) están aquí en dos formas: funciones escalares con
+``math`` y núcleos que evalúan la curva del sistema sobre muchos caudales.
+Todos los núcleos implementan la misma interfaz (NucleoHidraulico):
+
+    python: bucle sobre array('d'), sin dependencias
+    numpy:  operaciones sobre arreglos completos
+    numba:  el mismo bucle compilado con Numba (si está instalado)
+
+El núcleo se elige solo (numba > numpy > python según lo instalado) y se
+puede forzar con seleccionar_nucleo() o con la variable de entorno
+``SISTEMA_BOMBEO_NUCLEO=python|numpy|numba``. verificar_paridad() compara
+todos los núcleos disponibles con el de Python puro.
+"""
+import math
+import os
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él solo queda el núcleo de Python
+    np = None
+
+try:
+    import numba
+except ImportError:  # Numba es opcional: solo acelera el bucle del núcleo de Python
+    numba = None
+
+# Tolerancia relativa con la que los núcleos deben coincidir
+TOLERANCIA_PARIDAD = 1e-12
+
+COLUMNAS = ('velocidad', 'numero_reynolds', 'factor_friccion',
+            'perdidas_mayores', 'perdidas_menores')
+
+
+def area_seccion(diametro: float) -> float:
+    """Área de la sección transversal de la tubería"""
+    return math.pi * (diametro ** 2) / 4.0
+
+
+def velocidad_flujo(caudal: float, diametro: float) -> float:
+    """Velocidad media del fluido en la tubería"""
+    return caudal / area_seccion(diametro)
+
+
+def numero_reynolds(velocidad: float, diametro: float, densidad: float, viscosidad: float) -> float:
+    """Número de Reynolds"""
+    return (densidad * velocidad * diametro) / viscosidad
+
+
+def factor_friccion(Re: float) -> float:
+    """Factor de fricción de Darcy-Weisbach (laminar o Blasius)"""
+    if Re < 2000:
+        return 64.0 / Re
+    return 0.3164 * (Re ** -0.25)
+
+
+def altura_velocidad(velocidad: float, G: float) -> float:
+    """Altura de velocidad (energía cinética por unidad de peso)"""
+    return (velocidad ** 2) / (2 * G)
+
+
+def perdida_friccion(f: float, longitud_sobre_diametro: float, hv: float) -> float:
+    """Pérdida de Darcy-Weisbach de un tramo (o de la suma de L/D de varios)"""
+    return f * longitud_sobre_diametro * hv
+
+
+def _bucle_curva_sistema(caudales, diametro, L_sobre_D, K_total, densidad, viscosidad, G,
+                         velocidad, Re, f, mayores, menores):
+    """Curva del sistema punto por punto sobre arreglos ya reservados
+
+    Mismas expresiones que las funciones escalares, escritas en línea para
+    que Numba pueda compilar el bucle tal cual. Con caudal cero f es NaN y
+    las pérdidas mayores son nulas.
+    """
+    area = math.pi * (diametro ** 2) / 4.0
+    for i in range(len(caudales)):
+        v = caudales[i] / area
+        re = (densidad * v * diametro) / viscosidad
+        hv = (v ** 2) / (2 * G)
+        velocidad[i] = v
+        Re[i] = re
+        menores[i] = K_total * hv
+        if re > 0:
+            fi = 64.0 / re if re < 2000 else 0.3164 * (re ** -0.25)
+            f[i] = fi
+            mayores[i] = fi * L_sobre_D * hv
+        else:
+            f[i] = math.nan
+            mayores[i] = 0.0
+
+
+class NucleoHidraulico(ABC):
+    """Interfaz de los núcleos: curva del sistema para muchos caudales
+
+    curva_sistema retorna las columnas de COLUMNAS (arreglos de NumPy o
+    array('d'), según el núcleo). Un núcleo que no la implementa no se puede
+    instanciar.
+    """
+    nombre = ''
+
+    @classmethod
+    def disponible(cls) -> bool:
+        return True
+
+    @abstractmethod
+    def curva_sistema(self, caudales: Sequence[float], diametro: float, L_sobre_D: float,
+                      K_total: float, densidad: float, viscosidad: float,
+                      G: float) -> Dict[str, Sequence[float]]:
+        """Columnas de COLUMNAS para cada caudal"""
+
+
+class NucleoPython(NucleoHidraulico):
+    """Bucle de Python puro sobre array('d') (sin dependencias)"""
+    nombre = 'python'
+
+    def curva_sistema(self, caudales, diametro, L_sobre_D, K_total, densidad, viscosidad, G):
+        columnas = {clave: array('d', bytes(8 * len(caudales))) for clave in COLUMNAS}
+        _bucle_curva_sistema(caudales, diametro, L_sobre_D, K_total, densidad, viscosidad, G,
+                             *(columnas[clave] for clave in COLUMNAS))
+        return columnas
+
+
+class NucleoNumPy(NucleoHidraulico):
+    """Operaciones de NumPy sobre todo el arreglo"""
+    nombre = 'numpy'
+
+    @classmethod
+    def disponible(cls) -> bool:
+        return np is not None
+
+    def curva_sistema(self, caudales, diametro, L_sobre_D, K_total, densidad, viscosidad, G):
+        Q = np.asarray(caudales, dtype=float)
+        velocidad = Q / area_seccion(diametro)
+        Re = (densidad * velocidad * diametro) / viscosidad
+        hv = velocidad ** 2 / (2 * G)
+        con_flujo = Re > 0
+        # Con caudal cero f es infinito y f·hv indeterminado: se descartan con np.where
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f = np.where(Re < 2000, 64.0 / Re, 0.3164 * np.abs(Re) ** -0.25)
+            perdidas_mayores = np.where(con_flujo, f * L_sobre_D * hv, 0.0)
+        return {
+            'velocidad': velocidad,
+            'numero_reynolds': Re,
+            'factor_friccion': np.where(con_flujo, f, np.nan),
+            'perdidas_mayores': perdidas_mayores,
+            'perdidas_menores': K_total * hv,
+        }
+
+
+class NucleoNumba(NucleoHidraulico):
+    """El bucle del núcleo de Python compilado con Numba (se compila al primer uso)"""
+    nombre = 'numba'
+    _compilado = None
+
+    @classmethod
+    def disponible(cls) -> bool:
+        return numba is not None and np is not None
+
+    def curva_sistema(self, caudales, diametro, L_sobre_D, K_total, densidad, viscosidad, G):
+        if NucleoNumba._compilado is None:
+            NucleoNumba._compilado = numba.njit(cache=False)(_bucle_curva_sistema)
+        Q = np.ascontiguousarray(caudales, dtype=float)
+        columnas = {clave: np.empty(len(Q)) for clave in COLUMNAS}
+        NucleoNumba._compilado(Q, float(diametro), float(L_sobre_D), float(K_total),
+                               float(densidad), float(viscosidad), float(G),
+                               *(columnas[clave] for clave in COLUMNAS))
+        return columnas
+
+
+# En orden de preferencia para la selección automática
+NUCLEOS = {nucleo.nombre: nucleo for nucleo in (NucleoNumba, NucleoNumPy, NucleoPython)}
+
+_seleccionado: Optional[NucleoHidraulico] = None
+
+
+def nucleos_disponibles() -> List[str]:
+    """Nombres de los núcleos que se pueden usar, del preferido al de respaldo"""
+    return [nombre for nombre, nucleo in NUCLEOS.items() if nucleo.disponible()]
+
+
+def obtener_nucleo(nombre: Optional[str] = None) -> NucleoHidraulico:
+    """
+    Núcleo por nombre, o el seleccionado si nombre es None
+
+    Sin selección explícita se usa SISTEMA_BOMBEO_NUCLEO o, si no está
+    definida, el primer núcleo disponible.
+    """
+    global _seleccionado
+    if nombre is None:
+        if _seleccionado is None:
+            _seleccionado = obtener_nucleo(os.environ.get('SISTEMA_BOMBEO_NUCLEO')
+                                           or nucleos_disponibles()[0])
+        return _seleccionado
+    if nombre not in NUCLEOS:
+        raise ValueError(f"Núcleo desconocido: {nombre} (opciones: {', '.join(NUCLEOS)})")
+    if not NUCLEOS[nombre].disponible():
+        raise ValueError(f"El núcleo '{nombre}' no está disponible en esta instalación")
+    return NUCLEOS[nombre]()
+
+
+def seleccionar_nucleo(nombre: Optional[str]) -> NucleoHidraulico:
+    """Fija el núcleo por defecto (None vuelve a la selección automática)"""
+    global _seleccionado
+    _seleccionado = obtener_nucleo(nombre) if nombre is not None else None
+    return obtener_nucleo()
+
+
+def verificar_paridad(caudales: Optional[Sequence[float]] = None,
+                      tolerancia: float = TOLERANCIA_PARIDAD) -> Dict[str, float]:
+    """
+    Compara cada núcleo disponible con el de Python puro
+
+    Por defecto usa caudales que cruzan caudal cero y los regímenes laminar,
+    de transición y turbulento en varias tuberías.
+
+    Returns: núcleo -> mayor diferencia relativa encontrada
+    Raises: AssertionError si algún núcleo difiere más que la tolerancia
+    """
+    if caudales is None:
+        caudales = [0.0] + [10.0 ** (k / 4.0) for k in range(-40, 5)]
+    casos = [
+        # diámetro, L/D, K total, densidad, viscosidad, G
+        (0.1, 1500.0, 3.2, 998.2, 1.002e-3, 9.81),
+        (0.025, 40000.0, 0.0, 860.0, 0.35, 9.80665),
+        (1.2, 12.5, 18.7, 1025.0, 1.08e-3, 9.81),
+    ]
+    referencia = NucleoPython()
+    diferencias = {}
+    for nombre in nucleos_disponibles():
+        nucleo = obtener_nucleo(nombre)
+        maxima = 0.0
+        for caso in casos:
+            esperado = referencia.curva_sistema(caudales, *caso)
+            obtenido = nucleo.curva_sistema(caudales, *caso)
+            for clave in COLUMNAS:
+                for a, b in zip(esperado[clave], obtenido[clave]):
+                    a, b = float(a), float(b)
+                    if math.isnan(a) or math.isnan(b):
+                        if not (math.isnan(a) and math.isnan(b)):
+                            raise AssertionError(f"{nombre}.{clave}: NaN en un solo núcleo")
+                        continue
+                    maxima = max(maxima, abs(a - b) / max(abs(a), 1e-300) if a != b else 0.0)
+        if maxima > tolerancia:
+            raise AssertionError(f"El núcleo '{nombre}' difiere {maxima:.3e} del de Python")
+        diferencias[nombre] = maxima
+    return diferencias
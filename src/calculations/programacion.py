@@ -0,0 +1,402 @@
+"""
+Módulo de programación óptima de bombas con almacenamiento en tanque
+
+Encuentra el programa horario de encendido y velocidad de las bombas de
+una estación que abastece un tanque (el punto 2 del sistema) con el menor
+costo de energía, respetando los niveles mínimo y máximo del tanque.
+
+El problema se resuelve por programación dinámica sobre una malla de
+niveles del tanque y las horas del horizonte:
+
+    costo[t + 1][nivel'] = mín sobre (nivel, configuración) de
+        costo[t][nivel] + potencia(configuración, nivel) × precio[t]
+
+donde nivel' es el nivel al que lleva el balance de volumen de la hora. Cada
+estado de la malla guarda además el nivel real (sin redondear) del mejor
+camino que llega a él: el balance se aplica sobre ese nivel y los límites
+del tanque y el nivel final se verifican con él, de modo que el redondeo a
+la malla no se acumula hora tras hora. El punto de operación y la potencia de cada configuración se calculan una sola
+vez para todos los niveles (la carga estática cambia con el nivel), y las
+transiciones de cada hora se evalúan juntas como una matriz
+niveles × configuraciones. Se descartan los estados inalcanzables y los
+que ya no pueden llegar al nivel final exigido.
+"""
+import math
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..models import CurvaBomba, SistemaTuberias
+from .bombeo import CalculadoraBombeo
+from .instrumentacion import span
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las transiciones se evalúan una por una
+    np = None
+
+# Puntos de la curva combinada de la estación (malla de cargas)
+PUNTOS_CURVA_ESTACION = 129
+
+# Holgura con la que se comparan los niveles reales con los límites del tanque (m)
+TOLERANCIA_NIVEL = 1e-9
+
+
+@dataclass
+class Tanque:
+    """Tanque de descarga; los niveles se miden desde el fondo (elevacion_punto2)"""
+    area: float  # m²
+    nivel_minimo: float  # m
+    nivel_maximo: float  # m
+    nivel_inicial: float  # m
+    nivel_final_minimo: Optional[float] = None  # m; por defecto el nivel inicial
+
+    def __post_init__(self):
+        if self.area <= 0:
+            raise ValueError("El área del tanque debe ser positiva")
+        if not 0 <= self.nivel_minimo < self.nivel_maximo:
+            raise ValueError("Los niveles deben cumplir 0 ≤ mínimo < máximo")
+        if not self.nivel_minimo <= self.nivel_inicial <= self.nivel_maximo:
+            raise ValueError("El nivel inicial debe estar entre el mínimo y el máximo")
+        if self.nivel_final_minimo is not None and not (
+                self.nivel_minimo <= self.nivel_final_minimo <= self.nivel_maximo):
+            raise ValueError("El nivel final debe estar entre el mínimo y el máximo")
+
+
+@dataclass
+class ProgramaBombeo:
+    """Programa óptimo: una entrada por hora del horizonte
+
+    velocidades[t][i] es la velocidad relativa de la bomba i en la hora t
+    (0 = apagada); niveles tiene una entrada más (el nivel al final).
+    """
+    velocidades: List[Tuple[float, ...]]
+    niveles: List[float]
+    caudales: List[float]  # m³/s bombeados en cada hora
+    potencias_kW: List[float]
+    costos: List[float]
+    estados_evaluados: int = 0
+    extras: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def costo_total(self) -> float:
+        return math.fsum(self.costos)
+
+    @property
+    def energia_kWh(self) -> float:
+        return math.fsum(self.potencias_kW)
+
+    @property
+    def horas_bombeo(self) -> int:
+        return sum(1 for caudal in self.caudales if caudal > 0)
+
+
+class ProgramadorBombas:
+    """Programación dinámica del encendido y la velocidad de varias bombas en paralelo
+
+    Args:
+        sistema: Sistema de la estación al tanque (su elevacion_punto2 es el fondo del tanque)
+        bombas: Curvas de las bombas instaladas en paralelo
+        tanque: Geometría y niveles admisibles del tanque
+        velocidades: Velocidades relativas admisibles de cada bomba encendida
+                     (leyes de afinidad: Q ∝ n, H ∝ n²)
+        niveles: Puntos de la malla de niveles del tanque
+        constantes: Constantes físicas compartidas (opcional)
+    """
+
+    def __init__(self, sistema: SistemaTuberias, bombas: Sequence[CurvaBomba], tanque: Tanque,
+                 velocidades: Sequence[float] = (1.0,), niveles: int = 101,
+                 constantes: Optional[Dict[str, float]] = None):
+        if not bombas:
+            raise ValueError("La estación necesita al menos una bomba")
+        if any(not 0 < n <= 1.5 for n in velocidades):
+            raise ValueError("Las velocidades relativas deben estar entre 0 y 1.5")
+        if niveles < 2:
+            raise ValueError("Se necesitan al menos dos niveles")
+        self.sistema = sistema
+        self.bombas = list(bombas)
+        self.tanque = tanque
+        self.velocidades = tuple(sorted(set(velocidades)))
+        self.bombeo = CalculadoraBombeo(sistema, constantes)
+        self.hidraulica = self.bombeo.hidraulica
+        paso = (tanque.nivel_maximo - tanque.nivel_minimo) / (niveles - 1)
+        self.niveles = [tanque.nivel_minimo + i * paso for i in range(niveles)]
+        self.configuraciones = self._configuraciones()
+        with span('programacion.puntos_operacion'):
+            # caudales[c][k] y potencias[c][k]: configuración c con el tanque en el nivel k
+            self.caudales, self.potencias = self._tabla_operacion()
+
+    # --- Configuraciones -------------------------------------------------
+
+    def _configuraciones(self) -> List[Tuple[float, ...]]:
+        """Combinaciones de velocidades (0 = apagada) sin repetir las equivalentes
+
+        Entre bombas iguales solo importa cuántas funcionan a cada velocidad,
+        así que (1, 0) y (0, 1) se consideran la misma configuración.
+        """
+        grupos = []
+        for i, bomba in enumerate(self.bombas):
+            for grupo in grupos:
+                if self.bombas[grupo[0]] == bomba:
+                    grupo.append(i)
+                    break
+            else:
+                grupos.append([i])
+        configuraciones = {}
+        for combinacion in product((0.0,) + self.velocidades, repeat=len(self.bombas)):
+            canonica = tuple(tuple(sorted(combinacion[i] for i in grupo)) for grupo in grupos)
+            # Entre equivalentes se prefiere encender primero las bombas de menor índice
+            if canonica not in configuraciones or combinacion > configuraciones[canonica]:
+                configuraciones[canonica] = combinacion
+        return list(configuraciones.values())
+
+    def _tabla_operacion(self) -> Tuple[List[List[float]], List[List[float]]]:
+        """Caudal y potencia eléctrica de cada configuración en cada nivel"""
+        estatica = (self.hidraulica.calcular_altura_elevacion()
+                    + self.hidraulica.calcular_altura_presion())
+        caudales, potencias = [], []
+        for configuracion in self.configuraciones:
+            if not any(configuracion):
+                caudales.append([0.0] * len(self.niveles))
+                potencias.append([0.0] * len(self.niveles))
+                continue
+            Qc, Pc, Hc = self._curva_estacion(configuracion)
+            perdidas = self.hidraulica.calcular_curva_sistema(Qc)['perdidas_totales']
+            q_nivel, p_nivel = [], []
+            for nivel in self.niveles:
+                q, p = _interseccion(Qc, Pc, Hc, perdidas, estatica + nivel)
+                q_nivel.append(q)
+                p_nivel.append(p)
+            caudales.append(q_nivel)
+            potencias.append(p_nivel)
+        return caudales, potencias
+
+    def _curva_estacion(self, configuracion: Sequence[float]):
+        """Curva combinada de las bombas encendidas en paralelo, por caudal creciente
+
+        Returns: (caudales m³/s, potencias kW, cargas m) sobre una malla de cargas
+        """
+        encendidas = [(bomba, n) for bomba, n in zip(self.bombas, configuracion) if n > 0]
+        carga_maxima = max(max(bomba.alturas) * n * n for bomba, n in encendidas)
+        puntos = PUNTOS_CURVA_ESTACION
+        # De la carga máxima a cero: el caudal total crece a lo largo de la malla
+        cargas = [carga_maxima * (1.0 - i / (puntos - 1)) for i in range(puntos)]
+        caudales, potencias = [], []
+        for h in cargas:
+            q_total = p_total = 0.0
+            for bomba, n in encendidas:
+                q = _caudal_a_carga(bomba, n, h)
+                if q > 0:
+                    eta = (bomba.eficiencia(q / n) if bomba.eficiencias
+                           else self.sistema.eficiencia_bomba)
+                    q_total += q
+                    Wh = self.bombeo.calcular_potencia_hidraulica(h, caudal=q)
+                    p_total += self.bombeo.calcular_potencia_bomba(Wh, eficiencia=eta) / 1000.0
+            caudales.append(q_total)
+            potencias.append(p_total)
+        return caudales, potencias, cargas
+
+    def descripcion(self, velocidades: Sequence[float]) -> str:
+        """Texto breve de una configuración, p. ej. 'B1 100%, B2 85%'"""
+        partes = [f"B{i + 1} {n:.0%}" for i, n in enumerate(velocidades) if n > 0]
+        return ', '.join(partes) if partes else "Apagadas"
+
+    # --- Programación dinámica -------------------------------------------
+
+    def programar(self, demandas: Sequence[float], precios: Sequence[float]) -> ProgramaBombeo:
+        """
+        Programa de mínimo costo para el horizonte
+
+        Args:
+            demandas: Caudal que sale del tanque en cada hora (m³/s)
+            precios: Precio de la energía en cada hora ($/kWh)
+
+        Raises:
+            ValueError: Si los datos no son coherentes o no existe un programa
+                        que respete los niveles del tanque
+        """
+        if len(demandas) != len(precios):
+            raise ValueError("Las demandas y los precios deben cubrir las mismas horas")
+        if not demandas:
+            raise ValueError("El horizonte debe tener al menos una hora")
+        with span('programacion.programar'):
+            if np is not None:
+                return self._programar_numpy(demandas, precios)
+            return self._programar_python(demandas, precios)
+
+    def _nivel_indice(self, nivel: float) -> int:
+        paso = self.niveles[1] - self.niveles[0]
+        return int(round((nivel - self.niveles[0]) / paso))
+
+    def _cotas_finales(self, demandas: Sequence[float]) -> List[float]:
+        """Nivel mínimo necesario al inicio de cada hora (el último es el nivel final exigido)
+
+        Un estado se descarta si ni bombeando el máximo en todas las horas
+        restantes podría terminar sobre el nivel final.
+        """
+        tanque = self.tanque
+        final = tanque.nivel_final_minimo if tanque.nivel_final_minimo is not None else tanque.nivel_inicial
+        caudal_maximo = max(max(fila) for fila in self.caudales)
+        horas = len(demandas)
+        minimos = [0.0] * (horas + 1)
+        minimos[horas] = final - TOLERANCIA_NIVEL
+        for t in range(horas - 1, -1, -1):
+            minimos[t] = minimos[t + 1] - (caudal_maximo - demandas[t]) * 3600.0 / tanque.area
+        return minimos
+
+    def _programar_numpy(self, demandas, precios) -> ProgramaBombeo:
+        tanque = self.tanque
+        niveles = np.asarray(self.niveles)
+        n_niveles = len(niveles)
+        paso = niveles[1] - niveles[0]
+        caudales = np.asarray(self.caudales).T  # niveles × configuraciones
+        potencias = np.asarray(self.potencias).T
+        n_config = caudales.shape[1]
+        minimos = self._cotas_finales(demandas)
+        horas = len(demandas)
+
+        costo = np.full(n_niveles, np.inf)
+        real = np.full(n_niveles, np.nan)  # nivel sin redondear del mejor camino a cada estado
+        inicial = self._nivel_indice(tanque.nivel_inicial)
+        costo[inicial] = 0.0
+        real[inicial] = tanque.nivel_inicial
+        previo = np.empty((horas, n_niveles), dtype=np.int32)
+        eleccion = np.empty((horas, n_niveles), dtype=np.int32)
+        estados = 0
+        for t in range(horas):
+            activos = np.flatnonzero(np.isfinite(costo) & (real >= minimos[t]))
+            if activos.size == 0:
+                break
+            estados += activos.size * n_config
+            # Transiciones de todos los estados activos con todas las configuraciones
+            siguiente = real[activos, None] + (caudales[activos] - demandas[t]) * 3600.0 / tanque.area
+            valido = ((siguiente >= tanque.nivel_minimo - TOLERANCIA_NIVEL)
+                      & (siguiente <= tanque.nivel_maximo + TOLERANCIA_NIVEL))
+            candidato = np.where(valido, costo[activos, None] + potencias[activos] * precios[t], np.inf)
+            destino = np.where(valido, np.rint((siguiente - niveles[0]) / paso), 0)
+            destino = np.clip(destino, 0, n_niveles - 1).astype(np.int64).ravel()
+            candidato = candidato.ravel()
+            # Mínimo por nivel destino: ordenar por costo y quedarse con la primera aparición
+            orden = np.lexsort((candidato, destino))
+            destino_ordenado = destino[orden]
+            primeros = orden[np.r_[True, destino_ordenado[1:] != destino_ordenado[:-1]]]
+            nuevo = np.full(n_niveles, np.inf)
+            nuevo[destino[primeros]] = candidato[primeros]
+            real = np.full(n_niveles, np.nan)
+            real[destino[primeros]] = siguiente.ravel()[primeros]
+            previo[t, destino[primeros]] = activos[primeros // n_config]
+            eleccion[t, destino[primeros]] = primeros % n_config
+            costo = nuevo
+        else:
+            finales = np.where(np.isfinite(costo) & (real >= minimos[horas]), costo, np.inf)
+            if np.isfinite(finales).any():
+                nivel = int(np.argmin(finales))
+                ruta = []
+                for t in range(horas - 1, -1, -1):
+                    ruta.append((int(previo[t, nivel]), int(eleccion[t, nivel])))
+                    nivel = ruta[-1][0]
+                ruta.reverse()
+                return self._programa(ruta, demandas, precios, estados)
+        raise ValueError("No existe un programa que respete los niveles del tanque")
+
+    def _programar_python(self, demandas, precios) -> ProgramaBombeo:
+        tanque = self.tanque
+        niveles = self.niveles
+        n_niveles = len(niveles)
+        paso = niveles[1] - niveles[0]
+        minimos = self._cotas_finales(demandas)
+        horas = len(demandas)
+        infinito = math.inf
+        bajo = tanque.nivel_minimo - TOLERANCIA_NIVEL
+        alto = tanque.nivel_maximo + TOLERANCIA_NIVEL
+
+        costo = [infinito] * n_niveles
+        real = [0.0] * n_niveles  # nivel sin redondear del mejor camino a cada estado
+        inicial = self._nivel_indice(tanque.nivel_inicial)
+        costo[inicial] = 0.0
+        real[inicial] = tanque.nivel_inicial
+        previos, elecciones = [], []
+        estados = 0
+        for t in range(horas):
+            nuevo = [infinito] * n_niveles
+            nuevo_real = [0.0] * n_niveles
+            previo = [0] * n_niveles
+            eleccion = [0] * n_niveles
+            for k in range(n_niveles):
+                if costo[k] == infinito or real[k] < minimos[t]:
+                    continue
+                for c in range(len(self.configuraciones)):
+                    estados += 1
+                    siguiente = real[k] + (self.caudales[c][k] - demandas[t]) * 3600.0 / tanque.area
+                    if bajo <= siguiente <= alto:
+                        destino = min(n_niveles - 1, max(0, round((siguiente - niveles[0]) / paso)))
+                        candidato = costo[k] + self.potencias[c][k] * precios[t]
+                        if candidato < nuevo[destino]:
+                            nuevo[destino] = candidato
+                            nuevo_real[destino] = siguiente
+                            previo[destino] = k
+                            eleccion[destino] = c
+            costo, real = nuevo, nuevo_real
+            previos.append(previo)
+            elecciones.append(eleccion)
+
+        finales = [(costo[k], k) for k in range(n_niveles)
+                   if costo[k] < infinito and real[k] >= minimos[horas]]
+        if not finales:
+            raise ValueError("No existe un programa que respete los niveles del tanque")
+        nivel = min(finales)[1]
+        ruta = []
+        for t in range(horas - 1, -1, -1):
+            ruta.append((previos[t][nivel], elecciones[t][nivel]))
+            nivel = ruta[-1][0]
+        ruta.reverse()
+        return self._programa(ruta, demandas, precios, estados)
+
+    def _programa(self, ruta, demandas, precios, estados) -> ProgramaBombeo:
+        """Arma el programa a partir de (nivel al inicio, configuración) de cada hora"""
+        velocidades, caudales, potencias, costos = [], [], [], []
+        # Niveles reales: el mismo balance sin redondear que siguió la programación dinámica
+        niveles = [self.tanque.nivel_inicial]
+        for t, (k, c) in enumerate(ruta):
+            velocidades.append(tuple(self.configuraciones[c]))
+            caudales.append(self.caudales[c][k])
+            potencias.append(self.potencias[c][k])
+            costos.append(self.potencias[c][k] * precios[t])
+            niveles.append(niveles[-1] + (caudales[-1] - demandas[t]) * 3600.0 / self.tanque.area)
+        return ProgramaBombeo(velocidades, niveles, caudales, potencias, costos, estados)
+
+
+def _caudal_a_carga(bomba: CurvaBomba, velocidad: float, carga: float) -> float:
+    """Caudal de una bomba a cierta velocidad relativa contra una carga (0 si no la vence)"""
+    escala = velocidad * velocidad
+    alturas = bomba.alturas
+    if carga >= alturas[0] * escala:
+        return 0.0
+    for i in range(1, len(alturas)):
+        h1, h2 = alturas[i - 1] * escala, alturas[i] * escala
+        if h2 <= carga:
+            t = (h1 - carga) / (h1 - h2) if h1 != h2 else 1.0
+            q1, q2 = bomba.caudales[i - 1], bomba.caudales[i]
+            return velocidad * (q1 + t * (q2 - q1))
+    # Por debajo del último punto de la curva: caudal máximo de la curva
+    return velocidad * bomba.caudales[-1]
+
+
+def _interseccion(caudales, potencias, cargas, perdidas, estatica) -> Tuple[float, float]:
+    """Punto de operación: la curva de la estación corta a la del sistema
+
+    Las curvas se recorren por caudal creciente; la diferencia carga de la
+    estación − carga del sistema decrece y se interpola en su cambio de signo.
+    """
+    anterior = None
+    for i in range(len(caudales)):
+        diferencia = cargas[i] - (estatica + perdidas[i])
+        if diferencia <= 0:
+            if anterior is None or caudales[i] == 0:
+                return 0.0, 0.0
+            d0 = anterior
+            w = d0 / (d0 - diferencia)
+            return (caudales[i - 1] + w * (caudales[i] - caudales[i - 1]),
+                    potencias[i - 1] + w * (potencias[i] - potencias[i - 1]))
+        anterior = diferencia
+    return caudales[-1], potencias[-1]
@@ -0,0 +1,123 @@
+"""
+Registro compacto de los resultados de un cálculo de bombeo
+
+obtener_resultados_completos entrega un diccionario de 20 claves, cómodo
+para la interfaz y para JSON pero costoso en lotes: cada evaluación crea un
+diccionario nuevo y cada lectura calcula el hash de una cadena.
+ResultadosBombeo guarda los mismos valores en una tupla con nombre de orden
+fijo, se lee por atributo y se serializa como 20 float64 little-endian
+(160 bytes) para pasarlo entre procesos.
+
+Orden de los campos (CAMPOS; el mismo del diccionario y de las columnas de
+un barrido, después de 'caudal'):
+
+     0 velocidad                  m/s
+     1 numero_reynolds            -
+     2 factor_friccion            -
+     3 perdidas_mayores           m
+     4 perdidas_menores           m
+     5 perdidas_totales           m
+     6 altura_elevacion           m
+     7 altura_presion             m
+     8 carga_total_bomba          m
+     9 altura_sucursal            m
+    10 altura_descarga            m
+    11 NPSHa                      m
+    12 presion_inicial_m          m
+    13 presion_vapor_m            m
+    14 elevacion_fluido_sucursal  m
+    15 perdidas_sucursal          m
+    16 potencia_hidraulica_W      W
+    17 potencia_bomba_W           W
+    18 potencia_hidraulica_kW     kW
+    19 potencia_bomba_kW          kW
+"""
+import math
+import struct
+from typing import Dict, List, Mapping, NamedTuple, Sequence
+
+
+class ResultadosBombeo(NamedTuple):
+    """Resultados completos de un cálculo, con los campos en un orden fijo
+
+    Es una tupla: se construye con los valores en el orden de CAMPOS (o por
+    nombre), se lee por atributo y se itera y compara como tupla. Para leer
+    un campo por su nombre se usa getattr; el diccionario se obtiene con
+    a_dict.
+    """
+    velocidad: float
+    numero_reynolds: float
+    factor_friccion: float
+    perdidas_mayores: float
+    perdidas_menores: float
+    perdidas_totales: float
+    altura_elevacion: float
+    altura_presion: float
+    carga_total_bomba: float
+    altura_sucursal: float
+    altura_descarga: float
+    NPSHa: float
+    presion_inicial_m: float
+    presion_vapor_m: float
+    elevacion_fluido_sucursal: float
+    perdidas_sucursal: float
+    potencia_hidraulica_W: float
+    potencia_bomba_W: float
+    potencia_hidraulica_kW: float
+    potencia_bomba_kW: float
+
+    @classmethod
+    def desde_dict(cls, resultados: Mapping[str, float], parcial: bool = False) -> 'ResultadosBombeo':
+        """
+        Registro a partir del diccionario de obtener_resultados_completos
+
+        Las claves que no son campos se ignoran.
+
+        Args:
+            resultados: Diccionario con las claves de CAMPOS
+            parcial: Si es True, los campos que faltan quedan en NaN (por
+                ejemplo, resultados guardados por una versión anterior)
+
+        Raises:
+            ValueError: Si faltan campos y parcial es False
+        """
+        if not parcial:
+            faltantes = [campo for campo in CAMPOS if campo not in resultados]
+            if faltantes:
+                raise ValueError(f"Faltan resultados: {', '.join(faltantes)}")
+        return cls._make([resultados.get(campo, math.nan) for campo in CAMPOS])
+
+    def a_dict(self) -> Dict[str, float]:
+        """Diccionario con las claves de obtener_resultados_completos"""
+        return dict(zip(CAMPOS, self))
+
+    def a_bytes(self) -> bytes:
+        """Los campos como float64 little-endian en el orden de CAMPOS"""
+        return _FORMATO.pack(*self)
+
+    @classmethod
+    def desde_bytes(cls, datos) -> 'ResultadosBombeo':
+        """Inverso de a_bytes"""
+        return cls._make(_FORMATO.unpack(datos))
+
+
+CAMPOS = ResultadosBombeo._fields
+
+# Un registro serializado: un float64 little-endian por campo
+_FORMATO = struct.Struct(f'<{len(CAMPOS)}d')
+TAMANO_REGISTRO = _FORMATO.size
+
+
+def empaquetar(registros: Sequence[ResultadosBombeo]) -> bytes:
+    """Varios registros en un solo bloque de bytes (TAMANO_REGISTRO por registro)"""
+    datos = bytearray(TAMANO_REGISTRO * len(registros))
+    for i, registro in enumerate(registros):
+        _FORMATO.pack_into(datos, i * TAMANO_REGISTRO, *registro)
+    return bytes(datos)
+
+
+def desempaquetar(datos) -> List[ResultadosBombeo]:
+    """Inverso de empaquetar"""
+    if len(datos) % TAMANO_REGISTRO:
+        raise ValueError(f"El bloque no es múltiplo de {TAMANO_REGISTRO} bytes")
+    return [ResultadosBombeo._make(valores) for valores in _FORMATO.iter_unpack(datos)]
@@ -0,0 +1,188 @@
+"""
+Ejecución de cálculos fuera del hilo de la interfaz.
+
+Este módulo contiene el CalculationDispatcher, que envía los cálculos a un
+QThreadPool, reporta su avance, permite cancelarlos de forma cooperativa y
+descarta las solicitudes que quedan obsoletas cuando llega una más nueva
+(o, sin coalescencia, las ejecuta todas en orden).
+Los resultados se entregan mediante señales en el hilo de la interfaz.
+"""
+from collections import deque
+from typing import Any, Callable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from ..calculations.cancelacion import CalculoCancelado, TokenCancelacion
+
+# Firma de las tareas: reciben el token de cancelación y una función de progreso
+CalculationFunction = Callable[[TokenCancelacion, Callable[[int], None]], Any]
+
+
+class _TaskSignals(QObject):
+    """Señales emitidas por una tarea desde el hilo de trabajo."""
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+    cancelled = pyqtSignal(int)
+
+
+class CalculationTask(QRunnable):
+    """Tarea ejecutable en el QThreadPool.
+
+    Args:
+        request_id (int): Identificador de la solicitud
+        function: Función de cálculo que recibe (token, progreso)
+        token (TokenCancelacion): Token de cancelación cooperativa
+    """
+
+    def __init__(self, request_id: int, function: CalculationFunction, token: TokenCancelacion):
+        super().__init__()
+        self.request_id = request_id
+        self.function = function
+        self.token = token
+        self.signals = _TaskSignals()
+        self.setAutoDelete(True)
+
+    def run(self):
+        """Ejecuta el cálculo y emite la señal correspondiente al resultado."""
+        try:
+            result = self.function(self.token, self._report_progress)
+            if self.token.cancelado:
+                self.signals.cancelled.emit(self.request_id)
+            else:
+                self.signals.finished.emit(self.request_id, result)
+        except CalculoCancelado:
+            self.signals.cancelled.emit(self.request_id)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, str(e))
+
+    def _report_progress(self, percent: int):
+        self.signals.progress.emit(self.request_id, int(percent))
+
+
+class CalculationDispatcher(QObject):
+    """Despacha cálculos a un QThreadPool con coalescencia de solicitudes.
+
+    Solo hay un cálculo en curso a la vez. Si llega una solicitud nueva
+    mientras otra se ejecuta, la actual se cancela y la nueva queda en
+    espera; si llegan varias, solo se conserva la última. Por eso cada tipo
+    de cálculo que no debe reemplazar a otro (p. ej. un barrido frente al
+    recálculo del sistema) necesita su propio despachador.
+
+    Con coalesce=False (p. ej. para exportaciones) ninguna solicitud
+    reemplaza a otra: se ejecutan en orden de llegada y cada una emite su
+    resultado, su error o su cancelación. Las señales siempre se emiten en
+    el hilo de la interfaz.
+
+    Señales:
+        started: Emitida al iniciar una solicitud
+        progress: Porcentaje de avance de la solicitud vigente
+        result_ready: Resultado de la solicitud vigente
+        failed: Mensaje de error de la solicitud vigente
+        cancelled: Emitida cuando se cancela una solicitud que no fue
+                   reemplazada por otra más nueva
+        idle: Emitida cuando no queda trabajo pendiente
+    """
+
+    started = pyqtSignal()
+    progress = pyqtSignal(int)
+    result_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    idle = pyqtSignal()
+
+    def __init__(self, parent=None, thread_pool: Optional[QThreadPool] = None,
+                 coalesce: bool = True):
+        super().__init__(parent)
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self.coalesce = coalesce
+        self._last_id = 0
+        self._running = None  # (request_id, token, task)
+        self._pending = deque()  # (request_id, function); a lo sumo una si coalesce
+        self._superseded = False  # la tarea en curso se canceló para dar paso a _pending
+
+    def submit(self, function: CalculationFunction) -> int:
+        """Solicita un cálculo; con coalescencia reemplaza cualquier solicitud pendiente.
+
+        Returns:
+            int: Identificador de la solicitud
+        """
+        self._last_id += 1
+        request_id = self._last_id
+
+        if self._running is None:
+            self._start(request_id, function)
+        elif not self.coalesce:
+            self._pending.append((request_id, function))
+        else:
+            # Coalescer: cancelar la tarea en curso y conservar solo la última solicitud
+            token = self._running[1]
+            if not token.cancelado:
+                token.cancelar()
+                self._superseded = True
+            self._pending.clear()
+            self._pending.append((request_id, function))
+        return request_id
+
+    def cancel(self):
+        """Cancela la tarea en curso y descarta las solicitudes pendientes."""
+        descartadas = len(self._pending)
+        self._pending.clear()
+        self._superseded = False
+        if self._running is not None:
+            self._running[1].cancelar()
+        if not self.coalesce:
+            # Sin coalescencia cada solicitud informa su cancelación
+            for _ in range(descartadas):
+                self.cancelled.emit()
+
+    def is_busy(self) -> bool:
+        """Indica si hay un cálculo en curso o pendiente."""
+        return self._running is not None or bool(self._pending)
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """Espera a que el pool termine sus tareas (útil en scripts y pruebas)."""
+        return self.thread_pool.waitForDone(msecs)
+
+    def _start(self, request_id: int, function: CalculationFunction):
+        token = TokenCancelacion()
+        task = CalculationTask(request_id, function, token)
+        task.signals.progress.connect(self._on_progress)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        task.signals.cancelled.connect(self._on_cancelled)
+        self._running = (request_id, token, task.signals)
+        self._superseded = False
+        self.started.emit()
+        self.thread_pool.start(task)
+
+    def _is_current(self, request_id: int) -> bool:
+        return not self.coalesce or request_id == self._last_id
+
+    def _on_progress(self, request_id: int, percent: int):
+        if self._is_current(request_id):
+            self.progress.emit(percent)
+
+    def _on_finished(self, request_id: int, result):
+        if self._is_current(request_id):
+            self.result_ready.emit(result)
+        self._task_done()
+
+    def _on_failed(self, request_id: int, message: str):
+        if self._is_current(request_id):
+            self.failed.emit(message)
+        self._task_done()
+
+    def _on_cancelled(self, request_id: int):
+        if not self._superseded:
+            self.cancelled.emit()
+        self._task_done()
+
+    def _task_done(self):
+        """Libera la tarea actual e inicia la solicitud pendiente, si existe."""
+        self._running = None
+        if self._pending:
+            request_id, function = self._pending.popleft()
+            self._start(request_id, function)
+        else:
+            self.idle.emit()
@@ -0,0 +1,389 @@
+"""
+Mapa de calor del margen de NPSH y panel de cavitación.
+
+Este módulo contiene el widget CavitationMap, que dibuja el margen
+NPSHa − NPSHr de un MapaCavitacion (niveles × caudales a una temperatura)
+como una imagen, con la envolvente de operación segura encima, y el panel
+CavitationPanel con sus controles.
+
+La imagen se arma una sola vez por mapa y temperatura (una paleta de 256
+colores indexada con NumPy, o fila por fila sin él) y al pintar solo se
+escala al área de dibujo, así que redimensionar no recalcula nada.
+"""
+import math
+
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QColor, QImage, QPainter, QPen, QPolygonF
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QDoubleSpinBox, QSpinBox, QSizePolicy
+)
+
+from .curve_chart import AXIS_PEN, BACKGROUND_COLOR, LABEL_FONT, PLOT_COLOR, TEXT_PEN, nice_ticks
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él la imagen se arma fila por fila
+    np = None
+
+ENVELOPE_PEN = QPen(QColor(255, 255, 255), 2)
+MARKER_PEN = QPen(QColor(33, 150, 243), 2)
+NAN_COLOR = QColor(70, 70, 70)
+# Cavitación en rojo, margen insuficiente en amarillo, operación segura en verde
+CAVITATION_DEEP = QColor(120, 0, 0)
+CAVITATION_COLOR = QColor(229, 57, 53)
+WARNING_COLOR = QColor(255, 193, 7)
+SAFE_COLOR = QColor(46, 160, 67)
+PALETTE_SIZE = 256
+# Margen (m) en el que se satura la escala de colores
+MAX_MARGIN = 10.0
+
+
+def build_palette(limit, safety):
+    """Paleta ARGB de PALETTE_SIZE colores para márgenes en [−limit, limit].
+
+    Los negativos van de rojo oscuro a rojo; de 0 al margen de seguridad,
+    amarillo; por encima, de amarillo a verde.
+    """
+    palette = []
+    for i in range(PALETTE_SIZE):
+        value = -limit + 2.0 * limit * i / (PALETTE_SIZE - 1)
+        if value < 0:
+            color = _mix(CAVITATION_DEEP, CAVITATION_COLOR, 1.0 + value / limit)
+        elif value < safety:
+            color = WARNING_COLOR
+        else:
+            color = _mix(WARNING_COLOR, SAFE_COLOR, (value - safety) / max(limit - safety, 1e-9))
+        palette.append(color.rgb())
+    return palette
+
+
+def _mix(a, b, t):
+    t = min(1.0, max(0.0, t))
+    return QColor(round(a.red() + t * (b.red() - a.red())),
+                  round(a.green() + t * (b.green() - a.green())),
+                  round(a.blue() + t * (b.blue() - a.blue())))
+
+
+def margin_image(margin, limit, safety):
+    """Imagen (QImage RGB32) de una malla niveles × caudales; el nivel más alto arriba.
+
+    Args:
+        margin: Filas por nivel (NumPy 2D o secuencia de array('d'))
+        limit (float): Margen en que se satura la escala
+        safety (float): Margen de seguridad (frontera amarillo/verde)
+    """
+    palette = build_palette(limit, safety)
+    scale = (PALETTE_SIZE - 1) / (2.0 * limit)
+    if np is not None and isinstance(margin, np.ndarray):
+        rows, columns = margin.shape
+        lut = np.array(palette, dtype=np.uint32)
+        with np.errstate(invalid='ignore'):
+            index = np.clip(np.rint((margin[::-1] + limit) * scale), 0, PALETTE_SIZE - 1)
+        pixels = np.where(np.isnan(margin[::-1]), np.uint32(NAN_COLOR.rgb()),
+                          lut[np.nan_to_num(index).astype(np.intp)])
+        pixels = np.ascontiguousarray(pixels, dtype=np.uint32)
+        image = QImage(pixels.data, columns, rows, 4 * columns, QImage.Format.Format_RGB32)
+        return image.copy()  # la imagen no debe depender del arreglo temporal
+
+    rows, columns = len(margin), len(margin[0])
+    image = QImage(columns, rows, QImage.Format.Format_RGB32)
+    nan_color = NAN_COLOR.rgb()
+    for y, fila in enumerate(reversed(margin)):
+        for x, m in enumerate(fila):
+            if m != m:
+                image.setPixel(x, y, nan_color)
+            else:
+                i = min(PALETTE_SIZE - 1, max(0, round((m + limit) * scale)))
+                image.setPixel(x, y, palette[i])
+    return image
+
+
+class CavitationMap(QWidget):
+    """Mapa de calor del margen de NPSH con la envolvente de operación segura.
+
+    Eje horizontal: caudal; eje vertical: nivel del tanque de succión
+    respecto a la bomba. La línea blanca es el nivel mínimo seguro de cada
+    caudal: por encima de ella la bomba opera sin cavitar.
+    """
+
+    MARGIN_LEFT = 60
+    MARGIN_RIGHT = 80
+    MARGIN_TOP = 12
+    MARGIN_BOTTOM = 40
+    COLORBAR_WIDTH = 14
+
+    def __init__(self, parent=None, flow_scale=1000.0):
+        super().__init__(parent)
+        self.setMinimumSize(300, 200)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.flow_scale = flow_scale
+        self.mapa = None
+        self.temperature_index = 0
+        self.markers = []
+        self.image = None
+        self.limit = MAX_MARGIN
+        self.x_title = "Caudal (L/s)"
+        self.y_title = "Nivel de succión (m)"
+
+    def set_map(self, mapa, temperature_index=0):
+        """Muestra un MapaCavitacion a una de sus temperaturas."""
+        self.mapa = mapa
+        self.temperature_index = temperature_index
+        self._build_image()
+        self.update()
+
+    def set_markers(self, markers):
+        """Marcadores (caudal en m³/s, nivel en m, etiqueta), p. ej. el punto de diseño."""
+        self.markers = list(markers)
+        self.update()
+
+    def clear(self):
+        self.mapa = None
+        self.image = None
+        self.markers = []
+        self.update()
+
+    def _build_image(self):
+        corte = self.mapa.corte(self.temperature_index)
+        if np is not None and isinstance(corte, np.ndarray):
+            finite = np.abs(corte[np.isfinite(corte)])
+            largest = float(finite.max()) if finite.size else 0.0
+        else:
+            largest = max((abs(m) for fila in corte for m in fila if m == m), default=0.0)
+        self.limit = min(MAX_MARGIN, max(largest, 2.0 * self.mapa.margen_seguridad, 1e-3))
+        self.image = margin_image(corte, self.limit, self.mapa.margen_seguridad)
+
+    def plot_rect(self):
+        """Rectángulo del área de dibujo en coordenadas del widget."""
+        return QRectF(self.MARGIN_LEFT, self.MARGIN_TOP,
+                      max(1, self.width() - self.MARGIN_LEFT - self.MARGIN_RIGHT),
+                      max(1, self.height() - self.MARGIN_TOP - self.MARGIN_BOTTOM))
+
+    def _ranges(self):
+        caudales, niveles = self.mapa.caudales, self.mapa.niveles
+        x_range = (caudales[0] * self.flow_scale, caudales[-1] * self.flow_scale)
+        y_range = (niveles[0], niveles[-1])
+        # Un solo caudal o nivel: se le da un ancho mínimo para poder dibujarlo
+        if x_range[1] <= x_range[0]:
+            x_range = (x_range[0] - 0.5, x_range[0] + 0.5)
+        if y_range[1] <= y_range[0]:
+            y_range = (y_range[0] - 0.5, y_range[0] + 0.5)
+        return x_range, y_range
+
+    def _to_pixel(self, rect, x, y):
+        (x_min, x_max), (y_min, y_max) = self._ranges()
+        return QPointF(rect.left() + (x - x_min) * rect.width() / (x_max - x_min),
+                       rect.bottom() - (y - y_min) * rect.height() / (y_max - y_min))
+
+    # --- Pintado -----------------------------------------------------------
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND_COLOR)
+        rect = self.plot_rect()
+        painter.fillRect(rect, PLOT_COLOR)
+        painter.setFont(LABEL_FONT)
+        if self.mapa is None or self.image is None:
+            painter.setPen(TEXT_PEN)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "Sin mapa de cavitación")
+            painter.end()
+            return
+
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, False)
+        painter.drawImage(rect, self.image)
+        self._draw_axes(painter, rect)
+
+        painter.save()
+        painter.setClipRect(rect)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(ENVELOPE_PEN)
+        painter.drawPolyline(self._envelope(rect))
+        painter.setPen(MARKER_PEN)
+        for caudal, nivel, label in self.markers:
+            point = self._to_pixel(rect, caudal * self.flow_scale, nivel)
+            painter.drawEllipse(point, 5, 5)
+            painter.drawText(point + QPointF(8, -8), label)
+        painter.restore()
+
+        self._draw_colorbar(painter, rect)
+        painter.end()
+
+    def _envelope(self, rect):
+        """Polilínea del nivel mínimo seguro (se omiten los caudales fuera de la bomba)."""
+        niveles = self.mapa.nivel_minimo[self.temperature_index]
+        polygon = QPolygonF()
+        for caudal, nivel in zip(self.mapa.caudales, niveles):
+            if math.isfinite(nivel):
+                polygon.append(self._to_pixel(rect, caudal * self.flow_scale, nivel))
+        return polygon
+
+    def _draw_axes(self, painter, rect):
+        metrics = painter.fontMetrics()
+        (x_min, x_max), (y_min, y_max) = self._ranges()
+        painter.setPen(TEXT_PEN)
+        for x in nice_ticks(x_min, x_max, max(2, int(rect.width() / 90))):
+            px = self._to_pixel(rect, x, y_min).x()
+            label = f"{x:g}"
+            painter.drawText(QPointF(px - metrics.horizontalAdvance(label) / 2,
+                                     rect.bottom() + metrics.height()), label)
+        for y in nice_ticks(y_min, y_max, max(2, int(rect.height() / 50))):
+            py = self._to_pixel(rect, x_min, y).y()
+            label = f"{y:g}"
+            painter.drawText(QPointF(rect.left() - metrics.horizontalAdvance(label) - 6,
+                                     py + metrics.ascent() / 2), label)
+        painter.drawText(QPointF(rect.center().x() - metrics.horizontalAdvance(self.x_title) / 2,
+                                 rect.bottom() + 2 * metrics.height() + 2), self.x_title)
+        painter.save()
+        painter.translate(14, rect.center().y() + metrics.horizontalAdvance(self.y_title) / 2)
+        painter.rotate(-90)
+        painter.drawText(QPointF(0, 0), self.y_title)
+        painter.restore()
+        painter.setPen(AXIS_PEN)
+        painter.drawRect(rect)
+
+    def _draw_colorbar(self, painter, rect):
+        """Escala de colores del margen (m) a la derecha del mapa."""
+        metrics = painter.fontMetrics()
+        bar = QRectF(rect.right() + 10, rect.top(), self.COLORBAR_WIDTH, rect.height())
+        palette = build_palette(self.limit, self.mapa.margen_seguridad)
+        image = QImage(1, PALETTE_SIZE, QImage.Format.Format_RGB32)
+        for i, color in enumerate(reversed(palette)):
+            image.setPixel(0, i, color)
+        painter.drawImage(bar, image)
+        painter.setPen(AXIS_PEN)
+        painter.drawRect(bar)
+        painter.setPen(TEXT_PEN)
+        for value in nice_ticks(-self.limit, self.limit, max(2, int(rect.height() / 50))):
+            py = bar.bottom() - (value + self.limit) / (2 * self.limit) * bar.height()
+            painter.drawText(QPointF(bar.right() + 4, py + metrics.ascent() / 2), f"{value:g}")
+
+
+class CavitationPanel(QWidget):
+    """Mapa de cavitación de un sistema con su bomba y controles de la malla.
+
+    La malla cubre los caudales de la curva de la bomba y el rango de
+    niveles elegido; la temperatura solo se puede cambiar si el fluido es
+    agua (las demás propiedades vienen del catálogo). Mientras el panel no
+    está visible, los cambios solo se anotan y el mapa se calcula al mostrarlo.
+    """
+
+    FLOW_SCALE = 1000.0
+    DEFAULT_POINTS = 500
+    MAX_POINTS = 4000
+
+    def __init__(self):
+        super().__init__()
+        self.sistema = None
+        self.bomba = None
+        self.mapa = None
+        self.stale = False
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+
+        controls.addWidget(QLabel("Nivel (m):"))
+        self.level_min_spin = self._spin(-50.0, 50.0, -8.0)
+        controls.addWidget(self.level_min_spin)
+        controls.addWidget(QLabel("a"))
+        self.level_max_spin = self._spin(-50.0, 50.0, 5.0)
+        controls.addWidget(self.level_max_spin)
+
+        controls.addWidget(QLabel("Temperatura (°C):"))
+        self.temperature_spin = self._spin(1.0, 100.0, 20.0)
+        controls.addWidget(self.temperature_spin)
+
+        controls.addWidget(QLabel("Margen (m):"))
+        self.safety_spin = self._spin(0.0, 10.0, 0.5)
+        controls.addWidget(self.safety_spin)
+
+        controls.addWidget(QLabel("Puntos:"))
+        self.points_spin = QSpinBox()
+        self.points_spin.setRange(20, self.MAX_POINTS)
+        self.points_spin.setSingleStep(100)
+        self.points_spin.setValue(self.DEFAULT_POINTS)
+        self.points_spin.editingFinished.connect(self.refresh)
+        controls.addWidget(self.points_spin)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.map = CavitationMap(flow_scale=self.FLOW_SCALE)
+        layout.addWidget(self.map)
+
+        self.summary_label = QLabel("Nivel mínimo de succión: --")
+        self.summary_label.setProperty("class", "result")
+        layout.addWidget(self.summary_label)
+
+    def _spin(self, minimum, maximum, value):
+        spin = QDoubleSpinBox()
+        spin.setRange(minimum, maximum)
+        spin.setDecimals(1)
+        spin.setValue(value)
+        spin.editingFinished.connect(self.refresh)
+        return spin
+
+    def update_map(self, sistema, bomba):
+        """Recalcula el mapa para un sistema y una curva de bomba."""
+        self.sistema = sistema
+        self.bomba = bomba
+        if self.isVisible():
+            self.refresh()
+        else:
+            self.stale = True
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.stale:
+            self.refresh()
+
+    def refresh(self):
+        """Recalcula y dibuja el mapa con los controles actuales."""
+        self.stale = False
+        if self.sistema is None or self.bomba is None or not self.bomba.npsh_requerido:
+            self.clear_map()
+            return
+
+        from ..calculations import CalculadoraCavitacion
+
+        es_agua = self.sistema.fluido.nombre == 'agua'
+        self.temperature_spin.setEnabled(es_agua)
+        puntos = self.points_spin.value()
+        nivel_min = self.level_min_spin.value()
+        nivel_max = max(self.level_max_spin.value(), nivel_min + 0.1)
+        caudal_max = self.bomba.caudal_maximo
+        caudales = [caudal_max * i / (puntos - 1) for i in range(puntos)]
+        niveles = [nivel_min + (nivel_max - nivel_min) * i / (puntos - 1) for i in range(puntos)]
+        temperaturas = [self.temperature_spin.value()] if es_agua else None
+
+        calculadora = CalculadoraCavitacion(self.sistema, self.bomba)
+        self.mapa = calculadora.calcular_mapa(caudales, niveles, temperaturas,
+                                              margen_seguridad=self.safety_spin.value())
+        self.map.set_map(self.mapa)
+        nivel = self._design_level()
+        self.map.set_markers([(self.sistema.caudal, nivel, "Diseño")] if math.isfinite(nivel) else [])
+        self.update_summary()
+
+    def _design_level(self):
+        """Nivel mínimo seguro en el caudal de diseño (interpolado en la envolvente)."""
+        caudales = self.mapa.caudales
+        niveles = self.mapa.nivel_minimo[0]
+        q = self.sistema.caudal
+        for i in range(1, len(caudales)):
+            if caudales[i] >= q:
+                t = (q - caudales[i - 1]) / (caudales[i] - caudales[i - 1])
+                return float(niveles[i - 1] + t * (niveles[i] - niveles[i - 1]))
+        return float('nan')
+
+    def update_summary(self):
+        nivel = self._design_level()
+        texto = "Nivel mínimo de succión en el caudal de diseño: "
+        texto += f"{nivel:.2f} m" if math.isfinite(nivel) else "fuera de la curva de la bomba"
+        texto += f" · Zona segura: {self.mapa.fraccion_segura() * 100:.1f} % del mapa"
+        self.summary_label.setText(texto)
+
+    def clear_map(self):
+        self.mapa = None
+        self.stale = False
+        self.map.clear()
+        self.summary_label.setText("Nivel mínimo de succión: --")
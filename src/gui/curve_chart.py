@@ -0,0 +1,522 @@
+"""
+Gráfico de curvas con QPainter para series de millones de puntos.
+
+Este módulo contiene el widget CurveChart, usado para las curvas del sistema
+y de la bomba. No depende de matplotlib (excluido del ejecutable): dibuja
+directamente con QPainter.
+
+Antes de pintar, cada serie se reduce a lo que puede verse: solo el tramo
+dentro del rango visible y, si hay más puntos que columnas de pixels, el
+primer, mínimo, máximo y último valor de cada columna (downsample_minmax).
+Así el costo de pintar depende del ancho del widget y no del número de
+muestras, y desplazar o hacer zoom sigue siendo interactivo.
+"""
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+
+from PyQt6.QtCore import QPointF, QRectF, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen, QPolygonF
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él la reducción se hace en Python
+    np = None
+
+BACKGROUND_COLOR = QColor(43, 43, 43)
+PLOT_COLOR = QColor(35, 35, 35)
+GRID_PEN = QPen(QColor(70, 70, 70), 1, Qt.PenStyle.DotLine)
+AXIS_PEN = QPen(QColor(140, 140, 140), 1)
+TEXT_PEN = QPen(QColor(200, 200, 200))
+MARKER_PEN = QPen(QColor(255, 255, 255), 2)
+LABEL_FONT = QFont("Arial", 9)
+
+# Puntos por columna de pixels tras la reducción (primero, mínimo, máximo, último)
+POINTS_PER_COLUMN = 4
+# Tamaños de bloque de los niveles precalculados de una serie (solo con NumPy)
+LEVEL_BLOCKS = (16, 256, 4096)
+# Una serie necesita al menos estos bloques para que valga la pena un nivel
+LEVEL_MIN_BLOCKS = 1024
+
+
+def downsample_minmax(xs, ys, x_min, x_max, columns):
+    """Reduce una serie ordenada por x a lo visible en [x_min, x_max].
+
+    Incluye un punto a cada lado del rango para que la línea llegue a los
+    bordes. Si quedan más de POINTS_PER_COLUMN puntos por columna, cada
+    columna se reemplaza por su primer, mínimo, máximo y último valor, lo que
+    conserva picos y el trazo exacto a la resolución de pantalla.
+
+    Args:
+        xs, ys: Secuencias del mismo largo (xs creciente)
+        x_min, x_max: Rango visible en unidades de datos
+        columns (int): Número de columnas de pixels del área de dibujo
+
+    Returns:
+        tuple: (xs, ys) reducidos, del mismo tipo que la entrada (NumPy o array)
+    """
+    if np is not None and isinstance(xs, np.ndarray):
+        return _downsample_numpy(xs, ys, x_min, x_max, columns)
+    return _downsample_python(xs, ys, x_min, x_max, columns)
+
+
+def _downsample_numpy(xs, ys, x_min, x_max, columns):
+    start = max(0, int(np.searchsorted(xs, x_min, 'left')) - 1)
+    stop = min(len(xs), int(np.searchsorted(xs, x_max, 'right')) + 1)
+    xs, ys = xs[start:stop], ys[start:stop]
+    if len(xs) <= POINTS_PER_COLUMN * columns:
+        return xs, ys
+
+    # Inicio de cada columna no vacía (los puntos fuera del rango caen en la primera y la última)
+    edges = x_min + (x_max - x_min) * np.arange(1, columns) / columns
+    starts = np.unique(np.concatenate(([0], np.searchsorted(xs, edges, 'left'))))
+    starts = starts[starts < len(xs)]
+    ends = np.append(starts[1:], len(xs)) - 1
+
+    lows = np.minimum.reduceat(ys, starts)
+    highs = np.maximum.reduceat(ys, starts)
+    out_x = np.column_stack((xs[starts], xs[starts], xs[ends], xs[ends])).ravel()
+    out_y = np.column_stack((ys[starts], lows, highs, ys[ends])).ravel()
+    return out_x, out_y
+
+
+def _downsample_python(xs, ys, x_min, x_max, columns):
+    start = max(0, bisect_left(xs, x_min) - 1)
+    stop = min(len(xs), bisect_right(xs, x_max) + 1)
+    if stop - start <= POINTS_PER_COLUMN * columns:
+        return array('d', xs[start:stop]), array('d', ys[start:stop])
+
+    scale = columns / (x_max - x_min)
+    out_x, out_y = array('d'), array('d')
+    current = None
+    for i in range(start, stop):
+        x, y = xs[i], ys[i]
+        column = min(columns - 1, max(0, int((x - x_min) * scale)))
+        if column != current:
+            if current is not None:
+                out_x.extend((first_x, first_x, last_x, last_x))
+                out_y.extend((first_y, low, high, last_y))
+            current, first_x, first_y, low, high = column, x, y, y, y
+        elif y < low:
+            low = y
+        elif y > high:
+            high = y
+        last_x, last_y = x, y
+    out_x.extend((first_x, first_x, last_x, last_x))
+    out_y.extend((first_y, low, high, last_y))
+    return out_x, out_y
+
+
+def build_levels(xs, ys):
+    """Niveles de detalle de una serie para vistas alejadas.
+
+    Cada nivel reemplaza bloques consecutivos de B puntos por su primer,
+    mínimo, máximo y último valor (el mismo criterio que downsample_minmax),
+    de modo que una vista donde cada columna cubre varios bloques se reduce
+    desde el nivel en lugar de recorrer todas las muestras.
+
+    Returns:
+        list: [(B, xs, ys)] del bloque más chico al más grande
+    """
+    levels = []
+    for block in LEVEL_BLOCKS:
+        blocks = len(xs) // block
+        if blocks < LEVEL_MIN_BLOCKS:
+            break
+        end = blocks * block
+        bx = xs[:end].reshape(blocks, block)
+        by = ys[:end].reshape(blocks, block)
+        level_x = np.column_stack((bx[:, 0], bx[:, 0], bx[:, -1], bx[:, -1])).ravel()
+        level_y = np.column_stack((by[:, 0], by.min(axis=1), by.max(axis=1), by[:, -1])).ravel()
+        # Los puntos que no completan un bloque se conservan tal cual
+        levels.append((block, np.concatenate((level_x, xs[end:])),
+                       np.concatenate((level_y, ys[end:]))))
+    return levels
+
+
+def nice_ticks(lower, upper, count=6):
+    """Marcas de eje "redondas" (1, 2, 2.5 o 5 × 10^n) dentro de [lower, upper]."""
+    span = upper - lower
+    if span <= 0 or not math.isfinite(span):
+        return [lower]
+    raw = span / max(1, count)
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+    first = math.ceil(lower / step) * step
+    return [first + i * step for i in range(int((upper - first) / step + 1e-9) + 1)]
+
+
+class ChartSeries:
+    """Serie de un CurveChart.
+
+    Solo se conservan los puntos finitos; xs debe ser creciente.
+
+    Args:
+        name (str): Nombre en la leyenda
+        xs, ys: Secuencias del mismo largo (listas, array o NumPy)
+        color (QColor): Color de la línea
+        axis (str): 'left' o 'right' (eje vertical secundario)
+        style (Qt.PenStyle): Estilo de la línea
+    """
+
+    def __init__(self, name, xs, ys, color, axis='left', style=Qt.PenStyle.SolidLine):
+        self.name = name
+        self.axis = axis
+        self.pen = QPen(color, 2, style)
+        self.pen.setCosmetic(True)
+        self.visible = True
+        if np is not None:
+            xs = np.asarray(xs, dtype=float)
+            ys = np.asarray(ys, dtype=float)
+            finite = np.isfinite(xs) & np.isfinite(ys)
+            self.xs, self.ys = xs[finite], ys[finite]
+            self.levels = build_levels(self.xs, self.ys)
+        else:
+            self.levels = []
+            pairs = [(x, y) for x, y in zip(xs, ys) if math.isfinite(x) and math.isfinite(y)]
+            self.xs = array('d', (x for x, _ in pairs))
+            self.ys = array('d', (y for _, y in pairs))
+
+    def __len__(self):
+        return len(self.xs)
+
+    def level_for(self, x_min, x_max, columns):
+        """(xs, ys) del nivel más reducido que conserva el detalle por columna.
+
+        Se usa un nivel de bloque B si cada columna visible cubre al menos
+        2·B muestras originales.
+        """
+        xs, ys = self.xs, self.ys
+        if not self.levels:
+            return xs, ys
+        visible = int(np.searchsorted(xs, x_max, 'right') - np.searchsorted(xs, x_min, 'left'))
+        per_column = visible / max(1, columns)
+        for block, level_x, level_y in self.levels:
+            if 2 * block > per_column:
+                break
+            xs, ys = level_x, level_y
+        return xs, ys
+
+    def y_range(self):
+        """(mínimo, máximo) de los valores, o None si la serie está vacía."""
+        if not len(self):
+            return None
+        if np is not None:
+            return float(self.ys.min()), float(self.ys.max())
+        return min(self.ys), max(self.ys)
+
+
+class CurveChart(QWidget):
+    """Gráfico de líneas interactivo para curvas con muchas muestras.
+
+    Interacción:
+    - Rueda: zoom horizontal alrededor del cursor (con Shift, vertical)
+    - Arrastrar: desplazar
+    - Doble clic: ajustar a todos los datos
+
+    Attributes:
+        view_changed: Señal emitida cuando cambia el rango visible
+    """
+
+    view_changed = pyqtSignal()
+
+    MARGIN_LEFT = 60
+    MARGIN_RIGHT = 60
+    MARGIN_TOP = 12
+    MARGIN_BOTTOM = 40
+    ZOOM_FACTOR = 1.25
+    Y_PADDING = 0.05
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(300, 200)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.series = []
+        self.markers = []
+        self.x_title = ""
+        self.left_title = ""
+        self.right_title = ""
+        self._x_range = (0.0, 1.0)
+        self._left_range = (0.0, 1.0)
+        self._right_range = (0.0, 1.0)
+        self._drag_origin = None
+        self._cache = {}
+
+    # --- Datos -----------------------------------------------------------
+
+    def set_series(self, series):
+        """Reemplaza las series y ajusta la vista a los datos."""
+        self.series = list(series)
+        self._cache.clear()
+        self.reset_view()
+
+    def set_series_visible(self, name, visible):
+        """Muestra u oculta una serie por nombre."""
+        for serie in self.series:
+            if serie.name == name:
+                serie.visible = visible
+        self.update()
+
+    def set_markers(self, markers):
+        """Marcadores (x, y, etiqueta) sobre el eje izquierdo, p. ej. el punto de operación."""
+        self.markers = list(markers)
+        self.update()
+
+    def set_axis_titles(self, x_title, left_title, right_title=""):
+        self.x_title = x_title
+        self.left_title = left_title
+        self.right_title = right_title
+        self.update()
+
+    def clear(self):
+        self.series = []
+        self.markers = []
+        self._cache.clear()
+        self.update()
+
+    # --- Vista -----------------------------------------------------------
+
+    def x_range(self):
+        return self._x_range
+
+    def set_x_range(self, x_min, x_max):
+        if x_max > x_min:
+            self._x_range = (x_min, x_max)
+            self.update()
+            self.view_changed.emit()
+
+    def reset_view(self):
+        """Ajusta los rangos a todos los datos."""
+        xs = [(float(s.xs[0]), float(s.xs[-1])) for s in self.series if len(s)]
+        if xs:
+            self._x_range = _padded(min(lo for lo, _ in xs), max(hi for _, hi in xs), 0.0)
+        self._left_range = self._data_y_range('left')
+        self._right_range = self._data_y_range('right')
+        self.update()
+        self.view_changed.emit()
+
+    def _data_y_range(self, axis):
+        ranges = [s.y_range() for s in self.series if s.axis == axis and len(s)]
+        if not ranges:
+            return (0.0, 1.0)
+        lower = min(lo for lo, _ in ranges)
+        upper = max(hi for _, hi in ranges)
+        # Las curvas de bombeo se leen mejor con el cero a la vista
+        return _padded(min(0.0, lower), upper, self.Y_PADDING)
+
+    def plot_rect(self):
+        """Rectángulo del área de dibujo en coordenadas del widget."""
+        right = self.MARGIN_RIGHT if self._has_right_axis() else 20
+        return QRectF(self.MARGIN_LEFT, self.MARGIN_TOP,
+                      max(1, self.width() - self.MARGIN_LEFT - right),
+                      max(1, self.height() - self.MARGIN_TOP - self.MARGIN_BOTTOM))
+
+    def _has_right_axis(self):
+        return any(s.axis == 'right' for s in self.series)
+
+    # --- Pintado -----------------------------------------------------------
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND_COLOR)
+        rect = self.plot_rect()
+        painter.fillRect(rect, PLOT_COLOR)
+        painter.setFont(LABEL_FONT)
+
+        self._draw_axes(painter, rect)
+
+        painter.save()
+        painter.setClipRect(rect)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        for serie in self.series:
+            if serie.visible and len(serie):
+                painter.setPen(serie.pen)
+                painter.drawPolyline(self._polyline(serie, rect))
+        self._draw_markers(painter, rect)
+        painter.restore()
+
+        self._draw_legend(painter, rect)
+        painter.end()
+
+    def _polyline(self, serie, rect):
+        """Polilínea en pixels de una serie (reducida y guardada por vista)."""
+        y_range = self._left_range if serie.axis == 'left' else self._right_range
+        key = (id(serie), self._x_range, y_range, rect.width(), rect.height())
+        polygon = self._cache.get(key)
+        if polygon is not None:
+            return polygon
+
+        x_min, x_max = self._x_range
+        y_min, y_max = y_range
+        columns = int(rect.width())
+        xs, ys = downsample_minmax(*serie.level_for(x_min, x_max, columns), x_min, x_max, columns)
+        sx = rect.width() / (x_max - x_min)
+        sy = rect.height() / (y_max - y_min)
+
+        if np is not None and isinstance(xs, np.ndarray):
+            points = np.empty((len(xs), 2))
+            points[:, 0] = rect.left() + (xs - x_min) * sx
+            points[:, 1] = rect.bottom() - (ys - y_min) * sy
+            # Pixels lejos del área visible se acotan (evita desbordes del rasterizador)
+            np.clip(points, -1e6, 1e6, out=points)
+            # Puntos que caen en el mismo pixel que el anterior no cambian el trazo
+            pixels = np.rint(points)
+            keep = np.ones(len(points), dtype=bool)
+            keep[1:] = np.any(pixels[1:] != pixels[:-1], axis=1)
+            keep[-1] = True
+            points = points[keep]
+            polygon = QPolygonF()
+            polygon.resize(len(points))
+            buffer = polygon.data()
+            buffer.setsize(points.nbytes)
+            np.frombuffer(buffer, dtype=float)[:] = points.ravel()
+        else:
+            left, bottom = rect.left(), rect.bottom()
+            polygon = QPolygonF([
+                QPointF(left + (x - x_min) * sx, bottom - (y - y_min) * sy)
+                for x, y in zip(xs, ys)
+            ])
+
+        # Solo se conserva la vista actual (el siguiente pan la invalida)
+        self._cache = {k: v for k, v in self._cache.items() if k[1:] == key[1:]}
+        self._cache[key] = polygon
+        return polygon
+
+    def _to_pixel(self, rect, x, y, y_range):
+        x_min, x_max = self._x_range
+        y_min, y_max = y_range
+        return QPointF(rect.left() + (x - x_min) * rect.width() / (x_max - x_min),
+                       rect.bottom() - (y - y_min) * rect.height() / (y_max - y_min))
+
+    def _draw_axes(self, painter, rect):
+        metrics = painter.fontMetrics()
+        x_min, x_max = self._x_range
+
+        for x in nice_ticks(x_min, x_max, max(2, int(rect.width() / 90))):
+            px = self._to_pixel(rect, x, 0, self._left_range).x()
+            painter.setPen(GRID_PEN)
+            painter.drawLine(QPointF(px, rect.top()), QPointF(px, rect.bottom()))
+            painter.setPen(TEXT_PEN)
+            label = f"{x:g}"
+            painter.drawText(QPointF(px - metrics.horizontalAdvance(label) / 2,
+                                     rect.bottom() + metrics.height()), label)
+
+        y_count = max(2, int(rect.height() / 50))
+        for y in nice_ticks(*self._left_range, y_count):
+            py = self._to_pixel(rect, 0, y, self._left_range).y()
+            painter.setPen(GRID_PEN)
+            painter.drawLine(QPointF(rect.left(), py), QPointF(rect.right(), py))
+            painter.setPen(TEXT_PEN)
+            label = f"{y:g}"
+            painter.drawText(QPointF(rect.left() - metrics.horizontalAdvance(label) - 6,
+                                     py + metrics.ascent() / 2), label)
+
+        if self._has_right_axis():
+            painter.setPen(TEXT_PEN)
+            for y in nice_ticks(*self._right_range, y_count):
+                py = self._to_pixel(rect, 0, y, self._right_range).y()
+                painter.drawText(QPointF(rect.right() + 6, py + metrics.ascent() / 2), f"{y:g}")
+
+        painter.setPen(AXIS_PEN)
+        painter.drawRect(rect)
+
+        painter.setPen(TEXT_PEN)
+        painter.drawText(QRectF(rect.left(), rect.bottom() + metrics.height() + 4,
+                                rect.width(), metrics.height()),
+                         Qt.AlignmentFlag.AlignCenter, self.x_title)
+        for title, x, angle in ((self.left_title, 14, -90),
+                                (self.right_title, self.width() - 14, 90)):
+            if not title:
+                continue
+            painter.save()
+            painter.translate(x, rect.center().y())
+            painter.rotate(angle)
+            painter.drawText(QRectF(-rect.height() / 2, -metrics.height() / 2,
+                                    rect.height(), metrics.height()),
+                             Qt.AlignmentFlag.AlignCenter, title)
+            painter.restore()
+
+    def _draw_markers(self, painter, rect):
+        painter.setPen(MARKER_PEN)
+        for x, y, label in self.markers:
+            point = self._to_pixel(rect, x, y, self._left_range)
+            painter.drawEllipse(point, 5, 5)
+            painter.drawText(point + QPointF(8, -8), label)
+
+    def _draw_legend(self, painter, rect):
+        metrics = painter.fontMetrics()
+        x = rect.left() + 10
+        y = rect.top() + 8
+        for serie in self.series:
+            if not serie.visible:
+                continue
+            y += metrics.height()
+            painter.setPen(serie.pen)
+            painter.drawLine(QPointF(x, y - metrics.ascent() / 2),
+                             QPointF(x + 20, y - metrics.ascent() / 2))
+            painter.setPen(TEXT_PEN)
+            painter.drawText(QPointF(x + 26, y), serie.name)
+
+    # --- Interacción -----------------------------------------------------
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if not steps:
+            return
+        factor = self.ZOOM_FACTOR ** -steps
+        rect = self.plot_rect()
+        position = event.position()
+
+        if event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+            fraction = (rect.bottom() - position.y()) / rect.height()
+            self._left_range = _zoom(self._left_range, fraction, factor)
+            self._right_range = _zoom(self._right_range, fraction, factor)
+            self.update()
+        else:
+            fraction = (position.x() - rect.left()) / rect.width()
+            self.set_x_range(*_zoom(self._x_range, fraction, factor))
+        event.accept()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag_origin = (event.position(), self._x_range,
+                                 self._left_range, self._right_range)
+            self.setCursor(Qt.CursorShape.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if self._drag_origin is None:
+            return
+        origin, x_range, left_range, right_range = self._drag_origin
+        rect = self.plot_rect()
+        delta = event.position() - origin
+        dx = -delta.x() / rect.width() * (x_range[1] - x_range[0])
+        self._left_range = _shift(left_range, delta.y() / rect.height())
+        self._right_range = _shift(right_range, delta.y() / rect.height())
+        self.set_x_range(x_range[0] + dx, x_range[1] + dx)
+
+    def mouseReleaseEvent(self, event):
+        self._drag_origin = None
+        self.unsetCursor()
+
+    def mouseDoubleClickEvent(self, event):
+        self.reset_view()
+
+
+def _padded(lower, upper, padding):
+    if upper <= lower:
+        upper = lower + 1.0
+    extra = (upper - lower) * padding
+    return (lower - extra if lower < 0 else lower, upper + extra)
+
+
+def _zoom(value_range, fraction, factor):
+    lower, upper = value_range
+    anchor = lower + fraction * (upper - lower)
+    return (anchor - (anchor - lower) * factor, anchor + (upper - anchor) * factor)
+
+
+def _shift(value_range, fraction):
+    lower, upper = value_range
+    offset = fraction * (upper - lower)
+    return (lower + offset, upper + offset)
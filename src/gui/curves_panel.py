@@ -0,0 +1,226 @@
+"""
+Panel de curvas características del sistema de bombeo.
+
+Este módulo contiene la clase CurvesPanel, que grafica la curva del sistema,
+la curva de la bomba, su eficiencia y el margen de NPSH sobre un rango de
+caudales, y marca el punto de operación. Las curvas se calculan de una vez
+para todo el rango (CalculadoraCurvas) y se dibujan con CurveChart. Una
+segunda pestaña muestra el mapa de cavitación de la misma bomba
+(CavitationPanel).
+"""
+from array import array
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QCheckBox,
+    QSpinBox, QFileDialog, QMessageBox, QTabWidget
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+
+from .cavitation_map import CavitationPanel
+from .curve_chart import ChartSeries, CurveChart
+
+
+class CurvesPanel(QWidget):
+    """Panel con el gráfico de curvas del sistema y de la bomba.
+
+    Si no se carga una curva de bomba desde CSV, se usa una bomba de
+    referencia con su mejor punto en el punto de diseño del sistema
+    (CurvaBomba.desde_punto_diseno).
+    """
+
+    # Caudal mostrado en L/s (los cálculos usan m³/s)
+    FLOW_SCALE = 1000.0
+    DEFAULT_POINTS = 2000
+    MAX_POINTS = 5_000_000
+    # NPSH requerido en el punto de diseño de la bomba de referencia (m)
+    REFERENCE_NPSHR = 3.0
+
+    # (nombre, columna, color, eje, estilo)
+    SERIES = [
+        ("Curva del sistema", 'carga_sistema', QColor(76, 175, 80), 'left', Qt.PenStyle.SolidLine),
+        ("Curva de la bomba", 'altura_bomba', QColor(33, 150, 243), 'left', Qt.PenStyle.SolidLine),
+        ("Eficiencia (%)", 'eficiencia_bomba', QColor(255, 193, 7), 'right', Qt.PenStyle.DashLine),
+        ("NPSHa", 'NPSHa', QColor(156, 39, 176), 'left', Qt.PenStyle.SolidLine),
+        ("NPSHr", 'npsh_requerido', QColor(244, 67, 54), 'left', Qt.PenStyle.DashLine),
+        ("Margen NPSH", 'margen_npsh', QColor(0, 188, 212), 'left', Qt.PenStyle.DotLine),
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self.sistema = None
+        self.resultados = None
+        self.bomba = None  # curva cargada por el usuario (None = bomba de referencia)
+        self.curvas = None
+        self.init_ui()
+
+    def init_ui(self):
+        """Inicializa la interfaz del panel de curvas."""
+        outer = QVBoxLayout(self)
+        outer.setContentsMargins(0, 0, 0, 0)
+        self.view_tabs = QTabWidget()
+        outer.addWidget(self.view_tabs)
+
+        curves_page = QWidget()
+        layout = QVBoxLayout(curves_page)
+        self.view_tabs.addTab(curves_page, "Curvas")
+
+        # Mapa de cavitación de la misma bomba
+        self.cavitation_panel = CavitationPanel()
+        self.view_tabs.addTab(self.cavitation_panel, "Cavitación")
+
+        # Controles
+        controls = QHBoxLayout()
+
+        load_button = QPushButton("Cargar Curva de Bomba...")
+        load_button.clicked.connect(self.load_pump_curve)
+        controls.addWidget(load_button)
+
+        reference_button = QPushButton("Bomba de Referencia")
+        reference_button.clicked.connect(self.use_reference_pump)
+        controls.addWidget(reference_button)
+
+        controls.addWidget(QLabel("Puntos:"))
+        self.points_spin = QSpinBox()
+        self.points_spin.setRange(100, self.MAX_POINTS)
+        self.points_spin.setSingleStep(1000)
+        self.points_spin.setValue(self.DEFAULT_POINTS)
+        self.points_spin.setGroupSeparatorShown(True)
+        self.points_spin.editingFinished.connect(self.refresh)
+        controls.addWidget(self.points_spin)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        # Visibilidad de cada serie
+        toggles = QHBoxLayout()
+        self.series_checks = {}
+        for name, _, color, _, _ in self.SERIES:
+            check = QCheckBox(name)
+            check.setChecked(True)
+            check.setStyleSheet(f"color: {color.name()};")
+            check.toggled.connect(
+                lambda visible, name=name: self.chart.set_series_visible(name, visible)
+            )
+            toggles.addWidget(check)
+            self.series_checks[name] = check
+        toggles.addStretch()
+        layout.addLayout(toggles)
+
+        # Gráfico
+        self.chart = CurveChart()
+        self.chart.set_axis_titles("Caudal (L/s)", "Altura / NPSH (m)", "Eficiencia (%)")
+        layout.addWidget(self.chart)
+
+        hint = QLabel("Rueda: zoom · Shift + rueda: zoom vertical · Arrastrar: desplazar · "
+                      "Doble clic: ajustar")
+        hint.setStyleSheet("color: #999; font-size: 10px;")
+        layout.addWidget(hint)
+
+        self.operating_label = QLabel("Punto de operación: --")
+        self.operating_label.setProperty("class", "result")
+        layout.addWidget(self.operating_label)
+
+    def update_curves(self, sistema, resultados):
+        """Recalcula las curvas para un sistema y sus resultados de diseño.
+
+        Args:
+            sistema: Objeto SistemaTuberias
+            resultados (dict): Resultados completos del cálculo de bombeo
+        """
+        self.sistema = sistema
+        self.resultados = resultados
+        self.refresh()
+
+    def current_pump(self):
+        """Curva de bomba en uso: la cargada o la de referencia del sistema."""
+        from ..models import CurvaBomba
+
+        if self.bomba is not None:
+            return self.bomba
+        altura = self.resultados['carga_total_bomba']
+        if self.sistema.caudal <= 0 or altura <= 0:
+            return None
+        return CurvaBomba.desde_punto_diseno(
+            self.sistema.caudal, altura, self.sistema.eficiencia_bomba,
+            npsh_requerido=self.REFERENCE_NPSHR
+        )
+
+    def refresh(self):
+        """Recalcula y grafica las curvas con la configuración actual."""
+        if self.sistema is None or self.resultados is None:
+            return
+
+        from ..calculations import CalculadoraCurvas
+
+        bomba = self.current_pump()
+        self.cavitation_panel.update_map(self.sistema, bomba)
+        calculadora = CalculadoraCurvas(self.sistema, bomba)
+        self.curvas = calculadora.calcular_curvas(puntos=self.points_spin.value())
+        self.chart.set_series(self.build_series(self.curvas))
+
+        punto = calculadora.punto_operacion(self.curvas)
+        if punto is None:
+            self.chart.set_markers([])
+            self.operating_label.setText("Punto de operación: las curvas no se cruzan")
+            return
+
+        caudal = punto['caudal'] * self.FLOW_SCALE
+        self.chart.set_markers([(caudal, punto['altura'], "Operación")])
+        texto = f"Punto de operación: Q = {caudal:.2f} L/s · H = {punto['altura']:.2f} m"
+        if punto['eficiencia'] == punto['eficiencia']:  # no NaN
+            texto += f" · η = {punto['eficiencia'] * 100:.1f} %"
+        self.operating_label.setText(texto)
+
+    def build_series(self, curvas):
+        """Series del gráfico a partir de las columnas de CalculadoraCurvas."""
+        caudales = _scaled(curvas['caudal'], self.FLOW_SCALE)
+        series = []
+        for name, key, color, axis, style in self.SERIES:
+            if key not in curvas:
+                continue
+            valores = curvas[key]
+            if key == 'eficiencia_bomba':
+                valores = _scaled(valores, 100.0)
+            serie = ChartSeries(name, caudales, valores, color, axis, style)
+            serie.visible = self.series_checks[name].isChecked()
+            series.append(serie)
+        return series
+
+    def load_pump_curve(self):
+        """Carga una curva de bomba desde CSV (caudal, altura, eficiencia, npsh_requerido)."""
+        ruta, _ = QFileDialog.getOpenFileName(
+            self, "Cargar Curva de Bomba", "", "Archivos CSV (*.csv)"
+        )
+        if not ruta:
+            return
+
+        from ..calculations import DataLoader
+
+        try:
+            self.bomba = DataLoader().cargar_curva_bomba(ruta)
+        except (OSError, KeyError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"No se pudo cargar la curva de la bomba: {str(e)}")
+            return
+        self.refresh()
+
+    def use_reference_pump(self):
+        """Vuelve a la bomba de referencia del punto de diseño."""
+        self.bomba = None
+        self.refresh()
+
+    def clear_curves(self):
+        """Limpia el gráfico y los datos del sistema."""
+        self.sistema = None
+        self.resultados = None
+        self.curvas = None
+        self.chart.clear()
+        self.cavitation_panel.clear_map()
+        self.operating_label.setText("Punto de operación: --")
+
+
+def _scaled(valores, factor):
+    """Multiplica una columna (NumPy, array o lista) por un factor."""
+    if isinstance(valores, (array, list)):
+        # En array y list, "*" repetiría la secuencia
+        return array('d', (v * factor for v in valores))
+    return valores * factor
@@ -0,0 +1,171 @@
+"""
+Exportación de diagramas del sistema a PNG y SVG sin ventanas.
+
+Este módulo contiene la clase DiagramExporter, que reutiliza la escena de un
+SystemViewer que nunca se muestra para renderizar diagramas a archivos de
+imagen. Como la escena se actualiza de forma incremental, exportar muchos
+sistemas seguidos solo recrea los elementos que cambian entre uno y otro.
+
+Para procesos por lotes en servidores sin pantalla basta con usar
+ensure_application(), que crea la QApplication sobre la plataforma Qt
+'offscreen' si todavía no existe::
+
+    ensure_application()
+    exporter = DiagramExporter(width=1600)
+    exporter.export_batch(sistemas, "diagramas", fmt="png")
+"""
+import os
+import sys
+
+from PyQt6.QtCore import QRectF, QSize, Qt
+from PyQt6.QtGui import QColor, QImage, QPainter
+from PyQt6.QtWidgets import QApplication
+
+from ..calculations.instrumentacion import span
+from .system_viewer import SystemViewer
+
+# Color de fondo de la vista (ver styles.py)
+BACKGROUND_COLOR = QColor(43, 43, 43)
+FORMATS = ('png', 'svg')
+
+# Referencia a la aplicación creada aquí (evita que el recolector la destruya)
+_application = None
+
+
+def ensure_application():
+    """Retorna la QApplication actual o crea una sobre la plataforma offscreen.
+
+    Returns:
+        QApplication: Instancia de la aplicación
+    """
+    global _application
+    app = QApplication.instance()
+    if app is None:
+        # Debe configurarse antes de crear la aplicación
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        app = _application = QApplication(sys.argv[:1])
+    return app
+
+
+class DiagramExporter:
+    """Renderiza diagramas de sistemas de tuberías a PNG o SVG.
+
+    Args:
+        width (int): Ancho de la imagen en pixels
+        height (int): Alto de la imagen; si es None se calcula con la
+            proporción del diagrama, limitada a [min_height, max_height]
+        min_height (int): Alto mínimo cuando el alto es automático
+        max_height (int): Alto máximo cuando el alto es automático
+        background (QColor): Color de fondo
+    """
+
+    def __init__(self, width=1600, height=None, min_height=300, max_height=4000,
+                 background=BACKGROUND_COLOR):
+        ensure_application()
+        self.width = width
+        self.height = height
+        self.min_height = min_height
+        self.max_height = max_height
+        self.background = background
+        self._viewer = SystemViewer()
+
+    def image_size(self, source):
+        """Tamaño de la imagen para un rectángulo de escena dado."""
+        if self.height is not None:
+            return QSize(self.width, self.height)
+        ratio = source.height() / source.width() if source.width() > 0 else 1.0
+        height = int(round(self.width * ratio))
+        return QSize(self.width, max(self.min_height, min(self.max_height, height)))
+
+    def _prepare(self, sistema):
+        """Sincroniza la escena con el sistema y retorna el rectángulo de contenido."""
+        viewer = self._viewer
+        viewer.sistema = sistema
+        viewer.sync_scene()
+        return viewer.content_rect()
+
+    def _render(self, painter, target, source):
+        painter.fillRect(target, self.background)
+        self._viewer.graphics_scene.render(
+            painter, target, source, Qt.AspectRatioMode.KeepAspectRatio
+        )
+
+    def render_image(self, sistema):
+        """Renderiza el diagrama de un sistema a una QImage.
+
+        Args:
+            sistema: Objeto SistemaTuberias
+
+        Returns:
+            QImage: Imagen del diagrama
+        """
+        source = self._prepare(sistema)
+        size = self.image_size(source)
+        image = QImage(size, QImage.Format.Format_ARGB32_Premultiplied)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self._render(painter, QRectF(0, 0, size.width(), size.height()), source)
+        painter.end()
+        return image
+
+    def export_png(self, sistema, path):
+        """Exporta el diagrama de un sistema a un archivo PNG."""
+        with span('exportar.png'):
+            if not self.render_image(sistema).save(path, 'PNG'):
+                raise OSError(f"No se pudo escribir la imagen: {path}")
+
+    def export_svg(self, sistema, path):
+        """Exporta el diagrama de un sistema a un archivo SVG (requiere QtSvg)."""
+        try:
+            from PyQt6.QtSvg import QSvgGenerator
+        except ImportError as e:
+            raise RuntimeError("La exportación a SVG requiere el módulo QtSvg de PyQt6") from e
+
+        with span('exportar.svg'):
+            source = self._prepare(sistema)
+            size = self.image_size(source)
+            generator = QSvgGenerator()
+            generator.setFileName(path)
+            generator.setSize(size)
+            generator.setViewBox(QRectF(0, 0, size.width(), size.height()))
+            generator.setTitle("Diagrama del sistema de tuberías")
+            painter = QPainter(generator)
+            self._render(painter, QRectF(0, 0, size.width(), size.height()), source)
+            painter.end()
+
+    def export(self, sistema, path):
+        """Exporta un diagrama; el formato se deduce de la extensión del archivo."""
+        extension = os.path.splitext(path)[1].lower().lstrip('.')
+        if extension == 'png':
+            self.export_png(sistema, path)
+        elif extension == 'svg':
+            self.export_svg(sistema, path)
+        else:
+            raise ValueError(f"Formato no soportado: '{extension}' (use {', '.join(FORMATS)})")
+
+    def export_batch(self, sistemas, directory, fmt='png', name_pattern='diagrama_{:05d}',
+                     progreso=None):
+        """Exporta una serie de sistemas a archivos numerados.
+
+        Args:
+            sistemas: Iterable de SistemaTuberias
+            directory (str): Carpeta de salida (se crea si no existe)
+            fmt (str): 'png' o 'svg'
+            name_pattern (str): Patrón del nombre de archivo sin extensión
+            progreso: Función opcional que recibe el número de diagramas exportados
+
+        Returns:
+            list: Rutas de los archivos generados
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato no soportado: '{fmt}' (use {', '.join(FORMATS)})")
+        os.makedirs(directory, exist_ok=True)
+
+        paths = []
+        for i, sistema in enumerate(sistemas):
+            path = os.path.join(directory, f"{name_pattern.format(i)}.{fmt}")
+            self.export(sistema, path)
+            paths.append(path)
+            if progreso is not None:
+                progreso(i + 1)
+        return paths
@@ -0,0 +1,207 @@
+"""
+Geometría del diagrama del sistema de tuberías.
+
+Este módulo calcula todas las coordenadas del diagrama (vértices de los
+tramos, tanques, etiquetas, accesorios, línea de referencia y rectángulo de
+contenido) sin depender de Qt. Las posiciones de los tramos se obtienen con
+sumas acumuladas sobre los desplazamientos, de modo que el costo es lineal y
+se puede usar tanto en el visualizador interactivo como en procesos por
+lotes sin ventana.
+"""
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Iterator, List, Tuple
+
+SCALE = 60  # 60 pixels por metro
+START_X = 80
+START_Y = 400  # Más abajo para dejar espacio para elevación
+TANK_SIZE = 50
+LEGEND_X = 50
+LEGEND_Y = 50
+
+
+def classify_fittings(accesorios) -> List[Tuple[str, Tuple[str, ...]]]:
+    """Clasifica los accesorios según su regla de ubicación.
+
+    Args:
+        accesorios: Lista de Accesorio del sistema
+
+    Returns:
+        list: Tuplas (categoría, tipos repetidos según la cantidad)
+    """
+    rules = []
+    for accesorio in accesorios:
+        if accesorio.cantidad > 0:
+            accesorio_type = accesorio.tipo.value
+            if 'entrada_tanque' in accesorio_type:
+                category = 'entrada'
+            elif 'codo' in accesorio_type:
+                category = 'codo'
+            elif 'salida_tanque' in accesorio_type:
+                category = 'salida'
+            elif 'valvula' in accesorio_type or 'tee' in accesorio_type:
+                category = 'intermedio'
+            else:
+                continue
+            rules.append((category, (accesorio_type,) * accesorio.cantidad))
+    return rules
+
+
+def fittings_for_tramo(tramo_index, num_tramos, is_vertical, rules) -> Tuple[str, ...]:
+    """Determina qué accesorios se dibujan en un tramo (ubicación inteligente).
+
+    Args:
+        tramo_index (int): Índice del tramo
+        num_tramos (int): Número total de tramos del sistema
+        is_vertical (bool): True si el tramo es vertical
+        rules (list): Resultado de classify_fittings
+
+    Returns:
+        tuple: Tipos de accesorio a dibujar, repetidos según su cantidad
+    """
+    fittings_for_this_tramo = ()
+    for category, types in rules:
+        # Entrada de tanque: siempre en el primer tramo
+        if category == 'entrada':
+            place = tramo_index == 0
+        # Codos: en cambios de dirección (tramos verticales)
+        elif category == 'codo':
+            place = tramo_index > 0 and is_vertical
+        # Salida de tanque: siempre en el último tramo
+        elif category == 'salida':
+            place = tramo_index == num_tramos - 1
+        # Válvulas y tees: en tramos horizontales intermedios
+        else:
+            place = 0 < tramo_index < num_tramos - 1 and not is_vertical
+        if place:
+            fittings_for_this_tramo += types
+
+    return fittings_for_this_tramo
+
+
+def fitting_positions(x1, y1, x2, y2, fittings) -> Iterator[Tuple[float, float, str]]:
+    """Posiciones de los accesorios a lo largo de una tubería.
+
+    Yields:
+        tuple: (x, y, tipo de accesorio)
+    """
+    spacing = 0.8  # Espaciado entre accesorios
+    current_pos = 0.1
+
+    for fitting_type in fittings:
+        # Calcular posición del accesorio
+        if x1 == x2:  # Vertical
+            yield x1, y1 + (y2 - y1) * current_pos, fitting_type
+        else:  # Horizontal
+            yield x1 + (x2 - x1) * current_pos, y1, fitting_type
+
+        current_pos += spacing
+        if current_pos > 0.9:
+            current_pos = 0.1
+
+
+@dataclass
+class DiagramLayout:
+    """Coordenadas del diagrama en pixels de escena.
+
+    Los tramos se describen por sus vértices: el tramo i va de
+    (xs[i], ys[i]) a (xs[i + 1], ys[i + 1]).
+    """
+    xs: List[float]
+    ys: List[float]
+    vertical: List[bool]
+    lengths: List[float]  # metros, para las etiquetas
+    diameters: List[float]  # pixels
+    tramo_fittings: List[Tuple[str, ...]]
+    tank1: Tuple[float, float]
+    tank2: Tuple[float, float]
+    reference_y: float
+    reference_end_x: float
+    bounds: Tuple[float, float, float, float]  # (izquierda, arriba, ancho, alto)
+
+    @property
+    def num_tramos(self) -> int:
+        return len(self.vertical)
+
+    def label_position(self, index) -> Tuple[float, float]:
+        """Esquina superior izquierda de la etiqueta de longitud de un tramo."""
+        x, y = self.xs[index], self.ys[index]
+        if self.vertical[index]:
+            return x + 30, (y + self.ys[index + 1]) / 2 - 10
+        return (x + self.xs[index + 1]) / 2 - 20, y + 30
+
+    def labels(self) -> Iterator[Tuple[float, float, str]]:
+        """Etiquetas de longitud: (x, y, texto)."""
+        for i, length in enumerate(self.lengths):
+            x, y = self.label_position(i)
+            yield x, y, f"{length}m"
+
+    def fittings(self) -> Iterator[Tuple[float, float, float, str]]:
+        """Símbolos de accesorios: (x, y, tamaño, tipo)."""
+        xs, ys = self.xs, self.ys
+        for i, fittings in enumerate(self.tramo_fittings):
+            if fittings:
+                size = self.diameters[i] * 2.0
+                for x, y, fitting_type in fitting_positions(
+                        xs[i], ys[i], xs[i + 1], ys[i + 1], fittings):
+                    yield x, y, size, fitting_type
+
+
+def compute_layout(sistema, scale=SCALE, start_x=START_X, start_y=START_Y) -> DiagramLayout:
+    """Calcula la geometría completa del diagrama de un sistema.
+
+    Args:
+        sistema: Objeto SistemaTuberias
+        scale (float): Pixels por metro
+        start_x (float): Posición X del tanque de succión
+        start_y (float): Posición Y de la elevación cero
+
+    Returns:
+        DiagramLayout: Coordenadas de todos los componentes
+    """
+    tramos = sistema.tramos
+    num_tramos = len(tramos)
+    vertical = [tramo.orientacion != 'horizontal' for tramo in tramos]
+    lengths = [tramo.longitud for tramo in tramos]
+
+    # Desplazamientos por tramo (hacia arriba es negativo) y sus sumas acumuladas
+    first_y = start_y - sistema.elevacion_punto1 * scale
+    xs = list(accumulate(
+        (0.0 if is_vertical else length * scale for length, is_vertical in zip(lengths, vertical)),
+        initial=start_x
+    ))
+    ys = list(accumulate(
+        (-length * scale if is_vertical else 0.0 for length, is_vertical in zip(lengths, vertical)),
+        initial=first_y
+    ))
+
+    rules = classify_fittings(sistema.accesorios)
+    tramo_fittings = [
+        fittings_for_tramo(i, num_tramos, is_vertical, rules) if rules else ()
+        for i, is_vertical in enumerate(vertical)
+    ]
+
+    # Posición Y final basada en elevación P2 (independiente de los tramos)
+    end_x = xs[-1]
+    final_y = start_y - sistema.elevacion_punto2 * scale
+    min_y, max_y = min(ys), max(ys)
+
+    # Rectángulo de contenido (leyenda, tramos, tanques y línea de referencia)
+    left = min(LEGEND_X - 10, start_x - 60)
+    top = min(LEGEND_Y - 10, min_y - 80, final_y - 80)
+    right = max(end_x + 120, LEGEND_X + 270)
+    bottom = max(max_y, final_y, start_y) + 120
+
+    return DiagramLayout(
+        xs=xs,
+        ys=ys,
+        vertical=vertical,
+        lengths=lengths,
+        diameters=[tramo.diametro * scale for tramo in tramos],
+        tramo_fittings=tramo_fittings,
+        tank1=(start_x, first_y),
+        tank2=(end_x, final_y),
+        reference_y=start_y,
+        reference_end_x=end_x + 100,
+        bounds=(left, top, right - left, bottom - top)
+    )
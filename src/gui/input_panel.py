@@ -5,16 +5,20 @@ Este módulo contiene la clase InputPanel que proporciona la interfaz
 para que el usuario configure todos los parámetros del sistema de tuberías,
 incluyendo fluidos, tramos, accesorios y puntos del sistema.
 """
+from dataclasses import replace
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, 
     QLineEdit, QDoubleSpinBox, QSpinBox, QComboBox, QPushButton,
     QCheckBox, QScrollArea, QFormLayout, QGridLayout, QButtonGroup
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont
 
 from ..models import SistemaTuberias
 from ..calculations import DataLoader
+from ..calculations.instrumentacion import span
+from .pipes_editor import PipesEditor
 
 
 class InputPanel(QWidget):
@@ -22,25 +26,52 @@ class InputPanel(QWidget):
     
     Este widget gestiona la configuración completa del sistema incluyendo:
     - Datos básicos (fluido, caudal, eficiencia)
-    - Tramos de tubería (longitud, orientación, diámetro)
+    - Tramos de tubería (longitud, orientación, diámetro) en una tabla
+      virtualizada con importación desde CSV (ver pipes_editor)
     - Accesorios (tipos y cantidades)
     - Puntos del sistema (elevaciones y presiones)
     
+    En modo "en vivo" los cambios se agrupan con un temporizador (debounce)
+    y solo los campos modificados se aplican sobre el último sistema construido.
+    
     Señales:
         data_ready: Emitida cuando el sistema está configurado
+        live_data_ready: Emitida con cada sistema aplicado en modo en vivo
         calculate_requested: Emitida cuando se solicita cálculo
+        live_error: Mensaje cuando los datos en vivo aún no forman un sistema válido
     """
     
     # Señales
     data_ready = pyqtSignal(object)
+    live_data_ready = pyqtSignal(object)
     calculate_requested = pyqtSignal()
+    live_error = pyqtSignal(str)
+    
+    # Tiempo de espera tras el último cambio antes de recalcular (ms)
+    LIVE_DEBOUNCE_MS = 150
     
     def __init__(self):
         super().__init__()
         self.loader = DataLoader()
-        self.accesorios_data = self.loader.cargar_accesorios()
+        # Un accesorio por tipo desde el catálogo paginado (sin leer el CSV completo)
+        self.accesorios_data = self.loader.accesorios_por_tipo()
         self.fluidos_data = self.loader.cargar_fluidos()
+        # Accesorios de un sistema cargado cuyo tipo no está en el catálogo
+        # (p. ej. la pérdida local de EPANET): se conservan sin casilla
+        self.accesorios_sin_casilla = []
+        
+        # Estado del modo en vivo
+        self.current_sistema = None
+        self._pending_fields = set()
+        self._pending_pipes = set()
+        self._pipes_structure_changed = False
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self.LIVE_DEBOUNCE_MS)
+        self.live_timer.timeout.connect(self.apply_pending_changes)
+        
         self.init_ui()
+        self.connect_live_signals()
     
     def init_ui(self):
         """Inicializa la interfaz del panel de entrada."""
@@ -122,77 +153,20 @@ class InputPanel(QWidget):
         group_layout = QVBoxLayout(group)
         
         # Instrucciones
-        instructions = QLabel("Agregue los tramos con sus longitudes y orientaciones")
+        instructions = QLabel("Edite los tramos en la tabla (doble clic), pegue desde una "
+                              "hoja de cálculo (Ctrl+V) o importe un CSV con columnas "
+                              "longitud, orientacion, diametro")
+        instructions.setWordWrap(True)
         instructions.setStyleSheet("color: #666; font-size: 10px; margin-bottom: 4px;")
         group_layout.addWidget(instructions)
         
-        # Contenedor para tramos
-        self.pipes_container = QWidget()
-        self.pipes_layout = QVBoxLayout(self.pipes_container)
-        
-        # Agregar primer tramo por defecto
-        self.add_pipe_section()
-        
-        # Botón para agregar tramo
-        add_pipe_btn = QPushButton("Agregar Tramo")
-        add_pipe_btn.clicked.connect(self.add_pipe_section)
-        add_pipe_btn.setMinimumHeight(35)
-        group_layout.addWidget(self.pipes_container)
-        group_layout.addWidget(add_pipe_btn)
+        # Tabla de tramos (los datos viven en self.pipes_model, no en widgets)
+        self.pipes_editor = PipesEditor()
+        self.pipes_model = self.pipes_editor.model
+        group_layout.addWidget(self.pipes_editor)
         
         layout.addWidget(group)
     
-    def add_pipe_section(self):
-        """Agrega una sección para un tramo de tubería"""
-        pipe_widget = QWidget()
-        pipe_layout = QHBoxLayout(pipe_widget)
-        
-        # Longitud
-        longitud_input = QDoubleSpinBox()
-        longitud_input.setRange(0.1, 1000.0)
-        longitud_input.setDecimals(1)
-        longitud_input.setSuffix(" m")
-        longitud_input.setValue(10.0)
-        
-        # Orientación
-        orient_combo = QComboBox()
-        orient_combo.addItems(["horizontal", "vertical"])
-        
-        # Diámetro
-        diametro_input = QDoubleSpinBox()
-        diametro_input.setRange(0.01, 2.0)
-        diametro_input.setDecimals(3)
-        diametro_input.setSuffix(" m")
-        diametro_input.setValue(0.100)
-        
-        # Botón de eliminar
-        remove_btn = QPushButton("X")
-        remove_btn.setProperty("class", "danger")
-        remove_btn.setMaximumWidth(30)
-        remove_btn.setMinimumHeight(25)
-        remove_btn.clicked.connect(lambda: self.remove_pipe_section(pipe_widget))
-        
-        pipe_layout.addWidget(QLabel("Longitud:"))
-        pipe_layout.addWidget(longitud_input)
-        pipe_layout.addWidget(QLabel("Orientación:"))
-        pipe_layout.addWidget(orient_combo)
-        pipe_layout.addWidget(QLabel("Diámetro:"))
-        pipe_layout.addWidget(diametro_input)
-        pipe_layout.addWidget(remove_btn)
-        pipe_layout.addStretch()
-        
-        # Guardar referencias
-        pipe_widget.longitud_input = longitud_input
-        pipe_widget.orient_combo = orient_combo
-        pipe_widget.diametro_input = diametro_input
-        
-        self.pipes_layout.addWidget(pipe_widget)
-    
-    def remove_pipe_section(self, widget):
-        """Elimina una sección de tramo"""
-        self.pipes_layout.removeWidget(widget)
-        widget.deleteLater()
-    
     def create_fittings_section(self, layout):
         """Crea la sección de accesorios"""
         group = QGroupBox("Accesorios")
@@ -203,6 +177,23 @@ class InputPanel(QWidget):
         instructions.setStyleSheet("color: #666; font-size: 10px; margin-bottom: 4px;")
         group_layout.addWidget(instructions)
         
+        # Filtros del catálogo (norma y fabricante)
+        filter_layout = QHBoxLayout()
+        self.norma_filter_combo = QComboBox()
+        self.norma_filter_combo.addItem("Todas")
+        self.norma_filter_combo.addItems(self.loader.listar_normas())
+        self.fabricante_filter_combo = QComboBox()
+        self.fabricante_filter_combo.addItem("Todos")
+        self.fabricante_filter_combo.addItems(self.loader.listar_fabricantes())
+        self.norma_filter_combo.currentTextChanged.connect(self.on_fitting_filter_changed)
+        self.fabricante_filter_combo.currentTextChanged.connect(self.on_fitting_filter_changed)
+        filter_layout.addWidget(QLabel("Norma:"))
+        filter_layout.addWidget(self.norma_filter_combo)
+        filter_layout.addWidget(QLabel("Fabricante:"))
+        filter_layout.addWidget(self.fabricante_filter_combo)
+        filter_layout.addStretch()
+        group_layout.addLayout(filter_layout)
+        
         # Contenedor para accesorios
         self.fittings_container = QWidget()
         fittings_layout = QGridLayout(self.fittings_container)
@@ -239,6 +230,35 @@ class InputPanel(QWidget):
         group_layout.addWidget(self.fittings_container)
         layout.addWidget(group)
     
+    def on_fitting_filter_changed(self, _text=None):
+        """Muestra solo los tipos de accesorio disponibles con la norma/fabricante elegidos.
+        
+        Las consultas al catálogo se hacen por páginas, de modo que un catálogo
+        de fabricantes muy grande nunca se carga completo en memoria.
+        """
+        norma = self.norma_filter_combo.currentText()
+        fabricante = self.fabricante_filter_combo.currentText()
+        norma = None if norma == "Todas" else norma
+        fabricante = None if fabricante == "Todos" else fabricante
+        
+        # Primer accesorio del catálogo que cumple los filtros para cada tipo
+        disponibles = self.loader.accesorios_por_tipo(norma, fabricante)
+        reemplazados = False
+        for accesorio_name, checkbox in self.fitting_checkboxes.items():
+            accesorio = disponibles.get(accesorio_name)
+            visible = accesorio is not None
+            if visible:
+                # Otro accesorio del mismo tipo (otro K) cambia el sistema si está seleccionado
+                if accesorio != self.accesorios_data[accesorio_name] and checkbox.isChecked():
+                    reemplazados = True
+                self.accesorios_data[accesorio_name] = accesorio
+            elif checkbox.isChecked():
+                checkbox.setChecked(False)
+            checkbox.setVisible(visible)
+            self.fitting_spinboxes[accesorio_name].setVisible(visible)
+        if reemplazados:
+            self.mark_field_changed('accesorios')
+    
     def on_fitting_changed(self, state):
         """Habilita/deshabilita spinbox cuando cambia el checkbox"""
         sender = self.sender()
@@ -339,15 +359,130 @@ class InputPanel(QWidget):
         clear_btn.clicked.connect(self.clear_data)
         clear_btn.setMinimumHeight(40)
         
+        # Recalcular automáticamente al modificar los datos
+        self.live_check = QCheckBox("Recalcular en vivo")
+        self.live_check.toggled.connect(self.on_live_toggled)
+        
         button_layout.addWidget(calculate_btn)
         button_layout.addWidget(clear_btn)
+        button_layout.addWidget(self.live_check)
         
         layout.addLayout(button_layout)
     
+    def connect_live_signals(self):
+        """Conecta los campos escalares y los accesorios al modo en vivo."""
+        campos = {
+            'caudal': self.caudal_input,
+            'eficiencia_bomba': self.eficiencia_input,
+            'elevacion_punto1': self.z1_input,
+            'elevacion_punto2': self.z2_input,
+            'presion_punto1': self.p1_input,
+            'presion_punto2': self.p2_input,
+        }
+        for campo, spinbox in campos.items():
+            spinbox.valueChanged.connect(lambda _, c=campo: self.mark_field_changed(c))
+        
+        self.fluid_combo.currentTextChanged.connect(lambda _: self.mark_field_changed('fluido'))
+        for spinbox in self.fitting_spinboxes.values():
+            spinbox.valueChanged.connect(lambda _: self.mark_field_changed('accesorios'))
+        
+        # Tramos: una edición marca sus filas; insertar, eliminar o importar, toda la lista
+        self.pipes_model.dataChanged.connect(
+            lambda first, last, _roles=None: self.mark_pipes_changed(range(first.row(), last.row() + 1))
+        )
+        self.pipes_model.rowsInserted.connect(self.mark_pipes_structure_changed)
+        self.pipes_model.rowsRemoved.connect(self.mark_pipes_structure_changed)
+        self.pipes_model.modelReset.connect(self.mark_pipes_structure_changed)
+    
+    def on_live_toggled(self, checked):
+        """Activa o desactiva el recálculo en vivo."""
+        if checked:
+            # Partir de un sistema completo; luego solo se aplican parches
+            self.current_sistema = None
+            self.live_timer.start()
+        else:
+            self.live_timer.stop()
+    
+    def mark_field_changed(self, field):
+        """Registra un campo escalar modificado y reinicia el temporizador."""
+        self._pending_fields.add(field)
+        self._schedule_live_update()
+    
+    def mark_pipes_changed(self, rows):
+        """Registra filas de tramos modificadas y reinicia el temporizador."""
+        self._pending_pipes.update(rows)
+        self._schedule_live_update()
+    
+    def mark_pipes_structure_changed(self, *_):
+        """Registra que se agregaron o eliminaron tramos."""
+        self._pipes_structure_changed = True
+        self._schedule_live_update()
+    
+    def _schedule_live_update(self):
+        if hasattr(self, 'live_check') and self.live_check.isChecked():
+            self.live_timer.start()
+    
+    def apply_pending_changes(self):
+        """Aplica los cambios acumulados y solicita el recálculo."""
+        try:
+            if self.current_sistema is None:
+                sistema = self.create_sistema_from_inputs()
+            else:
+                sistema = self.patch_sistema(self.current_sistema)
+        except Exception as e:
+            # Datos intermedios inválidos: los cambios quedan pendientes para el próximo intento
+            self.live_error.emit(str(e))
+            return
+        
+        self._pending_fields.clear()
+        self._pending_pipes.clear()
+        self._pipes_structure_changed = False
+        self.current_sistema = sistema
+        self.live_data_ready.emit(sistema)
+        self.calculate_requested.emit()
+    
+    def patch_sistema(self, sistema):
+        """Crea un nuevo sistema aplicando solo los campos modificados.
+        
+        Los tramos no modificados se comparten con el sistema anterior, de
+        modo que el costo de un cambio no depende del número de tramos.
+        
+        Args:
+            sistema: Último SistemaTuberias construido
+            
+        Returns:
+            SistemaTuberias: Nuevo sistema con los cambios aplicados
+        """
+        cambios = {}
+        valores = {
+            'caudal': lambda: self.caudal_input.value() / 1000.0,  # L/s a m³/s
+            'eficiencia_bomba': self.eficiencia_input.value,
+            'elevacion_punto1': self.z1_input.value,
+            'elevacion_punto2': self.z2_input.value,
+            'presion_punto1': self.p1_input.value,
+            'presion_punto2': self.p2_input.value,
+            'fluido': lambda: self.fluidos_data[self.fluid_combo.currentText()],
+            'accesorios': self.create_accesorios_from_inputs,
+        }
+        for campo in self._pending_fields:
+            cambios[campo] = valores[campo]()
+        
+        if self._pipes_structure_changed:
+            cambios['tramos'] = self.create_tramos_from_inputs()
+        elif self._pending_pipes:
+            tramos = list(sistema.tramos)
+            for indice in self._pending_pipes:
+                if 0 <= indice < len(tramos):
+                    tramos[indice] = self.pipes_model.tramo(indice)
+            cambios['tramos'] = tramos
+        
+        return replace(sistema, **cambios)
+    
     def on_calculate(self):
         """Manejador del botón calcular"""
         try:
             sistema = self.create_sistema_from_inputs()
+            self.current_sistema = sistema
             self.data_ready.emit(sistema)
             self.calculate_requested.emit()
         except Exception as e:
@@ -371,28 +506,86 @@ class InputPanel(QWidget):
             presion_punto2=self.p2_input.value()
         )
         
-        # Agregar tramos
-        for i in range(self.pipes_layout.count()):
-            pipe_widget = self.pipes_layout.itemAt(i).widget()
-            if hasattr(pipe_widget, 'longitud_input'):
-                sistema.agregar_tramo(
-                    longitud=pipe_widget.longitud_input.value(),
-                    orientacion=pipe_widget.orient_combo.currentText(),
-                    diametro=pipe_widget.diametro_input.value()
-                )
-        
-        # Agregar accesorios
+        sistema.tramos = self.create_tramos_from_inputs()
+        sistema.accesorios = self.create_accesorios_from_inputs()
+        
+        return sistema
+    
+    def create_tramos_from_inputs(self):
+        """Crea la lista de tramos desde la tabla (sin recorrer widgets)"""
+        with span('tramos.construir'):
+            return self.pipes_model.tramos()
+    
+    def create_accesorios_from_inputs(self):
+        """Crea la lista de accesorios seleccionados con sus cantidades"""
+        accesorios = []
         for accesorio_name, accesorio in self.accesorios_data.items():
             checkbox = self.fitting_checkboxes[accesorio_name]
             spinbox = self.fitting_spinboxes[accesorio_name]
             
             if checkbox.isChecked() and spinbox.value() > 0:
-                accesorio_copy = accesorio
-                accesorio_copy.cantidad = spinbox.value()
-                sistema.agregar_accesorio(accesorio_copy)
-        
-        return sistema
+                # Copia para no modificar la entrada del catálogo
+                accesorios.append(replace(accesorio, cantidad=spinbox.value()))
+        return accesorios + self.accesorios_sin_casilla
+
+    def cargar_sistema(self, sistema):
+        """Muestra en el formulario un sistema existente (p. ej. de un proyecto).
+
+        El fluido y los accesorios del sistema reemplazan a los del catálogo
+        con el mismo nombre o tipo, de modo que reconstruir el sistema desde
+        el formulario reproduce los mismos datos.
+
+        Args:
+            sistema: Objeto SistemaTuberias a mostrar
+        """
+        # Fluido
+        if sistema.fluido is not None:
+            nombre = sistema.fluido.nombre
+            self.fluidos_data[nombre] = sistema.fluido
+            if self.fluid_combo.findText(nombre) < 0:
+                self.fluid_combo.addItem(nombre)
+            self.fluid_combo.setCurrentText(nombre)
+
+        # Datos básicos y puntos
+        self.caudal_input.setValue(sistema.caudal * 1000.0)  # m³/s a L/s
+        self.eficiencia_input.setValue(sistema.eficiencia_bomba)
+        self.z1_input.setValue(sistema.elevacion_punto1)
+        self.z2_input.setValue(sistema.elevacion_punto2)
+        self.p1_atm_check.setChecked(sistema.presion_punto1 == 101325)
+        self.p1_input.setValue(sistema.presion_punto1)
+        self.p2_atm_check.setChecked(sistema.presion_punto2 == 101325)
+        self.p2_input.setValue(sistema.presion_punto2)
+
+        # Tramos (la tabla reutiliza los objetos TramoTuberia del sistema)
+        self.pipes_model.set_tramos(sistema.tramos)
+
+        # Accesorios: sin filtros, para que todos los tipos estén visibles
+        self.norma_filter_combo.setCurrentText("Todas")
+        self.fabricante_filter_combo.setCurrentText("Todos")
+        cantidades = {}
+        self.accesorios_sin_casilla = []
+        for accesorio in sistema.accesorios:
+            if accesorio.tipo.value not in self.fitting_checkboxes:
+                self.accesorios_sin_casilla.append(accesorio)
+                continue
+            self.accesorios_data[accesorio.tipo.value] = accesorio
+            cantidades[accesorio.tipo.value] = accesorio.cantidad
+        for accesorio_name, checkbox in self.fitting_checkboxes.items():
+            cantidad = cantidades.get(accesorio_name, 0)
+            checkbox.setChecked(cantidad > 0)
+            self.fitting_spinboxes[accesorio_name].setValue(cantidad)
+
+        # El sistema cargado es la base del modo en vivo; los cambios de arriba no cuentan
+        self.discard_pending_changes()
+        self.current_sistema = sistema
     
+    def discard_pending_changes(self):
+        """Descarta los cambios acumulados del modo en vivo sin recalcular."""
+        self.live_timer.stop()
+        self._pending_fields.clear()
+        self._pending_pipes.clear()
+        self._pipes_structure_changed = False
+
     def clear_data(self):
         """Limpia todos los datos del formulario"""
         # Reiniciar valores básicos
@@ -401,19 +594,12 @@ class InputPanel(QWidget):
         self.z1_input.setValue(2.0)
         self.z2_input.setValue(8.0)
         
-        # Limpiar tramos (dejar solo uno)
-        while self.pipes_layout.count() > 1:
-            widget = self.pipes_layout.itemAt(0).widget()
-            self.remove_pipe_section(widget)
-        
-        # Reiniciar primer tramo
-        if self.pipes_layout.count() > 0:
-            pipe_widget = self.pipes_layout.itemAt(0).widget()
-            pipe_widget.longitud_input.setValue(10.0)
-            pipe_widget.orient_combo.setCurrentIndex(0)
-            pipe_widget.diametro_input.setValue(0.100)
+        # Limpiar tramos (dejar solo uno con los valores por defecto)
+        self.pipes_model.set_arrays([], b'', [])
+        self.pipes_model.insertRows(0, 1)
         
         # Limpiar accesorios
+        self.accesorios_sin_casilla = []
         for checkbox in self.fitting_checkboxes.values():
             checkbox.setChecked(False)
         for spinbox in self.fitting_spinboxes.values():
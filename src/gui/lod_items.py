@@ -0,0 +1,207 @@
+"""
+Elementos gráficos por lotes con nivel de detalle (LOD).
+
+Para sistemas con miles de tramos, SystemViewer deja de crear un elemento
+por línea, etiqueta y accesorio. Las tuberías se agrupan en un QPainterPath
+por diámetro y bloque de tramos (PipeBatchItem), y las etiquetas y símbolos
+de accesorios se pintan desde una sola capa (DetailLayerItem) que los omite
+por debajo de un umbral de zoom y solo recorre los que caen en el área
+expuesta. Los bloques de tuberías usan DeviceCoordinateCache mientras su
+tamaño en pantalla sea acotado, de modo que desplazar la vista reutiliza lo
+ya pintado; con mucho zoom se dibujan directamente, porque un caché del
+tamaño del bloque completo costaría más que pintar solo lo visible.
+"""
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from PyQt6.QtWidgets import QGraphicsItem
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QPen, QPolygonF
+
+# Apariencia de un símbolo de accesorio ya resuelta a objetos de Qt
+FittingStyle = namedtuple('FittingStyle', 'shape brush pen text offset')
+
+# Apariencia de un texto: fuente y pluma con su color
+TextStyle = namedtuple('TextStyle', 'font pen')
+
+# Margen interno que QGraphicsTextItem agrega alrededor del texto
+_TEXT_MARGIN = 4
+_TEXT_FLAGS = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop
+
+
+class PipeBatchItem(QGraphicsItem):
+    """Bloque de tuberías de un mismo diámetro dibujado como un único path.
+
+    Args:
+        path (QPainterPath): Trazado de todos los tramos del bloque
+        pipe_pen (QPen): Pluma de la tubería
+        border_pen (QPen): Pluma del borde (más ancha, se dibuja encima)
+    """
+
+    # Ancho mínimo en pantalla (pixels) para dibujar la tubería con su grosor real
+    MIN_SCREEN_WIDTH = 1.5
+    # Tamaño máximo en pantalla (pixels) de un bloque para usar el caché
+    MAX_CACHE_EXTENT = 4096
+
+    def __init__(self, path, pipe_pen, border_pen):
+        super().__init__()
+        self._path = path
+        self._pipe_pen = pipe_pen
+        self._border_pen = border_pen
+        # Pluma cosmética (1 pixel sin importar el zoom) para vistas alejadas
+        self._thin_pen = QPen(border_pen.color(), 0)
+        pad = border_pen.widthF()  # cubre la punta de las uniones en ángulo
+        self._bounds = path.controlPointRect().adjusted(-pad, -pad, pad, pad)
+
+    def boundingRect(self):
+        return self._bounds
+
+    def update_cache_mode(self, transform):
+        """Activa el caché en coordenadas de dispositivo si el bloque cabe en él.
+
+        Args:
+            transform (QTransform): Transformación actual de la vista
+        """
+        extent = transform.mapRect(self.sceneBoundingRect())
+        if max(extent.width(), extent.height()) <= self.MAX_CACHE_EXTENT:
+            mode = QGraphicsItem.CacheMode.DeviceCoordinateCache
+        else:
+            mode = QGraphicsItem.CacheMode.NoCache
+        if self.cacheMode() != mode:
+            self.setCacheMode(mode)
+
+    def paint(self, painter, option, widget=None):
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if lod * self._border_pen.widthF() < self.MIN_SCREEN_WIDTH:
+            painter.setPen(self._thin_pen)
+            painter.drawPath(self._path)
+            return
+        painter.setPen(self._pipe_pen)
+        painter.drawPath(self._path)
+        painter.setPen(self._border_pen)
+        painter.drawPath(self._path)
+
+
+class DetailLayerItem(QGraphicsItem):
+    """Capa con las etiquetas de longitud y los símbolos de accesorios.
+
+    Los registros se ordenan por X al finalizar; al pintar se ubica con
+    búsqueda binaria el rango visible del área expuesta, por lo que el costo
+    depende de lo que se ve y no del tamaño del sistema.
+
+    Args:
+        label_style (TextStyle): Estilo de las etiquetas de longitud
+        fitting_label_style (TextStyle): Estilo de las etiquetas de accesorios
+    """
+
+    # Nivel de detalle mínimo para dibujar símbolos y etiquetas
+    SYMBOL_MIN_LOD = 0.15
+    LABEL_MIN_LOD = 0.4
+    # Extensión aproximada de un texto a partir de su posición (pixels de escena)
+    TEXT_WIDTH = 110
+    TEXT_HEIGHT = 30
+
+    def __init__(self, label_style, fitting_label_style):
+        super().__init__()
+        self._label_style = label_style
+        self._fitting_label_style = fitting_label_style
+        self._labels = []  # (x, y, texto)
+        self._fittings = []  # (x, y, tamaño, FittingStyle)
+        self._label_keys = []
+        self._fitting_keys = []
+        self._max_symbol = 0.0
+        self._bounds = QRectF()
+        # Sin caché: el área expuesta permite pintar solo los registros visibles
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+    def add_label(self, x, y, text):
+        """Agrega una etiqueta con su esquina superior izquierda en (x, y)."""
+        self._labels.append((x, y, text))
+
+    def add_fitting(self, x, y, size, style):
+        """Agrega un símbolo de accesorio centrado en (x, y)."""
+        self._fittings.append((x, y, size, style))
+        if size > self._max_symbol:
+            self._max_symbol = size
+
+    def finalize(self):
+        """Ordena los registros y calcula el rectángulo envolvente."""
+        self.prepareGeometryChange()
+        self._labels.sort(key=lambda record: record[0])
+        self._fittings.sort(key=lambda record: record[0])
+        self._label_keys = [record[0] for record in self._labels]
+        self._fitting_keys = [record[0] for record in self._fittings]
+
+        xs = self._label_keys + self._fitting_keys
+        if not xs:
+            self._bounds = QRectF()
+            return
+        ys = [record[1] for record in self._labels] + [record[1] for record in self._fittings]
+        margin = self._margin()
+        self._bounds = QRectF(min(xs) - margin, min(ys) - margin,
+                              max(xs) - min(xs) + 2 * margin + self.TEXT_WIDTH,
+                              max(ys) - min(ys) + 2 * margin + self.TEXT_HEIGHT)
+
+    def _margin(self):
+        return self._max_symbol + self.TEXT_HEIGHT
+
+    def boundingRect(self):
+        return self._bounds
+
+    def paint(self, painter, option, widget=None):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if lod < self.SYMBOL_MIN_LOD:
+            return
+        draw_labels = lod >= self.LABEL_MIN_LOD
+        rect = option.exposedRect
+        margin = self._margin()
+        top = rect.top() - margin
+        bottom = rect.bottom() + margin
+
+        # Símbolos de accesorios (y sus etiquetas)
+        lo = bisect_left(self._fitting_keys, rect.left() - margin - self.TEXT_WIDTH)
+        hi = bisect_right(self._fitting_keys, rect.right() + margin)
+        visible_labels = []
+        for x, y, size, style in self._fittings[lo:hi]:
+            if top <= y <= bottom:
+                half = size // 2
+                self._draw_symbol(painter, x, y, size, half, style)
+                if draw_labels:
+                    visible_labels.append((x - style.offset, y + half + 5, style.text))
+        if draw_labels:
+            self._draw_texts(painter, visible_labels, self._fitting_label_style)
+
+            # Etiquetas de longitud
+            lo = bisect_left(self._label_keys, rect.left() - self.TEXT_WIDTH)
+            hi = bisect_right(self._label_keys, rect.right())
+            self._draw_texts(
+                painter,
+                [record for record in self._labels[lo:hi] if top <= record[1] <= bottom],
+                self._label_style
+            )
+
+    def _draw_symbol(self, painter, x, y, size, half, style):
+        painter.setBrush(style.brush)
+        painter.setPen(style.pen)
+        if style.shape == 'square':
+            painter.drawRect(QRectF(x - half, y - half, size, size))
+        elif style.shape == 'tee':
+            painter.drawRect(QRectF(x - size // 3, y - half, size * 2 / 3, size))
+        elif style.shape == 'triangle':
+            painter.drawPolygon(QPolygonF([
+                QPointF(x, y - half),
+                QPointF(x - half, y + half),
+                QPointF(x + half, y + half)
+            ]))
+        else:  # circle
+            painter.drawEllipse(QRectF(x - half, y - half, size, size))
+
+    def _draw_texts(self, painter, records, style):
+        painter.setFont(style.font)
+        painter.setPen(style.pen)
+        for x, y, text in records:
+            painter.drawText(
+                QRectF(x + _TEXT_MARGIN, y + _TEXT_MARGIN, self.TEXT_WIDTH, self.TEXT_HEIGHT),
+                _TEXT_FLAGS, text
+            )
@@ -5,19 +5,25 @@ Este módulo contiene la clase MainWindow que sirve como contenedor principal
 de la aplicación, gestionando la interfaz de usuario y la coordinación
 entre los diferentes componentes del sistema de cálculo.
 """
+import os
 import sys
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QVBoxLayout, 
     QHBoxLayout, QWidget, QLabel, QPushButton, QMessageBox,
-    QStatusBar, QMenuBar, QSplitter
+    QStatusBar, QMenuBar, QSplitter, QFileDialog, QProgressBar, QInputDialog
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QIcon, QFont
+from PyQt6.QtGui import QIcon, QFont, QKeySequence
 
 from .input_panel import InputPanel
 from .results_panel import ResultsPanel
+from .curves_panel import CurvesPanel
+from .scenarios_panel import ScenariosPanel
 from .system_viewer import SystemViewer
+from .calculation_worker import CalculationDispatcher
 from .styles import apply_modern_style
+from ..calculations.instrumentacion import instrumentacion
+from ..models import HistorialSistema
 
 
 class MainWindow(QMainWindow):
@@ -34,6 +40,26 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.sistema = None
         self.resultados = None
+        # Columnas del último barrido de caudal (se guardan con el proyecto)
+        self.barrido = None
+        # El visor solo se redibuja visible: con la pestaña oculta se marca pendiente
+        self.viewer_pending = False
+        # Estados del sistema para deshacer/rehacer (con sus resultados)
+        self.historial = HistorialSistema()
+        # Sistema de la última solicitud de cálculo 'sistema'
+        self.calculated_sistema = None
+        
+        # Los cálculos se ejecutan fuera del hilo de la interfaz, con un despachador
+        # por tipo: una solicitud nueva solo reemplaza a otra del mismo tipo, y las
+        # exportaciones nunca se reemplazan (se ejecutan todas, en orden)
+        self.dispatchers = {
+            'sistema': CalculationDispatcher(self),
+            'barrido': CalculationDispatcher(self),
+            'exportacion': CalculationDispatcher(self, coalesce=False),
+        }
+        # Tipo del último cálculo iniciado; la barra de progreso muestra su avance
+        self.progress_kind = None
+        
         self.init_ui()
     
     def init_ui(self):
@@ -58,6 +84,23 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Listo para calcular sistema de bombeo")
         
+        # Resumen permanente de la instrumentación (tiempos por etapa)
+        self.instrumentation_label = QLabel("")
+        self.instrumentation_label.setStyleSheet("color: #999; font-size: 10px;")
+        self.status_bar.addPermanentWidget(self.instrumentation_label)
+        
+        # Progreso y cancelación del cálculo en curso
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setMaximumWidth(160)
+        self.progress_bar.setVisible(False)
+        self.status_bar.addPermanentWidget(self.progress_bar)
+        
+        self.cancel_button = QPushButton("Cancelar")
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self.cancelar_calculo)
+        self.status_bar.addPermanentWidget(self.cancel_button)
+        
         # Conectar señales
         self.connect_signals()
     
@@ -71,20 +114,67 @@ class MainWindow(QMainWindow):
         nuevo_action = archivo_menu.addAction('Nuevo Sistema')
         nuevo_action.triggered.connect(self.nuevo_sistema)
         
-        guardar_action = archivo_menu.addAction('Guardar Resultados')
+        abrir_action = archivo_menu.addAction('Abrir Proyecto...')
+        abrir_action.triggered.connect(self.abrir_proyecto)
+        
+        guardar_proyecto_action = archivo_menu.addAction('Guardar Proyecto...')
+        guardar_proyecto_action.triggered.connect(self.guardar_proyecto)
+        
+        archivo_menu.addSeparator()
+        
+        importar_epanet_action = archivo_menu.addAction('Importar Red EPANET...')
+        importar_epanet_action.triggered.connect(self.importar_epanet)
+        
+        exportar_epanet_action = archivo_menu.addAction('Exportar Red EPANET...')
+        exportar_epanet_action.triggered.connect(self.exportar_epanet)
+        
+        archivo_menu.addSeparator()
+        
+        guardar_action = archivo_menu.addAction('Guardar Resultados...')
         guardar_action.triggered.connect(self.guardar_resultados)
         
+        exportar_barrido_action = archivo_menu.addAction('Exportar Barrido...')
+        exportar_barrido_action.triggered.connect(self.exportar_barrido)
+        
         archivo_menu.addSeparator()
         
         salir_action = archivo_menu.addAction('Salir')
         salir_action.triggered.connect(self.close)
         
+        # Menú Editar
+        editar_menu = menubar.addMenu('Editar')
+        
+        self.deshacer_action = editar_menu.addAction('Deshacer')
+        self.deshacer_action.setShortcut(QKeySequence.StandardKey.Undo)
+        self.deshacer_action.triggered.connect(self.deshacer)
+        
+        self.rehacer_action = editar_menu.addAction('Rehacer')
+        self.rehacer_action.setShortcut(QKeySequence.StandardKey.Redo)
+        self.rehacer_action.triggered.connect(self.rehacer)
+        self.update_history_actions()
+        
         # Menú Herramientas
         herramientas_menu = menubar.addMenu('Herramientas')
         
         calcular_action = herramientas_menu.addAction('Calcular Sistema')
         calcular_action.triggered.connect(self.calcular_sistema)
         
+        barrido_action = herramientas_menu.addAction('Barrido de Caudal...')
+        barrido_action.triggered.connect(self.barrido_caudal)
+        
+        cancelar_action = herramientas_menu.addAction('Cancelar Cálculo')
+        cancelar_action.triggered.connect(self.cancelar_calculo)
+        
+        herramientas_menu.addSeparator()
+        
+        self.instrumentacion_action = herramientas_menu.addAction('Instrumentación de Tiempos')
+        self.instrumentacion_action.setCheckable(True)
+        self.instrumentacion_action.setChecked(instrumentacion.habilitada)
+        self.instrumentacion_action.toggled.connect(self.toggle_instrumentation)
+        
+        exportar_metricas_action = herramientas_menu.addAction('Exportar Métricas...')
+        exportar_metricas_action.triggered.connect(self.exportar_metricas)
+        
         # Menú Ayuda
         ayuda_menu = menubar.addMenu('Ayuda')
         
@@ -121,6 +211,15 @@ class MainWindow(QMainWindow):
         self.system_viewer = SystemViewer()
         self.tab_widget.addTab(self.system_viewer, "Visualización")
         
+        # Pestaña de curvas del sistema y de la bomba
+        self.curves_panel = CurvesPanel()
+        self.tab_widget.addTab(self.curves_panel, "Curvas")
+        
+        # Pestaña de comparación de escenarios (comparte el catálogo del panel de entrada)
+        self.scenarios_panel = ScenariosPanel(self.input_panel.loader)
+        self.tab_widget.addTab(self.scenarios_panel, "Escenarios")
+        
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         right_layout.addWidget(self.tab_widget)
         splitter.addWidget(right_widget)
         
@@ -133,78 +232,543 @@ class MainWindow(QMainWindow):
         """Conecta las señales entre widgets para coordinación."""
         # Señal del panel de entrada cuando se completa
         self.input_panel.data_ready.connect(self.on_data_ready)
+        # Cambios del modo en vivo: se agrupan en el historial mientras lleguen seguidos
+        self.input_panel.live_data_ready.connect(
+            lambda sistema: self.on_data_ready(sistema, agrupar=True))
         
         # Señal del panel de entrada para calcular
         self.input_panel.calculate_requested.connect(self.calcular_sistema)
+        
+        # Errores del modo en vivo (datos intermedios inválidos) en la barra de estado
+        self.input_panel.live_error.connect(self.on_live_error)
+        
+        # Agregar el sistema configurado a la comparación de escenarios
+        self.scenarios_panel.add_current_requested.connect(self.agregar_escenario)
+        
+        # Señales de los despachadores de cálculos (siempre en el hilo de la interfaz)
+        for kind, dispatcher in self.dispatchers.items():
+            dispatcher.started.connect(lambda k=kind: self.on_calculation_started(k))
+            dispatcher.progress.connect(lambda percent, k=kind: self.on_calculation_progress(k, percent))
+            dispatcher.failed.connect(lambda mensaje, k=kind: self.on_calculation_failed(k, mensaje))
+            dispatcher.cancelled.connect(lambda k=kind: self.on_calculation_cancelled(k))
+            dispatcher.idle.connect(self.on_calculation_idle)
+        self.dispatchers['sistema'].result_ready.connect(self.on_calculation_finished)
+        self.dispatchers['barrido'].result_ready.connect(self.on_sweep_finished)
+        self.dispatchers['exportacion'].result_ready.connect(self.on_export_finished)
     
-    def on_data_ready(self, sistema):
+    def on_data_ready(self, sistema, agrupar=False):
         """Se ejecuta cuando los datos del sistema están configurados.
         
         Args:
             sistema: Objeto SistemaTuberias con la configuración completa
+            agrupar: Si es un cambio en vivo que puede fundirse con el anterior
+                en una sola entrada del historial
         """
         self.sistema = sistema
+        self.historial.registrar(sistema, agrupar=agrupar)
+        self.update_history_actions()
         self.status_bar.showMessage("Sistema configurado. Listo para calcular.")
         
         # Actualizar visualización
-        self.system_viewer.update_system(sistema)
+        self.update_viewer()
+    
+    def update_viewer(self):
+        """Redibuja el visor con el sistema actual, o lo deja pendiente si está oculto."""
+        if self.tab_widget.currentWidget() is not self.system_viewer:
+            self.viewer_pending = True
+            return
+        self.viewer_pending = False
+        if self.sistema is None:
+            self.system_viewer.clear_system()
+        else:
+            self.system_viewer.update_system(self.sistema)
+    
+    def on_tab_changed(self, _index):
+        """Aplica al visor los cambios que llegaron mientras estaba oculto."""
+        if self.viewer_pending:
+            self.update_viewer()
+    
+    def on_live_error(self, mensaje):
+        """Informa que los datos editados en vivo aún no forman un sistema válido."""
+        self.status_bar.showMessage(f"Datos no válidos, no se recalcula: {mensaje}")
+    
+    def agregar_escenario(self):
+        """Agrega el sistema configurado a la comparación de escenarios."""
+        if not self.sistema:
+            QMessageBox.warning(self, "Advertencia", 
+                              "Primero configure el sistema de tuberías.")
+            return
+        self.scenarios_panel.add_scenario(self.sistema)
     
     def calcular_sistema(self):
-        """Realiza los cálculos hidráulicos del sistema configurado.
+        """Solicita los cálculos hidráulicos del sistema configurado.
         
-        Ejecuta los cálculos de bombeo y actualiza los paneles de resultados
-        y visualización con los nuevos valores calculados.
+        El cálculo se despacha a un hilo de trabajo; si ya hay otro cálculo del
+        sistema en curso, se cancela y solo se conserva la solicitud más
+        reciente (los barridos y exportaciones en curso no se tocan). Los paneles
+        se actualizan al recibir el resultado en el hilo de la interfaz.
         """
         if not self.sistema:
             QMessageBox.warning(self, "Advertencia", 
                               "Primero configure el sistema de tuberías.")
             return
         
-        try:
+        # Importar aquí para evitar importación circular
+        from ..calculations import CalculadoraBombeo
+        
+        sistema = self.sistema
+        
+        def calcular(token, progreso):
+            calc = CalculadoraBombeo(sistema)
+            return calc.obtener_resultados_completos(progreso=progreso, cancelacion=token)
+        
+        self.calculated_sistema = sistema
+        self.dispatchers['sistema'].submit(calcular)
+    
+    def barrido_caudal(self):
+        """Calcula los resultados para una serie de caudales alrededor del de diseño.
+        
+        Los resultados se muestran por columnas en la tabla de barrido del
+        panel de resultados, que admite millones de filas.
+        """
+        if not self.sistema:
+            QMessageBox.warning(self, "Advertencia", 
+                              "Primero configure el sistema de tuberías.")
+            return
+        if self.sistema.caudal <= 0:
+            QMessageBox.warning(self, "Advertencia", 
+                              "El caudal de diseño debe ser mayor que cero.")
+            return
+        
+        puntos, ok = QInputDialog.getInt(
+            self, "Barrido de Caudal",
+            "Número de puntos (del 10% al 200% del caudal de diseño):",
+            1000, 2, 1_000_000, 100
+        )
+        if not ok:
+            return
+        
+        from ..calculations import CalculadoraBombeo
+        
+        sistema = self.sistema
+        caudal_min = 0.1 * sistema.caudal
+        paso = (2.0 * sistema.caudal - caudal_min) / (puntos - 1)
+        caudales = [caudal_min + i * paso for i in range(puntos)]
+        
+        def calcular(token, progreso):
+            calc = CalculadoraBombeo(sistema)
+            return calc.barrido_caudal(caudales, progreso=progreso, cancelacion=token)
+        
+        self.dispatchers['barrido'].submit(calcular)
+    
+    def cancelar_calculo(self):
+        """Cancela todos los cálculos y exportaciones en curso."""
+        for dispatcher in self.dispatchers.values():
+            dispatcher.cancel()
+    
+    def descartar_calculos(self):
+        """Cancela los cálculos del sistema anterior (las exportaciones continúan)."""
+        self.dispatchers['sistema'].cancel()
+        self.dispatchers['barrido'].cancel()
+    
+    def on_calculation_started(self, kind):
+        """Muestra el progreso al iniciar un cálculo."""
+        self.progress_kind = kind
+        if kind == 'exportacion':
+            self.status_bar.showMessage("Exportando resultados...")
+        elif kind == 'barrido':
+            self.status_bar.showMessage("Calculando barrido...")
+        else:
             self.status_bar.showMessage("Calculando sistema...")
-            
-            # Importar aquí para evitar importación circular
-            from ..calculations import CalculadoraBombeo
-            
-            # Realizar cálculos
-            calc = CalculadoraBombeo(self.sistema)
-            self.resultados = calc.obtener_resultados_completos()
-            
-            # Actualizar panel de resultados
-            self.results_panel.update_results(self.resultados)
-            
-            # Cambiar a pestaña de resultados
-            self.tab_widget.setCurrentIndex(0)
-            
-            self.status_bar.showMessage("Cálculo completado exitosamente")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error de Cálculo", 
-                              f"Error al calcular el sistema: {str(e)}")
-            self.status_bar.showMessage("Error en el cálculo")
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.cancel_button.setVisible(True)
+    
+    def on_calculation_progress(self, kind, percent):
+        """Muestra el avance del último cálculo iniciado."""
+        if kind == self.progress_kind:
+            self.progress_bar.setValue(percent)
+    
+    def on_sweep_finished(self, resultados):
+        """Muestra las columnas del barrido recibidas del hilo de trabajo."""
+        self.barrido = resultados
+        self.results_panel.update_sweep_results(resultados)
+        self.tab_widget.setCurrentIndex(0)
+        self.status_bar.showMessage(
+            f"Barrido completado: {len(resultados['caudal']):,} puntos"
+        )
+        self.update_instrumentation_summary()
+    
+    def on_export_finished(self, ruta):
+        """Informa la ruta del archivo exportado."""
+        self.status_bar.showMessage(f"Resultados exportados a {ruta}")
+    
+    def on_calculation_finished(self, resultados):
+        """Actualiza los paneles con el resultado recibido del hilo de trabajo.
+        
+        Args:
+            resultados (dict): Resultados completos del cálculo de bombeo
+        """
+        self.resultados = resultados
+        # Deshacer hasta este estado mostrará los resultados sin recalcular
+        self.historial.asociar_resultados(self.calculated_sistema, resultados)
+        
+        # Actualizar panel de resultados
+        self.results_panel.update_results(self.resultados)
+        
+        # Actualizar curvas con el sistema que se calculó (el actual pudo cambiar después)
+        self.curves_panel.update_curves(self.calculated_sistema, self.resultados)
+        
+        # Cambiar a pestaña de resultados
+        self.tab_widget.setCurrentIndex(0)
+        
+        self.status_bar.showMessage("Cálculo completado exitosamente")
+        self.update_instrumentation_summary()
+    
+    def on_calculation_failed(self, kind, mensaje):
+        """Informa un error del cálculo."""
+        if kind == 'exportacion':
+            QMessageBox.critical(self, "Error", 
+                              f"No se pudieron exportar los resultados: {mensaje}")
+            self.status_bar.showMessage("Error en la exportación")
+            return
+        QMessageBox.critical(self, "Error de Cálculo", 
+                          f"Error al calcular el sistema: {mensaje}")
+        self.status_bar.showMessage("Error en el cálculo")
+    
+    def on_calculation_cancelled(self, kind):
+        """Informa que el cálculo fue cancelado."""
+        if kind == 'exportacion':
+            self.status_bar.showMessage("Exportación cancelada")
+        elif kind == 'barrido':
+            self.status_bar.showMessage("Barrido cancelado")
+        else:
+            self.status_bar.showMessage("Cálculo cancelado")
+    
+    def on_calculation_idle(self):
+        """Oculta los controles de progreso cuando no queda trabajo pendiente."""
+        if any(dispatcher.is_busy() for dispatcher in self.dispatchers.values()):
+            return
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setVisible(False)
     
     def nuevo_sistema(self):
         """Crea un nuevo sistema limpiando todos los datos actuales."""
+        self.descartar_calculos()
         self.sistema = None
         self.resultados = None
+        self.barrido = None
         self.input_panel.clear_data()
         self.results_panel.clear_results()
-        self.system_viewer.clear_system()
+        self.curves_panel.clear_curves()
+        self.update_viewer()
+        # El formulario vacío es un estado más: se puede deshacer
+        self.historial.registrar(None)
+        self.update_history_actions()
         self.status_bar.showMessage("Nuevo sistema creado")
     
+    def deshacer(self):
+        """Vuelve al estado anterior del sistema."""
+        if self.historial.puede_deshacer:
+            self.restaurar_instantanea(self.historial.deshacer())
+            self.status_bar.showMessage("Cambio deshecho")
+    
+    def rehacer(self):
+        """Vuelve a aplicar el último cambio deshecho."""
+        if self.historial.puede_rehacer:
+            self.restaurar_instantanea(self.historial.rehacer())
+            self.status_bar.showMessage("Cambio rehecho")
+    
+    def restaurar_instantanea(self, instantanea):
+        """Muestra un estado del historial.
+        
+        Si el estado tiene resultados guardados se muestran directamente;
+        si no, se calcula. El barrido no se guarda en el historial.
+        
+        Args:
+            instantanea: Instantanea del historial a restaurar
+        """
+        self.descartar_calculos()
+        sistema = instantanea.sistema()
+        self.sistema = sistema
+        self.resultados = instantanea.resultados
+        self.barrido = None
+        self.results_panel.clear_results()
+        self.update_viewer()
+        
+        if sistema is None:
+            self.input_panel.clear_data()
+            self.input_panel.discard_pending_changes()
+            self.curves_panel.clear_curves()
+        else:
+            self.input_panel.cargar_sistema(sistema)
+            if self.resultados is not None:
+                self.results_panel.update_results(self.resultados)
+                self.curves_panel.update_curves(sistema, self.resultados)
+            else:
+                self.curves_panel.clear_curves()
+                self.calcular_sistema()
+        self.update_history_actions()
+    
+    def update_history_actions(self):
+        """Habilita deshacer/rehacer según el historial."""
+        self.deshacer_action.setEnabled(self.historial.puede_deshacer)
+        self.rehacer_action.setEnabled(self.historial.puede_rehacer)
+    
+    def abrir_proyecto(self):
+        """Abre un archivo de proyecto y muestra su sistema y resultados.
+        
+        Solo se leen las secciones necesarias; las columnas del barrido se
+        mapean desde el archivo y se cargan a medida que la tabla las muestra.
+        """
+        from ..persistencia import EXTENSION, abrir_proyecto
+        
+        ruta, _ = QFileDialog.getOpenFileName(
+            self, "Abrir Proyecto", "", f"Proyectos de Bombeo (*{EXTENSION})"
+        )
+        if not ruta:
+            return
+        
+        try:
+            proyecto = abrir_proyecto(ruta)
+            sistema = proyecto.sistema
+            resultados = proyecto.resultados
+            barrido = proyecto.barrido
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"No se pudo abrir el proyecto: {str(e)}")
+            return
+        
+        self.descartar_calculos()
+        self.sistema = sistema
+        self.resultados = resultados
+        self.barrido = barrido
+        
+        self.input_panel.cargar_sistema(sistema)
+        self.update_viewer()
+        self.historial.registrar(sistema)
+        self.update_history_actions()
+        self.results_panel.clear_results()
+        if resultados is not None:
+            self.historial.asociar_resultados(sistema, resultados)
+            self.results_panel.update_results(resultados)
+            self.curves_panel.update_curves(sistema, resultados)
+        else:
+            self.curves_panel.clear_curves()
+        if barrido is not None:
+            self.results_panel.update_sweep_results(barrido)
+        
+        self.status_bar.showMessage(f"Proyecto abierto: {ruta}")
+    
+    def guardar_proyecto(self):
+        """Guarda el sistema, sus resultados y el último barrido en un archivo de proyecto."""
+        if not self.sistema:
+            QMessageBox.warning(self, "Advertencia", 
+                              "Primero configure el sistema de tuberías.")
+            return
+        
+        from ..persistencia import EXTENSION, guardar_proyecto
+        
+        ruta, _ = QFileDialog.getSaveFileName(
+            self, "Guardar Proyecto", f"proyecto{EXTENSION}",
+            f"Proyectos de Bombeo (*{EXTENSION})"
+        )
+        if not ruta:
+            return
+        if not ruta.endswith(EXTENSION):
+            ruta += EXTENSION
+        
+        try:
+            guardar_proyecto(ruta, self.sistema, self.resultados, self.barrido)
+            self.status_bar.showMessage(f"Proyecto guardado en {ruta}")
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar el proyecto: {str(e)}")
+    
+    def importar_epanet(self):
+        """Importa el recorrido principal de una red EPANET (.inp).
+        
+        Se toma el camino más corto entre el primer embalse y el tanque (o
+        nudo) de descarga; si el archivo no permite deducir el caudal de
+        diseño, se pide al usuario.
+        """
+        from ..persistencia import EXTENSION_EPANET, ErrorEpanet, importar_inp
+        
+        ruta, _ = QFileDialog.getOpenFileName(
+            self, "Importar Red EPANET", "", f"Modelos EPANET (*{EXTENSION_EPANET})"
+        )
+        if not ruta:
+            return
+        
+        try:
+            red = importar_inp(ruta)
+            try:
+                sistema = red.a_sistema()
+            except ErrorEpanet:
+                caudal, ok = QInputDialog.getDouble(
+                    self, "Importar Red EPANET",
+                    "No se pudo deducir el caudal de diseño.\nCaudal (L/s):",
+                    10.0, 0.001, 1_000_000.0, 3
+                )
+                if not ok:
+                    return
+                sistema = red.a_sistema(caudal=caudal / 1000.0)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"No se pudo importar la red: {str(e)}")
+            return
+        
+        self.descartar_calculos()
+        self.sistema = sistema
+        self.resultados = None
+        self.barrido = None
+        
+        self.input_panel.cargar_sistema(sistema)
+        self.update_viewer()
+        self.historial.registrar(sistema)
+        self.update_history_actions()
+        self.results_panel.clear_results()
+        self.curves_panel.clear_curves()
+        
+        self.status_bar.showMessage(
+            f"Red EPANET importada: {red.num_nudos:,} nudos, {red.num_enlaces:,} enlaces; "
+            f"recorrido de {len(sistema.tramos):,} tramos"
+        )
+    
+    def exportar_epanet(self):
+        """Exporta el sistema como red EPANET (.inp), con la bomba si ya se calculó."""
+        if not self.sistema:
+            QMessageBox.warning(self, "Advertencia", 
+                              "Primero configure el sistema de tuberías.")
+            return
+        
+        from ..persistencia import EXTENSION_EPANET, exportar_inp, red_desde_sistema
+        
+        ruta, _ = QFileDialog.getSaveFileName(
+            self, "Exportar Red EPANET", f"sistema{EXTENSION_EPANET}",
+            f"Modelos EPANET (*{EXTENSION_EPANET})"
+        )
+        if not ruta:
+            return
+        if not ruta.endswith(EXTENSION_EPANET):
+            ruta += EXTENSION_EPANET
+        
+        carga_bomba = self.resultados['carga_total_bomba'] if self.resultados else None
+        try:
+            exportar_inp(ruta, red_desde_sistema(self.sistema, carga_bomba))
+            self.status_bar.showMessage(f"Red EPANET exportada a {ruta}")
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"No se pudo exportar la red: {str(e)}")
+    
     def guardar_resultados(self):
-        """Guarda los resultados del cálculo en formato PDF/Excel.
+        """Exporta los resultados del cálculo a CSV, Excel (XLSX) o un resumen PDF.
         
-        TODO: Implementar funcionalidad de exportación de resultados.
+        En XLSX y PDF se incluye también el último barrido (sus columnas en
+        hojas aparte, o su resumen). La exportación se ejecuta en el hilo de
+        trabajo, después de las exportaciones ya solicitadas, y se puede
+        cancelar.
         """
         if not self.resultados:
             QMessageBox.warning(self, "Advertencia", 
                               "No hay resultados para guardar.")
             return
         
-        # TODO: Implementar guardado a PDF/Excel
-        QMessageBox.information(self, "Información", 
-                              "Función de guardado en desarrollo.")
+        ruta = self._pedir_ruta_exportacion(
+            "Guardar Resultados", "resultados",
+            {"CSV (*.csv)": '.csv', "Excel (*.xlsx)": '.xlsx', "Resumen PDF (*.pdf)": '.pdf'}
+        )
+        if not ruta:
+            return
+        
+        from ..persistencia import exportar_resultados
+        
+        resultados, sistema, barrido = self.resultados, self.sistema, self.barrido
+        
+        def exportar(token, progreso):
+            exportar_resultados(ruta, resultados, sistema, barrido,
+                                progreso=progreso, cancelacion=token)
+            return ruta
+        
+        self.dispatchers['exportacion'].submit(exportar)
+    
+    def exportar_barrido(self):
+        """Exporta todas las filas del último barrido a CSV o Excel (XLSX)."""
+        if not self.barrido:
+            QMessageBox.warning(self, "Advertencia", 
+                              "No hay un barrido para exportar.")
+            return
+        
+        ruta = self._pedir_ruta_exportacion(
+            "Exportar Barrido", "barrido",
+            {"CSV (*.csv)": '.csv', "Excel (*.xlsx)": '.xlsx'}
+        )
+        if not ruta:
+            return
+        
+        from ..persistencia import exportar_barrido
+        
+        barrido = self.barrido
+        
+        def exportar(token, progreso):
+            exportar_barrido(ruta, barrido, progreso=progreso, cancelacion=token)
+            return ruta
+        
+        self.dispatchers['exportacion'].submit(exportar)
+    
+    def _pedir_ruta_exportacion(self, titulo, nombre, filtros):
+        """Pide la ruta de destino; agrega la extensión del filtro elegido si falta."""
+        ruta, filtro = QFileDialog.getSaveFileName(
+            self, titulo, nombre + next(iter(filtros.values())), ";;".join(filtros)
+        )
+        if ruta and os.path.splitext(ruta)[1].lower() not in filtros.values():
+            ruta += filtros.get(filtro, next(iter(filtros.values())))
+        return ruta
+    
+    def toggle_instrumentation(self, habilitada):
+        """Habilita o deshabilita la medición de tiempos por etapa."""
+        if habilitada:
+            instrumentacion.reiniciar()
+            instrumentacion.habilitar()
+        else:
+            instrumentacion.deshabilitar()
+            self.instrumentation_label.setText("")
+    
+    def update_instrumentation_summary(self):
+        """Muestra en la barra de estado la última duración de cada etapa."""
+        if not instrumentacion.habilitada:
+            return
+        
+        etapas = [
+            ("Cálculo", 'bombeo.total'),
+            ("Flujo", 'bombeo.flujo'),
+            ("Pérdidas", 'bombeo.perdidas'),
+            ("NPSHa", 'bombeo.npsha'),
+            ("Potencia", 'bombeo.potencia'),
+            ("Curvas", 'curvas.total'),
+            ("Escenarios", 'escenarios.evaluar'),
+            ("Escena", 'viewer.escena'),
+        ]
+        partes = [
+            f"{nombre} {instrumentacion.ultima_duracion(clave) * 1000:.2f} ms"
+            for nombre, clave in etapas
+        ]
+        self.instrumentation_label.setText(" · ".join(partes))
+    
+    def exportar_metricas(self):
+        """Exporta las métricas acumuladas como resumen JSON o traza de Chrome."""
+        filtro_traza = "Traza Chrome (*.json)"
+        filtro_resumen = "Resumen JSON (*.json)"
+        ruta, filtro = QFileDialog.getSaveFileName(
+            self, "Exportar Métricas", "metricas.json", f"{filtro_traza};;{filtro_resumen}"
+        )
+        if not ruta:
+            return
+        
+        try:
+            if filtro == filtro_resumen:
+                instrumentacion.exportar_json(ruta)
+            else:
+                instrumentacion.exportar_chrome_trace(ruta)
+            self.status_bar.showMessage(f"Métricas exportadas a {ruta}")
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudieron exportar las métricas: {str(e)}")
     
     def show_about(self):
         """Muestra el diálogo Acerca de con información de la aplicación."""
@@ -0,0 +1,202 @@
+"""
+Editor de tramos de tubería basado en tabla.
+
+Este módulo contiene PipesEditor, la sección de tramos del panel de
+entrada: una QTableView virtualizada sobre PipesTableModel con botones para
+agregar, eliminar, importar desde CSV y pegar desde el portapapeles. Solo la
+celda en edición tiene un widget (creado por PipeItemDelegate).
+
+Atajos de la tabla: Ctrl+V pega (sobrescribe desde la fila actual y agrega
+las que sobren), Ctrl+C copia las filas seleccionadas y Supr las elimina.
+"""
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableView,
+    QHeaderView, QAbstractItemView, QStyledItemDelegate, QDoubleSpinBox,
+    QComboBox, QFileDialog, QMessageBox, QApplication
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QKeySequence
+
+from ..calculations.instrumentacion import span
+from .pipes_model import ORIENTATIONS, PipesTableModel, parse_pipes_text
+
+
+class PipeItemDelegate(QStyledItemDelegate):
+    """Editores de celda: QDoubleSpinBox para medidas y QComboBox para la orientación."""
+
+    # columna: (mínimo, máximo, decimales, sufijo)
+    SPIN_SETTINGS = {
+        PipesTableModel.LENGTH: (0.01, 1_000_000.0, 2, " m"),
+        PipesTableModel.DIAMETER: (0.001, 10.0, 3, " m"),
+    }
+
+    def createEditor(self, parent, option, index):
+        if index.column() == PipesTableModel.ORIENTATION:
+            editor = QComboBox(parent)
+            editor.addItems(ORIENTATIONS)
+            return editor
+        minimum, maximum, decimals, suffix = self.SPIN_SETTINGS[index.column()]
+        editor = QDoubleSpinBox(parent)
+        editor.setRange(minimum, maximum)
+        editor.setDecimals(decimals)
+        editor.setSuffix(suffix)
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.ItemDataRole.EditRole)
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText(value)
+        else:
+            editor.setValue(value)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText())
+        else:
+            editor.interpretText()
+            model.setData(index, editor.value())
+
+
+class PipesTableView(QTableView):
+    """Tabla de tramos con atajos de copiar, pegar y eliminar."""
+
+    ROW_HEIGHT = 24
+
+    def __init__(self, editor):
+        super().__init__()
+        self.editor = editor
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked
+                             | QAbstractItemView.EditTrigger.EditKeyPressed
+                             | QAbstractItemView.EditTrigger.AnyKeyPressed)
+        # Altura de fila fija: la vista no mide las filas, necesario con 100k tramos
+        vertical = self.verticalHeader()
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(self.ROW_HEIGHT)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Paste):
+            self.editor.paste_from_clipboard()
+        elif event.matches(QKeySequence.StandardKey.Copy):
+            self.editor.copy_selection()
+        elif event.matches(QKeySequence.StandardKey.Delete) and self.state() != self.State.EditingState:
+            self.editor.remove_selected()
+        else:
+            super().keyPressEvent(event)
+
+
+class PipesEditor(QWidget):
+    """Sección de tramos: tabla virtualizada más acciones masivas.
+
+    Attributes:
+        model (PipesTableModel): Tramos editados
+    """
+
+    TABLE_HEIGHT = 240
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = PipesTableModel(self)
+        self.init_ui()
+
+        self.model.modelReset.connect(self.update_summary)
+        self.model.rowsInserted.connect(self.update_summary)
+        self.model.rowsRemoved.connect(self.update_summary)
+        self.model.dataChanged.connect(self.update_summary)
+
+        # Primer tramo por defecto
+        self.add_pipe()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.table = PipesTableView(self)
+        self.table.setModel(self.model)
+        self.table.setItemDelegate(PipeItemDelegate(self.table))
+        self.table.setMinimumHeight(self.TABLE_HEIGHT)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setStyleSheet("color: #999; font-size: 10px;")
+        layout.addWidget(self.summary_label)
+
+        buttons = QHBoxLayout()
+        add_btn = QPushButton("Agregar Tramo")
+        add_btn.clicked.connect(self.add_pipe)
+        remove_btn = QPushButton("Eliminar")
+        remove_btn.setProperty("class", "danger")
+        remove_btn.clicked.connect(self.remove_selected)
+        import_btn = QPushButton("Importar CSV...")
+        import_btn.clicked.connect(self.import_csv)
+        paste_btn = QPushButton("Pegar")
+        paste_btn.clicked.connect(self.paste_from_clipboard)
+        for button in (add_btn, remove_btn, import_btn, paste_btn):
+            button.setMinimumHeight(35)
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+
+    def add_pipe(self):
+        """Agrega un tramo después de la fila actual (o al final)."""
+        current = self.table.currentIndex()
+        row = current.row() + 1 if current.isValid() else self.model.rowCount()
+        self.model.insertRows(row, 1)
+        self.table.setCurrentIndex(self.model.index(row, 0))
+
+    def remove_selected(self):
+        """Elimina las filas seleccionadas."""
+        rows = {index.row() for index in self.table.selectionModel().selectedRows()}
+        if not rows and self.table.currentIndex().isValid():
+            rows = {self.table.currentIndex().row()}
+        self.model.remove_row_set(rows)
+
+    def import_csv(self):
+        """Reemplaza los tramos con los de un archivo CSV."""
+        ruta, _ = QFileDialog.getOpenFileName(
+            self, "Importar Tramos", "", "Archivos CSV (*.csv *.txt)"
+        )
+        if not ruta:
+            return
+        try:
+            self.load_csv(ruta)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"No se pudieron importar los tramos: {str(e)}")
+
+    def load_csv(self, ruta):
+        """Carga los tramos de un archivo CSV (columnas longitud, orientacion, diametro).
+
+        Raises:
+            OSError: Si no se puede leer el archivo
+            ValueError: Si alguna fila no es válida
+        """
+        with span('tramos.importar'):
+            with open(ruta, 'r', encoding='utf-8-sig') as file:
+                columnas = parse_pipes_text(file.read())
+            self.model.set_arrays(*columnas)
+
+    def paste_from_clipboard(self):
+        """Pega tramos desde el portapapeles a partir de la fila actual."""
+        try:
+            longitudes, verticales, diametros = parse_pipes_text(QApplication.clipboard().text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Advertencia", f"No se pudo pegar: {str(e)}")
+            return
+        if not longitudes:
+            return
+        current = self.table.currentIndex()
+        row = current.row() if current.isValid() else self.model.rowCount()
+        self.model.replace_rows(row, longitudes, verticales, diametros)
+
+    def copy_selection(self):
+        """Copia las filas seleccionadas como texto separado por tabuladores."""
+        rows = {index.row() for index in self.table.selectionModel().selectedIndexes()}
+        if rows:
+            QApplication.clipboard().setText(self.model.rows_as_text(rows))
+
+    def update_summary(self, *_):
+        count = self.model.rowCount()
+        self.summary_label.setText(
+            f"{count:,} tramos · longitud total {self.model.total_length():,.1f} m"
+        )
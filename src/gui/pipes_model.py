@@ -0,0 +1,307 @@
+"""
+Modelo de tabla para los tramos de tubería del panel de entrada.
+
+Este módulo contiene PipesTableModel, que guarda los tramos en arreglos por
+columna (longitudes, orientaciones y diámetros) en lugar de una fila de
+widgets por tramo. La vista solo crea editores para la celda que se edita,
+de modo que rutas de cientos de miles de tramos se abren al instante.
+
+También contiene parse_pipes_text, que interpreta tramos pegados desde una
+hoja de cálculo o importados desde CSV.
+"""
+import csv
+from array import array
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from ..models import TramoTuberia
+from .results_model import DATA_BACKGROUND, DATA_FOREGROUND
+
+ORIENTATIONS = ('horizontal', 'vertical')
+
+_ALIGN_NUMBER = int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+_ALIGN_TEXT = int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+
+# Nombres aceptados en la fila de encabezado de un CSV
+_HEADER_NAMES = {
+    'longitud': 0, 'longitud (m)': 0, 'longitud_m': 0,
+    'orientacion': 1, 'orientación': 1,
+    'diametro': 2, 'diámetro': 2, 'diametro (m)': 2, 'diámetro (m)': 2, 'diametro_m': 2,
+}
+_ORIENTATION_NAMES = {
+    'horizontal': 0, 'h': 0, '0': 0,
+    'vertical': 1, 'v': 1, '1': 1,
+}
+
+
+def parse_pipes_text(text):
+    """Interpreta tramos en texto CSV o pegado desde una hoja de cálculo.
+
+    El separador se detecta en la primera fila (tabulador, punto y coma o
+    coma). Si la primera fila no es numérica se toma como encabezado y las
+    columnas se ubican por nombre (longitud, orientacion, diametro); si no,
+    se usa ese mismo orden. Con tabulador o punto y coma se acepta la coma
+    decimal.
+
+    Args:
+        text (str): Contenido a interpretar
+
+    Returns:
+        tuple: (longitudes array('d'), verticales bytearray, diámetros array('d'))
+
+    Raises:
+        ValueError: Si alguna fila no es válida (el mensaje indica la fila)
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    longitudes, verticales, diametros = array('d'), bytearray(), array('d')
+    if not lines:
+        return longitudes, verticales, diametros
+
+    first = lines[0]
+    delimiter = '\t' if '\t' in first else ';' if ';' in first else ','
+    decimal_comma = delimiter != ','
+    rows = csv.reader(lines, delimiter=delimiter)
+
+    columns = (0, 1, 2)
+    header = next(rows)
+    start = 1
+    if _parse_number(header[0], decimal_comma) is None:
+        columns = _header_columns(header)
+        start = 2
+    else:
+        rows = csv.reader(lines, delimiter=delimiter)
+
+    i_longitud, i_orientacion, i_diametro = columns
+    for numero, row in enumerate(rows, start=start):
+        try:
+            longitud = _parse_number(row[i_longitud], decimal_comma)
+            orientacion = _ORIENTATION_NAMES.get(row[i_orientacion].strip().lower())
+            diametro = _parse_number(row[i_diametro], decimal_comma)
+        except IndexError:
+            raise ValueError(f"Fila {numero}: se esperaban longitud, orientación y diámetro") from None
+        if longitud is None or longitud <= 0:
+            raise ValueError(f"Fila {numero}: longitud inválida '{row[i_longitud]}'")
+        if orientacion is None:
+            raise ValueError(f"Fila {numero}: orientación inválida '{row[i_orientacion]}'")
+        if diametro is None or diametro <= 0:
+            raise ValueError(f"Fila {numero}: diámetro inválido '{row[i_diametro]}'")
+        longitudes.append(longitud)
+        verticales.append(orientacion)
+        diametros.append(diametro)
+    return longitudes, verticales, diametros
+
+
+def _parse_number(text, decimal_comma):
+    text = text.strip()
+    if decimal_comma:
+        text = text.replace(',', '.')
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _header_columns(header):
+    """Índices de (longitud, orientación, diámetro) en un encabezado."""
+    positions = {}
+    for i, name in enumerate(header):
+        column = _HEADER_NAMES.get(name.strip().lower())
+        if column is not None:
+            positions.setdefault(column, i)
+    for column, name in enumerate(('longitud', 'orientacion', 'diametro')):
+        if column not in positions:
+            raise ValueError(f"El encabezado no tiene la columna '{name}'")
+    return positions[0], positions[1], positions[2]
+
+
+class PipesTableModel(QAbstractTableModel):
+    """Tramos de tubería editables almacenados por columnas.
+
+    Los TramoTuberia se crean a pedido y se guardan por fila; editar una
+    fila solo descarta su tramo, de modo que construir el sistema después
+    de un cambio reutiliza todos los demás.
+    """
+
+    HEADERS = ("Longitud (m)", "Orientación", "Diámetro (m)")
+    LENGTH, ORIENTATION, DIAMETER = range(3)
+    DEFAULT_LENGTH = 10.0
+    DEFAULT_DIAMETER = 0.100
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._longitudes = array('d')
+        self._verticales = bytearray()
+        self._diametros = array('d')
+        self._tramos = []  # TramoTuberia por fila (None = por crear)
+
+    # --- Datos -----------------------------------------------------------
+
+    def set_arrays(self, longitudes, verticales, diametros):
+        """Reemplaza todos los tramos (p. ej. al importar un CSV)."""
+        if not len(longitudes) == len(verticales) == len(diametros):
+            raise ValueError("Las columnas de tramos deben tener el mismo largo")
+        self.beginResetModel()
+        self._longitudes = array('d', longitudes)
+        self._verticales = bytearray(verticales)
+        self._diametros = array('d', diametros)
+        self._tramos = [None] * len(self._longitudes)
+        self.endResetModel()
+
+    def set_tramos(self, tramos):
+        """Reemplaza todos los tramos a partir de objetos TramoTuberia."""
+        self.set_arrays(
+            array('d', (tramo.longitud for tramo in tramos)),
+            bytearray(tramo.orientacion == 'vertical' for tramo in tramos),
+            array('d', (tramo.diametro for tramo in tramos)),
+        )
+        self._tramos = list(tramos)
+
+    def replace_rows(self, row, longitudes, verticales, diametros):
+        """Sobrescribe filas desde row y agrega al final las que sobren (pegar)."""
+        count = len(longitudes)
+        overwrite = max(0, min(count, len(self._longitudes) - row))
+        if overwrite:
+            end = row + overwrite
+            self._longitudes[row:end] = array('d', longitudes[:overwrite])
+            self._verticales[row:end] = bytearray(verticales[:overwrite])
+            self._diametros[row:end] = array('d', diametros[:overwrite])
+            self._tramos[row:end] = [None] * overwrite
+            self.dataChanged.emit(self.index(row, 0), self.index(end - 1, len(self.HEADERS) - 1))
+        if count > overwrite:
+            self.append_arrays(longitudes[overwrite:], verticales[overwrite:], diametros[overwrite:])
+
+    def append_arrays(self, longitudes, verticales, diametros):
+        """Agrega tramos al final."""
+        first = len(self._longitudes)
+        self.beginInsertRows(QModelIndex(), first, first + len(longitudes) - 1)
+        self._longitudes.extend(array('d', longitudes))
+        self._verticales.extend(bytearray(verticales))
+        self._diametros.extend(array('d', diametros))
+        self._tramos.extend([None] * len(longitudes))
+        self.endInsertRows()
+
+    def remove_row_set(self, rows):
+        """Elimina un conjunto de filas, agrupando las contiguas."""
+        for first, count in _ranges_descending(rows):
+            self.removeRows(first, count)
+
+    def tramo(self, row):
+        """TramoTuberia de una fila (se crea una sola vez mientras no cambie)."""
+        tramo = self._tramos[row]
+        if tramo is None:
+            tramo = self._tramos[row] = TramoTuberia(
+                longitud=self._longitudes[row],
+                orientacion=ORIENTATIONS[self._verticales[row]],
+                diametro=self._diametros[row],
+            )
+        return tramo
+
+    def tramos(self):
+        """Lista de TramoTuberia de todas las filas."""
+        return [tramo if tramo is not None else self.tramo(row)
+                for row, tramo in enumerate(self._tramos)]
+
+    def total_length(self):
+        return sum(self._longitudes)
+
+    def rows_as_text(self, rows):
+        """Filas en texto separado por tabuladores (para copiar)."""
+        return "\n".join(
+            f"{self._longitudes[row]:g}\t{ORIENTATIONS[self._verticales[row]]}\t{self._diametros[row]:g}"
+            for row in sorted(rows)
+        )
+
+    # --- Interfaz de QAbstractTableModel ----------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._longitudes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.LENGTH:
+                return f"{self._longitudes[row]:.2f}"
+            if column == self.ORIENTATION:
+                return ORIENTATIONS[self._verticales[row]]
+            return f"{self._diametros[row]:.3f}"
+        if role == Qt.ItemDataRole.EditRole:
+            if column == self.LENGTH:
+                return self._longitudes[row]
+            if column == self.ORIENTATION:
+                return ORIENTATIONS[self._verticales[row]]
+            return self._diametros[row]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return _ALIGN_TEXT if column == self.ORIENTATION else _ALIGN_NUMBER
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return DATA_BACKGROUND
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return DATA_FOREGROUND
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        row, column = index.row(), index.column()
+        if column == self.ORIENTATION:
+            vertical = _ORIENTATION_NAMES.get(str(value).strip().lower())
+            if vertical is None:
+                return False
+            self._verticales[row] = vertical
+        else:
+            number = value if isinstance(value, float) else _parse_number(str(value), True)
+            if number is None or number <= 0:
+                return False
+            target = self._longitudes if column == self.LENGTH else self._diametros
+            target[row] = number
+        self._tramos[row] = None
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        return (Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+                | Qt.ItemFlag.ItemIsEditable)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return self.HEADERS[section]
+            return str(section + 1)
+        return None
+
+    def insertRows(self, row, count, parent=QModelIndex()):
+        """Inserta tramos con los valores por defecto."""
+        if parent.isValid() or count <= 0:
+            return False
+        self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        self._longitudes[row:row] = array('d', [self.DEFAULT_LENGTH] * count)
+        self._verticales[row:row] = bytearray(count)
+        self._diametros[row:row] = array('d', [self.DEFAULT_DIAMETER] * count)
+        self._tramos[row:row] = [None] * count
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or count <= 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        del self._longitudes[row:row + count]
+        del self._verticales[row:row + count]
+        del self._diametros[row:row + count]
+        del self._tramos[row:row + count]
+        self.endRemoveRows()
+        return True
+
+
+def _ranges_descending(rows):
+    """Agrupa filas en rangos contiguos (primera, cantidad), del último al primero."""
+    ranges = []
+    for row in sorted(set(rows), reverse=True):
+        if ranges and ranges[-1][0] == row + 1:
+            first, count = ranges[-1]
+            ranges[-1] = (row, count + 1)
+        else:
+            ranges.append((row, 1))
+    return ranges
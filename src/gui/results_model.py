@@ -0,0 +1,302 @@
+"""
+Modelos de tabla para los resultados del cálculo.
+
+Este módulo contiene los modelos de Qt (model/view) usados por ResultsPanel:
+
+- SummaryResultsModel: resultados detallados de un cálculo, agrupados por
+  categoría.
+- ColumnarResultsModel: resultados de barridos con millones de filas,
+  leídos directamente de arreglos por columna.
+
+Ninguno crea un objeto por celda: los textos se formatean al momento de
+pintar solo para las celdas visibles, y colores y fuentes se comparten.
+El ordenamiento y el filtrado se resuelven con una permutación de índices
+de fila, sin copiar las columnas.
+"""
+from array import array
+from collections import namedtuple
+from typing import Dict, List, Optional, Sequence
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QBrush, QColor, QFont
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo acelera ordenar y filtrar
+    np = None
+
+# Estilos compartidos por todas las celdas
+CATEGORY_BACKGROUND = QBrush(QColor(60, 60, 60))
+CATEGORY_FOREGROUND = QBrush(QColor(255, 255, 255))
+DATA_BACKGROUND = QBrush(QColor(45, 45, 45))
+DATA_FOREGROUND = QBrush(QColor(220, 220, 220))
+CATEGORY_FONT = QFont()
+CATEGORY_FONT.setBold(True)
+
+_ALIGN_NUMBER = int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+_ALIGN_TEXT = int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+
+# Rol para obtener el valor numérico sin formato
+RawValueRole = Qt.ItemDataRole.UserRole
+
+# Columna de resultados: clave en el diccionario de columnas, encabezado y formato
+ResultColumn = namedtuple('ResultColumn', 'key header fmt')
+
+
+class SummaryResultsModel(QAbstractTableModel):
+    """Resultados detallados de un cálculo organizados por categorías.
+
+    Las filas se definen una sola vez en CATEGORIES; al actualizar solo se
+    reemplaza el registro de resultados (ResultadosBombeo, leído por atributo)
+    y se notifica el cambio.
+    """
+
+    HEADERS = ("Parámetro", "Valor")
+
+    # (categoría, [(parámetro, clave, formato)])
+    CATEGORIES = [
+        ("Parámetros del Flujo", [
+            ("Velocidad", 'velocidad', "{:.2f} m/s"),
+            ("Número de Reynolds", 'numero_reynolds', "{:.0f}"),
+            ("Factor de Fricción", 'factor_friccion', "{:.4f}"),
+        ]),
+        ("Alturas del Sistema", [
+            ("Altura de Elevación", 'altura_elevacion', "{:.3f} m"),
+            ("Pérdidas Mayores", 'perdidas_mayores', "{:.3f} m"),
+            ("Pérdidas Menores", 'perdidas_menores', "{:.3f} m"),
+            ("Carga Total de Bomba (Ht)", 'carga_total_bomba', "{:.3f} m"),
+        ]),
+        ("Potencia", [
+            ("Potencia Hidráulica", 'potencia_hidraulica_kW', "{:.2f} kW"),
+            ("Potencia Requerida", 'potencia_bomba_kW', "{:.2f} kW"),
+        ]),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._resultados = None
+        # Filas planas: (texto, clave, formato); clave None indica categoría
+        self._rows = []
+        for category, items in self.CATEGORIES:
+            self._rows.append((category, None, None))
+            self._rows.extend(items)
+
+    def set_resultados(self, resultados):
+        """Reemplaza los resultados mostrados."""
+        had_rows = self._resultados is not None
+        if not had_rows:
+            self.beginResetModel()
+            self._resultados = resultados
+            self.endResetModel()
+            return
+        self._resultados = resultados
+        self.dataChanged.emit(self.index(0, 1), self.index(len(self._rows) - 1, 1))
+
+    def clear(self):
+        """Elimina los resultados (la tabla queda vacía)."""
+        self.beginResetModel()
+        self._resultados = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self._resultados is None:
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        text, key, fmt = self._rows[index.row()]
+        is_category = key is None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.column() == 0:
+                return text
+            return "" if is_category else fmt.format(getattr(self._resultados, key))
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return CATEGORY_BACKGROUND if is_category else DATA_BACKGROUND
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return CATEGORY_FOREGROUND if is_category else DATA_FOREGROUND
+        if role == Qt.ItemDataRole.FontRole and is_category:
+            return CATEGORY_FONT
+        if role == RawValueRole and not is_category:
+            return getattr(self._resultados, key)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+
+class ColumnarResultsModel(QAbstractTableModel):
+    """Tabla de solo lectura sobre resultados almacenados por columnas.
+
+    Las columnas pueden ser listas, array.array o arreglos de NumPy del
+    mismo largo. Las filas visibles se describen con una permutación de
+    índices (None mientras no haya orden ni filtro), de modo que ordenar y
+    filtrar no copia ni reformatea los datos.
+    """
+
+    DEFAULT_FORMAT = "{:.6g}"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._specs: List[ResultColumn] = []
+        self._columns: List[Sequence[float]] = []
+        self._num_rows = 0
+        self._order = None  # permutación del ordenamiento actual
+        self._rows = None  # filas visibles (orden + filtro)
+        self._filter = None  # (columna, mínimo, máximo)
+
+    # --- Datos -----------------------------------------------------------
+
+    def set_columns(self, columns: Dict[str, Sequence[float]],
+                    specs: Optional[List[ResultColumn]] = None):
+        """Reemplaza los datos del modelo.
+
+        Args:
+            columns: Diccionario clave -> secuencia de valores (todas del mismo largo)
+            specs: Columnas a mostrar con su encabezado y formato; por defecto
+                   todas las claves con formato DEFAULT_FORMAT
+        """
+        if specs is None:
+            specs = [ResultColumn(key, key, self.DEFAULT_FORMAT) for key in columns]
+        lengths = {len(columns[spec.key]) for spec in specs}
+        if len(lengths) > 1:
+            raise ValueError("Todas las columnas deben tener el mismo número de filas")
+
+        self.beginResetModel()
+        self._specs = list(specs)
+        self._columns = [columns[spec.key] for spec in specs]
+        self._num_rows = lengths.pop() if lengths else 0
+        self._order = None
+        self._rows = None
+        self._filter = None
+        self.endResetModel()
+
+    def clear(self):
+        """Elimina todos los datos."""
+        self.set_columns({}, [])
+
+    @property
+    def specs(self) -> List[ResultColumn]:
+        return list(self._specs)
+
+    def total_rows(self) -> int:
+        """Número de filas sin filtrar."""
+        return self._num_rows
+
+    def source_row(self, row: int) -> int:
+        """Índice en las columnas de una fila visible."""
+        return row if self._rows is None else int(self._rows[row])
+
+    def value(self, row: int, column: int) -> float:
+        """Valor numérico de una celda visible."""
+        return self._columns[column][self.source_row(row)]
+
+    # --- Interfaz de QAbstractTableModel ----------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._num_rows if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._specs)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            column = index.column()
+            row = index.row() if self._rows is None else int(self._rows[index.row()])
+            return self._specs[column].fmt.format(self._columns[column][row])
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return _ALIGN_NUMBER
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return DATA_BACKGROUND
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return DATA_FOREGROUND
+        if role == RawValueRole:
+            return float(self.value(index.row(), index.column()))
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return self._specs[section].header
+            return str(self.source_row(section) + 1)
+        if role == Qt.ItemDataRole.TextAlignmentRole and orientation == Qt.Orientation.Vertical:
+            return _ALIGN_TEXT
+        return None
+
+    # --- Ordenamiento y filtrado ------------------------------------------
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Ordena las filas por una columna (permutación de índices)."""
+        if not 0 <= column < len(self._columns):
+            return
+        permutation = _argsort(self._columns[column], self._num_rows)
+        if order == Qt.SortOrder.DescendingOrder:
+            permutation = permutation[::-1]
+        self.beginResetModel()
+        self._order = permutation
+        self._rows = self._apply_filter()
+        self.endResetModel()
+
+    def set_range_filter(self, key: str, minimo: Optional[float] = None,
+                         maximo: Optional[float] = None):
+        """Muestra solo las filas con minimo <= columna <= maximo.
+
+        Args:
+            key: Clave de la columna
+            minimo, maximo: Límites inclusivos (None = sin límite)
+        """
+        keys = [spec.key for spec in self._specs]
+        if key not in keys:
+            raise ValueError(f"Columna desconocida: {key}")
+        self.beginResetModel()
+        self._filter = (keys.index(key), minimo, maximo)
+        self._rows = self._apply_filter()
+        self.endResetModel()
+
+    def clear_filter(self):
+        """Quita el filtro (conserva el orden actual)."""
+        self.beginResetModel()
+        self._filter = None
+        self._rows = self._order
+        self.endResetModel()
+
+    def _apply_filter(self):
+        """Filas visibles: el orden actual restringido por el filtro."""
+        if self._filter is None:
+            return self._order
+        column, minimo, maximo = self._filter
+        values = self._columns[column]
+        minimo = float('-inf') if minimo is None else minimo
+        maximo = float('inf') if maximo is None else maximo
+
+        if np is not None:
+            values = _as_float_array(values)
+            base = np.arange(self._num_rows) if self._order is None else np.asarray(self._order)
+            selected = values[base]
+            return base[(selected >= minimo) & (selected <= maximo)]
+
+        base = range(self._num_rows) if self._order is None else self._order
+        return array('q', (i for i in base if minimo <= values[i] <= maximo))
+
+
+def _argsort(values, num_rows):
+    """Permutación que ordena una columna de forma ascendente (estable)."""
+    if np is not None:
+        return np.argsort(_as_float_array(values), kind='stable')
+    return array('q', sorted(range(num_rows), key=values.__getitem__))
+
+
+def _as_float_array(values):
+    """Vista de NumPy de una columna; array('d') se envuelve sin copiar."""
+    if isinstance(values, array) and values.typecode == 'd':
+        return np.frombuffer(values, dtype=float)
+    return np.asarray(values, dtype=float)
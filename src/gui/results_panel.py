@@ -8,20 +8,41 @@ fácil de leer para el usuario.
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, 
-    QTableWidget, QHeaderView, QSplitter
+    QTableView, QHeaderView, QSplitter, QComboBox, QLineEdit, QPushButton,
+    QAbstractItemView, QMessageBox
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
+
+from ..calculations.resultados import ResultadosBombeo
+from .results_model import ColumnarResultsModel, ResultColumn, SummaryResultsModel
 
 
 class ResultsPanel(QWidget):
     """Panel para mostrar los resultados del cálculo del sistema de bombeo.
     
-    Este widget se divide en dos secciones principales:
+    Este widget se divide en tres secciones principales:
     - Resultados principales: Los 6 valores más importantes (Ht, NPSHa, Potencia, etc.)
     - Resultados detallados: Tabla completa con todos los parámetros calculados
+    - Resultados de barrido: Tabla por columnas para barridos con millones de filas
+    
+    Las tablas usan modelos de Qt (ver results_model), por lo que no se crea
+    un objeto por celda y solo se formatean las filas visibles.
     """
     
+    # Columnas mostradas en la tabla de barrido (clave, encabezado, formato)
+    SWEEP_COLUMNS = [
+        ResultColumn('caudal', "Caudal (m³/s)", "{:.5f}"),
+        ResultColumn('velocidad', "Velocidad (m/s)", "{:.3f}"),
+        ResultColumn('numero_reynolds', "Reynolds", "{:.0f}"),
+        ResultColumn('factor_friccion', "f", "{:.5f}"),
+        ResultColumn('perdidas_totales', "Pérdidas (m)", "{:.3f}"),
+        ResultColumn('carga_total_bomba', "Ht (m)", "{:.3f}"),
+        ResultColumn('NPSHa', "NPSHa (m)", "{:.3f}"),
+        ResultColumn('potencia_hidraulica_kW', "P. Hidráulica (kW)", "{:.3f}"),
+        ResultColumn('potencia_bomba_kW', "P. Bomba (kW)", "{:.3f}"),
+    ]
+    SWEEP_ROW_HEIGHT = 22
+    
     def __init__(self):
         super().__init__()
         self.init_ui()
@@ -52,8 +73,13 @@ class ResultsPanel(QWidget):
         detailed_results = self.create_detailed_results_panel()
         splitter.addWidget(detailed_results)
         
-        # Configurar splitter (50% principales, 50% detallados)
-        splitter.setSizes([350, 350])
+        # Panel de resultados de barrido (visible solo con datos)
+        self.sweep_group = self.create_sweep_results_panel()
+        self.sweep_group.setVisible(False)
+        splitter.addWidget(self.sweep_group)
+        
+        # Configurar splitter (principales, detallados y barrido)
+        splitter.setSizes([300, 300, 300])
         
         layout.addWidget(splitter)
     
@@ -134,9 +160,9 @@ class ResultsPanel(QWidget):
         layout = QVBoxLayout(group)
         
         # Tabla de resultados
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(2)
-        self.results_table.setHorizontalHeaderLabels(["Parámetro", "Valor"])
+        self.results_model = SummaryResultsModel(self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         
         # Configurar tabla
         header = self.results_table.horizontalHeader()
@@ -144,7 +170,7 @@ class ResultsPanel(QWidget):
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         
         self.results_table.setAlternatingRowColors(True)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         
         # Aumentar altura de filas para mejor legibilidad
         self.results_table.verticalHeader().setDefaultSectionSize(25)
@@ -154,98 +180,146 @@ class ResultsPanel(QWidget):
         
         return group
     
+    def create_sweep_results_panel(self):
+        """Crea el panel con la tabla de resultados de barrido.
+        
+        Returns:
+            QGroupBox: Widget contenedor con la tabla por columnas, el filtro
+                      por rango y el contador de filas.
+        """
+        group = QGroupBox("Resultados de Barrido")
+        layout = QVBoxLayout(group)
+        
+        # Filtro por rango de una columna
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Filtrar:"))
+        self.sweep_filter_column = QComboBox()
+        for spec in self.SWEEP_COLUMNS:
+            self.sweep_filter_column.addItem(spec.header, spec.key)
+        filter_layout.addWidget(self.sweep_filter_column)
+        
+        self.sweep_filter_min = QLineEdit()
+        self.sweep_filter_min.setPlaceholderText("mínimo")
+        self.sweep_filter_min.setMaximumWidth(90)
+        filter_layout.addWidget(self.sweep_filter_min)
+        
+        self.sweep_filter_max = QLineEdit()
+        self.sweep_filter_max.setPlaceholderText("máximo")
+        self.sweep_filter_max.setMaximumWidth(90)
+        filter_layout.addWidget(self.sweep_filter_max)
+        
+        apply_btn = QPushButton("Aplicar")
+        apply_btn.clicked.connect(self.apply_sweep_filter)
+        filter_layout.addWidget(apply_btn)
+        
+        clear_btn = QPushButton("Quitar")
+        clear_btn.clicked.connect(self.clear_sweep_filter)
+        filter_layout.addWidget(clear_btn)
+        
+        filter_layout.addStretch()
+        self.sweep_count_label = QLabel("")
+        self.sweep_count_label.setStyleSheet("color: #999; font-size: 10px;")
+        filter_layout.addWidget(self.sweep_count_label)
+        layout.addLayout(filter_layout)
+        
+        # Tabla virtual: solo se consultan las filas visibles
+        self.sweep_model = ColumnarResultsModel(self)
+        self.sweep_table = QTableView()
+        self.sweep_table.setModel(self.sweep_model)
+        self.sweep_table.setSortingEnabled(True)
+        self.sweep_table.setAlternatingRowColors(True)
+        self.sweep_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.sweep_table.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        
+        # Altura fija de filas: el encabezado no mide cada fila
+        vertical_header = self.sweep_table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.SWEEP_ROW_HEIGHT)
+        self.sweep_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.sweep_table.horizontalHeader().setDefaultSectionSize(110)
+        
+        self.sweep_model.modelReset.connect(self.update_sweep_count)
+        layout.addWidget(self.sweep_table)
+        
+        return group
+    
     def update_results(self, resultados):
         """Actualiza todos los resultados mostrados con los valores calculados.
         
         Args:
-            resultados (dict): Diccionario con todos los resultados del cálculo
-                            incluyendo parámetros del flujo, alturas, potencia, etc.
+            resultados (ResultadosBombeo | dict): Resultados del cálculo
+                            (registro compacto o diccionario de
+                            obtener_resultados_completos)
         """
         if not resultados:
             return
+        if not isinstance(resultados, ResultadosBombeo):
+            # Un proyecto de una versión anterior puede no tener todos los campos
+            resultados = ResultadosBombeo.desde_dict(resultados, parcial=True)
         
         # Actualizar resultados principales
-        self.ht_label.setText(f"Ht: {resultados['carga_total_bomba']:.3f} m")
-        self.npsh_label.setText(f"NPSHa: {resultados['NPSHa']:.3f} m")
-        self.power_label.setText(f"Potencia: {resultados['potencia_bomba_kW']:.2f} kW")
+        self.ht_label.setText(f"Ht: {resultados.carga_total_bomba:.3f} m")
+        self.npsh_label.setText(f"NPSHa: {resultados.NPSHa:.3f} m")
+        self.power_label.setText(f"Potencia: {resultados.potencia_bomba_kW:.2f} kW")
         
-        self.velocity_label.setText(f"Velocidad: {resultados['velocidad']:.2f} m/s")
-        self.reynolds_label.setText(f"Re: {resultados['numero_reynolds']:.0f}")
-        self.friction_label.setText(f"f: {resultados['factor_friccion']:.4f}")
+        self.velocity_label.setText(f"Velocidad: {resultados.velocidad:.2f} m/s")
+        self.reynolds_label.setText(f"Re: {resultados.numero_reynolds:.0f}")
+        self.friction_label.setText(f"f: {resultados.factor_friccion:.4f}")
         
         # Actualizar tabla detallada
         self.populate_results_table(resultados)
     
     def populate_results_table(self, resultados):
-        """Llena la tabla detallada con todos los resultados organizados.
+        """Muestra los resultados en la tabla detallada organizada por categorías.
         
         Args:
-            resultados (dict): Diccionario con todos los resultados del cálculo
+            resultados (ResultadosBombeo): Resultados del cálculo
         """
-        # Organizar resultados por categorías
-        categories = {
-            "Parámetros del Flujo": [
-                ("Velocidad", f"{resultados['velocidad']:.2f} m/s"),
-                ("Número de Reynolds", f"{resultados['numero_reynolds']:.0f}"),
-                ("Factor de Fricción", f"{resultados['factor_friccion']:.4f}")
-            ],
-            "Alturas del Sistema": [
-                ("Altura de Elevación", f"{resultados['altura_elevacion']:.3f} m"),
-                ("Pérdidas Mayores", f"{resultados['perdidas_mayores']:.3f} m"),
-                ("Pérdidas Menores", f"{resultados['perdidas_menores']:.3f} m"),
-                ("Carga Total de Bomba (Ht)", f"{resultados['carga_total_bomba']:.3f} m")
-            ],
-            "Potencia": [
-                ("Potencia Hidráulica", f"{resultados['potencia_hidraulica_kW']:.2f} kW"),
-                ("Potencia Requerida", f"{resultados['potencia_bomba_kW']:.2f} kW")
-            ]
-        }
-        
-        # Contar total de filas
-        total_rows = sum(len(items) for items in categories.values())
-        self.results_table.setRowCount(total_rows)
-        
-        # Llenar tabla
-        row = 0
-        for category, items in categories.items():
-            # Agregar fila de categoría
-            self.results_table.setItem(row, 0, self.create_table_item(category, is_category=True))
-            self.results_table.setItem(row, 1, self.create_table_item("", is_category=True))
-            row += 1
-            
-            # Agregar items de la categoría
-            for param, value in items:
-                self.results_table.setItem(row, 0, self.create_table_item(param))
-                self.results_table.setItem(row, 1, self.create_table_item(value))
-                row += 1
+        self.results_model.set_resultados(resultados)
     
-    def create_table_item(self, text, is_category=False):
-        """Crea un item para la tabla con formato apropiado.
+    def update_sweep_results(self, columnas):
+        """Muestra los resultados de un barrido en la tabla por columnas.
         
         Args:
-            text (str): Texto del item
-            is_category (bool): True si es una fila de categoría
-            
-        Returns:
-            QTableWidgetItem: Item configurado para la tabla
+            columnas (dict): Clave de resultado -> secuencia de valores
+                            (listas, array.array o arreglos de NumPy)
         """
-        from PyQt6.QtWidgets import QTableWidgetItem
-        
-        item = QTableWidgetItem(text)
-        
-        if is_category:
-            # Formato para categorías (negrita y fondo)
-            item.setBackground(QColor(60, 60, 60))
-            item.setForeground(QColor(255, 255, 255))
-            font = item.font()
-            font.setBold(True)
-            item.setFont(font)
+        specs = [spec for spec in self.SWEEP_COLUMNS if spec.key in columnas]
+        self.sweep_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.sweep_model.set_columns(columnas, specs)
+        self.sweep_group.setVisible(True)
+    
+    def apply_sweep_filter(self):
+        """Aplica el filtro por rango a la columna seleccionada."""
+        try:
+            minimo = self._parse_limit(self.sweep_filter_min.text())
+            maximo = self._parse_limit(self.sweep_filter_max.text())
+        except ValueError:
+            QMessageBox.warning(self, "Advertencia", "Los límites del filtro deben ser numéricos.")
+            return
+        key = self.sweep_filter_column.currentData()
+        if key in {spec.key for spec in self.sweep_model.specs}:
+            self.sweep_model.set_range_filter(key, minimo, maximo)
+    
+    def clear_sweep_filter(self):
+        """Quita el filtro de la tabla de barrido."""
+        self.sweep_filter_min.clear()
+        self.sweep_filter_max.clear()
+        self.sweep_model.clear_filter()
+    
+    @staticmethod
+    def _parse_limit(text):
+        text = text.strip().replace(',', '.')
+        return float(text) if text else None
+    
+    def update_sweep_count(self):
+        """Actualiza el contador de filas visibles de la tabla de barrido."""
+        visibles = self.sweep_model.rowCount()
+        total = self.sweep_model.total_rows()
+        if visibles == total:
+            self.sweep_count_label.setText(f"{total:,} filas")
         else:
-            # Formato para datos regulares
-            item.setBackground(QColor(45, 45, 45))
-            item.setForeground(QColor(220, 220, 220))
-        
-        return item
+            self.sweep_count_label.setText(f"{visibles:,} de {total:,} filas")
     
     def clear_results(self):
         """Limpia todos los resultados mostrados."""
@@ -255,4 +329,6 @@ class ResultsPanel(QWidget):
         self.velocity_label.setText("Velocidad: -- m/s")
         self.reynolds_label.setText("Re: --")
         self.friction_label.setText("f: --")
-        self.results_table.setRowCount(0)
+        self.results_model.clear()
+        self.sweep_model.clear()
+        self.sweep_group.setVisible(False)
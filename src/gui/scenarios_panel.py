@@ -0,0 +1,307 @@
+"""
+Panel de comparación de escenarios.
+
+Este módulo contiene ScenariosPanel, que mantiene un EspacioEscenarios con
+varias alternativas del sistema (diámetros, fluidos, caudales) y las muestra
+lado a lado: una tabla de comparación con una columna por escenario y las
+curvas del sistema superpuestas en un CurveChart.
+
+Los escenarios comparten el catálogo del panel de entrada y se evalúan en
+un hilo de trabajo; solo se recalculan los que cambiaron.
+"""
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableView,
+    QHeaderView, QAbstractItemView, QSplitter, QInputDialog, QMessageBox
+)
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtGui import QBrush, QColor
+
+from ..calculations import EspacioEscenarios
+from .calculation_worker import CalculationDispatcher
+from .curve_chart import ChartSeries, CurveChart
+from .results_model import DATA_BACKGROUND, DATA_FOREGROUND
+
+_ALIGN_NUMBER = int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+_BEST_FOREGROUND = QBrush(QColor(76, 175, 80))
+
+
+class ScenarioComparisonModel(QAbstractTableModel):
+    """Tabla de comparación: una fila por indicador y una columna por escenario.
+
+    En los indicadores con sentido de mejora, el mejor valor de la fila se
+    resalta en verde.
+    """
+
+    # (indicador, valor(sistema, resultados), formato, mejor: 'min', 'max' o None)
+    ROWS = [
+        ("Fluido", lambda s, r: s.fluido.nombre, "{}", None),
+        ("Caudal (L/s)", lambda s, r: s.caudal * 1000, "{:.2f}", None),
+        ("Tramos", lambda s, r: len(s.tramos), "{:,}", None),
+        ("Velocidad (m/s)", lambda s, r: r['velocidad'], "{:.3f}", None),
+        ("Reynolds", lambda s, r: r['numero_reynolds'], "{:.0f}", None),
+        ("Pérdidas Totales (m)", lambda s, r: r['perdidas_totales'], "{:.3f}", 'min'),
+        ("Ht (m)", lambda s, r: r['carga_total_bomba'], "{:.3f}", 'min'),
+        ("NPSHa (m)", lambda s, r: r['NPSHa'], "{:.3f}", 'max'),
+        ("Potencia Bomba (kW)", lambda s, r: r['potencia_bomba_kW'], "{:.3f}", 'min'),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names = []
+        self._values = []  # por escenario: lista de valores por fila
+        self._best = {}  # fila -> columna con el mejor valor
+
+    def set_results(self, escenarios, resultados):
+        """Reemplaza los escenarios mostrados.
+
+        Args:
+            escenarios: Escenarios en el orden de las columnas
+            resultados (dict): nombre -> ResultadoEscenario
+        """
+        self.beginResetModel()
+        self._names = [escenario.nombre for escenario in escenarios]
+        self._values = [
+            [value(escenario.sistema, resultados[escenario.nombre].resultados)
+             for _, value, _, _ in self.ROWS]
+            for escenario in escenarios
+        ]
+        self._best = {}
+        for row, (_, _, _, best) in enumerate(self.ROWS):
+            if best and len(self._values) > 1:
+                column_values = [values[row] for values in self._values]
+                choose = min if best == 'min' else max
+                self._best[row] = column_values.index(choose(column_values))
+        self.endResetModel()
+
+    def clear(self):
+        self.set_results([], {})
+
+    def scenario_name(self, column):
+        return self._names[column]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ROWS)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.ROWS[row][2].format(self._values[column][row])
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return _ALIGN_NUMBER
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return DATA_BACKGROUND
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return _BEST_FOREGROUND if self._best.get(row) == column else DATA_FOREGROUND
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return self._names[section]
+            return self.ROWS[section][0]
+        return None
+
+
+class ScenariosPanel(QWidget):
+    """Pestaña de escenarios: comparación en tabla y curvas superpuestas.
+
+    Señales:
+        add_current_requested: Se pide agregar el sistema configurado como escenario
+    """
+
+    add_current_requested = pyqtSignal()
+
+    # Caudal mostrado en L/s (los cálculos usan m³/s)
+    FLOW_SCALE = 1000.0
+
+    def __init__(self, loader=None):
+        super().__init__()
+        self.workspace = EspacioEscenarios(loader)
+        self.dispatcher = CalculationDispatcher(self)
+        self.dispatcher.result_ready.connect(self.show_results)
+        self.dispatcher.failed.connect(self.on_evaluation_failed)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        buttons = QHBoxLayout()
+        add_button = QPushButton("Agregar Sistema Actual")
+        add_button.setProperty("class", "primary")
+        add_button.clicked.connect(self.add_current_requested)
+        diameter_button = QPushButton("Variante de Diámetro...")
+        diameter_button.clicked.connect(self.add_diameter_variant)
+        fluid_button = QPushButton("Variante de Fluido...")
+        fluid_button.clicked.connect(self.add_fluid_variant)
+        flow_button = QPushButton("Variante de Caudal...")
+        flow_button.clicked.connect(self.add_flow_variant)
+        remove_button = QPushButton("Eliminar")
+        remove_button.setProperty("class", "danger")
+        remove_button.clicked.connect(self.remove_selected)
+        for button in (add_button, diameter_button, fluid_button, flow_button, remove_button):
+            button.setMinimumHeight(35)
+            buttons.addWidget(button)
+        buttons.addStretch()
+        layout.addLayout(buttons)
+
+        hint = QLabel("Las variantes se crean a partir del escenario seleccionado en la tabla")
+        hint.setStyleSheet("color: #999; font-size: 10px;")
+        layout.addWidget(hint)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+
+        self.comparison_model = ScenarioComparisonModel(self)
+        self.comparison_table = QTableView()
+        self.comparison_table.setModel(self.comparison_model)
+        self.comparison_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectColumns)
+        self.comparison_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.comparison_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.comparison_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.comparison_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.ResizeToContents)
+        splitter.addWidget(self.comparison_table)
+
+        self.chart = CurveChart()
+        self.chart.set_axis_titles("Caudal (L/s)", "Carga del sistema (m)")
+        splitter.addWidget(self.chart)
+        splitter.setSizes([260, 400])
+        layout.addWidget(splitter)
+
+        self.status_label = QLabel("Sin escenarios")
+        self.status_label.setStyleSheet("color: #999; font-size: 10px;")
+        layout.addWidget(self.status_label)
+
+    # --- Escenarios ------------------------------------------------------
+
+    def add_scenario(self, sistema, nombre=None):
+        """Agrega un sistema como escenario y recalcula la comparación."""
+        if nombre is None:
+            nombre = self._unique_name(f"Escenario {len(self.workspace) + 1}")
+        self.workspace.agregar(nombre, sistema)
+        self.evaluate()
+
+    def base_scenario(self):
+        """Escenario seleccionado en la tabla (o el primero)."""
+        columns = self.comparison_table.selectionModel().selectedColumns()
+        if columns:
+            return self.comparison_model.scenario_name(columns[0].column())
+        names = self.workspace.nombres()
+        if not names:
+            QMessageBox.warning(self, "Advertencia", "Primero agregue un escenario.")
+            return None
+        return names[0]
+
+    def add_diameter_variant(self):
+        base = self.base_scenario()
+        if base is None:
+            return
+        tramos = self.workspace[base].sistema.tramos
+        actual = tramos[0].diametro * 1000 if tramos else 100.0
+        diametro, ok = QInputDialog.getDouble(
+            self, "Variante de Diámetro", f"Diámetro de todos los tramos de '{base}' (mm):",
+            actual, 1.0, 10_000.0, 1
+        )
+        if ok:
+            self._add_variant(self.workspace.variante_diametro, base,
+                              f"{base} · D={diametro:g} mm", diametro / 1000.0)
+
+    def add_fluid_variant(self):
+        base = self.base_scenario()
+        if base is None:
+            return
+        fluido, ok = QInputDialog.getItem(
+            self, "Variante de Fluido", f"Fluido para '{base}':",
+            list(self.workspace.fluidos), 0, False
+        )
+        if ok:
+            self._add_variant(self.workspace.variante_fluido, base, f"{base} · {fluido}", fluido)
+
+    def add_flow_variant(self):
+        base = self.base_scenario()
+        if base is None:
+            return
+        caudal, ok = QInputDialog.getDouble(
+            self, "Variante de Caudal", f"Caudal para '{base}' (L/s):",
+            self.workspace[base].sistema.caudal * self.FLOW_SCALE, 0.001, 1_000_000.0, 3
+        )
+        if ok:
+            self._add_variant(
+                lambda base, nombre, valor: self.workspace.variante(base, nombre, caudal=valor),
+                base, f"{base} · Q={caudal:g} L/s", caudal / self.FLOW_SCALE
+            )
+
+    def _add_variant(self, crear, base, nombre, valor):
+        try:
+            crear(base, self._unique_name(nombre), valor)
+        except ValueError as e:
+            QMessageBox.warning(self, "Advertencia", str(e))
+            return
+        self.evaluate()
+
+    def remove_selected(self):
+        columns = self.comparison_table.selectionModel().selectedColumns()
+        if not columns:
+            return
+        self.workspace.eliminar(self.comparison_model.scenario_name(columns[0].column()))
+        self.evaluate()
+
+    def clear_scenarios(self):
+        """Elimina todos los escenarios."""
+        self.dispatcher.cancel()
+        for nombre in self.workspace.nombres():
+            self.workspace.eliminar(nombre)
+        self.comparison_model.clear()
+        self.chart.clear()
+        self.status_label.setText("Sin escenarios")
+
+    def _unique_name(self, nombre):
+        candidato, n = nombre, 2
+        while candidato in self.workspace:
+            candidato = f"{nombre} ({n})"
+            n += 1
+        return candidato
+
+    # --- Evaluación ------------------------------------------------------
+
+    def evaluate(self):
+        """Evalúa en segundo plano los escenarios que cambiaron."""
+        if not len(self.workspace):
+            self.comparison_model.clear()
+            self.chart.clear()
+            self.status_label.setText("Sin escenarios")
+            return
+        workspace = self.workspace
+        self.status_label.setText(f"Calculando {len(workspace)} escenario(s)...")
+
+        def evaluar(token, progreso):
+            escenarios = list(workspace)
+            resultados = workspace.evaluar([e.nombre for e in escenarios], progreso, token)
+            return escenarios, resultados
+
+        self.dispatcher.submit(evaluar)
+
+    def show_results(self, resultado):
+        escenarios, resultados = resultado
+        self.comparison_model.set_results(escenarios, resultados)
+        self.chart.set_series(self.build_series(escenarios, resultados))
+        self.status_label.setText(f"{len(escenarios)} escenario(s) comparados")
+
+    def build_series(self, escenarios, resultados):
+        """Curva del sistema de cada escenario, con un color por escenario."""
+        series = []
+        total = max(1, len(escenarios))
+        for i, escenario in enumerate(escenarios):
+            curvas = resultados[escenario.nombre].curvas
+            if not curvas:
+                continue
+            color = QColor.fromHsv(int(360 * i / total) % 360, 200, 220)
+            caudales = [q * self.FLOW_SCALE for q in curvas['caudal']]
+            series.append(ChartSeries(escenario.nombre, caudales, curvas['carga_sistema'],
+                                      color, 'left', Qt.PenStyle.SolidLine))
+        return series
+
+    def on_evaluation_failed(self, mensaje):
+        self.status_label.setText(f"Error al evaluar los escenarios: {mensaje}")
@@ -8,10 +8,120 @@ elevaciones y controles de zoom y navegación.
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGraphicsView, QGraphicsScene, 
     QGraphicsRectItem, QGraphicsEllipseItem, QGraphicsTextItem, QGraphicsLineItem,
-    QGraphicsPolygonItem, QLabel, QPushButton
+    QGraphicsPolygonItem, QGraphicsItemGroup, QLabel, QPushButton
 )
-from PyQt6.QtCore import Qt, QPointF
-from PyQt6.QtGui import QPen, QBrush, QColor, QFont, QPainter, QPolygonF
+from functools import lru_cache
+
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QPen, QBrush, QColor, QFont, QPainter, QPainterPath, QPolygonF
+
+from ..calculations.instrumentacion import span
+from . import diagram_layout
+from .diagram_layout import compute_layout, fitting_positions
+from .lod_items import DetailLayerItem, FittingStyle, PipeBatchItem, TextStyle
+
+
+# Estilos compartidos: cada combinación se crea una sola vez
+@lru_cache(maxsize=None)
+def _color(r, g, b):
+    return QColor(r, g, b)
+
+
+@lru_cache(maxsize=256)
+def _pen(r, g, b, width, style=Qt.PenStyle.SolidLine):
+    return QPen(_color(r, g, b), width, style)
+
+
+@lru_cache(maxsize=None)
+def _path_pen(r, g, b, width):
+    # Uniones en ángulo: un path continuo se ve igual que líneas con extremos cuadrados
+    pen = QPen(_color(r, g, b), width)
+    pen.setJoinStyle(Qt.PenJoinStyle.MiterJoin)
+    return pen
+
+
+@lru_cache(maxsize=None)
+def _lighter_pen(r, g, b):
+    return QPen(_color(r, g, b).lighter(150), 1)
+
+
+@lru_cache(maxsize=None)
+def _brush(r, g, b):
+    return QBrush(_color(r, g, b))
+
+
+@lru_cache(maxsize=None)
+def _font(size, bold=False):
+    if bold:
+        return QFont("Arial", size, QFont.Weight.Bold)
+    return QFont("Arial", size)
+
+
+@lru_cache(maxsize=None)
+def _fitting_appearance(fitting_type):
+    """Forma, colores (relleno, borde), etiqueta y desplazamiento de la etiqueta."""
+    if 'codo' in fitting_type:
+        return 'square', (200, 100, 100), (255, 150, 150), "Codo", 15
+    if 'valvula' in fitting_type:
+        return 'circle', (100, 200, 100), (150, 255, 150), "Válvula", 20
+    if 'tee' in fitting_type:
+        return 'tee', (200, 200, 100), (255, 255, 150), "Tee", 10
+    if 'entrada_tanque' in fitting_type:
+        return 'triangle', (150, 150, 200), (200, 200, 255), "Entrada", 20
+    return 'circle', (150, 150, 200), (200, 200, 255), "Accesorio", 25
+
+
+@lru_cache(maxsize=None)
+def _fitting_style(fitting_type):
+    shape, fill, outline, text, offset = _fitting_appearance(fitting_type)
+    return FittingStyle(shape, _brush(*fill), _pen(*outline, 2), text, offset)
+
+
+def _set_text(item, text):
+    """Cambia el texto de un QGraphicsTextItem solo si es distinto."""
+    if item.toPlainText() != text:
+        item.setPlainText(text)
+
+
+def _same_tramos(previous, current):
+    """Indica si dos listas de tramos son iguales (comparando primero por identidad)."""
+    return (previous is not None and len(previous) == len(current)
+            and all(a is b or a == b for a, b in zip(previous, current)))
+
+
+class _TramoItems:
+    """Elementos de la escena asociados a un tramo de tubería.
+    
+    Todos los elementos son hijos de un grupo ubicado en el inicio del tramo,
+    por lo que desplazar el tramo completo es una sola llamada a setPos.
+    """
+    __slots__ = ('tramo', 'origin', 'fittings', 'group', 'pipe', 'border', 'label', 'fitting_items')
+    
+    def __init__(self, group, pipe, border, label):
+        self.tramo = None
+        self.origin = None
+        self.fittings = None
+        self.group = group
+        self.pipe = pipe
+        self.border = border
+        self.label = label
+        self.fitting_items = []
+
+
+class _BatchBlock:
+    """Elementos de la escena de un bloque de BATCH_SIZE tramos (modo por lotes).
+    
+    Los paths y la capa de detalle usan coordenadas locales al primer
+    vértice del bloque, de modo que si solo cambia un tramo anterior el
+    bloque se desplaza con setPos sin reconstruirse.
+    """
+    __slots__ = ('tramos', 'fittings', 'origin', 'items')
+    
+    def __init__(self):
+        self.tramos = None
+        self.fittings = None
+        self.origin = None
+        self.items = []
 
 
 class SystemViewer(QWidget):
@@ -23,12 +133,33 @@ class SystemViewer(QWidget):
     - Etiquetas descriptivas para cada componente
     - Controles de zoom y navegación
     - Leyenda completa de símbolos utilizados
+    
+    Las coordenadas se calculan con diagram_layout (sin Qt); la escena
+    conserva un mapeo de tramos a elementos gráficos, de modo que
+    al editar el sistema solo se crean, eliminan o mueven los elementos que
+    cambiaron. Plumas, fuentes y pinceles se comparten entre elementos.
+    
+    A partir de BATCH_THRESHOLD tramos se usa el modo por lotes: cada bloque
+    de BATCH_SIZE tramos agrupa sus tuberías en paths por diámetro y pinta
+    etiquetas y accesorios desde una capa con nivel de detalle (ver
+    lod_items). Al editar solo se reconstruyen los bloques que cambiaron; los
+    posteriores se desplazan.
     """
     
+    SCALE = diagram_layout.SCALE
+    START_X = diagram_layout.START_X
+    START_Y = diagram_layout.START_Y
+    TANK_SIZE = diagram_layout.TANK_SIZE
+    LEGEND_X = diagram_layout.LEGEND_X
+    LEGEND_Y = diagram_layout.LEGEND_Y
+    BATCH_THRESHOLD = 2000  # tramos a partir de los cuales se dibuja por lotes
+    BATCH_SIZE = 256  # tramos por bloque de paths en el modo por lotes
+    
     def __init__(self):
         super().__init__()
         self.sistema = None
         self.zoom_factor = 1.0
+        self._reset_scene_state()
         self.init_ui()
     
     def init_ui(self):
@@ -105,110 +236,318 @@ class SystemViewer(QWidget):
         """Limpia la visualización y elimina el sistema actual."""
         self.sistema = None
         self.graphics_scene.clear()
+        self._reset_scene_state()
         self.info_label.setText("Sin sistema configurado")
     
+    def _reset_scene_state(self):
+        """Olvida las referencias a elementos de la escena (tras limpiarla)."""
+        self._tramo_items = []
+        self._batch_blocks = []
+        self._batched = False
+        self._static_items = None
+        self._content_rect = QRectF()
+    
     def draw_system(self):
         """Dibuja el diagrama completo del sistema de tuberías.
         
         Incluye tuberías, accesorios, tanques, elevaciones y línea de referencia.
+        La escena se actualiza de forma incremental: solo se crean, eliminan o
+        mueven los elementos de los tramos que cambiaron.
         """
         if not self.sistema:
             return
         
-        self.graphics_scene.clear()
+        with span('viewer.escena'):
+            self.sync_scene()
         
-        # Configurar escala y posición
-        scale = 60  # 60 pixels por metro (más grande)
-        start_x = 80
-        start_y = 400  # Más abajo para dejar espacio para elevación
-        
-        current_x = start_x
-        current_y = start_y
-        
-        # Calcular posición Y inicial basada en elevación P1
-        current_y = start_y - (self.sistema.elevacion_punto1 * scale)
-        
-        # Dibujar punto 1 (tanque de succión)
-        self.draw_tank(current_x, current_y, "P1", f"Succión\nZ={self.sistema.elevacion_punto1}m")
-        
-        # Guardar posición inicial para línea de elevación
-        elevation_start_x = current_x
-        elevation_start_y = current_y
-        
-        # Dibujar tramos de tubería
-        for i, tramo in enumerate(self.sistema.tramos):
-            if tramo.orientacion == 'horizontal':
-                # Dibujar tramo horizontal (misma elevación)
-                end_x = current_x + tramo.longitud * scale
-                self.draw_pipe(current_x, current_y, end_x, current_y, tramo.diametro * scale)
-                
-                # Dibujar accesorios en este tramo
-                self.draw_fittings_on_pipe(current_x, current_y, end_x, current_y, tramo.diametro * scale, i)
-                
-                # Agregar etiqueta de longitud
-                mid_x = (current_x + end_x) / 2
-                length_text = QGraphicsTextItem(f"{tramo.longitud}m")
-                length_text.setDefaultTextColor(QColor(255, 255, 255))
-                length_text.setFont(QFont("Arial", 10))
-                length_text.setPos(mid_x - 20, current_y + 30)
-                self.graphics_scene.addItem(length_text)
-                
-                current_x = end_x
-            else:  # vertical
-                # Dibujar tramo vertical (independiente de la elevación)
-                end_y = current_y - tramo.longitud * scale  # hacia arriba es negativo
-                self.draw_pipe(current_x, current_y, current_x, end_y, tramo.diametro * scale)
-                
-                # Dibujar accesorios en este tramo
-                self.draw_fittings_on_pipe(current_x, current_y, current_x, end_y, tramo.diametro * scale, i)
-                
-                # Agregar etiqueta de longitud
-                mid_y = (current_y + end_y) / 2
-                length_text = QGraphicsTextItem(f"{tramo.longitud}m")
-                length_text.setDefaultTextColor(QColor(255, 255, 255))
-                length_text.setFont(QFont("Arial", 10))
-                length_text.setPos(current_x + 30, mid_y - 10)
-                self.graphics_scene.addItem(length_text)
-                
-                current_y = end_y
-        
-        # Calcular posición Y final basada en elevación P2 (independiente de los tramos)
-        final_y = start_y - (self.sistema.elevacion_punto2 * scale)
-        
-        # Dibujar línea de elevación (diferencia de altura entre puntos)
-        if abs(self.sistema.elevacion_punto2 - self.sistema.elevacion_punto1) > 0.1:  # Si hay diferencia significativa
-            # Línea de elevación con estilo diferente
-            elevation_line = QGraphicsLineItem(elevation_start_x, elevation_start_y, current_x, final_y)
-            elevation_line.setPen(QPen(QColor(255, 200, 100), 4))  # Línea amarilla gruesa para elevación
-            self.graphics_scene.addItem(elevation_line)
-            
-            # Etiqueta de cambio de elevación
-            mid_elev_x = (elevation_start_x + current_x) / 2
-            mid_elev_y = (elevation_start_y + final_y) / 2
+        # Ajustar la vista
+        with span('viewer.fitInView'):
+            self.graphics_view.fitInView(self._content_rect, Qt.AspectRatioMode.KeepAspectRatio)
+        self.update_cache_modes()
+    
+    def sync_scene(self):
+        """Sincroniza los elementos de la escena con el sistema actual."""
+        num_tramos = len(self.sistema.tramos)
+        batched = num_tramos >= self.BATCH_THRESHOLD
+        # Al cambiar de modo, o si desaparece la mayoría de los tramos,
+        # reconstruir es más rápido que eliminar uno a uno
+        if batched != self._batched or len(self._tramo_items) > 2 * num_tramos + 100:
+            self.graphics_scene.clear()
+            self._reset_scene_state()
+            self._batched = batched
+        
+        if self._static_items is None:
+            self._static_items = self.create_static_items()
+        
+        layout = compute_layout(self.sistema, self.SCALE, self.START_X, self.START_Y)
+        if batched:
+            self.sync_batch_items(layout)
+        else:
+            self.sync_tramo_items(layout)
+        self.update_static_items(layout)
+        
+        # Fijar el rectángulo de la escena evita que Qt lo recalcule recorriendo los elementos
+        self._content_rect = QRectF(*layout.bounds)
+        self.graphics_scene.setSceneRect(self._content_rect)
+    
+    def sync_tramo_items(self, layout):
+        """Sincroniza los elementos individuales de cada tramo (modo incremental).
+        
+        Args:
+            layout (DiagramLayout): Geometría del diagrama
+        """
+        tramos = self.sistema.tramos
+        
+        for i, tramo in enumerate(tramos):
+            fittings = layout.tramo_fittings[i]
+            origin = (layout.xs[i], layout.ys[i])
             
-            # Fondo para la etiqueta de elevación
-            elev_bg = QGraphicsRectItem(mid_elev_x - 5, mid_elev_y - 15, 120, 25)
-            elev_bg.setBrush(QBrush(QColor(50, 50, 50)))
-            elev_bg.setPen(QPen(QColor(255, 200, 100), 2))
-            self.graphics_scene.addItem(elev_bg)
+            if i < len(self._tramo_items):
+                entry = self._tramo_items[i]
+                if entry.tramo is not tramo and entry.tramo != tramo:
+                    self.update_tramo_items(entry, tramo, fittings)
+                elif entry.fittings != fittings:
+                    self.update_fitting_items(entry, tramo, fittings)
+            else:
+                entry = self.create_tramo_items(tramo, fittings)
+                self._tramo_items.append(entry)
             
-            elev_text = QGraphicsTextItem(f"ΔZ = {abs(self.sistema.elevacion_punto2 - self.sistema.elevacion_punto1):.1f}m")
-            elev_text.setDefaultTextColor(QColor(255, 200, 100))
-            elev_text.setFont(QFont("Arial", 11, QFont.Weight.Bold))
-            elev_text.setPos(mid_elev_x, mid_elev_y - 12)
-            self.graphics_scene.addItem(elev_text)
+            # Los tramos posteriores a una edición solo se desplazan
+            if entry.origin != origin:
+                entry.group.setPos(*origin)
+                entry.origin = origin
+        
+        # Eliminar los tramos sobrantes
+        while len(self._tramo_items) > len(tramos):
+            self.graphics_scene.removeItem(self._tramo_items.pop().group)
+    
+    def sync_batch_items(self, layout):
+        """Sincroniza los bloques de tramos en modo por lotes (sistemas muy grandes).
         
-        # Dibujar punto 2 (tanque de descarga)
-        self.draw_tank(current_x, final_y, "P2", f"Descarga\nZ={self.sistema.elevacion_punto2}m")
+        Los tramos de un mismo diámetro dentro de cada bloque de BATCH_SIZE
+        tramos forman un solo path, y las etiquetas y accesorios del bloque
+        van a una capa de detalle: la escena queda con unos pocos elementos
+        por bloque en lugar de varios por tramo. Solo se reconstruyen los
+        bloques cuyos tramos o accesorios cambiaron; los demás, si se movió
+        su primer vértice, se desplazan con setPos.
+        
+        Args:
+            layout (DiagramLayout): Geometría del diagrama
+        """
+        tramos = self.sistema.tramos
+        batch_size = self.BATCH_SIZE
+        
+        for index, start in enumerate(range(0, len(tramos), batch_size)):
+            end = min(start + batch_size, len(tramos))
+            block_tramos = tramos[start:end]
+            fittings = layout.tramo_fittings[start:end]
+            origin = (layout.xs[start], layout.ys[start])
+            
+            if index < len(self._batch_blocks):
+                block = self._batch_blocks[index]
+                if not _same_tramos(block.tramos, block_tramos) or block.fittings != fittings:
+                    self.build_batch_block(block, layout, start, end)
+            else:
+                block = _BatchBlock()
+                self.build_batch_block(block, layout, start, end)
+                self._batch_blocks.append(block)
+            block.tramos = block_tramos
+            block.fittings = fittings
+            
+            if block.origin != origin:
+                for item in block.items:
+                    item.setPos(*origin)
+                block.origin = origin
+        
+        # Eliminar los bloques sobrantes
+        num_blocks = -(-len(tramos) // batch_size)
+        while len(self._batch_blocks) > num_blocks:
+            for item in self._batch_blocks.pop().items:
+                self.graphics_scene.removeItem(item)
+    
+    def build_batch_block(self, block, layout, start, end):
+        """Recrea los paths y la capa de detalle de los tramos start..end-1.
         
-        # Dibujar línea de referencia (elevación 0)
-        self.draw_reference_line(start_y)
+        Args:
+            block (_BatchBlock): Bloque a reconstruir (sus elementos se reemplazan)
+            layout (DiagramLayout): Geometría del diagrama
+            start (int): Primer tramo del bloque
+            end (int): Tramo siguiente al último del bloque
+        """
+        for item in block.items:
+            self.graphics_scene.removeItem(item)
+        block.items = []
+        block.origin = None  # los elementos nuevos se ubican al sincronizar
+        
+        xs, ys = layout.xs, layout.ys
+        ox, oy = xs[start], ys[start]
+        paths = {}  # diámetro -> QPainterPath
+        previous = None
+        for i in range(start, end):
+            # Tramos consecutivos del mismo diámetro se unen en un solo subpath
+            diameter = layout.diameters[i]
+            path = paths.get(diameter)
+            if path is None:
+                path = paths[diameter] = QPainterPath()
+            if diameter != previous:
+                path.moveTo(xs[i] - ox, ys[i] - oy)
+            path.lineTo(xs[i + 1] - ox, ys[i + 1] - oy)
+            previous = diameter
+        
+        for diameter, path in paths.items():
+            item = PipeBatchItem(path, _path_pen(180, 180, 180, diameter),
+                                 _path_pen(100, 100, 100, diameter + 4))
+            self.graphics_scene.addItem(item)
+            block.items.append(item)
+        
+        detail = DetailLayerItem(
+            TextStyle(_font(10), _pen(255, 255, 255, 1)),
+            TextStyle(_font(8), _pen(255, 255, 255, 1))
+        )
+        for i in range(start, end):
+            x, y = layout.label_position(i)
+            detail.add_label(x - ox, y - oy, f"{layout.lengths[i]}m")
+            fittings = layout.tramo_fittings[i]
+            if fittings:
+                size = layout.diameters[i] * 2.0
+                for x, y, fitting_type in fitting_positions(
+                        xs[i] - ox, ys[i] - oy, xs[i + 1] - ox, ys[i + 1] - oy, fittings):
+                    detail.add_fitting(x, y, size, _fitting_style(fitting_type))
+        detail.finalize()
+        # Sobre las tuberías de todos los bloques y bajo los elementos fijos de descarga
+        detail.setZValue(0.5)
+        self.graphics_scene.addItem(detail)
+        block.items.append(detail)
+    
+    def create_static_items(self):
+        """Crea los elementos que persisten entre actualizaciones.
         
-        # Agregar leyenda mejorada
+        Returns:
+            dict: Tanques, línea de elevación, línea de referencia y leyenda
+        """
+        items = {}
+        items['tank1'] = self.draw_tank(0, 0, "P1", "")
+        items['tank2'] = self.draw_tank(0, 0, "P2", "")
+        
+        # Línea de elevación con estilo diferente (amarilla gruesa)
+        items['elev_line'] = self._add_line(0, 0, 0, 0, _pen(255, 200, 100, 4))
+        items['elev_bg'] = QGraphicsRectItem()
+        items['elev_bg'].setBrush(_brush(50, 50, 50))
+        items['elev_bg'].setPen(_pen(255, 200, 100, 2))
+        self.graphics_scene.addItem(items['elev_bg'])
+        items['elev_text'] = self._add_text("", _font(11, True), _color(255, 200, 100), 0, 0)
+
+        # Conservar el orden de dibujo original: descarga y elevación sobre los tramos
+        for item in (*items['tank2'], items['elev_line'], items['elev_bg'], items['elev_text']):
+            item.setZValue(1)
+
+        items['reference'] = self.draw_reference_line(self.START_Y)
         self.draw_legend()
+        return items
+    
+    def update_static_items(self, layout):
+        """Mueve tanques, línea de elevación y referencia a sus nuevas posiciones.
         
-        # Ajustar la vista
-        self.graphics_view.fitInView(self.graphics_scene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
+        Args:
+            layout (DiagramLayout): Geometría del diagrama
+        """
+        (x1, y1), (x2, y2) = layout.tank1, layout.tank2
+        reference_y = layout.reference_y
+        items = self._static_items
+        self.move_tank(items['tank1'], x1, y1, "P1",
+                       f"Succión\nZ={self.sistema.elevacion_punto1}m")
+        self.move_tank(items['tank2'], x2, y2, "P2",
+                       f"Descarga\nZ={self.sistema.elevacion_punto2}m")
+        
+        # Línea de elevación (diferencia de altura entre puntos)
+        delta_z = abs(self.sistema.elevacion_punto2 - self.sistema.elevacion_punto1)
+        visible = delta_z > 0.1  # Si hay diferencia significativa
+        for key in ('elev_line', 'elev_bg', 'elev_text'):
+            items[key].setVisible(visible)
+        if visible:
+            mid_elev_x = (x1 + x2) / 2
+            mid_elev_y = (y1 + y2) / 2
+            items['elev_line'].setLine(x1, y1, x2, y2)
+            items['elev_bg'].setRect(mid_elev_x - 5, mid_elev_y - 15, 120, 25)
+            _set_text(items['elev_text'], f"ΔZ = {delta_z:.1f}m")
+            items['elev_text'].setPos(mid_elev_x, mid_elev_y - 12)
+        
+        # Línea de referencia (elevación 0)
+        ref_line, ref_text = items['reference']
+        ref_line.setLine(50, reference_y, layout.reference_end_x, reference_y)
+        ref_text.setPos(55, reference_y + 5)
+    
+    def create_tramo_items(self, tramo, fittings):
+        """Crea la tubería, la etiqueta y los accesorios de un tramo.
+        
+        Returns:
+            _TramoItems: Referencias a los elementos creados
+        """
+        group = QGraphicsItemGroup()
+        self.graphics_scene.addItem(group)
+        pipe, border = self.draw_pipe(0, 0, 0, 0, tramo.diametro * self.SCALE, parent=group)
+        label = self._add_text("", _font(10), _color(255, 255, 255), 0, 0, parent=group)
+        entry = _TramoItems(group, pipe, border, label)
+        self.update_tramo_items(entry, tramo, fittings)
+        return entry
+    
+    def tramo_vector(self, tramo):
+        """Desplazamiento (dx, dy) en pixels desde el inicio al final del tramo."""
+        if tramo.orientacion == 'horizontal':
+            return tramo.longitud * self.SCALE, 0.0
+        return 0.0, -tramo.longitud * self.SCALE  # hacia arriba es negativo
+    
+    def update_tramo_items(self, entry, tramo, fittings):
+        """Ajusta los elementos de un tramo existente (coordenadas locales al tramo)."""
+        dx, dy = self.tramo_vector(tramo)
+        diameter = tramo.diametro * self.SCALE
+        
+        if entry.tramo is None or entry.tramo.diametro != tramo.diametro:
+            entry.pipe.setPen(_pen(180, 180, 180, diameter))
+            entry.border.setPen(_pen(100, 100, 100, diameter + 4))
+        entry.pipe.setLine(0, 0, dx, dy)
+        entry.border.setLine(0, 0, dx, dy)
+        
+        # Etiqueta de longitud
+        _set_text(entry.label, f"{tramo.longitud}m")
+        if dy == 0:  # Horizontal
+            entry.label.setPos(dx / 2 - 20, 30)
+        else:  # Vertical
+            entry.label.setPos(30, dy / 2 - 10)
+        
+        entry.fittings = None  # la geometría cambió: recrear símbolos
+        self.update_fitting_items(entry, tramo, fittings)
+    
+    def update_fitting_items(self, entry, tramo, fittings):
+        """Recrea los símbolos de accesorios de un tramo."""
+        for item in entry.fitting_items:
+            self.graphics_scene.removeItem(item)
+        dx, dy = self.tramo_vector(tramo)
+        entry.fitting_items = self.draw_fittings_on_pipe(
+            0, 0, dx, dy, tramo.diametro * self.SCALE, fittings, parent=entry.group
+        )
+        entry.fittings = fittings
+        entry.tramo = tramo
+    
+    def _add_item(self, item, parent=None):
+        """Agrega un elemento a la escena, o como hijo de un grupo si se indica."""
+        if parent is None:
+            self.graphics_scene.addItem(item)
+        else:
+            item.setParentItem(parent)
+        return item
+    
+    def _add_line(self, x1, y1, x2, y2, pen, parent=None):
+        line = QGraphicsLineItem(x1, y1, x2, y2)
+        line.setPen(pen)
+        return self._add_item(line, parent)
+    
+    def _add_text(self, text, font, color, x, y, parent=None):
+        item = QGraphicsTextItem(text)
+        item.setDefaultTextColor(color)
+        item.setFont(font)
+        item.setPos(x, y)
+        return self._add_item(item, parent)
     
     def draw_tank(self, x, y, label, description):
         """Dibuja un tanque en la posición especificada.
@@ -218,235 +557,141 @@ class SystemViewer(QWidget):
             y (float): Posición Y del centro del tanque
             label (str): Etiqueta del tanque (P1, P2)
             description (str): Descripción con elevación
+            
+        Returns:
+            tuple: (rectángulo, texto) del tanque
         """
         # Rectángulo del tanque
-        tank_size = 50  # Más grande
-        tank = QGraphicsRectItem(x - tank_size//2, y - tank_size//2, tank_size, tank_size)
-        tank.setBrush(QBrush(QColor(70, 130, 180)))  # Azul más oscuro
-        tank.setPen(QPen(QColor(100, 150, 200), 3))  # Borde más grueso
+        tank = QGraphicsRectItem()
+        tank.setBrush(_brush(70, 130, 180))  # Azul más oscuro
+        tank.setPen(_pen(100, 150, 200, 3))  # Borde más grueso
         self.graphics_scene.addItem(tank)
         
         # Etiqueta del tanque
-        text = QGraphicsTextItem(f"{label}\n{description}")
-        text.setDefaultTextColor(QColor(255, 255, 255))
-        text.setFont(QFont("Arial", 11, QFont.Weight.Bold))
+        text = self._add_text("", _font(11, True), _color(255, 255, 255), 0, 0)
+        
+        items = (tank, text)
+        self.move_tank(items, x, y, label, description)
+        return items
+    
+    def move_tank(self, items, x, y, label, description):
+        """Mueve un tanque existente y actualiza su etiqueta."""
+        tank, text = items
+        tank_size = self.TANK_SIZE
+        tank.setRect(x - tank_size//2, y - tank_size//2, tank_size, tank_size)
+        _set_text(text, f"{label}\n{description}")
         text.setPos(x - 25, y + tank_size//2 + 10)
-        self.graphics_scene.addItem(text)
     
-    def draw_pipe(self, x1, y1, x2, y2, diameter):
+    def draw_pipe(self, x1, y1, x2, y2, diameter, parent=None):
         """Dibuja una tubería entre dos puntos con el diámetro especificado.
         
         Args:
             x1, y1 (float): Coordenadas del punto inicial
             x2, y2 (float): Coordenadas del punto final
             diameter (float): Diámetro visual de la tubería
+            parent (QGraphicsItem): Grupo contenedor opcional
+            
+        Returns:
+            tuple: (línea principal, línea de borde)
         """
         # Línea principal (más gruesa)
-        pipe = QGraphicsLineItem(x1, y1, x2, y2)
-        pipe.setPen(QPen(QColor(180, 180, 180), diameter))
-        self.graphics_scene.addItem(pipe)
+        pipe = self._add_line(x1, y1, x2, y2, _pen(180, 180, 180, diameter), parent)
         
         # Línea de borde (más visible)
-        border = QGraphicsLineItem(x1, y1, x2, y2)
-        border.setPen(QPen(QColor(100, 100, 100), diameter + 4))
-        self.graphics_scene.addItem(border)
+        border = self._add_line(x1, y1, x2, y2, _pen(100, 100, 100, diameter + 4), parent)
+        return pipe, border
     
-    def draw_fittings_on_pipe(self, x1, y1, x2, y2, pipe_diameter, tramo_index):
-        """Dibuja accesorios sobre una tubería específica con ubicación inteligente.
+    def draw_fittings_on_pipe(self, x1, y1, x2, y2, pipe_diameter, fittings, parent=None):
+        """Dibuja accesorios sobre una tubería específica.
         
         Args:
             x1, y1 (float): Coordenadas del punto inicial de la tubería
             x2, y2 (float): Coordenadas del punto final de la tubería
             pipe_diameter (float): Diámetro de la tubería
-            tramo_index (int): Índice del tramo para ubicación inteligente
-        """
-        if not self.sistema or not self.sistema.accesorios:
-            return
-        
-        # Determinar qué accesorios van en este tramo
-        fittings_for_this_tramo = []
-        
-        # Debug: imprimir información del tramo
-        print(f"DEBUG: Tramo {tramo_index}, x1={x1}, y1={y1}, x2={x2}, y2={y2}")
-        print(f"DEBUG: Es vertical: {x1 == x2}, Es horizontal: {x1 != x2}")
-        
-        for accesorio in self.sistema.accesorios:
-            if accesorio.cantidad > 0:
-                # Lógica de ubicación según tipo de accesorio
-                accesorio_type = accesorio.tipo.value
-                print(f"DEBUG: Accesorio encontrado: {accesorio_type}, cantidad: {accesorio.cantidad}")
-                
-                # Entrada de tanque: siempre en el primer tramo
-                if 'entrada_tanque' in accesorio_type and tramo_index == 0:
-                    print(f"DEBUG: Entrada tanque asignada al tramo {tramo_index}")
-                    fittings_for_this_tramo.extend([accesorio_type] * accesorio.cantidad)
-                
-                # Codos: en cambios de dirección (tramos verticales)
-                elif 'codo' in accesorio_type and tramo_index > 0:
-                    # Verificar si este tramo es vertical
-                    if x1 == x2:  # Tramo vertical
-                        print(f"DEBUG: Codo asignado al tramo vertical {tramo_index}")
-                        fittings_for_this_tramo.extend([accesorio_type] * accesorio.cantidad)
-                
-                # Salida de tanque: siempre en el último tramo
-                elif 'salida_tanque' in accesorio_type and tramo_index == len(self.sistema.tramos) - 1:
-                    print(f"DEBUG: Salida tanque asignada al último tramo {tramo_index}")
-                    fittings_for_this_tramo.extend([accesorio_type] * accesorio.cantidad)
-                
-                # Válvulas y otros: en tramos horizontales intermedios
-                elif ('valvula' in accesorio_type or 'tee' in accesorio_type):
-                    if tramo_index > 0 and tramo_index < len(self.sistema.tramos) - 1:
-                        if x1 != x2:  # Tramo horizontal
-                            print(f"DEBUG: Válvula/Tee asignada al tramo horizontal intermedio {tramo_index}")
-                            fittings_for_this_tramo.extend([accesorio_type] * accesorio.cantidad)
-                        else:
-                            print(f"DEBUG: Válvula/Tee NO asignada (tramo vertical) {tramo_index}")
-                    else:
-                        print(f"DEBUG: Válvula/Tee NO asignada (tramo extremo) {tramo_index}")
-        
-        print(f"DEBUG: Accesorios en tramo {tramo_index}: {fittings_for_this_tramo}")
-        
-        if not fittings_for_this_tramo:
-            return
-        
-        # Dibujar accesorios en este tramo
-        spacing = 0.8  # Espaciado entre accesorios
-        current_pos = 0.1
-        
-        for fitting_type in fittings_for_this_tramo:
-            # Calcular posición del accesorio
-            if x1 == x2:  # Vertical
-                y = y1 + (y2 - y1) * current_pos
-                x = x1
-            else:  # Horizontal
-                x = x1 + (x2 - x1) * current_pos
-                y = y1
+            fittings (tuple): Tipos de accesorio a dibujar (ver fittings_for_tramo)
+            parent (QGraphicsItem): Grupo contenedor opcional
             
+        Returns:
+            list: Elementos de la escena creados
+        """
+        items = []
+        for x, y, fitting_type in fitting_positions(x1, y1, x2, y2, fittings):
             # Dibujar símbolo del accesorio
-            self.draw_fitting_symbol(x, y, pipe_diameter, fitting_type)
-            
-            current_pos += spacing
-            if current_pos > 0.9:
-                current_pos = 0.1
+            items.extend(self.draw_fitting_symbol(x, y, pipe_diameter, fitting_type, parent))
+        return items
     
-    def draw_fitting_symbol(self, x, y, pipe_diameter, fitting_type):
+    def draw_fitting_symbol(self, x, y, pipe_diameter, fitting_type, parent=None):
         """Dibuja el símbolo de un accesorio con etiqueta descriptiva.
         
         Args:
             x, y (float): Coordenadas del centro del símbolo
             pipe_diameter (float): Diámetro de la tubería para escalar el símbolo
             fitting_type (str): Tipo de accesorio para determinar el símbolo
+            parent (QGraphicsItem): Grupo contenedor opcional
+            
+        Returns:
+            tuple: (símbolo, etiqueta)
         """
         symbol_size = pipe_diameter * 2.0  # Más grande
+        half = symbol_size // 2
+        shape, fill, outline, text, offset = _fitting_appearance(fitting_type)
         
-        if 'codo' in fitting_type:
+        if shape == 'square':
             # Dibujar un cuadrado para codo
-            rect = QGraphicsRectItem(x - symbol_size//2, y - symbol_size//2, symbol_size, symbol_size)
-            rect.setBrush(QBrush(QColor(200, 100, 100)))
-            rect.setPen(QPen(QColor(255, 150, 150), 2))
-            self.graphics_scene.addItem(rect)
-            
-            # Etiqueta del accesorio
-            label = QGraphicsTextItem("Codo")
-            label.setDefaultTextColor(QColor(255, 255, 255))
-            label.setFont(QFont("Arial", 8))
-            label.setPos(x - 15, y + symbol_size//2 + 5)
-            self.graphics_scene.addItem(label)
-            
-        elif 'valvula' in fitting_type:
-            # Dibujar un círculo para válvula
-            circle = QGraphicsEllipseItem(x - symbol_size//2, y - symbol_size//2, symbol_size, symbol_size)
-            circle.setBrush(QBrush(QColor(100, 200, 100)))
-            circle.setPen(QPen(QColor(150, 255, 150), 2))
-            self.graphics_scene.addItem(circle)
-            
-            # Etiqueta del accesorio
-            label = QGraphicsTextItem("Válvula")
-            label.setDefaultTextColor(QColor(255, 255, 255))
-            label.setFont(QFont("Arial", 8))
-            label.setPos(x - 20, y + symbol_size//2 + 5)
-            self.graphics_scene.addItem(label)
-            
-        elif 'tee' in fitting_type:
+            symbol = QGraphicsRectItem(x - half, y - half, symbol_size, symbol_size)
+        elif shape == 'tee':
             # Dibujar un rombo para tee
-            diamond = QGraphicsRectItem(x - symbol_size//3, y - symbol_size//2, symbol_size*2/3, symbol_size)
-            diamond.setBrush(QBrush(QColor(200, 200, 100)))
-            diamond.setPen(QPen(QColor(255, 255, 150), 2))
-            self.graphics_scene.addItem(diamond)
-            
-            # Etiqueta del accesorio
-            label = QGraphicsTextItem("Tee")
-            label.setDefaultTextColor(QColor(255, 255, 255))
-            label.setFont(QFont("Arial", 8))
-            label.setPos(x - 10, y + symbol_size//2 + 5)
-            self.graphics_scene.addItem(label)
-            
-        elif 'entrada_tanque' in fitting_type:
+            symbol = QGraphicsRectItem(x - symbol_size//3, y - half, symbol_size*2/3, symbol_size)
+        elif shape == 'triangle':
             # Dibujar triángulo para entrada
             polygon = QPolygonF([
-                QPointF(x, y - symbol_size//2),
-                QPointF(x - symbol_size//2, y + symbol_size//2),
-                QPointF(x + symbol_size//2, y + symbol_size//2)
+                QPointF(x, y - half),
+                QPointF(x - half, y + half),
+                QPointF(x + half, y + half)
             ])
-            triangle = QGraphicsPolygonItem(polygon)
-            triangle.setBrush(QBrush(QColor(150, 150, 200)))
-            triangle.setPen(QPen(QColor(200, 200, 255), 2))
-            self.graphics_scene.addItem(triangle)
-            
-            # Etiqueta del accesorio
-            label = QGraphicsTextItem("Entrada")
-            label.setDefaultTextColor(QColor(255, 255, 255))
-            label.setFont(QFont("Arial", 8))
-            label.setPos(x - 20, y + symbol_size//2 + 5)
-            self.graphics_scene.addItem(label)
-            
+            symbol = QGraphicsPolygonItem(polygon)
         else:
-            # Dibujar un círculo para otros accesorios
-            circle = QGraphicsEllipseItem(x - symbol_size//2, y - symbol_size//2, symbol_size, symbol_size)
-            circle.setBrush(QBrush(QColor(150, 150, 200)))
-            circle.setPen(QPen(QColor(200, 200, 255), 2))
-            self.graphics_scene.addItem(circle)
-            
-            # Etiqueta del accesorio
-            label = QGraphicsTextItem("Accesorio")
-            label.setDefaultTextColor(QColor(255, 255, 255))
-            label.setFont(QFont("Arial", 8))
-            label.setPos(x - 25, y + symbol_size//2 + 5)
-            self.graphics_scene.addItem(label)
+            # Dibujar un círculo para válvulas y otros accesorios
+            symbol = QGraphicsEllipseItem(x - half, y - half, symbol_size, symbol_size)
+        
+        symbol.setBrush(_brush(*fill))
+        symbol.setPen(_pen(*outline, 2))
+        self._add_item(symbol, parent)
+        
+        # Etiqueta del accesorio
+        label = self._add_text(text, _font(8), _color(255, 255, 255),
+                               x - offset, y + half + 5, parent)
+        return symbol, label
     
     def draw_legend(self):
         """Dibuja una leyenda completa con todos los símbolos utilizados.
         
         Incluye descripciones detalladas para cada tipo de componente
-        del sistema de tuberías.
+        del sistema de tuberías. La leyenda se crea una sola vez por escena.
         """
-        legend_x = 50
-        legend_y = 50
+        legend_x = self.LEGEND_X
+        legend_y = self.LEGEND_Y
         
         # Fondo de la leyenda
         legend_bg = QGraphicsRectItem(legend_x - 10, legend_y - 10, 280, 180)
-        legend_bg.setBrush(QBrush(QColor(40, 40, 40)))
-        legend_bg.setPen(QPen(QColor(100, 100, 100), 1))
+        legend_bg.setBrush(_brush(40, 40, 40))
+        legend_bg.setPen(_pen(100, 100, 100, 1))
         self.graphics_scene.addItem(legend_bg)
         
         # Título de la leyenda
-        title = QGraphicsTextItem("Leyenda:")
-        title.setDefaultTextColor(QColor(255, 255, 255))
-        title.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-        title.setPos(legend_x, legend_y)
-        self.graphics_scene.addItem(title)
+        self._add_text("Leyenda:", _font(12, True), _color(255, 255, 255), legend_x, legend_y)
         
         # Símbolos con descripciones detalladas
         symbols = [
-            ("Entrada", "triangle", QColor(150, 150, 200), "Entrada de tanque"),
-            ("Codo", "square", QColor(200, 100, 100), "Codo 90°"),
-            ("Válvula", "circle", QColor(100, 200, 100), "Válvula compuerta"),
-            ("Tee", "diamond", QColor(200, 200, 100), "Conexión Tee"),
-            ("Tubería", "line", QColor(180, 180, 180), "Tubería principal"),
-            ("Elevación", "elevation", QColor(255, 200, 100), "Diferencia de elevación")
+            ("Entrada", "triangle", (150, 150, 200), "Entrada de tanque"),
+            ("Codo", "square", (200, 100, 100), "Codo 90°"),
+            ("Válvula", "circle", (100, 200, 100), "Válvula compuerta"),
+            ("Tee", "diamond", (200, 200, 100), "Conexión Tee"),
+            ("Tubería", "line", (180, 180, 180), "Tubería principal"),
+            ("Elevación", "elevation", (255, 200, 100), "Diferencia de elevación")
         ]
         
-        for i, (name, shape, color, description) in enumerate(symbols):
+        for i, (name, shape, rgb, description) in enumerate(symbols):
             y_pos = legend_y + 25 + i * 22
             
             # Dibujar símbolo
@@ -456,10 +701,10 @@ class SystemViewer(QWidget):
                 symbol = QGraphicsRectItem(legend_x + 2, y_pos - 2, 11, 19)
             elif shape == "line":
                 symbol = QGraphicsLineItem(legend_x, y_pos + 7, legend_x + 15, y_pos + 7)
-                symbol.setPen(QPen(color, 3))
+                symbol.setPen(_pen(*rgb, 3))
             elif shape == "elevation":
                 symbol = QGraphicsLineItem(legend_x, y_pos + 7, legend_x + 15, y_pos + 7)
-                symbol.setPen(QPen(color, 4))
+                symbol.setPen(_pen(*rgb, 4))
             elif shape == "triangle":
                 polygon = QPolygonF([
                     QPointF(legend_x + 7, y_pos),
@@ -471,35 +716,29 @@ class SystemViewer(QWidget):
                 symbol = QGraphicsEllipseItem(legend_x, y_pos, 15, 15)
             
             if shape != "line" and shape != "elevation":
-                symbol.setBrush(QBrush(color))
-                symbol.setPen(QPen(color.lighter(150), 1))
+                symbol.setBrush(_brush(*rgb))
+                symbol.setPen(_lighter_pen(*rgb))
             
             self.graphics_scene.addItem(symbol)
             
             # Etiqueta principal
-            label = QGraphicsTextItem(name)
-            label.setDefaultTextColor(QColor(255, 255, 255))
-            label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-            label.setPos(legend_x + 25, y_pos - 2)
-            self.graphics_scene.addItem(label)
+            self._add_text(name, _font(10, True), _color(255, 255, 255), legend_x + 25, y_pos - 2)
             
             # Descripción
-            desc = QGraphicsTextItem(description)
-            desc.setDefaultTextColor(QColor(200, 200, 200))
-            desc.setFont(QFont("Arial", 8))
-            desc.setPos(legend_x + 25, y_pos + 10)
-            self.graphics_scene.addItem(desc)
+            self._add_text(description, _font(8), _color(200, 200, 200), legend_x + 25, y_pos + 10)
     
     def zoom_in(self):
         """Aumenta el zoom en un 20%."""
         self.zoom_factor *= 1.2
         self.graphics_view.scale(1.2, 1.2)
+        self.update_cache_modes()
         self.update_zoom_label()
     
     def zoom_out(self):
         """Disminuye el zoom en un 20%."""
         self.zoom_factor /= 1.2
         self.graphics_view.scale(1/1.2, 1/1.2)
+        self.update_cache_modes()
         self.update_zoom_label()
     
     def reset_view(self):
@@ -508,7 +747,20 @@ class SystemViewer(QWidget):
         self.zoom_factor = 1.0
         self.update_zoom_label()
         # Ajustar vista al contenido
-        self.graphics_view.fitInView(self.graphics_scene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
+        self.graphics_view.fitInView(self._content_rect, Qt.AspectRatioMode.KeepAspectRatio)
+        self.update_cache_modes()
+    
+    def content_rect(self):
+        """Rectángulo de escena que contiene todo el diagrama."""
+        return QRectF(self._content_rect)
+    
+    def update_cache_modes(self):
+        """Ajusta el caché de los bloques de tuberías al zoom actual (modo por lotes)."""
+        transform = self.graphics_view.transform()
+        for block in self._batch_blocks:
+            for item in block.items:
+                if isinstance(item, PipeBatchItem):
+                    item.update_cache_mode(transform)
     
     def update_zoom_label(self):
         """Actualiza la etiqueta de zoom con el porcentaje actual."""
@@ -520,25 +772,18 @@ class SystemViewer(QWidget):
         
         Args:
             reference_y (float): Posición Y de la línea de referencia
+            
+        Returns:
+            tuple: (línea, etiqueta); su extensión se ajusta en update_static_items
         """
-        # Encontrar el límite derecho del sistema
-        max_x = 80
-        if self.sistema.tramos:
-            for tramo in self.sistema.tramos:
-                if tramo.orientacion == 'horizontal':
-                    max_x += tramo.longitud * 60  # scale
-        
         # Línea de referencia horizontal
-        ref_line = QGraphicsLineItem(50, reference_y, max_x + 100, reference_y)
-        ref_line.setPen(QPen(QColor(100, 100, 100), 2, Qt.PenStyle.DashLine))
-        self.graphics_scene.addItem(ref_line)
+        ref_line = self._add_line(50, reference_y, self.START_X + 100, reference_y,
+                                  _pen(100, 100, 100, 2, Qt.PenStyle.DashLine))
         
         # Etiqueta de referencia
-        ref_text = QGraphicsTextItem("Z = 0m (Referencia)")
-        ref_text.setDefaultTextColor(QColor(150, 150, 150))
-        ref_text.setFont(QFont("Arial", 9))
-        ref_text.setPos(55, reference_y + 5)
-        self.graphics_scene.addItem(ref_text)
+        ref_text = self._add_text("Z = 0m (Referencia)", _font(9), _color(150, 150, 150),
+                                  55, reference_y + 5)
+        return ref_line, ref_text
     
     def update_info(self):
         """Actualiza la información del sistema mostrada en el panel."""
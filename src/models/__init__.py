@@ -4,5 +4,9 @@ Módulo de modelos del sistema de bombeo
 from .fluido import Fluido
 from .accesorio import Accesorio, TipoAccesorio
 from .sistema_tuberias import SistemaTuberias, TramoTuberia
+from .bomba import CurvaBomba
+from .estacion import EstacionBombeo
+from .historial import HistorialSistema, Instantanea
 
-__all__ = ['Fluido', 'Accesorio', 'TipoAccesorio', 'SistemaTuberias', 'TramoTuberia']
+__all__ = ['Fluido', 'Accesorio', 'TipoAccesorio', 'SistemaTuberias', 'TramoTuberia',
+           'CurvaBomba', 'EstacionBombeo', 'HistorialSistema', 'Instantanea']
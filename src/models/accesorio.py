@@ -20,6 +20,7 @@ class TipoAccesorio(Enum):
     FILTRO_Y = "filtro_y"
     REDUCCION_BRUSCA = "reduccion_brusca"
     EXPANSION_BRUSCA = "expansion_brusca"
+    PERDIDA_LOCAL = "perdida_local"  # coeficiente K genérico (p. ej. importado de EPANET)
 
 @dataclass
 class Accesorio:
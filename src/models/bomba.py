@@ -0,0 +1,86 @@
+"""
+Modelo para representar la curva característica de una bomba
+"""
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+@dataclass
+class CurvaBomba:
+    """Curva característica de una bomba definida por puntos
+
+    Entre puntos se interpola linealmente; fuera del rango de caudales la
+    curva no está definida (se devuelve NaN).
+    """
+    nombre: str
+    caudales: List[float]  # m³/s, estrictamente crecientes
+    alturas: List[float]  # m
+    eficiencias: List[float] = field(default_factory=list)  # decimal (opcional)
+    npsh_requerido: List[float] = field(default_factory=list)  # m (opcional)
+
+    def __post_init__(self):
+        if len(self.caudales) < 2:
+            raise ValueError("La curva de la bomba necesita al menos dos puntos")
+        if len(self.alturas) != len(self.caudales):
+            raise ValueError("Debe haber una altura por cada caudal")
+        for nombre, valores in (("eficiencias", self.eficiencias),
+                                ("NPSH requerido", self.npsh_requerido)):
+            if valores and len(valores) != len(self.caudales):
+                raise ValueError(f"Debe haber un valor de {nombre} por cada caudal")
+        if any(q < 0 for q in self.caudales):
+            raise ValueError("Los caudales no pueden ser negativos")
+        if any(q2 <= q1 for q1, q2 in zip(self.caudales, self.caudales[1:])):
+            raise ValueError("Los caudales deben ser estrictamente crecientes")
+        if any(not 0 < eta <= 1 for eta in self.eficiencias):
+            raise ValueError("Las eficiencias deben estar entre 0 y 1")
+
+    @classmethod
+    def desde_punto_diseno(cls, caudal: float, altura: float, eficiencia: float,
+                           npsh_requerido: Optional[float] = None, puntos: int = 21,
+                           nombre: str = "Bomba de referencia") -> "CurvaBomba":
+        """Curva típica de una bomba centrífuga con su mejor punto en el de diseño
+
+        Usa las formas habituales de catálogo: H = Hd·(4/3 − Q²/(3·Qd²)),
+        η = ηd·(2·Q/Qd − (Q/Qd)²) y NPSHr = NPSHd·(0.5 + 0.5·(Q/Qd)²), entre
+        0 y 1.6·Qd.
+        """
+        if caudal <= 0 or altura <= 0:
+            raise ValueError("El caudal y la altura de diseño deben ser positivos")
+        caudales = [1.6 * caudal * i / (puntos - 1) for i in range(puntos)]
+        relaciones = [q / caudal for q in caudales]
+        return cls(
+            nombre=nombre,
+            caudales=caudales,
+            alturas=[altura * (4.0 / 3.0 - r * r / 3.0) for r in relaciones],
+            # El primer punto (Q = 0) tendría eficiencia nula
+            eficiencias=[max(1e-3, eficiencia * (2.0 * r - r * r)) for r in relaciones],
+            npsh_requerido=([npsh_requerido * (0.5 + 0.5 * r * r) for r in relaciones]
+                            if npsh_requerido is not None else []),
+        )
+
+    @property
+    def caudal_maximo(self) -> float:
+        """Mayor caudal de la curva"""
+        return self.caudales[-1]
+
+    def interpolar(self, valores: Sequence[float], caudal: float) -> float:
+        """Interpola linealmente una de las series de la curva en un caudal"""
+        caudales = self.caudales
+        if not valores or caudal < caudales[0] or caudal > caudales[-1]:
+            return float('nan')
+        i = min(bisect_right(caudales, caudal), len(caudales) - 1)
+        q1, q2 = caudales[i - 1], caudales[i]
+        t = (caudal - q1) / (q2 - q1)
+        return valores[i - 1] + t * (valores[i] - valores[i - 1])
+
+    def altura(self, caudal: float) -> float:
+        """Altura entregada por la bomba (m)"""
+        return self.interpolar(self.alturas, caudal)
+
+    def eficiencia(self, caudal: float) -> float:
+        """Eficiencia de la bomba (decimal); NaN si la curva no la incluye"""
+        return self.interpolar(self.eficiencias, caudal)
+
+    def npshr(self, caudal: float) -> float:
+        """NPSH requerido (m); NaN si la curva no lo incluye"""
+        return self.interpolar(self.npsh_requerido, caudal)
@@ -0,0 +1,44 @@
+"""
+Modelo para representar una estación de bombeo con varias bombas
+"""
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import List, Literal, Tuple
+
+from .bomba import CurvaBomba
+
+@dataclass
+class EstacionBombeo:
+    """Estación de 1 a 8 bombas conectadas en paralelo o en serie
+
+    En paralelo las bombas encendidas trabajan a la misma altura y sus
+    caudales se suman; en serie llevan el mismo caudal y sus alturas se suman.
+    """
+    bombas: List[CurvaBomba] = field(default_factory=list)
+    disposicion: Literal['paralelo', 'serie'] = 'paralelo'
+    nombre: str = "Estación"
+
+    MAX_BOMBAS = 8
+
+    def __post_init__(self):
+        if not self.bombas:
+            raise ValueError("La estación necesita al menos una bomba")
+        if len(self.bombas) > self.MAX_BOMBAS:
+            raise ValueError(f"La estación admite como máximo {self.MAX_BOMBAS} bombas")
+        if self.disposicion not in ['paralelo', 'serie']:
+            raise ValueError("La disposición debe ser 'paralelo' o 'serie'")
+
+    @property
+    def num_bombas(self) -> int:
+        return len(self.bombas)
+
+    def combinaciones(self) -> List[Tuple[int, ...]]:
+        """Las 2^N − 1 combinaciones de bombas encendidas (índices), de menos a más bombas"""
+        indices = range(len(self.bombas))
+        return [combinacion for n in range(1, len(self.bombas) + 1)
+                for combinacion in combinations(indices, n)]
+
+    def descripcion(self, combinacion: Tuple[int, ...]) -> str:
+        """Texto breve de una combinación, p. ej. 'B1 + B3'"""
+        union = ' + ' if self.disposicion == 'paralelo' else ' → '
+        return union.join(f"B{i + 1}" for i in combinacion) if combinacion else "Apagada"
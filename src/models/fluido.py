@@ -10,6 +10,7 @@ class Fluido:
     densidad: float  # kg/m³
     viscosidad: float  # Pa·s
     presion_vapor: float  # Pa
+    temperatura_C: float = 20.0  # °C a la que corresponden las propiedades
     
     def __post_init__(self):
         if self.densidad <= 0:
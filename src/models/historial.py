@@ -0,0 +1,277 @@
+"""
+Historial de deshacer/rehacer para sistemas de tuberías
+"""
+import sys
+import time
+import weakref
+from dataclasses import dataclass, field, fields, replace
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+from .accesorio import Accesorio
+from .sistema_tuberias import SistemaTuberias, TramoTuberia
+
+
+@dataclass(eq=False)
+class Instantanea:
+    """Estado inmutable de un sistema en un punto del historial
+
+    Los tramos se guardan en bloques de tamaño fijo (tuplas) que se comparten
+    con la instantánea anterior mientras no cambien: una edición solo copia
+    el bloque del tramo modificado. Los resultados calculados para este
+    estado quedan asociados a la instantánea, de modo que deshacer los
+    recupera sin recalcular.
+
+    Una instantánea sin plantilla representa el formulario vacío.
+    """
+    plantilla: Optional[SistemaTuberias]  # campos escalares y fluido, sin tramos ni accesorios
+    bloques: Tuple[Tuple[TramoTuberia, ...], ...] = ()
+    accesorios: Tuple[Accesorio, ...] = ()
+    resultados: Optional[Dict[str, float]] = None
+    tamano: int = 0  # bytes estimados que no comparte con la instantánea anterior
+    _sistema: Optional[weakref.ref] = field(default=None, repr=False)
+
+    @property
+    def num_tramos(self) -> int:
+        return sum(len(bloque) for bloque in self.bloques)
+
+    def sistema(self) -> Optional[SistemaTuberias]:
+        """Sistema de esta instantánea (se reutiliza mientras siga en uso)"""
+        if self.plantilla is None:
+            return None
+        sistema = self._sistema() if self._sistema is not None else None
+        if sistema is None:
+            sistema = replace(self.plantilla, tramos=list(chain.from_iterable(self.bloques)),
+                              accesorios=list(self.accesorios))
+            self._sistema = weakref.ref(sistema)
+        return sistema
+
+    def es_de(self, sistema: Optional[SistemaTuberias]) -> bool:
+        """Indica si el sistema es el objeto materializado de esta instantánea"""
+        if sistema is None:
+            return self.plantilla is None
+        return self._sistema is not None and self._sistema() is sistema
+
+    def equivale(self, otra: "Instantanea") -> bool:
+        """Mismo estado (las tuplas compartidas se comparan por identidad)"""
+        return (self.plantilla == otra.plantilla and self.bloques == otra.bloques
+                and self.accesorios == otra.accesorios)
+
+
+class HistorialSistema:
+    """Historial de deshacer/rehacer con instantáneas estructuralmente compartidas
+
+    Cada estado registrado se guarda como una Instantanea que reutiliza los
+    bloques de tramos sin cambios de la anterior, así que el costo de una
+    edición es proporcional a lo que cambia (más un índice de un puntero por
+    bloque) y no al tamaño del sistema. La memoria queda acotada por el
+    número de entradas y por un presupuesto de bytes estimados: al
+    superarlos se descartan los estados más antiguos. El presupuesto cuenta
+    la memoria que el historial agrega al sistema en uso, así que los tramos
+    del estado más antiguo (la base que comparten los demás) no se cuentan.
+
+    Los cambios registrados con agrupar=True (edición en vivo) se funden en
+    una sola entrada mientras lleguen seguidos, con menos de
+    ventana_agrupacion segundos entre uno y otro.
+    """
+
+    TAMANO_BLOQUE = 64
+
+    def __init__(self, max_entradas: int = 200, max_bytes: int = 64 * 1024 * 1024,
+                 ventana_agrupacion: float = 1.0):
+        if max_entradas < 1:
+            raise ValueError("El historial debe admitir al menos una entrada")
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.ventana_agrupacion = ventana_agrupacion
+        self._entradas: List[Instantanea] = []
+        self._posicion = -1
+        self._tamano_tramo = None
+        # Momento del último cambio agrupable (None: la entrada actual está cerrada)
+        self._ultimo_agrupable: Optional[float] = None
+
+    @property
+    def actual(self) -> Optional[Instantanea]:
+        return self._entradas[self._posicion] if self._entradas else None
+
+    @property
+    def puede_deshacer(self) -> bool:
+        return self._posicion > 0
+
+    @property
+    def puede_rehacer(self) -> bool:
+        return self._posicion < len(self._entradas) - 1
+
+    @property
+    def tamano(self) -> int:
+        """Bytes estimados que ocupa todo el historial"""
+        return sum(entrada.tamano for entrada in self._entradas)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def registrar(self, sistema: Optional[SistemaTuberias], agrupar: bool = False) -> Instantanea:
+        """
+        Registra un nuevo estado (None para el formulario vacío)
+
+        Si el estado no cambió respecto del actual no se agrega una entrada.
+        Registrar después de deshacer descarta los estados que se podían rehacer.
+
+        Args:
+            sistema: Estado a registrar
+            agrupar: Si el cambio sigue a otro agrupable dentro de la ventana,
+                reemplaza la entrada actual en lugar de agregar otra
+
+        Returns: La instantánea del estado registrado
+        """
+        ahora = time.monotonic()
+        agrupable = self._ultimo_agrupable
+        self._ultimo_agrupable = ahora if agrupar else None
+
+        anterior = self.actual
+        if anterior is not None and anterior.es_de(sistema):
+            return anterior
+        if (agrupar and agrupable is not None and self._posicion > 0
+                and ahora - agrupable < self.ventana_agrupacion):
+            return self._reemplazar_actual(sistema)
+
+        instantanea = self._instantanea(sistema, anterior)
+        if anterior is not None and anterior.equivale(instantanea):
+            # Mismo estado en otro objeto: los resultados siguen siendo válidos
+            anterior._sistema = weakref.ref(sistema) if sistema is not None else None
+            return anterior
+
+        del self._entradas[self._posicion + 1:]
+        self._entradas.append(instantanea)
+        self._posicion = len(self._entradas) - 1
+        self._recortar()
+        return instantanea
+
+    def deshacer(self) -> Instantanea:
+        """Vuelve al estado anterior"""
+        if not self.puede_deshacer:
+            raise IndexError("No hay cambios para deshacer")
+        self._ultimo_agrupable = None
+        self._posicion -= 1
+        return self._entradas[self._posicion]
+
+    def rehacer(self) -> Instantanea:
+        """Vuelve a aplicar el estado deshecho más reciente"""
+        if not self.puede_rehacer:
+            raise IndexError("No hay cambios para rehacer")
+        self._ultimo_agrupable = None
+        self._posicion += 1
+        return self._entradas[self._posicion]
+
+    def asociar_resultados(self, sistema: SistemaTuberias, resultados: Dict[str, float]) -> bool:
+        """
+        Guarda los resultados calculados para un sistema del historial
+
+        Returns: True si el sistema corresponde a alguna instantánea
+        """
+        for indice in range(self._posicion, -1, -1):
+            entrada = self._entradas[indice]
+            if entrada.es_de(sistema):
+                if entrada.resultados is None:
+                    entrada.tamano += self._tamano_resultados(resultados)
+                entrada.resultados = resultados
+                self._recortar()
+                return True
+        return False
+
+    def limpiar(self) -> None:
+        self._entradas.clear()
+        self._posicion = -1
+        self._ultimo_agrupable = None
+
+    # --- Instantáneas ----------------------------------------------------
+
+    def _instantanea(self, sistema: Optional[SistemaTuberias],
+                     anterior: Optional[Instantanea]) -> Instantanea:
+        if sistema is None:
+            return Instantanea(None, tamano=sys.getsizeof(Instantanea))
+
+        previos = anterior.bloques if anterior is not None else None
+        tramos = sistema.tramos
+        bloques = []
+        tamano = 0
+        for n, inicio in enumerate(range(0, len(tramos), self.TAMANO_BLOQUE)):
+            bloque = tuple(tramos[inicio:inicio + self.TAMANO_BLOQUE])
+            if previos is None:
+                # Estado base: sus tramos son los del sistema en uso
+                bloques.append(bloque)
+                continue
+            previo = previos[n] if n < len(previos) else ()
+            if bloque == previo:
+                bloque = previo
+            else:
+                nuevos = sum(1 for i, tramo in enumerate(bloque)
+                             if i >= len(previo) or tramo is not previo[i])
+                tamano += sys.getsizeof(bloque) + nuevos * self._estimar_tramo(bloque[0])
+            bloques.append(bloque)
+        bloques = tuple(bloques)
+
+        accesorios = tuple(sistema.accesorios)
+        if anterior is not None and accesorios == anterior.accesorios:
+            accesorios = anterior.accesorios
+        else:
+            tamano += sys.getsizeof(accesorios)
+
+        plantilla = replace(sistema, tramos=[], accesorios=[])
+        if anterior is not None and plantilla == anterior.plantilla:
+            plantilla = anterior.plantilla
+        else:
+            tamano += sys.getsizeof(plantilla) + sys.getsizeof(vars(plantilla))
+
+        tamano += sys.getsizeof(bloques) + sys.getsizeof(Instantanea)
+        return Instantanea(plantilla, bloques, accesorios, tamano=tamano,
+                           _sistema=weakref.ref(sistema))
+
+    def _reemplazar_actual(self, sistema: Optional[SistemaTuberias]) -> Instantanea:
+        """Funde un cambio agrupado con la entrada actual (la última: agrupar no sigue a deshacer)"""
+        # Se compara con la entrada previa al grupo: lo que solo compartía con la
+        # entrada reemplazada deja de estar en el historial
+        base = self._entradas[self._posicion - 1]
+        instantanea = self._instantanea(sistema, base)
+        del self._entradas[self._posicion:]
+        if base.equivale(instantanea):
+            # El grupo volvió al estado previo: su entrada desaparece
+            base._sistema = weakref.ref(sistema) if sistema is not None else None
+            self._posicion -= 1
+            self._ultimo_agrupable = None
+            return base
+        self._entradas.append(instantanea)
+        self._recortar()
+        return instantanea
+
+    def _recortar(self) -> None:
+        """Descarta los estados más antiguos hasta respetar los límites"""
+        total = self.tamano
+        descartados = 0
+        # Nunca se descarta el estado actual
+        while descartados < self._posicion and (
+                len(self._entradas) - descartados > self.max_entradas or total > self.max_bytes):
+            total -= self._entradas[descartados].tamano
+            descartados += 1
+        if descartados:
+            del self._entradas[:descartados]
+            self._posicion -= descartados
+            # El nuevo estado más antiguo pasa a ser la base: sus tramos no se cuentan
+            primera = self._entradas[0]
+            primera.tamano = self._tamano_base(primera)
+
+    def _tamano_base(self, instantanea: Instantanea) -> int:
+        tamano = sys.getsizeof(instantanea.bloques) + sys.getsizeof(Instantanea)
+        if instantanea.resultados is not None:
+            tamano += self._tamano_resultados(instantanea.resultados)
+        return tamano
+
+    def _estimar_tramo(self, tramo: TramoTuberia) -> int:
+        if self._tamano_tramo is None:
+            self._tamano_tramo = sys.getsizeof(tramo) + sys.getsizeof(vars(tramo)) + sum(
+                sys.getsizeof(getattr(tramo, campo.name)) for campo in fields(tramo))
+        return self._tamano_tramo
+
+    @staticmethod
+    def _tamano_resultados(resultados) -> int:
+        return sys.getsizeof(resultados) + sum(sys.getsizeof(v) for v in resultados.values())
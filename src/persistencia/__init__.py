@@ -0,0 +1,26 @@
+"""
+Módulo de persistencia: archivos de proyecto y exportación de resultados
+"""
+from .proyecto import (
+    EXTENSION, FORMATO_VERSION, ErrorProyecto, EscritorProyecto, LectorProyecto,
+    Proyecto, abrir_proyecto, guardar_proyecto
+)
+from .epanet import (
+    EXTENSION_EPANET, ErrorEpanet, RedEpanet, exportar_inp, importar_inp, red_desde_sistema
+)
+from .almacen import (
+    ALMACEN_VERSION, EXTENSION_ALMACEN, AlmacenResultados, ErrorAlmacen, EscritorAlmacen,
+    abrir_almacen, barrido_en_almacen
+)
+from .exportadores import (
+    bloques_columnas, exportar_barrido, exportar_csv, exportar_resultados,
+    exportar_resumen_pdf, exportar_xlsx
+)
+
+__all__ = ['EXTENSION', 'FORMATO_VERSION', 'ErrorProyecto', 'EscritorProyecto',
+           'LectorProyecto', 'Proyecto', 'abrir_proyecto', 'guardar_proyecto',
+           'bloques_columnas', 'exportar_barrido', 'exportar_csv', 'exportar_resultados',
+           'exportar_resumen_pdf', 'exportar_xlsx', 'EXTENSION_EPANET', 'ErrorEpanet',
+           'RedEpanet', 'exportar_inp', 'importar_inp', 'red_desde_sistema',
+           'ALMACEN_VERSION', 'EXTENSION_ALMACEN', 'AlmacenResultados', 'ErrorAlmacen',
+           'EscritorAlmacen', 'abrir_almacen', 'barrido_en_almacen']
@@ -0,0 +1,465 @@
+"""
+Almacén de resultados por columnas mapeado en memoria
+
+Un barrido de cientos de millones de puntos no cabe como diccionarios de
+Python. El almacén es un directorio con un archivo binario por columna
+(float64 little-endian, sin encabezado) y un encabezado JSON pequeño:
+
+    barrido.resultados/
+        encabezado.json     ← columnas, filas válidas, rangos reservados y metadatos
+        caudal.f64          ← columnas de parámetros
+        velocidad.f64       ← columnas de resultados
+        ...
+
+Abrir el almacén solo lee el encabezado; cada columna se mapea en memoria
+(np.memmap, o mmap + memoryview sin NumPy) y los cortes son vistas sin
+copia, de modo que el sistema operativo carga únicamente las páginas que se
+consultan.
+
+La escritura es solo por agregado y admite varios escritores a la vez
+(hilos o procesos que abren el mismo directorio): cada bloque reserva un
+rango de filas bajo un bloqueo de archivo, se escribe fuera del bloqueo y
+al terminar se marca como completo. Las filas válidas son el prefijo de
+rangos completos, así que un escritor que falla a mitad de un bloque nunca
+deja filas a medias visibles.
+
+Si la escritura de un bloque falla, su reserva se deshace cuando es la
+última; si no, el rango queda como vacío (se rellena con NaN y se anota en
+'vacios') para que el prefijo siga avanzando con los bloques posteriores.
+Las reservas de un escritor que terminó sin cerrarlas (p. ej. un proceso
+terminado) se recuperan con refrescar(recuperar=True).
+"""
+import json
+import mmap
+import os
+import re
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..calculations.cancelacion import TokenCancelacion
+from ..calculations.instrumentacion import span
+from .proyecto import _LITTLE_ENDIAN, _como_arreglo
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las columnas se leen como memoryview
+    np = None
+
+ALMACEN_VERSION = 1
+EXTENSION_ALMACEN = '.resultados'
+EXTENSION_COLUMNA = '.f64'
+BLOQUE_FILAS = 65536
+
+# Espera máxima por el bloqueo del encabezado antes de darlo por abandonado (s)
+ESPERA_BLOQUEO = 10.0
+
+_ENCABEZADO = 'encabezado.json'
+_BLOQUEO = 'encabezado.lock'
+_TAMANO = 8
+_NOMBRE_VALIDO = re.compile(r'^[A-Za-z0-9_]+$')
+
+
+class ErrorAlmacen(ValueError):
+    """El directorio no es un almacén válido, está dañado o es de una versión posterior"""
+
+
+class AlmacenResultados:
+    """Almacén de resultados por columnas (parámetros + resultados)
+
+    Uso:
+        almacen = AlmacenResultados.crear(ruta, ['caudal'], claves_resultados)
+        with almacen.escritor() as escritor:      # uno por hilo o proceso
+            escritor.agregar(columnas)
+        caudal = almacen.columna('caudal')[1000:2000]   # vista sin copia
+    """
+
+    def __init__(self, ruta):
+        """Abre un almacén existente (solo lee el encabezado)"""
+        self.ruta = os.fspath(ruta)
+        self._vistas: Dict[str, Tuple[int, object]] = {}
+        self._mapas: List[mmap.mmap] = []
+        self._leer_encabezado()
+
+    @classmethod
+    def crear(cls, ruta, parametros: Sequence[str], resultados: Sequence[str],
+              metadatos: Optional[dict] = None) -> 'AlmacenResultados':
+        """
+        Crea un almacén vacío
+
+        Args:
+            ruta: Directorio del almacén (no debe existir)
+            parametros: Columnas de parámetros (p. ej. ['caudal'])
+            resultados: Columnas de resultados
+            metadatos: Datos serializables como JSON (sistema, unidades, etc.)
+
+        Raises:
+            ValueError: Si las columnas están repetidas o tienen nombres no válidos
+            FileExistsError: Si el directorio ya existe
+        """
+        claves = list(parametros) + list(resultados)
+        if not claves:
+            raise ValueError("El almacén necesita al menos una columna")
+        if len(set(claves)) != len(claves):
+            raise ValueError("Las columnas del almacén no se pueden repetir")
+        for clave in claves:
+            if not _NOMBRE_VALIDO.match(clave):
+                raise ValueError(f"Nombre de columna no válido: '{clave}'")
+        ruta = os.fspath(ruta)
+        os.makedirs(ruta)
+        for clave in claves:
+            open(os.path.join(ruta, clave + EXTENSION_COLUMNA), 'wb').close()
+        _escribir_encabezado(ruta, {
+            'formato': ALMACEN_VERSION,
+            'creado': datetime.now().isoformat(timespec='seconds'),
+            'parametros': list(parametros),
+            'resultados': list(resultados),
+            'filas': 0,
+            'reservadas': 0,
+            'completos': [],
+            'vacios': [],
+            'metadatos': metadatos or {},
+        })
+        return cls(ruta)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+        return False
+
+    @property
+    def claves(self) -> List[str]:
+        return self.parametros + self.resultados
+
+    def __len__(self) -> int:
+        return self.filas
+
+    def __contains__(self, clave: str) -> bool:
+        return clave in self.claves
+
+    def __getitem__(self, clave: str):
+        return self.columna(clave)
+
+    def refrescar(self, recuperar: bool = False) -> int:
+        """
+        Relee el encabezado para ver las filas que otros escritores completaron
+
+        Args:
+            recuperar: Si es True, las filas reservadas que ningún escritor
+                       completó se dan por abandonadas: la última reserva se
+                       deshace y las demás quedan como vacíos. Solo debe
+                       usarse cuando no hay escritores activos.
+        """
+        if recuperar:
+            with _bloqueo(self.ruta):
+                encabezado = _leer_json(self.ruta)
+                for inicio, fin in _reservas_abiertas(encabezado):
+                    if _anular(encabezado, inicio, fin):
+                        _rellenar_nan(self.ruta, self.claves, inicio, fin)
+                _escribir_encabezado(self.ruta, encabezado)
+        self._leer_encabezado()
+        return self.filas
+
+    def columna(self, clave: str):
+        """
+        Columna completa como vista sobre el archivo mapeado (sin copia)
+
+        Returns: np.memmap de solo lectura, o memoryview de tipo 'd' sin
+                 NumPy (array('d') en máquinas big-endian)
+        """
+        if clave not in self.claves:
+            raise KeyError(clave)
+        guardada = self._vistas.get(clave)
+        if guardada is not None and guardada[0] == self.filas:
+            return guardada[1]
+        vista = self._mapear(clave, self.filas)
+        self._vistas[clave] = (self.filas, vista)
+        return vista
+
+    def corte(self, desde: int = 0, hasta: Optional[int] = None,
+              claves: Optional[Sequence[str]] = None) -> Dict[str, object]:
+        """Filas [desde, hasta) de varias columnas como vistas sin copia"""
+        claves = self.claves if claves is None else claves
+        return {clave: self.columna(clave)[desde:hasta] for clave in claves}
+
+    def iterar_bloques(self, claves: Optional[Sequence[str]] = None,
+                       filas_por_bloque: int = BLOQUE_FILAS) -> Iterator[Dict[str, object]]:
+        """Recorre las filas válidas por bloques (vistas sin copia)"""
+        for desde in range(0, self.filas, filas_por_bloque):
+            yield self.corte(desde, min(desde + filas_por_bloque, self.filas), claves)
+
+    def escritor(self) -> 'EscritorAlmacen':
+        """Escritor por agregado; cada hilo o proceso debe usar el suyo"""
+        return EscritorAlmacen(self.ruta)
+
+    def cerrar(self) -> None:
+        """Libera los mapeos (las vistas ya entregadas los mantienen abiertos)"""
+        self._vistas.clear()
+        for mapa in self._mapas:
+            try:
+                mapa.close()
+            except BufferError:
+                pass  # hay vistas en uso; se cierra cuando se liberen
+        self._mapas.clear()
+
+    def _leer_encabezado(self) -> None:
+        try:
+            with open(os.path.join(self.ruta, _ENCABEZADO), 'r', encoding='utf-8') as archivo:
+                datos = json.load(archivo)
+        except FileNotFoundError:
+            raise ErrorAlmacen(f"'{self.ruta}' no es un almacén de resultados") from None
+        except ValueError:
+            raise ErrorAlmacen("El encabezado del almacén está dañado") from None
+        if datos.get('formato', 0) > ALMACEN_VERSION:
+            raise ErrorAlmacen(f"El almacén usa la versión {datos['formato']} del formato; "
+                               f"esta aplicación admite hasta la {ALMACEN_VERSION}")
+        try:
+            self.parametros = list(datos['parametros'])
+            self.resultados = list(datos['resultados'])
+            self.filas = int(datos['filas'])
+            # Rangos [desde, hasta) anulados dentro de las filas válidas (valores NaN)
+            self.vacios = [tuple(rango) for rango in datos.get('vacios', [])]
+            self.metadatos = dict(datos.get('metadatos', {}))
+        except (KeyError, TypeError, ValueError):
+            raise ErrorAlmacen("El encabezado del almacén está dañado") from None
+        self.creado = datos.get('creado')
+
+    def _mapear(self, clave: str, filas: int):
+        ruta = os.path.join(self.ruta, clave + EXTENSION_COLUMNA)
+        if os.path.getsize(ruta) < filas * _TAMANO:
+            raise ErrorAlmacen(f"La columna '{clave}' está incompleta")
+        if np is not None:
+            if not filas:
+                return np.empty(0, dtype='<f8')
+            return np.memmap(ruta, dtype='<f8', mode='r', shape=(filas,))
+        if not filas:
+            return array('d')
+        with open(ruta, 'rb') as archivo:
+            mapa = mmap.mmap(archivo.fileno(), filas * _TAMANO, access=mmap.ACCESS_READ)
+        if not _LITTLE_ENDIAN:
+            columna = array('d', mapa[:])
+            mapa.close()
+            columna.byteswap()
+            return columna
+        self._mapas.append(mapa)
+        return memoryview(mapa).cast('d')
+
+
+class EscritorAlmacen:
+    """Escritura por agregado en un almacén
+
+    Cada escritor abre sus propios archivos, así que varios hilos o procesos
+    pueden escribir a la vez: solo la reserva y el cierre de cada bloque
+    pasan por el bloqueo del encabezado.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = os.fspath(ruta)
+        encabezado = _leer_json(self.ruta)
+        self.claves = list(encabezado['parametros']) + list(encabezado['resultados'])
+        self._archivos = {clave: open(os.path.join(self.ruta, clave + EXTENSION_COLUMNA), 'r+b')
+                          for clave in self.claves}
+        self.filas = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+        return False
+
+    def agregar(self, bloque: Dict[str, Sequence[float]]) -> int:
+        """
+        Agrega filas: un valor por columna (listas, array('d') o arreglos de NumPy)
+
+        Returns: índice de la primera fila agregada (-1 si el bloque está vacío)
+
+        Raises:
+            KeyError: Si falta alguna columna del almacén
+            ValueError: Si las columnas no tienen el mismo número de filas
+        """
+        valores = [_como_arreglo(bloque[clave], 'd') for clave in self.claves]
+        largos = {len(v) for v in valores}
+        if len(largos) > 1:
+            raise ValueError("Todas las columnas deben tener el mismo número de filas")
+        cantidad = largos.pop()
+        if not cantidad:
+            return -1
+        with span('almacen.agregar'):
+            with _bloqueo(self.ruta):
+                encabezado = _leer_json(self.ruta)
+                inicio = encabezado['reservadas']
+                encabezado['reservadas'] = inicio + cantidad
+                _escribir_encabezado(self.ruta, encabezado)
+            try:
+                for clave, datos in zip(self.claves, valores):
+                    archivo = self._archivos[clave]
+                    archivo.seek(inicio * _TAMANO)
+                    archivo.write(datos)
+                    archivo.flush()
+            except BaseException:
+                # La reserva no debe detener el prefijo de filas válidas
+                with _bloqueo(self.ruta):
+                    encabezado = _leer_json(self.ruta)
+                    if _anular(encabezado, inicio, inicio + cantidad):
+                        _rellenar_nan(self.ruta, self.claves, inicio, inicio + cantidad)
+                    _escribir_encabezado(self.ruta, encabezado)
+                raise
+            with _bloqueo(self.ruta):
+                encabezado = _leer_json(self.ruta)
+                _marcar_completo(encabezado, inicio, inicio + cantidad)
+                _escribir_encabezado(self.ruta, encabezado)
+        self.filas += cantidad
+        return inicio
+
+    def cerrar(self) -> None:
+        for archivo in self._archivos.values():
+            archivo.close()
+        self._archivos.clear()
+
+
+def barrido_en_almacen(ruta, calculadora, caudales: Sequence[float],
+                       filas_por_bloque: int = BLOQUE_FILAS, longitud_sucursal: float = 5.0,
+                       elevacion_fluido_sucursal: float = 1.0, metadatos: Optional[dict] = None,
+                       progreso: Optional[Callable[[int], None]] = None,
+                       cancelacion: Optional[TokenCancelacion] = None) -> AlmacenResultados:
+    """
+    Barrido de caudal de CalculadoraBombeo escrito por bloques en un almacén
+
+    La memoria usada depende de filas_por_bloque, no del número de caudales.
+    Si el almacén no existe se crea con 'caudal' como parámetro y las claves
+    de obtener_resultados_completos como resultados.
+    """
+    almacen = AlmacenResultados(ruta) if os.path.isdir(ruta) else None
+    escritor = None
+    total = len(caudales)
+    try:
+        with span('almacen.barrido'):
+            for desde in range(0, total, filas_por_bloque):
+                if cancelacion is not None:
+                    cancelacion.verificar()
+                columnas = calculadora.barrido_caudal(caudales[desde:desde + filas_por_bloque],
+                                                      longitud_sucursal, elevacion_fluido_sucursal)
+                if almacen is None:
+                    resultados = [clave for clave in columnas if clave != 'caudal']
+                    almacen = AlmacenResultados.crear(ruta, ['caudal'], resultados, metadatos)
+                if escritor is None:
+                    escritor = almacen.escritor()
+                escritor.agregar(columnas)
+                if progreso is not None:
+                    progreso(100 * min(desde + filas_por_bloque, total) // total)
+    finally:
+        if escritor is not None:
+            escritor.cerrar()
+    if almacen is None:
+        raise ValueError("El barrido necesita al menos un caudal")
+    almacen.refrescar()
+    return almacen
+
+
+def abrir_almacen(ruta) -> AlmacenResultados:
+    """
+    Abre un almacén de resultados (solo lee el encabezado)
+
+    Raises:
+        ErrorAlmacen: Si no es un almacén válido
+    """
+    return AlmacenResultados(ruta)
+
+
+def _reservas_abiertas(encabezado: dict) -> List[Tuple[int, int]]:
+    """Rangos reservados después de 'filas' que no están marcados como completos"""
+    abiertas = []
+    desde = encabezado['filas']
+    for inicio, fin in sorted(encabezado['completos']):
+        if inicio > desde:
+            abiertas.append((desde, inicio))
+        desde = max(desde, fin)
+    if encabezado['reservadas'] > desde:
+        abiertas.append((desde, encabezado['reservadas']))
+    return abiertas
+
+
+def _anular(encabezado: dict, inicio: int, fin: int) -> bool:
+    """
+    Da por perdida una reserva que no se escribió
+
+    Si es la última reserva, se deshace; si no, se registra como vacío y
+    cuenta como completa para el prefijo de filas válidas.
+
+    Returns: True si el rango quedó como vacío (y debe rellenarse con NaN)
+    """
+    if encabezado['reservadas'] == fin:
+        encabezado['reservadas'] = inicio
+        return False
+    encabezado.setdefault('vacios', []).append([inicio, fin])
+    _marcar_completo(encabezado, inicio, fin)
+    return True
+
+
+def _rellenar_nan(ruta: str, claves: Sequence[str], inicio: int, fin: int) -> None:
+    """Escribe NaN en un rango anulado (si tampoco se puede, el rango queda con ceros o basura
+    y solo 'vacios' lo distingue)"""
+    nan = array('d', [float('nan')]) * min(fin - inicio, BLOQUE_FILAS)
+    if not _LITTLE_ENDIAN:
+        nan.byteswap()
+    try:
+        for clave in claves:
+            with open(os.path.join(ruta, clave + EXTENSION_COLUMNA), 'r+b') as archivo:
+                for desde in range(inicio, fin, BLOQUE_FILAS):
+                    archivo.seek(desde * _TAMANO)
+                    archivo.write(memoryview(nan)[:min(BLOQUE_FILAS, fin - desde)].cast('B'))
+    except OSError:
+        pass
+
+
+def _marcar_completo(encabezado: dict, inicio: int, fin: int) -> None:
+    """Registra un rango completo y adelanta 'filas' sobre el prefijo continuo"""
+    completos = sorted(encabezado['completos'] + [[inicio, fin]])
+    filas = encabezado['filas']
+    pendientes = []
+    for desde, hasta in completos:
+        if desde == filas:
+            filas = hasta
+        else:
+            pendientes.append([desde, hasta])
+    encabezado['filas'] = filas
+    encabezado['completos'] = pendientes
+
+
+@contextmanager
+def _bloqueo(ruta: str):
+    """Bloqueo entre procesos con un archivo de creación exclusiva"""
+    ruta_bloqueo = os.path.join(ruta, _BLOQUEO)
+    limite = time.monotonic() + ESPERA_BLOQUEO
+    while True:
+        try:
+            descriptor = os.open(ruta_bloqueo, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            if time.monotonic() > limite:
+                raise ErrorAlmacen(f"El almacén sigue bloqueado; si ningún proceso lo usa, "
+                                   f"elimine '{ruta_bloqueo}'") from None
+            time.sleep(0.0005)
+    try:
+        yield
+    finally:
+        os.close(descriptor)
+        os.remove(ruta_bloqueo)
+
+
+def _leer_json(ruta: str) -> dict:
+    with open(os.path.join(ruta, _ENCABEZADO), 'r', encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def _escribir_encabezado(ruta: str, datos: dict) -> None:
+    """Escribe el encabezado en un temporal y lo reemplaza (los lectores nunca lo ven a medias)"""
+    temporal = os.path.join(ruta, _ENCABEZADO + '.tmp')
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(datos, archivo, ensure_ascii=False)
+    os.replace(temporal, os.path.join(ruta, _ENCABEZADO))
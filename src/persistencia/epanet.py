@@ -0,0 +1,713 @@
+"""
+Importación y exportación de modelos de red EPANET (.inp)
+
+El archivo se lee en flujo, línea por línea y sección por sección, y los
+datos de nudos y enlaces se escriben directamente en arreglos compactos
+(array) en unidades SI, de modo que una red de cientos de miles de
+tuberías no crea un objeto por elemento. Las secciones que el programa no
+interpreta (coordenadas, patrones, controles, etc.) se conservan como texto
+para que exportar la red la reproduzca completa.
+
+Correspondencia con los modelos del proyecto:
+    - JUNCTIONS / RESERVOIRS / TANKS: nudos; los extremos del recorrido
+      elegido son los puntos 1 y 2 del sistema
+    - PIPES: TramoTuberia (el material se deduce de la rugosidad)
+    - VALVES y pérdidas menores de tuberías: Accesorio
+    - PUMPS / CURVES: CurvaBomba y caudal de diseño
+    - OPTIONS (gravedad específica y viscosidad relativa): Fluido
+
+Como el sistema de bombeo es una sola línea de tuberías, RedEpanet.a_sistema
+toma el recorrido más corto (en número de enlaces) entre dos nudos.
+"""
+import math
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models import Accesorio, CurvaBomba, Fluido, SistemaTuberias, TipoAccesorio, TramoTuberia
+from ..calculations.instrumentacion import span
+from .exportadores import _archivo_temporal
+
+EXTENSION_EPANET = '.inp'
+
+# Tipos de nudo y de enlace (valores de RedEpanet.tipos_nudo / tipos_enlace)
+NUDO, EMBALSE, TANQUE = 0, 1, 2
+TUBERIA, BOMBA, VALVULA = 0, 1, 2
+
+# Unidades de caudal: factor a m³/s y si usan el sistema inglés (pies y pulgadas)
+UNIDADES_CAUDAL = {
+    'CFS': (0.028316846592, True),
+    'GPM': (6.30901964e-05, True),
+    'MGD': (0.0438126364, True),
+    'IMGD': (0.0526167, True),
+    'AFD': (0.0142764101, True),
+    'LPS': (1e-3, False),
+    'LPM': (1e-3 / 60.0, False),
+    'MLD': (1e3 / 86400.0, False),
+    'CMH': (1.0 / 3600.0, False),
+    'CMD': (1.0 / 86400.0, False),
+    'CMS': (1.0, False),
+}
+
+# material: (rugosidad D-W en mm, C de Hazen-Williams, n de Manning)
+MATERIALES = {
+    'pvc': (0.0015, 150.0, 0.009),
+    'polietileno': (0.007, 140.0, 0.010),
+    'cobre': (0.002, 135.0, 0.011),
+    'acero': (0.045, 120.0, 0.012),
+    'hierro_fundido': (0.26, 100.0, 0.013),
+    'galvanizado': (0.15, 110.0, 0.014),
+    'concreto': (1.0, 90.0, 0.015),
+}
+MATERIAL_POR_DEFECTO = 'acero'
+_COLUMNA_RUGOSIDAD = {'D-W': 0, 'H-W': 1, 'C-M': 2}
+
+# Propiedades de referencia de EPANET (agua a 20 °C)
+_DENSIDAD_AGUA = 1000.0  # kg/m³
+_VISCOSIDAD_CINEMATICA_AGUA = 1.0e-6  # m²/s
+_PRESION_VAPOR_AGUA = 2338.8  # Pa
+_PRESION_ATMOSFERICA = 101325.0  # Pa
+_GRAVEDAD = 9.81  # m/s²
+
+# Pendiente (|Δz| / L) a partir de la cual un tramo sin etiqueta se considera vertical
+PENDIENTE_VERTICAL = 0.5
+
+
+class ErrorEpanet(ValueError):
+    """Archivo INP inválido o red que no se puede convertir en sistema"""
+
+
+def _material_por_rugosidad(rugosidad: float, formula: str) -> str:
+    """Material cuya rugosidad típica es la más cercana (en escala logarítmica)"""
+    columna = _COLUMNA_RUGOSIDAD.get(formula)
+    if columna is None or rugosidad <= 0:
+        return MATERIAL_POR_DEFECTO
+    return min(MATERIALES, key=lambda m: abs(math.log(MATERIALES[m][columna] / rugosidad)))
+
+
+@dataclass
+class RedEpanet:
+    """Red EPANET en arreglos compactos
+
+    Elevaciones, cargas, niveles, longitudes y diámetros están en metros y
+    las demandas en m³/s; las rugosidades, los ajustes de válvulas, las
+    curvas y los demás datos de tanques quedan en las unidades del archivo
+    (`unidades`), que son las que se usan al exportar.
+    """
+    titulo: str = ""
+    unidades: str = 'LPS'
+    formula_perdidas: str = 'H-W'
+
+    # Nudos
+    ids_nudo: List[str] = field(default_factory=list)
+    tipos_nudo: bytearray = field(default_factory=bytearray)
+    elevaciones: array = field(default_factory=lambda: array('d'))  # embalses: carga total
+    demandas: array = field(default_factory=lambda: array('d'))
+    niveles: array = field(default_factory=lambda: array('d'))  # tanques: nivel inicial
+
+    # Enlaces
+    ids_enlace: List[str] = field(default_factory=list)
+    tipos_enlace: bytearray = field(default_factory=bytearray)
+    nudo_inicial: array = field(default_factory=lambda: array('i'))
+    nudo_final: array = field(default_factory=lambda: array('i'))
+    longitudes: array = field(default_factory=lambda: array('d'))
+    diametros: array = field(default_factory=lambda: array('d'))
+    rugosidades: array = field(default_factory=lambda: array('d'))
+    perdidas_menores: array = field(default_factory=lambda: array('d'))
+
+    # Datos por elemento que no todos tienen (texto en unidades del archivo)
+    patrones: Dict[str, str] = field(default_factory=dict)  # nudo -> patrón de demanda o carga
+    tanques: Dict[str, List[str]] = field(default_factory=dict)  # nivel mín., máx., diámetro...
+    estados: Dict[str, str] = field(default_factory=dict)  # tubería -> OPEN/CLOSED/CV
+    bombas: Dict[str, List[str]] = field(default_factory=dict)  # parámetros (HEAD curva, POWER...)
+    valvulas: Dict[str, Tuple[str, str]] = field(default_factory=dict)  # (tipo, ajuste)
+    curvas: Dict[str, Tuple[List[float], List[float]]] = field(default_factory=dict)
+    etiquetas: Dict[Tuple[str, str], str] = field(default_factory=dict)  # (NODE/LINK, id) -> etiqueta
+    opciones: Dict[str, str] = field(default_factory=dict)
+    otras_secciones: Dict[str, List[str]] = field(default_factory=dict)
+
+    _indice_nudo: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    @property
+    def num_nudos(self) -> int:
+        return len(self.ids_nudo)
+
+    @property
+    def num_enlaces(self) -> int:
+        return len(self.ids_enlace)
+
+    def indice_nudo(self, id_nudo: str) -> int:
+        indice = self._indice_nudo.get(id_nudo)
+        if indice is None:
+            raise KeyError(f"No existe el nudo '{id_nudo}'")
+        return indice
+
+    # --- Conversión a sistema --------------------------------------------
+
+    def fluido(self) -> Fluido:
+        """Fluido según la gravedad específica y la viscosidad relativa de [OPTIONS]"""
+        gravedad_especifica = float(self.opciones.get('SPECIFIC GRAVITY', 1.0))
+        viscosidad_relativa = float(self.opciones.get('VISCOSITY', 1.0))
+        densidad = _DENSIDAD_AGUA * gravedad_especifica
+        nombre = 'agua' if gravedad_especifica == 1.0 and viscosidad_relativa == 1.0 else 'fluido_epanet'
+        return Fluido(nombre=nombre, densidad=densidad,
+                      viscosidad=_VISCOSIDAD_CINEMATICA_AGUA * viscosidad_relativa * densidad,
+                      presion_vapor=_PRESION_VAPOR_AGUA)
+
+    def curva_bomba(self, id_bomba: str, eficiencia: float = 0.70) -> Optional[CurvaBomba]:
+        """
+        Curva HEAD de una bomba en m³/s y m
+
+        Una curva de un solo punto se completa con la misma forma que usa
+        EPANET (carga a válvula cerrada del 133% del punto de diseño).
+        Devuelve None si la bomba se definió por potencia.
+        """
+        id_curva = self._curva_head(id_bomba)
+        if id_curva is None:
+            return None
+        factor_caudal, factor_longitud = self._factores()[:2]
+        xs, ys = self.curvas[id_curva]
+        caudales = [x * factor_caudal for x in xs]
+        alturas = [y * factor_longitud for y in ys]
+        if len(caudales) == 1:
+            return CurvaBomba.desde_punto_diseno(caudales[0], alturas[0], eficiencia, nombre=id_bomba)
+        return CurvaBomba(id_curva, caudales, alturas)
+
+    def _curva_head(self, id_bomba: str) -> Optional[str]:
+        """Curva HEAD de una bomba (None si se definió por potencia)"""
+        parametros = self.bombas.get(id_bomba)
+        if parametros is None:
+            raise KeyError(f"No existe la bomba '{id_bomba}'")
+        palabras = [p.upper() for p in parametros]
+        if 'HEAD' not in palabras:
+            return None
+        id_curva = parametros[palabras.index('HEAD') + 1]
+        if id_curva not in self.curvas:
+            raise ErrorEpanet(f"La bomba '{id_bomba}' usa la curva inexistente '{id_curva}'")
+        return id_curva
+
+    def recorrido(self, origen: str, destino: str) -> List[int]:
+        """Índices de los enlaces del camino más corto (en enlaces) entre dos nudos"""
+        inicio, fin = self.indice_nudo(origen), self.indice_nudo(destino)
+        desplazamientos, adyacentes = self._adyacencia()
+        enlace_previo = array('i', [-1]) * self.num_nudos
+        visitado = bytearray(self.num_nudos)
+        visitado[inicio] = 1
+        cola = deque([inicio])
+        while cola and not visitado[fin]:
+            nudo = cola.popleft()
+            for posicion in range(desplazamientos[nudo], desplazamientos[nudo + 1]):
+                enlace = adyacentes[posicion]
+                otro = self.nudo_final[enlace] if self.nudo_inicial[enlace] == nudo else self.nudo_inicial[enlace]
+                if not visitado[otro]:
+                    visitado[otro] = 1
+                    enlace_previo[otro] = enlace
+                    cola.append(otro)
+        if not visitado[fin]:
+            raise ErrorEpanet(f"No hay un camino entre '{origen}' y '{destino}'")
+
+        enlaces = []
+        nudo = fin
+        while nudo != inicio:
+            enlace = enlace_previo[nudo]
+            enlaces.append(enlace)
+            nudo = self.nudo_inicial[enlace] if self.nudo_final[enlace] == nudo else self.nudo_final[enlace]
+        enlaces.reverse()
+        return enlaces
+
+    def a_sistema(self, origen: Optional[str] = None, destino: Optional[str] = None,
+                  caudal: Optional[float] = None, fluido: Optional[Fluido] = None,
+                  eficiencia_bomba: float = 0.70) -> SistemaTuberias:
+        """
+        Sistema de tuberías del recorrido entre dos nudos de la red
+
+        Args:
+            origen: Nudo de succión; por defecto el primer embalse (o tanque)
+            destino: Nudo de descarga; por defecto otro tanque o embalse, o el
+                     nudo más alejado del origen
+            caudal: Caudal de diseño (m³/s); por defecto la demanda del destino,
+                    el punto de diseño de la primera bomba del recorrido o la
+                    demanda total de la red
+            fluido: Por defecto el definido en [OPTIONS]
+            eficiencia_bomba: Eficiencia del sistema resultante
+
+        Raises:
+            ErrorEpanet: Si no hay recorrido o no se puede determinar el caudal
+        """
+        with span('epanet.a_sistema'):
+            origen = origen if origen is not None else self._origen_por_defecto()
+            destino = destino if destino is not None else self._destino_por_defecto(origen)
+            if origen == destino:
+                raise ErrorEpanet("El origen y el destino deben ser nudos distintos")
+
+            tramos, accesorios = [], []
+            perdida_local = 0.0
+            valvulas_k = []
+            bomba = None
+            etiquetas = self.etiquetas
+            nudo = self.indice_nudo(origen)
+            for enlace in self.recorrido(origen, destino):
+                siguiente = (self.nudo_final[enlace] if self.nudo_inicial[enlace] == nudo
+                             else self.nudo_inicial[enlace])
+                id_enlace = self.ids_enlace[enlace]
+                tipo = self.tipos_enlace[enlace]
+                if tipo == TUBERIA:
+                    longitud = self.longitudes[enlace]
+                    orientacion = etiquetas.get(('LINK', id_enlace), '').lower()
+                    if orientacion not in ('horizontal', 'vertical'):
+                        desnivel = abs(self.elevaciones[siguiente] - self.elevaciones[nudo])
+                        orientacion = 'vertical' if desnivel >= PENDIENTE_VERTICAL * longitud else 'horizontal'
+                    try:
+                        tramos.append(TramoTuberia(
+                            longitud, orientacion, self.diametros[enlace],
+                            _material_por_rugosidad(self.rugosidades[enlace], self.formula_perdidas)
+                        ))
+                    except ValueError as e:
+                        raise ErrorEpanet(f"Tubería '{id_enlace}': {e}") from e
+                    perdida_local += self.perdidas_menores[enlace]
+                elif tipo == VALVULA:
+                    tipo_valvula, ajuste = self.valvulas[id_enlace]
+                    # En una TCV el ajuste es el coeficiente de pérdida de la válvula
+                    valvulas_k.append(float(ajuste) if tipo_valvula == 'TCV' else self.perdidas_menores[enlace])
+                elif bomba is None:
+                    bomba = id_enlace
+                nudo = siguiente
+
+            if not tramos:
+                raise ErrorEpanet(f"El recorrido entre '{origen}' y '{destino}' no tiene tuberías")
+            if perdida_local > 0:
+                accesorios.append(Accesorio(TipoAccesorio.PERDIDA_LOCAL, perdida_local, 0.0,
+                                            'EPANET', 'Pérdidas menores de tuberías'))
+            if valvulas_k:
+                accesorios.append(Accesorio(TipoAccesorio.VALVULA_GLOBO_ABIERTA,
+                                            sum(valvulas_k) / len(valvulas_k), 0.0,
+                                            'EPANET', 'Válvulas', cantidad=len(valvulas_k)))
+
+            if caudal is None:
+                caudal = self.demandas[self.indice_nudo(destino)]
+            if caudal <= 0 and bomba is not None:
+                id_curva = self._curva_head(bomba)
+                if id_curva is not None:
+                    # Punto central de la curva (el de diseño en curvas de 1 y 3 puntos)
+                    xs = self.curvas[id_curva][0]
+                    caudal = xs[len(xs) // 2] * self._factores()[0]
+            if caudal <= 0:
+                # El recorrido abastece la demanda de toda la red
+                caudal = sum(self.demandas)
+            if caudal <= 0:
+                raise ErrorEpanet("No se pudo determinar el caudal de diseño: indíquelo explícitamente")
+
+            return SistemaTuberias(
+                tramos=tramos,
+                accesorios=accesorios,
+                fluido=fluido if fluido is not None else self.fluido(),
+                caudal=caudal,
+                eficiencia_bomba=eficiencia_bomba,
+                elevacion_punto1=self._carga_nudo(self.indice_nudo(origen)),
+                elevacion_punto2=self._carga_nudo(self.indice_nudo(destino)),
+            )
+
+    def _carga_nudo(self, indice: int) -> float:
+        """Cota de la superficie libre (tanques) o del nudo"""
+        if self.tipos_nudo[indice] == TANQUE:
+            return self.elevaciones[indice] + self.niveles[indice]
+        return self.elevaciones[indice]
+
+    def _origen_por_defecto(self) -> str:
+        for tipo in (EMBALSE, TANQUE):
+            indice = self.tipos_nudo.find(bytes([tipo]))
+            if indice >= 0:
+                return self.ids_nudo[indice]
+        raise ErrorEpanet("La red no tiene embalses ni tanques: indique el nudo de origen")
+
+    def _destino_por_defecto(self, origen: str) -> str:
+        inicio = self.indice_nudo(origen)
+        for tipo in (TANQUE, EMBALSE):
+            for indice, tipo_nudo in enumerate(self.tipos_nudo):
+                if tipo_nudo == tipo and indice != inicio:
+                    return self.ids_nudo[indice]
+        # Nudo más alejado del origen (último visitado en anchura)
+        desplazamientos, adyacentes = self._adyacencia()
+        visitado = bytearray(self.num_nudos)
+        visitado[inicio] = 1
+        cola = deque([inicio])
+        ultimo = inicio
+        while cola:
+            ultimo = nudo = cola.popleft()
+            for posicion in range(desplazamientos[nudo], desplazamientos[nudo + 1]):
+                enlace = adyacentes[posicion]
+                for otro in (self.nudo_inicial[enlace], self.nudo_final[enlace]):
+                    if not visitado[otro]:
+                        visitado[otro] = 1
+                        cola.append(otro)
+        return self.ids_nudo[ultimo]
+
+    def _adyacencia(self) -> Tuple[array, array]:
+        """Enlaces de cada nudo en formato comprimido (desplazamientos, enlaces)"""
+        conteo = array('i', [0]) * (self.num_nudos + 1)
+        for extremos in (self.nudo_inicial, self.nudo_final):
+            for nudo in extremos:
+                conteo[nudo + 1] += 1
+        for i in range(self.num_nudos):
+            conteo[i + 1] += conteo[i]
+        posicion = array('i', conteo)
+        adyacentes = array('i', [0]) * (2 * self.num_enlaces)
+        for enlace, (a, b) in enumerate(zip(self.nudo_inicial, self.nudo_final)):
+            adyacentes[posicion[a]] = enlace
+            posicion[a] += 1
+            adyacentes[posicion[b]] = enlace
+            posicion[b] += 1
+        return conteo, adyacentes
+
+    def _factores(self) -> Tuple[float, float, float]:
+        """Factores a SI de caudal, longitud y diámetro según las unidades"""
+        factor_caudal, ingles = UNIDADES_CAUDAL[self.unidades]
+        return (factor_caudal, 0.3048, 0.0254) if ingles else (factor_caudal, 1.0, 1e-3)
+
+
+# --- Lectura -------------------------------------------------------------
+
+class _LectorInp:
+    """Interpreta un archivo INP línea por línea escribiendo en una RedEpanet"""
+
+    def __init__(self):
+        self.red = RedEpanet()
+        self.titulo = []
+        self.manejadores = {
+            '[TITLE]': None,  # se guarda la línea completa, no sus campos
+            '[JUNCTIONS]': self.nudo_consumo,
+            '[RESERVOIRS]': self.embalse,
+            '[TANKS]': self.tanque,
+            '[PIPES]': self.tuberia,
+            '[PUMPS]': self.bomba,
+            '[VALVES]': self.valvula,
+            '[CURVES]': self.curva,
+            '[TAGS]': self.etiqueta,
+            '[OPTIONS]': self.opcion,
+        }
+        # Nudos referenciados por un enlace antes de ser definidos
+        self.sin_definir = set()
+
+    def leer(self, lineas: Iterable[str]):
+        red = self.red
+        manejador = None
+        seccion = None
+        for numero, linea in enumerate(lineas, start=1):
+            comentario = linea.find(';')
+            if comentario >= 0:
+                linea = linea[:comentario]
+            campos = linea.split()
+            if not campos:
+                continue
+            if campos[0].startswith('['):
+                seccion = campos[0].upper()
+                if seccion == '[END]':
+                    break
+                manejador = self.manejadores.get(seccion)
+                if seccion not in self.manejadores:
+                    red.otras_secciones.setdefault(seccion, [])
+                continue
+            try:
+                if seccion == '[TITLE]':
+                    self.titulo.append(linea.strip())
+                elif manejador is not None:
+                    manejador(campos)
+                elif seccion is not None:
+                    red.otras_secciones[seccion].append(linea.rstrip())
+            except (ValueError, IndexError, KeyError) as e:
+                raise ErrorEpanet(f"Línea {numero} ({seccion}): {e}") from e
+
+        if self.sin_definir:
+            faltantes = ', '.join(sorted(self.sin_definir)[:5])
+            raise ErrorEpanet(f"Enlaces conectados a nudos no definidos: {faltantes}")
+        red.titulo = '\n'.join(self.titulo)
+        self._convertir_unidades()
+        return red
+
+    # Nudos
+
+    def _nudo(self, id_nudo: str) -> int:
+        """Índice de un nudo; si aún no se definió se reserva su lugar"""
+        red = self.red
+        indice = red._indice_nudo.get(id_nudo)
+        if indice is None:
+            indice = red._indice_nudo[id_nudo] = len(red.ids_nudo)
+            red.ids_nudo.append(id_nudo)
+            red.tipos_nudo.append(NUDO)
+            red.elevaciones.append(0.0)
+            red.demandas.append(0.0)
+            red.niveles.append(0.0)
+            self.sin_definir.add(id_nudo)
+        return indice
+
+    def _definir_nudo(self, id_nudo: str, tipo: int, elevacion: float) -> int:
+        indice = self._nudo(id_nudo)
+        if id_nudo not in self.sin_definir:
+            raise ValueError(f"nudo duplicado '{id_nudo}'")
+        self.sin_definir.discard(id_nudo)
+        self.red.tipos_nudo[indice] = tipo
+        self.red.elevaciones[indice] = elevacion
+        return indice
+
+    def nudo_consumo(self, campos):
+        indice = self._definir_nudo(campos[0], NUDO, float(campos[1]))
+        if len(campos) > 2:
+            self.red.demandas[indice] = float(campos[2])
+        if len(campos) > 3:
+            self.red.patrones[campos[0]] = campos[3]
+
+    def embalse(self, campos):
+        self._definir_nudo(campos[0], EMBALSE, float(campos[1]))
+        if len(campos) > 2:
+            self.red.patrones[campos[0]] = campos[2]
+
+    def tanque(self, campos):
+        indice = self._definir_nudo(campos[0], TANQUE, float(campos[1]))
+        self.red.niveles[indice] = float(campos[2])
+        self.red.tanques[campos[0]] = campos[3:]
+
+    # Enlaces
+
+    def _enlace(self, id_enlace, tipo, inicial, final, longitud, diametro, rugosidad, perdida):
+        red = self.red
+        red.ids_enlace.append(id_enlace)
+        red.tipos_enlace.append(tipo)
+        red.nudo_inicial.append(self._nudo(inicial))
+        red.nudo_final.append(self._nudo(final))
+        red.longitudes.append(longitud)
+        red.diametros.append(diametro)
+        red.rugosidades.append(rugosidad)
+        red.perdidas_menores.append(perdida)
+
+    def tuberia(self, campos):
+        perdida = float(campos[6]) if len(campos) > 6 else 0.0
+        self._enlace(campos[0], TUBERIA, campos[1], campos[2], float(campos[3]),
+                     float(campos[4]), float(campos[5]), perdida)
+        if len(campos) > 7:
+            self.red.estados[campos[0]] = campos[7]
+
+    def bomba(self, campos):
+        self._enlace(campos[0], BOMBA, campos[1], campos[2], 0.0, 0.0, 0.0, 0.0)
+        self.red.bombas[campos[0]] = campos[3:]
+
+    def valvula(self, campos):
+        perdida = float(campos[6]) if len(campos) > 6 else 0.0
+        self._enlace(campos[0], VALVULA, campos[1], campos[2], 0.0, float(campos[3]), 0.0, perdida)
+        self.red.valvulas[campos[0]] = (campos[4].upper(), campos[5])
+
+    # Otras secciones
+
+    def curva(self, campos):
+        xs, ys = self.red.curvas.setdefault(campos[0], ([], []))
+        xs.append(float(campos[1]))
+        ys.append(float(campos[2]))
+
+    def etiqueta(self, campos):
+        self.red.etiquetas[(campos[0].upper(), campos[1])] = campos[2]
+
+    def opcion(self, campos):
+        self.red.opciones[' '.join(campos[:-1]).upper()] = campos[-1]
+
+    def _convertir_unidades(self):
+        """Pasa longitudes, diámetros, cotas y demandas a SI"""
+        red = self.red
+        red.unidades = red.opciones.get('UNITS', 'GPM').upper()
+        red.formula_perdidas = red.opciones.get('HEADLOSS', 'H-W').upper()
+        if red.unidades not in UNIDADES_CAUDAL:
+            raise ErrorEpanet(f"Unidades de caudal desconocidas: '{red.unidades}'")
+        factor_caudal, factor_longitud, factor_diametro = red._factores()
+        for columna, factor in ((red.demandas, factor_caudal), (red.elevaciones, factor_longitud),
+                                (red.niveles, factor_longitud), (red.longitudes, factor_longitud),
+                                (red.diametros, factor_diametro)):
+            if factor != 1.0:
+                columna[:] = array('d', [valor * factor for valor in columna])
+
+
+def importar_inp(ruta) -> RedEpanet:
+    """
+    Lee un archivo EPANET INP en flujo
+
+    Raises:
+        ErrorEpanet: Si el archivo no es un INP válido
+        OSError: Si no se puede leer el archivo
+    """
+    with span('epanet.importar'):
+        # surrogateescape conserva los bytes de ids en otras codificaciones (p. ej. Latin-1)
+        with open(ruta, 'r', encoding='utf-8', errors='surrogateescape', buffering=1 << 20) as archivo:
+            return _LectorInp().leer(archivo)
+
+
+# --- Escritura -----------------------------------------------------------
+
+def red_desde_sistema(sistema: SistemaTuberias, carga_bomba: Optional[float] = None) -> RedEpanet:
+    """
+    Red EPANET equivalente a un sistema de tuberías
+
+    La línea va del embalse R1 (punto 1) al embalse R2 (punto 2) pasando por
+    los nudos J0..Jn; las presiones de los puntos se suman a la carga de los
+    embalses. La orientación de cada tubería se guarda en [TAGS], el
+    material como rugosidad de Darcy-Weisbach y las pérdidas menores de los
+    accesorios en la primera tubería. Si se indica la carga de la bomba, se
+    agrega una bomba con una curva de un punto (caudal de diseño, carga).
+    """
+    if not sistema.tramos:
+        raise ValueError("El sistema no tiene tramos")
+    red = RedEpanet(titulo="Sistema de bombeo", unidades='LPS', formula_perdidas='D-W')
+    densidad = sistema.fluido.densidad if sistema.fluido is not None else _DENSIDAD_AGUA
+    viscosidad = sistema.fluido.viscosidad if sistema.fluido is not None else _DENSIDAD_AGUA * _VISCOSIDAD_CINEMATICA_AGUA
+    red.opciones = {
+        'UNITS': 'LPS',
+        'HEADLOSS': 'D-W',
+        'SPECIFIC GRAVITY': repr(densidad / _DENSIDAD_AGUA),
+        'VISCOSITY': repr(viscosidad / densidad / _VISCOSIDAD_CINEMATICA_AGUA),
+    }
+
+    def agregar_nudo(id_nudo, tipo, elevacion):
+        red._indice_nudo[id_nudo] = len(red.ids_nudo)
+        red.ids_nudo.append(id_nudo)
+        red.tipos_nudo.append(tipo)
+        red.elevaciones.append(elevacion)
+        red.demandas.append(0.0)
+        red.niveles.append(0.0)
+
+    def agregar_enlace(id_enlace, tipo, inicial, final, longitud=0.0, diametro=0.0,
+                       rugosidad=0.0, perdida=0.0):
+        red.ids_enlace.append(id_enlace)
+        red.tipos_enlace.append(tipo)
+        red.nudo_inicial.append(inicial)
+        red.nudo_final.append(final)
+        red.longitudes.append(longitud)
+        red.diametros.append(diametro)
+        red.rugosidades.append(rugosidad)
+        red.perdidas_menores.append(perdida)
+
+    def carga_presion(presion):
+        return (presion - _PRESION_ATMOSFERICA) / (densidad * _GRAVEDAD)
+
+    z1, z2 = sistema.elevacion_punto1, sistema.elevacion_punto2
+    agregar_nudo('R1', EMBALSE, z1 + carga_presion(sistema.presion_punto1))
+
+    # Perfil de cotas: el desnivel se reparte entre los tramos verticales
+    longitud_vertical = sum(t.longitud for t in sistema.tramos if t.orientacion == 'vertical')
+    n = len(sistema.tramos)
+    cota = z1
+    anterior = 0
+    if carga_bomba is not None:
+        agregar_nudo('J0', NUDO, cota)
+        agregar_enlace('B1', BOMBA, 0, 1)
+        red.bombas['B1'] = ['HEAD', 'C1']
+        red.curvas['C1'] = ([sistema.caudal * 1000.0], [carga_bomba])
+        anterior = 1
+
+    perdida_local = sum(acc.K_total for acc in sistema.accesorios)
+    for i, tramo in enumerate(sistema.tramos, start=1):
+        if longitud_vertical > 0:
+            if tramo.orientacion == 'vertical':
+                cota += (z2 - z1) * tramo.longitud / longitud_vertical
+        else:
+            cota += (z2 - z1) / n
+        if i < n:
+            agregar_nudo(f'J{i}', NUDO, cota)
+            final = len(red.ids_nudo) - 1
+        else:
+            agregar_nudo('R2', EMBALSE, z2 + carga_presion(sistema.presion_punto2))
+            final = len(red.ids_nudo) - 1
+        rugosidad = MATERIALES.get(tramo.material, MATERIALES[MATERIAL_POR_DEFECTO])[0]
+        agregar_enlace(f'P{i}', TUBERIA, anterior, final, tramo.longitud, tramo.diametro,
+                       rugosidad, perdida_local if i == 1 else 0.0)
+        red.etiquetas[('LINK', f'P{i}')] = tramo.orientacion
+        anterior = final
+    return red
+
+
+def _numero(valor: float) -> str:
+    return f'{valor:.12g}'
+
+
+def _lineas_inp(red: RedEpanet) -> Iterable[str]:
+    """Líneas del archivo INP en las unidades de la red"""
+    factor_caudal, factor_longitud, factor_diametro = red._factores()
+    ids = red.ids_nudo
+    tipos = red.tipos_nudo
+
+    yield '[TITLE]\n'
+    if red.titulo:
+        yield red.titulo + '\n'
+
+    yield '\n[JUNCTIONS]\n;ID\tElev\tDemand\tPattern\n'
+    for i, id_nudo in enumerate(ids):
+        if tipos[i] == NUDO:
+            patron = red.patrones.get(id_nudo, '')
+            yield (f'{id_nudo}\t{_numero(red.elevaciones[i] / factor_longitud)}\t'
+                   f'{_numero(red.demandas[i] / factor_caudal)}\t{patron}\n')
+
+    yield '\n[RESERVOIRS]\n;ID\tHead\tPattern\n'
+    for i, id_nudo in enumerate(ids):
+        if tipos[i] == EMBALSE:
+            yield f'{id_nudo}\t{_numero(red.elevaciones[i] / factor_longitud)}\t{red.patrones.get(id_nudo, "")}\n'
+
+    yield '\n[TANKS]\n;ID\tElevation\tInitLevel\tMinLevel\tMaxLevel\tDiameter\tMinVol\tVolCurve\n'
+    for i, id_nudo in enumerate(ids):
+        if tipos[i] == TANQUE:
+            resto = '\t'.join(red.tanques.get(id_nudo, ()))
+            yield (f'{id_nudo}\t{_numero(red.elevaciones[i] / factor_longitud)}\t'
+                   f'{_numero(red.niveles[i] / factor_longitud)}\t{resto}\n')
+
+    enlaces = list(enumerate(red.ids_enlace))
+    yield '\n[PIPES]\n;ID\tNode1\tNode2\tLength\tDiameter\tRoughness\tMinorLoss\tStatus\n'
+    for i, id_enlace in enlaces:
+        if red.tipos_enlace[i] == TUBERIA:
+            yield (f'{id_enlace}\t{ids[red.nudo_inicial[i]]}\t{ids[red.nudo_final[i]]}\t'
+                   f'{_numero(red.longitudes[i] / factor_longitud)}\t'
+                   f'{_numero(red.diametros[i] / factor_diametro)}\t{_numero(red.rugosidades[i])}\t'
+                   f'{_numero(red.perdidas_menores[i])}\t{red.estados.get(id_enlace, "Open")}\n')
+
+    yield '\n[PUMPS]\n;ID\tNode1\tNode2\tParameters\n'
+    for i, id_enlace in enlaces:
+        if red.tipos_enlace[i] == BOMBA:
+            parametros = ' '.join(red.bombas.get(id_enlace, ()))
+            yield f'{id_enlace}\t{ids[red.nudo_inicial[i]]}\t{ids[red.nudo_final[i]]}\t{parametros}\n'
+
+    yield '\n[VALVES]\n;ID\tNode1\tNode2\tDiameter\tType\tSetting\tMinorLoss\n'
+    for i, id_enlace in enlaces:
+        if red.tipos_enlace[i] == VALVULA:
+            tipo, ajuste = red.valvulas[id_enlace]
+            yield (f'{id_enlace}\t{ids[red.nudo_inicial[i]]}\t{ids[red.nudo_final[i]]}\t'
+                   f'{_numero(red.diametros[i] / factor_diametro)}\t{tipo}\t{ajuste}\t'
+                   f'{_numero(red.perdidas_menores[i])}\n')
+
+    yield '\n[TAGS]\n'
+    for (tipo, id_elemento), etiqueta in red.etiquetas.items():
+        yield f'{tipo}\t{id_elemento}\t{etiqueta}\n'
+
+    yield '\n[CURVES]\n;ID\tX-Value\tY-Value\n'
+    for id_curva, (xs, ys) in red.curvas.items():
+        for x, y in zip(xs, ys):
+            yield f'{id_curva}\t{_numero(x)}\t{_numero(y)}\n'
+
+    yield '\n[OPTIONS]\n'
+    opciones = dict(red.opciones)
+    opciones['UNITS'] = red.unidades
+    opciones['HEADLOSS'] = red.formula_perdidas
+    for clave, valor in opciones.items():
+        yield f'{clave.title()}\t{valor}\n'
+
+    for seccion, lineas in red.otras_secciones.items():
+        yield f'\n{seccion}\n'
+        for linea in lineas:
+            yield linea + '\n'
+    yield '\n[END]\n'
+
+
+def exportar_inp(ruta, red: RedEpanet) -> None:
+    """
+    Escribe una red en formato EPANET INP
+
+    Raises:
+        OSError: Si no se puede escribir el archivo
+    """
+    with span('epanet.exportar'), _archivo_temporal(ruta) as temporal:
+        with open(temporal, 'w', encoding='utf-8', errors='surrogateescape',
+                  newline='\n', buffering=1 << 20) as archivo:
+            archivo.writelines(_lineas_inp(red))
@@ -0,0 +1,601 @@
+"""
+Exportación de resultados a CSV, Excel (XLSX) y PDF
+
+Los exportadores reciben las filas como generadores y las escriben a medida
+que se producen, de modo que exportar un barrido de millones de filas usa
+memoria constante. Los barridos por columnas (diccionarios en memoria o
+secciones de un proyecto) se recorren por bloques con bloques_columnas.
+
+XLSX y PDF se escriben a mano (zipfile + XML y objetos PDF) sin dependencias
+adicionales. Cada archivo se escribe primero como temporal junto al destino,
+que solo se reemplaza si la exportación termina.
+"""
+import contextlib
+import csv
+import io
+import itertools
+import math
+import os
+import zipfile
+import zlib
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from ..calculations.cancelacion import TokenCancelacion
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: las estadísticas del resumen se calculan en Python
+    np = None
+
+BLOQUE_FILAS = 65536
+# Límite de filas por hoja de Excel (incluye el encabezado)
+FILAS_POR_HOJA_XLSX = 1_048_576
+
+# clave: (descripción, unidad), en el orden en que se presentan
+DESCRIPCIONES = {
+    'caudal': ("Caudal", "m³/s"),
+    'velocidad': ("Velocidad", "m/s"),
+    'numero_reynolds': ("Número de Reynolds", ""),
+    'factor_friccion': ("Factor de fricción", ""),
+    'perdidas_mayores': ("Pérdidas mayores", "m"),
+    'perdidas_menores': ("Pérdidas menores", "m"),
+    'perdidas_totales': ("Pérdidas totales", "m"),
+    'altura_elevacion': ("Altura de elevación", "m"),
+    'altura_presion': ("Altura de presión", "m"),
+    'carga_total_bomba': ("Carga total de bomba (Ht)", "m"),
+    'altura_sucursal': ("Altura de succión", "m"),
+    'altura_descarga': ("Altura de descarga", "m"),
+    'NPSHa': ("NPSH disponible", "m"),
+    'presion_inicial_m': ("Presión inicial", "m"),
+    'presion_vapor_m': ("Presión de vapor", "m"),
+    'elevacion_fluido_sucursal': ("Elevación del fluido en succión", "m"),
+    'perdidas_sucursal': ("Pérdidas en succión", "m"),
+    'potencia_hidraulica_W': ("Potencia hidráulica", "W"),
+    'potencia_bomba_W': ("Potencia de bomba", "W"),
+    'potencia_hidraulica_kW': ("Potencia hidráulica", "kW"),
+    'potencia_bomba_kW': ("Potencia de bomba", "kW"),
+}
+
+ENCABEZADO_RESULTADOS = ('parametro', 'descripcion', 'valor', 'unidad')
+EXTENSIONES = ('.csv', '.xlsx', '.pdf')
+
+
+# --- Generadores de filas ------------------------------------------------
+
+def bloques_columnas(columnas, claves: Optional[Sequence[str]] = None,
+                     filas_por_bloque: int = BLOQUE_FILAS,
+                     progreso: Optional[Callable[[int], None]] = None,
+                     cancelacion: Optional[TokenCancelacion] = None) -> Iterator[Dict[str, list]]:
+    """
+    Recorre columnas de igual largo por bloques de filas
+
+    Args:
+        columnas: Clave -> secuencia (listas, array, memoryview, NumPy o
+                  ColumnasProyecto; solo se lee el bloque en curso)
+        claves: Columnas a incluir; por defecto todas
+        filas_por_bloque: Filas por bloque
+        progreso: Función opcional que recibe el porcentaje recorrido
+        cancelacion: Token opcional; se verifica antes de cada bloque
+
+    Yields: diccionarios clave -> lista de valores del bloque
+    """
+    if claves is None:
+        claves = list(columnas)
+    total = len(columnas[claves[0]]) if claves else 0
+    for desde in range(0, total, filas_por_bloque):
+        if cancelacion is not None:
+            cancelacion.verificar()
+        hasta = min(desde + filas_por_bloque, total)
+        yield {clave: _como_lista(columnas[clave][desde:hasta]) for clave in claves}
+        if progreso is not None:
+            progreso(100 * hasta // total)
+
+
+def filas_de_bloques(bloques: Iterable[Dict[str, Sequence]], claves: Sequence[str]) -> Iterator[tuple]:
+    """Filas (tuplas) a partir de bloques por columnas"""
+    for bloque in bloques:
+        yield from zip(*(bloque[clave] for clave in claves))
+
+
+def filas_resultados(resultados: Dict[str, float]) -> Iterator[tuple]:
+    """Filas (parámetro, descripción, valor, unidad) de los resultados completos"""
+    for clave in _ordenar_claves(resultados):
+        descripcion, unidad = DESCRIPCIONES.get(clave, (clave, ""))
+        yield clave, descripcion, resultados[clave], unidad
+
+
+# --- CSV -----------------------------------------------------------------
+
+def exportar_csv(ruta, encabezado: Sequence[str], filas: Iterable[Sequence],
+                 separador: str = ',') -> int:
+    """
+    Escribe filas en un CSV a medida que el generador las produce
+
+    Los números se escriben con repr, que conserva todos los dígitos.
+
+    Returns: número de filas escritas (sin el encabezado)
+
+    Raises:
+        OSError: Si no se puede escribir el archivo
+    """
+    contador = _Contador(filas)
+    with _archivo_temporal(ruta) as temporal:
+        with open(temporal, 'w', encoding='utf-8', newline='', buffering=1 << 20) as archivo:
+            escritor = csv.writer(archivo, delimiter=separador, lineterminator='\n')
+            escritor.writerow(encabezado)
+            escritor.writerows(contador)
+    return contador.filas
+
+
+def exportar_csv_bloques(ruta, claves: Sequence[str], bloques: Iterable[Dict[str, Sequence]],
+                         separador: str = ',') -> int:
+    """
+    Escribe en CSV columnas numéricas recorridas por bloques
+
+    Cada bloque se formatea con una sola unión de textos, sin pasar fila por
+    fila por csv.writer (los números nunca necesitan comillas).
+
+    Returns: número de filas escritas (sin el encabezado)
+
+    Raises:
+        OSError: Si no se puede escribir el archivo
+    """
+    filas = 0
+    with _archivo_temporal(ruta) as temporal:
+        with open(temporal, 'w', encoding='utf-8', newline='', buffering=1 << 20) as archivo:
+            csv.writer(archivo, delimiter=separador, lineterminator='\n').writerow(claves)
+            for bloque in bloques:
+                columnas = [map(repr, bloque[clave]) for clave in claves]
+                archivo.write('\n'.join(map(separador.join, zip(*columnas))))
+                archivo.write('\n')
+                filas += len(bloque[claves[0]])
+    return filas
+
+
+# --- XLSX ----------------------------------------------------------------
+
+_TIPOS_CONTENIDO = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{hojas}</Types>'
+)
+_TIPO_HOJA = ('<Override PartName="/xl/worksheets/sheet{n}.xml" '
+              'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>')
+_RELACIONES_PAQUETE = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+_LIBRO = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{hojas}</sheets></workbook>'
+)
+_RELACIONES_LIBRO = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{hojas}<Relationship Id="rIdEstilos" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/></Relationships>'
+)
+_RELACION_HOJA = ('<Relationship Id="rId{n}" '
+                  'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                  'Target="worksheets/sheet{n}.xml"/>')
+# Estilo 0: normal; estilo 1: negrita (encabezados)
+_ESTILOS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '</styleSheet>'
+)
+_INICIO_HOJA = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" '
+    'activePane="bottomLeft" state="frozen"/></sheetView></sheetViews><sheetData>'
+)
+_FIN_HOJA = '</sheetData></worksheet>'
+# Filas que se agrupan en una sola escritura al archivo comprimido
+_FILAS_POR_ESCRITURA = 4096
+
+
+def exportar_xlsx(ruta, hojas: Iterable[Tuple[str, Sequence[str], Iterable[Sequence]]]) -> int:
+    """
+    Escribe un libro de Excel con una o más hojas, fila por fila
+
+    Las hojas que superan el límite de filas de Excel continúan en hojas
+    nuevas ("Barrido (2)", ...), repitiendo el encabezado.
+
+    Args:
+        ruta: Archivo de destino
+        hojas: (nombre, encabezado, filas) por hoja; las filas pueden ser un generador
+
+    Returns: número total de filas escritas (sin encabezados)
+
+    Raises:
+        OSError: Si no se puede escribir el archivo
+    """
+    total = 0
+    with _archivo_temporal(ruta) as temporal:
+        with zipfile.ZipFile(temporal, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as libro:
+            nombres = []
+            for nombre, encabezado, filas in hojas:
+                filas = iter(filas)
+                parte = 1
+                while True:
+                    titulo = nombre if parte == 1 else f"{nombre} ({parte})"
+                    nombres.append(_nombre_hoja(titulo))
+                    escritas, agotadas = _escribir_hoja(libro, len(nombres), encabezado, filas)
+                    total += escritas
+                    if agotadas:
+                        break
+                    # La hoja está llena: solo se necesita otra si quedan filas
+                    siguiente = next(filas, None)
+                    if siguiente is None:
+                        break
+                    filas = itertools.chain((siguiente,), filas)
+                    parte += 1
+
+            libro.writestr('[Content_Types].xml', _TIPOS_CONTENIDO.format(
+                hojas=''.join(_TIPO_HOJA.format(n=n) for n in range(1, len(nombres) + 1))))
+            libro.writestr('_rels/.rels', _RELACIONES_PAQUETE)
+            libro.writestr('xl/workbook.xml', _LIBRO.format(hojas=''.join(
+                f'<sheet name="{escape(titulo, {chr(34): "&quot;"})}" sheetId="{n}" r:id="rId{n}"/>'
+                for n, titulo in enumerate(nombres, start=1))))
+            libro.writestr('xl/_rels/workbook.xml.rels', _RELACIONES_LIBRO.format(
+                hojas=''.join(_RELACION_HOJA.format(n=n) for n in range(1, len(nombres) + 1))))
+            libro.writestr('xl/styles.xml', _ESTILOS)
+    return total
+
+
+def _escribir_hoja(libro: zipfile.ZipFile, numero: int, encabezado: Sequence[str],
+                   filas: Iterator[Sequence]) -> Tuple[int, bool]:
+    """Escribe una hoja hasta agotar las filas o llegar al límite de Excel
+
+    Returns: (filas escritas, False si la hoja se llenó antes de agotar las filas)
+    """
+    limite = FILAS_POR_HOJA_XLSX - 1
+    escritas = 0
+    agotadas = True
+    with libro.open(f'xl/worksheets/sheet{numero}.xml', 'w', force_zip64=True) as binario:
+        with io.TextIOWrapper(binario, encoding='utf-8') as hoja:
+            hoja.write(_INICIO_HOJA)
+            hoja.write('<row>' + ''.join(
+                f'<c t="inlineStr" s="1"><is><t>{escape(str(texto))}</t></is></c>'
+                for texto in encabezado) + '</row>')
+            pendientes = []
+            for fila in filas:
+                pendientes.append('<row>' + ''.join(map(_celda, fila)) + '</row>')
+                escritas += 1
+                if len(pendientes) >= _FILAS_POR_ESCRITURA:
+                    hoja.write(''.join(pendientes))
+                    pendientes.clear()
+                if escritas >= limite:
+                    agotadas = False
+                    break
+            hoja.write(''.join(pendientes))
+            hoja.write(_FIN_HOJA)
+    return escritas, agotadas
+
+
+def _celda(valor) -> str:
+    if isinstance(valor, float):
+        if math.isfinite(valor):
+            return f'<c><v>{valor!r}</v></c>'
+        return '<c t="e"><v>#N/A</v></c>'  # Excel no admite NaN ni infinitos
+    if isinstance(valor, (int, bool)):
+        return f'<c><v>{int(valor)}</v></c>'
+    if valor is None:
+        return '<c/>'
+    if isinstance(valor, str):
+        return f'<c t="inlineStr"><is><t>{escape(valor)}</t></is></c>'
+    return _celda(float(valor))  # escalares de NumPy
+
+
+def _nombre_hoja(nombre: str) -> str:
+    """Nombre de hoja válido en Excel (máximo 31 caracteres, sin []:*?/\\)"""
+    for caracter in '[]:*?/\\':
+        nombre = nombre.replace(caracter, ' ')
+    return nombre[:31] or "Hoja"
+
+
+# --- PDF -----------------------------------------------------------------
+
+class _DocumentoPDF:
+    """PDF mínimo de texto (A4, Helvetica) escrito página por página
+
+    Cada página se escribe al completarse, de modo que solo la página en
+    curso se mantiene en memoria.
+    """
+
+    ANCHO, ALTO = 595, 842
+    MARGEN = 50
+    INTERLINEA = 14
+
+    def __init__(self, archivo):
+        self.archivo = archivo
+        self.desplazamientos = {}
+        self.paginas = []
+        self.siguiente_objeto = 5  # 1 catálogo, 2 páginas, 3 y 4 fuentes
+        self._comandos = []
+        self._y = self.ALTO - self.MARGEN
+        archivo.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._objeto(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica '
+                        b'/Encoding /WinAnsiEncoding >>')
+        self._objeto(4, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold '
+                        b'/Encoding /WinAnsiEncoding >>')
+
+    def linea(self, *columnas: Tuple[float, str], negrita: bool = False, tamano: int = 10,
+              espacio: float = 0.0) -> None:
+        """Escribe una línea; cada columna es (x desde el margen, texto)"""
+        alto = self.INTERLINEA * tamano / 10 + espacio
+        if self._y - alto < self.MARGEN:
+            self._cerrar_pagina()
+        self._y -= alto
+        fuente = b'/F2' if negrita else b'/F1'
+        for x, texto in columnas:
+            self._comandos.append(b'BT %s %d Tf %.1f %.1f Td (%s) Tj ET' % (
+                fuente, tamano, self.MARGEN + x, self._y, _texto_pdf(texto)))
+
+    def cerrar(self) -> None:
+        if self._comandos or not self.paginas:
+            self._cerrar_pagina()
+        hijos = b' '.join(b'%d 0 R' % n for n in self.paginas)
+        self._objeto(2, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (hijos, len(self.paginas)))
+        self._objeto(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+
+        total = self.siguiente_objeto
+        posicion_xref = self.archivo.tell()
+        self.archivo.write(b'xref\n0 %d\n0000000000 65535 f \n' % total)
+        for numero in range(1, total):
+            self.archivo.write(b'%010d 00000 n \n' % self.desplazamientos[numero])
+        self.archivo.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                           % (total, posicion_xref))
+
+    def _cerrar_pagina(self) -> None:
+        contenido = zlib.compress(b'\n'.join(self._comandos))
+        flujo = self._nuevo_objeto()
+        self._objeto(flujo, b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream'
+                     % (len(contenido), contenido))
+        pagina = self._nuevo_objeto()
+        self._objeto(pagina, b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] '
+                             b'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>'
+                     % (self.ANCHO, self.ALTO, flujo))
+        self.paginas.append(pagina)
+        self._comandos = []
+        self._y = self.ALTO - self.MARGEN
+
+    def _nuevo_objeto(self) -> int:
+        numero = self.siguiente_objeto
+        self.siguiente_objeto += 1
+        return numero
+
+    def _objeto(self, numero: int, cuerpo: bytes) -> None:
+        self.desplazamientos[numero] = self.archivo.tell()
+        self.archivo.write(b'%d 0 obj\n%s\nendobj\n' % (numero, cuerpo))
+
+
+def exportar_resumen_pdf(ruta, resultados: Dict[str, float], sistema=None,
+                         barrido: Optional[Iterable[Dict[str, Sequence]]] = None) -> None:
+    """
+    Escribe un resumen en PDF: datos del sistema, resultados y estadísticas del barrido
+
+    Args:
+        ruta: Archivo de destino
+        resultados: Resultados completos del cálculo
+        sistema: SistemaTuberias opcional cuyos datos se incluyen
+        barrido: Bloques por columnas opcionales (p. ej. bloques_columnas); se
+                 resumen con mínimo y máximo por columna sin guardarlos en memoria
+
+    Raises:
+        OSError: Si no se puede escribir el archivo
+    """
+    with _archivo_temporal(ruta) as temporal, open(temporal, 'wb') as archivo:
+        pdf = _DocumentoPDF(archivo)
+        pdf.linea((0, "Resumen de Resultados - Sistema de Bombeo"), negrita=True, tamano=16)
+        pdf.linea((0, f"Generado: {datetime.now():%Y-%m-%d %H:%M}"), espacio=4)
+
+        if sistema is not None:
+            pdf.linea((0, "Sistema"), negrita=True, tamano=12, espacio=10)
+            for etiqueta, valor in _datos_sistema(sistema):
+                pdf.linea((0, etiqueta), (220, valor))
+
+        pdf.linea((0, "Resultados"), negrita=True, tamano=12, espacio=10)
+        pdf.linea((0, "Parámetro"), (260, "Valor"), (380, "Unidad"), negrita=True)
+        for _, descripcion, valor, unidad in filas_resultados(resultados):
+            pdf.linea((0, descripcion), (260, _formatear(valor)), (380, unidad))
+
+        if barrido is not None:
+            filas, estadisticas = _estadisticas(barrido)
+            pdf.linea((0, f"Barrido ({filas:,} puntos)"), negrita=True, tamano=12, espacio=10)
+            pdf.linea((0, "Columna"), (260, "Mínimo"), (340, "Máximo"), (420, "Unidad"),
+                      negrita=True)
+            for clave in _ordenar_claves(estadisticas):
+                minimo, maximo = estadisticas[clave]
+                descripcion, unidad = DESCRIPCIONES.get(clave, (clave, ""))
+                pdf.linea((0, descripcion), (260, _formatear(minimo)),
+                          (340, _formatear(maximo)), (420, unidad))
+        pdf.cerrar()
+
+
+def _texto_pdf(texto: str) -> bytes:
+    """Cadena literal de PDF en WinAnsiEncoding"""
+    datos = texto.encode('cp1252', errors='replace')
+    return datos.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+def _datos_sistema(sistema) -> List[Tuple[str, str]]:
+    datos = []
+    if sistema.fluido is not None:
+        datos.append(("Fluido", sistema.fluido.nombre))
+    datos += [
+        ("Caudal de diseño", f"{sistema.caudal * 1000:.3f} L/s"),
+        ("Eficiencia de la bomba", f"{sistema.eficiencia_bomba * 100:.1f} %"),
+        ("Tramos", f"{len(sistema.tramos):,}"),
+        ("Longitud total", f"{sistema.longitud_total:,.2f} m"),
+        ("Accesorios", f"{sum(a.cantidad for a in sistema.accesorios):,}"),
+        ("Elevación punto 1 / 2", f"{sistema.elevacion_punto1:.2f} m / {sistema.elevacion_punto2:.2f} m"),
+        ("Presión punto 1 / 2", f"{sistema.presion_punto1:,.0f} Pa / {sistema.presion_punto2:,.0f} Pa"),
+    ]
+    return datos
+
+
+def _estadisticas(bloques: Iterable[Dict[str, Sequence]]) -> Tuple[int, Dict[str, Tuple[float, float]]]:
+    """Filas y (mínimo, máximo) por columna, ignorando NaN, recorriendo los bloques una vez"""
+    filas = 0
+    estadisticas = {}
+    for bloque in bloques:
+        for clave, valores in bloque.items():
+            if np is not None:
+                arreglo = np.asarray(valores, dtype=float)
+                arreglo = arreglo[~np.isnan(arreglo)]
+                extremos = (float(arreglo.min()), float(arreglo.max())) if arreglo.size else None
+            else:
+                finitos = [v for v in valores if v == v]
+                extremos = (min(finitos), max(finitos)) if finitos else None
+            anterior = estadisticas.get(clave)
+            if extremos is None:
+                estadisticas.setdefault(clave, (math.nan, math.nan))
+            elif anterior is None or anterior[0] != anterior[0]:
+                estadisticas[clave] = extremos
+            else:
+                estadisticas[clave] = (min(anterior[0], extremos[0]), max(anterior[1], extremos[1]))
+        if bloque:
+            filas += len(next(iter(bloque.values())))
+    return filas, estadisticas
+
+
+def _formatear(valor) -> str:
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return "--"
+    valor = float(valor)
+    if valor != 0 and (abs(valor) >= 1e6 or abs(valor) < 1e-3):
+        return f"{valor:.4e}"
+    return f"{valor:,.4f}"
+
+
+# --- Exportación de alto nivel -------------------------------------------
+
+def exportar_resultados(ruta, resultados: Dict[str, float], sistema=None, barrido=None,
+                        progreso: Optional[Callable[[int], None]] = None,
+                        cancelacion: Optional[TokenCancelacion] = None) -> None:
+    """
+    Exporta los resultados completos según la extensión del archivo
+
+    - .csv: tabla parámetro, descripción, valor y unidad
+    - .xlsx: hoja "Resultados" y, si hay barrido, sus columnas en hojas "Barrido"
+    - .pdf: resumen con el sistema, los resultados y estadísticas del barrido
+
+    Args:
+        barrido: Columnas del barrido (opcional; no se usa en CSV)
+
+    Raises:
+        ValueError: Si la extensión no es .csv, .xlsx ni .pdf
+        OSError: Si no se puede escribir el archivo
+    """
+    extension = _extension(ruta)
+    if extension == '.csv':
+        exportar_csv(ruta, ENCABEZADO_RESULTADOS, filas_resultados(resultados))
+        return
+
+    bloques = None
+    if barrido:
+        bloques = bloques_columnas(barrido, progreso=progreso, cancelacion=cancelacion)
+    if extension == '.xlsx':
+        hojas = [("Resultados", ENCABEZADO_RESULTADOS, filas_resultados(resultados))]
+        if bloques is not None:
+            claves = list(barrido)
+            hojas.append(("Barrido", claves, filas_de_bloques(bloques, claves)))
+        exportar_xlsx(ruta, hojas)
+    else:
+        exportar_resumen_pdf(ruta, resultados, sistema, bloques)
+
+
+def exportar_barrido(ruta, columnas, progreso: Optional[Callable[[int], None]] = None,
+                     cancelacion: Optional[TokenCancelacion] = None) -> int:
+    """
+    Exporta las columnas de un barrido a CSV o XLSX según la extensión
+
+    Las columnas se recorren por bloques de BLOQUE_FILAS filas: la memoria
+    usada no depende del número de filas.
+
+    Returns: número de filas escritas
+
+    Raises:
+        ValueError: Si la extensión no es .csv ni .xlsx
+        OSError: Si no se puede escribir el archivo
+    """
+    extension = _extension(ruta)
+    if extension not in ('.csv', '.xlsx'):
+        raise ValueError("El barrido se exporta en formato .csv o .xlsx")
+    claves = list(columnas)
+    bloques = bloques_columnas(columnas, claves, progreso=progreso, cancelacion=cancelacion)
+    if extension == '.csv':
+        return exportar_csv_bloques(ruta, claves, bloques)
+    return exportar_xlsx(ruta, [("Barrido", claves, filas_de_bloques(bloques, claves))])
+
+
+# --- Utilidades ----------------------------------------------------------
+
+@contextlib.contextmanager
+def _archivo_temporal(ruta):
+    """Ruta temporal que reemplaza al destino solo si el bloque termina sin errores"""
+    ruta = os.fspath(ruta)
+    temporal = ruta + '.tmp'
+    try:
+        yield temporal
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporal)
+        raise
+    os.replace(temporal, ruta)
+
+
+class _Contador:
+    """Iterador que cuenta las filas que entrega"""
+
+    def __init__(self, filas):
+        self._filas = iter(filas)
+        self.filas = 0
+
+    def __iter__(self):
+        for fila in self._filas:
+            self.filas += 1
+            yield fila
+
+
+def _extension(ruta) -> str:
+    extension = os.path.splitext(os.fspath(ruta))[1].lower()
+    if extension not in EXTENSIONES:
+        raise ValueError(f"Formato no admitido: '{extension}' (use .csv, .xlsx o .pdf)")
+    return extension
+
+
+def _ordenar_claves(claves: Iterable[str]) -> List[str]:
+    """Claves en el orden de DESCRIPCIONES; las desconocidas al final en su orden original"""
+    orden = {clave: i for i, clave in enumerate(DESCRIPCIONES)}
+    return sorted(claves, key=lambda clave: orden.get(clave, len(orden)))
+
+
+def _como_lista(valores) -> list:
+    """Bloque de valores como lista de float de Python (más rápido de formatear)"""
+    tolist = getattr(valores, 'tolist', None)
+    return tolist() if tolist is not None else list(valores)
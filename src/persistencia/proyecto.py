@@ -0,0 +1,643 @@
+"""
+Formato de archivo de proyecto (.bombeo)
+
+Un proyecto guarda el sistema de tuberías, los resultados del cálculo y las
+columnas de un barrido en un solo archivo binario dividido en secciones:
+
+    [encabezado][sección][sección]...[índice JSON]
+
+El encabezado (24 bytes) lleva la firma, la versión del formato y la
+posición del índice, que se escribe al final; así las secciones se escriben
+en flujo sin conocer su tamaño de antemano. Abrir un proyecto solo lee el
+encabezado y el índice: cada sección se lee al pedirla, y las columnas
+numéricas se mapean en memoria (mmap) sin copiarse, de modo que el sistema
+operativo carga únicamente las páginas que se consultan.
+
+Tipos de sección:
+    - 'json': datos pequeños (sistema, resultados), verificados con CRC32
+    - 'columnas': valores binarios little-endian por columna, agrupados en
+      uno o más bloques de filas
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from ..models import Accesorio, Fluido, SistemaTuberias, TipoAccesorio, TramoTuberia
+from ..calculations.instrumentacion import span
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las columnas se escriben como array
+    np = None
+
+FIRMA = b'SBOMBEO\x00'
+FORMATO_VERSION = 1
+ESQUEMA_SISTEMA = 1
+EXTENSION = '.bombeo'
+
+# Filas que se acumulan antes de escribir un bloque cuando no se conoce el total
+BLOQUE_FILAS = 65536
+
+# firma, versión del formato, reservado, posición del índice
+_ENCABEZADO = struct.Struct('<8sHHQ4x')
+# Tipos de columna admitidos (código de array) y su tamaño en bytes
+_TAMANOS = {'d': 8, 'H': 2, 'B': 1}
+_DTYPES = {'d': '<f8', 'H': '<u2', 'B': 'u1'}
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+# Columnas de la sección de tramos y su tipo
+_TIPOS_TRAMOS = {'longitud': 'd', 'diametro': 'd', 'vertical': 'B', 'material': 'H'}
+
+
+class ErrorProyecto(ValueError):
+    """El archivo no es un proyecto válido, está dañado o es de una versión posterior"""
+
+
+class EscritorProyecto:
+    """Escribe un proyecto sección por sección
+
+    El contenido se escribe en un archivo temporal junto al destino, que lo
+    reemplaza al cerrar: un error a mitad de la escritura no daña un
+    proyecto existente.
+
+    Uso:
+        with EscritorProyecto(ruta) as escritor:
+            escritor.escribir_json('sistema', datos)
+            columnas = escritor.iniciar_columnas('barrido', claves, filas=n)
+            for bloque in bloques:
+                columnas.agregar(bloque)
+    """
+
+    def __init__(self, ruta):
+        self.ruta = os.fspath(ruta)
+        self._ruta_temporal = self.ruta + '.tmp'
+        self._archivo = open(self._ruta_temporal, 'wb')
+        self._archivo.write(_ENCABEZADO.pack(FIRMA, FORMATO_VERSION, 0, 0))
+        self._secciones = {}
+        self._columnas_abiertas = None
+        self._cerrado = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.descartar()
+        return False
+
+    def escribir_json(self, nombre: str, datos) -> None:
+        """Escribe una sección con datos serializables como JSON"""
+        self._nueva_seccion(nombre)
+        contenido = json.dumps(datos, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        desplazamiento = self._archivo.tell()
+        self._archivo.write(contenido)
+        self._secciones[nombre] = {
+            'tipo': 'json',
+            'desplazamiento': desplazamiento,
+            'longitud': len(contenido),
+            'crc32': zlib.crc32(contenido),
+        }
+
+    def escribir_columnas(self, nombre: str, columnas: Dict[str, Sequence],
+                          tipos: Optional[Dict[str, str]] = None) -> None:
+        """Escribe columnas completas (cada una queda contigua en el archivo)"""
+        claves = list(columnas)
+        filas = len(columnas[claves[0]]) if claves else 0
+        escritor = self.iniciar_columnas(nombre, claves, filas=filas, tipos=tipos)
+        escritor.agregar(columnas)
+        escritor.cerrar()
+
+    def iniciar_columnas(self, nombre: str, claves: Sequence[str], filas: Optional[int] = None,
+                         tipos: Optional[Dict[str, str]] = None) -> 'EscritorColumnas':
+        """
+        Inicia una sección de columnas que se escribe por bloques de filas
+
+        Args:
+            nombre: Nombre de la sección
+            claves: Nombres de las columnas
+            filas: Total de filas si se conoce (las columnas quedan contiguas)
+            tipos: Código de array por columna ('d', 'H' o 'B'); por defecto 'd'
+        """
+        self._nueva_seccion(nombre)
+        self._columnas_abiertas = EscritorColumnas(self, nombre, claves, filas, tipos)
+        return self._columnas_abiertas
+
+    def cerrar(self) -> None:
+        """Escribe el índice y reemplaza el destino con el archivo completo"""
+        if self._cerrado:
+            return
+        if self._columnas_abiertas is not None:
+            self._columnas_abiertas.cerrar()
+        indice = json.dumps({
+            'formato': FORMATO_VERSION,
+            'creado': datetime.now().isoformat(timespec='seconds'),
+            'secciones': self._secciones,
+        }, ensure_ascii=False).encode('utf-8')
+        posicion = self._archivo.tell()
+        self._archivo.write(indice)
+        self._archivo.seek(0)
+        self._archivo.write(_ENCABEZADO.pack(FIRMA, FORMATO_VERSION, 0, posicion))
+        self._archivo.close()
+        self._cerrado = True
+        os.replace(self._ruta_temporal, self.ruta)
+
+    def descartar(self) -> None:
+        """Abandona la escritura y elimina el archivo temporal"""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        self._archivo.close()
+        try:
+            os.remove(self._ruta_temporal)
+        except OSError:
+            pass
+
+    def _nueva_seccion(self, nombre: str) -> None:
+        if self._cerrado:
+            raise ValueError("El proyecto ya fue cerrado")
+        if self._columnas_abiertas is not None:
+            self._columnas_abiertas.cerrar()
+        if nombre in self._secciones:
+            raise ValueError(f"Sección repetida: '{nombre}'")
+
+    def _alinear(self) -> int:
+        """Completa hasta un múltiplo de 8 bytes y retorna la posición"""
+        relleno = -self._archivo.tell() % 8
+        if relleno:
+            self._archivo.write(b'\x00' * relleno)
+        return self._archivo.tell()
+
+
+class EscritorColumnas:
+    """Escritura en flujo de una sección de columnas
+
+    Si se conoce el total de filas, cada columna ocupa una región contigua
+    reservada de antemano y cada bloque agregado se escribe en su lugar; si
+    no, las filas se acumulan hasta BLOQUE_FILAS y se escriben como un
+    bloque. En ambos casos la memoria usada no depende del total de filas.
+    """
+
+    def __init__(self, proyecto: EscritorProyecto, nombre: str, claves: Sequence[str],
+                 filas: Optional[int], tipos: Optional[Dict[str, str]]):
+        tipos = tipos or {}
+        self.nombre = nombre
+        self.claves = list(claves)
+        self.tipos = [tipos.get(clave, 'd') for clave in self.claves]
+        for clave, tipo in zip(self.claves, self.tipos):
+            if tipo not in _TAMANOS:
+                raise ValueError(f"Tipo de columna no admitido para '{clave}': '{tipo}'")
+        self._proyecto = proyecto
+        self._archivo = proyecto._archivo
+        self._bloques = []
+        self._crc = [0] * len(self.claves)
+        self._filas = 0
+        self._reservadas = filas
+        self._pendientes = None
+        self._cerrado = False
+        if filas is None:
+            self._pendientes = [array(tipo) for tipo in self.tipos]
+        else:
+            self._reservar(filas)
+
+    @property
+    def filas(self) -> int:
+        """Filas agregadas hasta ahora"""
+        return self._filas
+
+    def agregar(self, bloque: Dict[str, Sequence]) -> None:
+        """Agrega filas: un valor por columna (listas, array.array o arreglos de NumPy)"""
+        if self._cerrado:
+            raise ValueError(f"La sección '{self.nombre}' ya fue cerrada")
+        valores = [_como_arreglo(bloque[clave], tipo) for clave, tipo in zip(self.claves, self.tipos)]
+        largos = {len(v) for v in valores}
+        if len(largos) > 1:
+            raise ValueError("Todas las columnas deben tener el mismo número de filas")
+        cantidad = largos.pop() if largos else 0
+        if not cantidad:
+            return
+
+        if self._reservadas is None:
+            for pendiente, datos in zip(self._pendientes, valores):
+                pendiente.frombytes(memoryview(datos).cast('B'))
+            if len(self._pendientes[0]) >= BLOQUE_FILAS:
+                self._escribir_bloque()
+        else:
+            if self._filas + cantidad > self._reservadas:
+                raise ValueError(f"La sección '{self.nombre}' admite {self._reservadas} filas")
+            inicios = self._bloques[0]['columnas']
+            for k, datos in enumerate(valores):
+                self._archivo.seek(inicios[k] + self._filas * _TAMANOS[self.tipos[k]])
+                self._escribir(k, datos)
+        self._filas += cantidad
+
+    def cerrar(self) -> None:
+        """Completa la sección y la registra en el índice del proyecto"""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        if self._reservadas is None:
+            if self._pendientes and len(self._pendientes[0]):
+                self._escribir_bloque()
+        else:
+            # Si se agregaron menos filas que las reservadas, solo cuentan las escritas
+            self._bloques[0]['filas'] = self._filas
+            self._archivo.seek(self._fin_reserva)
+        self._proyecto._secciones[self.nombre] = {
+            'tipo': 'columnas',
+            'claves': self.claves,
+            'tipos': self.tipos,
+            'filas': self._filas,
+            'bloques': self._bloques,
+            'crc32': self._crc,
+        }
+        self._proyecto._columnas_abiertas = None
+
+    def _reservar(self, filas: int) -> None:
+        """Reserva una región contigua por columna (el archivo se extiende sin escribir)"""
+        posicion = self._proyecto._alinear()
+        inicios = []
+        for tipo in self.tipos:
+            inicios.append(posicion)
+            posicion += filas * _TAMANOS[tipo]
+            posicion += -posicion % 8
+        self._archivo.truncate(posicion)
+        self._fin_reserva = posicion
+        self._bloques.append({'filas': filas, 'columnas': inicios})
+
+    def _escribir_bloque(self) -> None:
+        """Escribe las filas pendientes como un bloque, columna tras columna"""
+        inicios = []
+        for k, pendiente in enumerate(self._pendientes):
+            inicios.append(self._proyecto._alinear())
+            self._escribir(k, _a_little_endian(pendiente))
+        self._bloques.append({'filas': len(self._pendientes[0]), 'columnas': inicios})
+        self._pendientes = [array(tipo) for tipo in self.tipos]
+
+    def _escribir(self, k: int, datos) -> None:
+        self._archivo.write(datos)
+        self._crc[k] = zlib.crc32(datos, self._crc[k])
+
+
+class LectorProyecto:
+    """Acceso perezoso a las secciones de un proyecto
+
+    Al abrir solo se leen el encabezado y el índice. Las columnas guardadas
+    en un único bloque se devuelven como vistas (memoryview) sobre el
+    archivo mapeado en memoria; las demás se leen bloque por bloque.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = os.fspath(ruta)
+        self._mapa = None
+        with open(self.ruta, 'rb') as archivo:
+            encabezado = archivo.read(_ENCABEZADO.size)
+            if len(encabezado) < _ENCABEZADO.size or encabezado[:len(FIRMA)] != FIRMA:
+                raise ErrorProyecto("El archivo no es un proyecto del sistema de bombeo")
+            _, version, _, posicion = _ENCABEZADO.unpack(encabezado)
+            if version > FORMATO_VERSION:
+                raise ErrorProyecto(f"El proyecto usa la versión {version} del formato; "
+                                    f"esta aplicación admite hasta la {FORMATO_VERSION}")
+            if posicion == 0:
+                raise ErrorProyecto("El proyecto está incompleto (la escritura no terminó)")
+            archivo.seek(posicion)
+            try:
+                indice = json.loads(archivo.read().decode('utf-8'))
+                self._secciones = dict(indice['secciones'])
+            except (UnicodeDecodeError, ValueError, KeyError, TypeError):
+                raise ErrorProyecto("El índice del proyecto está dañado") from None
+        self.version = version
+        self.creado = indice.get('creado')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+        return False
+
+    def secciones(self) -> List[str]:
+        """Nombres de las secciones en el orden en que se escribieron"""
+        return list(self._secciones)
+
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self._secciones
+
+    def leer_json(self, nombre: str):
+        """Lee y verifica una sección JSON"""
+        seccion = self._seccion(nombre, 'json')
+        with open(self.ruta, 'rb') as archivo:
+            archivo.seek(seccion['desplazamiento'])
+            contenido = archivo.read(seccion['longitud'])
+        if len(contenido) != seccion['longitud'] or zlib.crc32(contenido) != seccion['crc32']:
+            raise ErrorProyecto(f"La sección '{nombre}' está dañada")
+        return json.loads(contenido.decode('utf-8'))
+
+    def columnas(self, nombre: str) -> 'ColumnasProyecto':
+        """Columnas de una sección, leídas a medida que se consultan"""
+        return ColumnasProyecto(self, nombre)
+
+    def filas(self, nombre: str) -> int:
+        return self._seccion(nombre, 'columnas')['filas']
+
+    def leer_columna(self, nombre: str, clave: str) -> Sequence:
+        """
+        Lee una columna de una sección
+
+        Returns: memoryview sobre el archivo mapeado si la columna es contigua,
+                 array con el tipo de la columna si está repartida en bloques
+        """
+        seccion = self._seccion(nombre, 'columnas')
+        try:
+            k = seccion['claves'].index(clave)
+        except ValueError:
+            raise KeyError(clave) from None
+        tipo = seccion['tipos'][k]
+        bloques = [bloque for bloque in seccion['bloques'] if bloque['filas']]
+
+        if len(bloques) == 1 and _LITTLE_ENDIAN:
+            inicio = bloques[0]['columnas'][k]
+            fin = inicio + bloques[0]['filas'] * _TAMANOS[tipo]
+            mapa = self._mapear()
+            if fin > len(mapa):
+                raise ErrorProyecto(f"La sección '{nombre}' está incompleta")
+            return memoryview(mapa)[inicio:fin].cast(tipo)
+
+        columna = array(tipo)
+        with open(self.ruta, 'rb') as archivo:
+            for bloque in bloques:
+                archivo.seek(bloque['columnas'][k])
+                try:
+                    columna.fromfile(archivo, bloque['filas'])
+                except EOFError:
+                    raise ErrorProyecto(f"La sección '{nombre}' está incompleta") from None
+        if not _LITTLE_ENDIAN:
+            columna.byteswap()
+        return columna
+
+    def iterar_bloques(self, nombre: str, claves: Optional[Sequence[str]] = None,
+                       filas_por_bloque: int = BLOQUE_FILAS) -> Iterator[Dict[str, array]]:
+        """
+        Recorre una sección de columnas por bloques de filas
+
+        La memoria usada depende de filas_por_bloque, no del total de filas.
+        """
+        seccion = self._seccion(nombre, 'columnas')
+        if claves is None:
+            claves = seccion['claves']
+        indices = []
+        for clave in claves:
+            if clave not in seccion['claves']:
+                raise KeyError(clave)
+            indices.append(seccion['claves'].index(clave))
+        tipos = seccion['tipos']
+
+        with open(self.ruta, 'rb') as archivo:
+            for bloque in seccion['bloques']:
+                for desde in range(0, bloque['filas'], filas_por_bloque):
+                    cantidad = min(filas_por_bloque, bloque['filas'] - desde)
+                    salida = {}
+                    for clave, k in zip(claves, indices):
+                        columna = array(tipos[k])
+                        archivo.seek(bloque['columnas'][k] + desde * _TAMANOS[tipos[k]])
+                        try:
+                            columna.fromfile(archivo, cantidad)
+                        except EOFError:
+                            raise ErrorProyecto(f"La sección '{nombre}' está incompleta") from None
+                        if not _LITTLE_ENDIAN:
+                            columna.byteswap()
+                        salida[clave] = columna
+                    yield salida
+
+    def verificar(self) -> None:
+        """Comprueba el CRC32 de todas las secciones (lee el archivo completo)
+
+        Raises:
+            ErrorProyecto: Si alguna sección está dañada
+        """
+        for nombre, seccion in self._secciones.items():
+            if seccion['tipo'] == 'json':
+                self.leer_json(nombre)
+                continue
+            crc = [0] * len(seccion['claves'])
+            for bloque in self.iterar_bloques(nombre):
+                for k, clave in enumerate(seccion['claves']):
+                    crc[k] = zlib.crc32(_a_little_endian(bloque[clave]), crc[k])
+            if crc != seccion['crc32']:
+                raise ErrorProyecto(f"La sección '{nombre}' está dañada")
+
+    def cerrar(self) -> None:
+        """Libera el mapeo del archivo (las vistas ya entregadas lo mantienen abierto)"""
+        if self._mapa is not None:
+            try:
+                self._mapa.close()
+            except BufferError:
+                pass  # hay columnas en uso; se cierra cuando se liberen
+            self._mapa = None
+
+    def _seccion(self, nombre: str, tipo: str) -> dict:
+        seccion = self._secciones.get(nombre)
+        if seccion is None:
+            raise KeyError(f"El proyecto no tiene la sección '{nombre}'")
+        if seccion['tipo'] != tipo:
+            raise ErrorProyecto(f"La sección '{nombre}' no es de tipo '{tipo}'")
+        return seccion
+
+    def _mapear(self) -> mmap.mmap:
+        if self._mapa is None:
+            with open(self.ruta, 'rb') as archivo:
+                self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mapa
+
+
+class ColumnasProyecto(Mapping):
+    """Columnas de una sección; cada una se lee la primera vez que se consulta"""
+
+    def __init__(self, lector: LectorProyecto, nombre: str):
+        seccion = lector._seccion(nombre, 'columnas')
+        self.nombre = nombre
+        self.filas = seccion['filas']
+        self._lector = lector
+        self._claves = list(seccion['claves'])
+        self._cargadas = {}
+
+    def __getitem__(self, clave: str) -> Sequence:
+        columna = self._cargadas.get(clave)
+        if columna is None:
+            if clave not in self._claves:
+                raise KeyError(clave)
+            columna = self._cargadas[clave] = self._lector.leer_columna(self.nombre, clave)
+        return columna
+
+    def __iter__(self):
+        return iter(self._claves)
+
+    def __len__(self) -> int:
+        return len(self._claves)
+
+
+class Proyecto:
+    """Proyecto abierto: el sistema, los resultados y el barrido se leen al consultarlos"""
+
+    def __init__(self, ruta):
+        with span('proyecto.abrir'):
+            self.lector = LectorProyecto(ruta)
+        self.ruta = self.lector.ruta
+        self._sistema = None
+        self._barrido = None
+
+    @property
+    def sistema(self) -> SistemaTuberias:
+        if self._sistema is None:
+            with span('proyecto.sistema'):
+                datos = self.lector.leer_json('sistema')
+                tramos = self.lector.columnas('tramos') if 'tramos' in self.lector else {}
+                self._sistema = sistema_desde_dict(datos, tramos)
+        return self._sistema
+
+    @property
+    def resultados(self) -> Optional[Dict[str, float]]:
+        """Resultados completos del cálculo, o None si no se guardaron"""
+        if 'resultados' not in self.lector:
+            return None
+        return self.lector.leer_json('resultados')
+
+    @property
+    def barrido(self) -> Optional[ColumnasProyecto]:
+        """Columnas del barrido de caudal, o None si no se guardó"""
+        if 'barrido' not in self.lector:
+            return None
+        if self._barrido is None:
+            self._barrido = self.lector.columnas('barrido')
+        return self._barrido
+
+    def cerrar(self) -> None:
+        self.lector.cerrar()
+
+
+def guardar_proyecto(ruta, sistema: SistemaTuberias,
+                     resultados: Optional[Dict[str, float]] = None,
+                     barrido: Optional[Dict[str, Sequence[float]]] = None) -> None:
+    """
+    Guarda un sistema, sus resultados y un barrido en un archivo de proyecto
+
+    Raises:
+        OSError: Si no se puede escribir el archivo
+    """
+    with span('proyecto.guardar'):
+        materiales = sorted({tramo.material for tramo in sistema.tramos})
+        with EscritorProyecto(ruta) as escritor:
+            escritor.escribir_json('sistema', sistema_a_dict(sistema, materiales))
+            escritor.escribir_columnas('tramos', _columnas_tramos(sistema.tramos, materiales),
+                                       tipos=_TIPOS_TRAMOS)
+            if resultados is not None:
+                escritor.escribir_json('resultados', resultados)
+            if barrido:
+                escritor.escribir_columnas('barrido', barrido)
+
+
+def abrir_proyecto(ruta) -> Proyecto:
+    """
+    Abre un archivo de proyecto (solo lee el encabezado y el índice)
+
+    Raises:
+        OSError: Si no se puede leer el archivo
+        ErrorProyecto: Si no es un proyecto válido
+    """
+    return Proyecto(ruta)
+
+
+def sistema_a_dict(sistema: SistemaTuberias, materiales: Sequence[str]) -> dict:
+    """Datos del sistema sin los tramos (que se guardan por columnas)"""
+    return {
+        'esquema': ESQUEMA_SISTEMA,
+        'fluido': asdict(sistema.fluido) if sistema.fluido is not None else None,
+        'caudal': sistema.caudal,
+        'eficiencia_bomba': sistema.eficiencia_bomba,
+        'elevacion_punto1': sistema.elevacion_punto1,
+        'elevacion_punto2': sistema.elevacion_punto2,
+        'presion_punto1': sistema.presion_punto1,
+        'presion_punto2': sistema.presion_punto2,
+        'accesorios': [dict(asdict(accesorio), tipo=accesorio.tipo.value)
+                       for accesorio in sistema.accesorios],
+        'materiales': list(materiales),
+    }
+
+
+def sistema_desde_dict(datos: dict, tramos: Mapping[str, Sequence]) -> SistemaTuberias:
+    """
+    Reconstruye un SistemaTuberias a partir de sistema_a_dict y las columnas de tramos
+
+    Raises:
+        ErrorProyecto: Si los datos no corresponden a un sistema válido
+    """
+    esquema = datos.get('esquema', 0)
+    if esquema > ESQUEMA_SISTEMA:
+        raise ErrorProyecto(f"El sistema usa la versión {esquema} del esquema; "
+                            f"esta aplicación admite hasta la {ESQUEMA_SISTEMA}")
+    try:
+        fluido = Fluido(**datos['fluido']) if datos['fluido'] is not None else None
+        accesorios = [Accesorio(**dict(accesorio, tipo=TipoAccesorio(accesorio['tipo'])))
+                      for accesorio in datos['accesorios']]
+        materiales = datos['materiales']
+        lista_tramos = []
+        if tramos:
+            orientaciones = ('horizontal', 'vertical')
+            lista_tramos = [
+                TramoTuberia(longitud, orientaciones[vertical], diametro, materiales[material])
+                for longitud, vertical, diametro, material in zip(
+                    tramos['longitud'], tramos['vertical'], tramos['diametro'], tramos['material'])
+            ]
+        return SistemaTuberias(
+            tramos=lista_tramos,
+            accesorios=accesorios,
+            fluido=fluido,
+            caudal=datos['caudal'],
+            eficiencia_bomba=datos['eficiencia_bomba'],
+            elevacion_punto1=datos['elevacion_punto1'],
+            elevacion_punto2=datos['elevacion_punto2'],
+            presion_punto1=datos['presion_punto1'],
+            presion_punto2=datos['presion_punto2'],
+        )
+    except (KeyError, TypeError, IndexError, ValueError) as e:
+        raise ErrorProyecto(f"Los datos del sistema no son válidos: {e}") from None
+
+
+def _columnas_tramos(tramos, materiales) -> Dict[str, array]:
+    indice_material = {material: i for i, material in enumerate(materiales)}
+    return {
+        'longitud': array('d', (tramo.longitud for tramo in tramos)),
+        'diametro': array('d', (tramo.diametro for tramo in tramos)),
+        'vertical': array('B', (tramo.orientacion == 'vertical' for tramo in tramos)),
+        'material': array('H', (indice_material[tramo.material] for tramo in tramos)),
+    }
+
+
+def _como_arreglo(valores, tipo: str):
+    """Valores de una columna como objeto con buffer little-endian del tipo indicado"""
+    if np is not None and isinstance(valores, np.ndarray):
+        return np.ascontiguousarray(valores, dtype=_DTYPES[tipo])
+    if isinstance(valores, array) and valores.typecode == tipo:
+        return _a_little_endian(valores)
+    if isinstance(valores, memoryview) and valores.format == tipo:
+        return _a_little_endian(valores)
+    if tipo == 'B' and isinstance(valores, (bytes, bytearray)):
+        return valores
+    return _a_little_endian(array(tipo, valores))
+
+
+def _a_little_endian(datos):
+    if _LITTLE_ENDIAN:
+        return datos
+    copia = array(datos.typecode if isinstance(datos, array) else datos.format, datos)
+    copia.byteswap()
+    return copia
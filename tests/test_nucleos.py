@@ -0,0 +1,131 @@
+"""
+Paridad de los núcleos de cálculo con el de Python puro
+
+Cada núcleo disponible (NumPy y Numba si están instalados) debe coincidir
+con NucleoPython a TOLERANCIA_PARIDAD, tanto directamente como a través de
+los cálculos que lo usan (curva del sistema, comparación de alternativas y
+mapa de cavitación).
+"""
+import math
+from dataclasses import replace
+
+import pytest
+
+from src.calculations import nucleos
+from src.calculations.cavitacion import CalculadoraCavitacion
+from src.calculations.energia import TarifaHoraria, comparar_alternativas
+from src.calculations.hidraulica import CalculadoraHidraulica
+from src.calculations.nucleos import COLUMNAS, TOLERANCIA_PARIDAD
+from src.models import CurvaBomba, Fluido, SistemaTuberias, TramoTuberia
+
+CONSTANTES = {'gravedad': 9.81}
+
+AGUA = Fluido('agua', densidad=998.2, viscosidad=1.002e-3, presion_vapor=2339.0)
+ACEITE = Fluido('aceite', densidad=860.0, viscosidad=0.35, presion_vapor=100.0)
+
+# Núcleos comparados con el de Python (el de Python consigo mismo no aporta)
+NUCLEOS = [nombre for nombre in nucleos.nucleos_disponibles() if nombre != 'python']
+
+pytestmark = pytest.mark.skipif(not NUCLEOS, reason="Solo está disponible el núcleo de Python")
+
+
+def sistema(fluido: Fluido, diametro: float, tramos: int = 3) -> SistemaTuberias:
+    return SistemaTuberias(
+        tramos=[TramoTuberia(10.0 + i, 'horizontal', diametro) for i in range(tramos)],
+        fluido=fluido, caudal=0.01, elevacion_punto1=1.0, elevacion_punto2=12.0,
+    )
+
+
+def assert_paridad(esperado, obtenido):
+    """Mismos NaN y diferencia relativa ≤ TOLERANCIA_PARIDAD en el resto"""
+    esperado, obtenido = [float(v) for v in esperado], [float(v) for v in obtenido]
+    assert len(esperado) == len(obtenido)
+    for a, b in zip(esperado, obtenido):
+        if math.isnan(a) or math.isnan(b):
+            assert math.isnan(a) and math.isnan(b)
+        else:
+            assert abs(a - b) <= TOLERANCIA_PARIDAD * max(abs(a), abs(b), 1e-300)
+
+
+@pytest.fixture(params=NUCLEOS)
+def nucleo(request):
+    return nucleos.obtener_nucleo(request.param)
+
+
+@pytest.fixture
+def seleccionado(nucleo):
+    """Fija el núcleo por defecto durante la prueba (para los cálculos que no lo reciben)"""
+    nucleos.seleccionar_nucleo(nucleo.nombre)
+    yield nucleo
+    nucleos.seleccionar_nucleo(None)
+
+
+@pytest.mark.parametrize('caso, caudal_minimo, laminar', [
+    ((0.025, 40000.0, 0.0, ACEITE.densidad, ACEITE.viscosidad, 9.81), 1e-5, True),
+    ((0.1, 1500.0, 3.2, AGUA.densidad, AGUA.viscosidad, 9.81), 1e-3, False),
+], ids=['laminar', 'turbulento'])
+def test_curva_sistema_por_regimen(nucleo, caso, caudal_minimo, laminar):
+    caudales = [caudal_minimo * (1.5 ** k) for k in range(12)]
+    esperado = nucleos.NucleoPython().curva_sistema(caudales, *caso)
+    assert all((re < 2000) == laminar for re in esperado['numero_reynolds'])
+    obtenido = nucleo.curva_sistema(caudales, *caso)
+    for clave in COLUMNAS:
+        assert_paridad(esperado[clave], obtenido[clave])
+
+
+def test_curva_sistema_caudal_cero(nucleo):
+    caso = (0.1, 1500.0, 3.2, AGUA.densidad, AGUA.viscosidad, 9.81)
+    esperado = nucleos.NucleoPython().curva_sistema([0.0, 0.0, 0.01], *caso)
+    obtenido = nucleo.curva_sistema([0.0, 0.0, 0.01], *caso)
+    for clave in COLUMNAS:
+        assert_paridad(esperado[clave], obtenido[clave])
+    assert math.isnan(float(obtenido['factor_friccion'][0]))
+    assert float(obtenido['perdidas_mayores'][0]) == 0.0
+
+
+def test_verificar_paridad():
+    diferencias = nucleos.verificar_paridad()
+    assert set(diferencias) == set(nucleos.nucleos_disponibles())
+
+
+@pytest.mark.parametrize('base', [sistema(ACEITE, 0.025), sistema(AGUA, 0.1),
+                                  sistema(AGUA, 0.1, tramos=0)],
+                         ids=['laminar', 'turbulento', 'sin_tramos'])
+def test_calculadora_hidraulica(nucleo, base):
+    caudales = [0.0, 1e-4, 1e-3, 0.01, 0.05]
+    esperado = CalculadoraHidraulica(base, CONSTANTES, nucleos.NucleoPython()).calcular_curva_sistema(caudales)
+    hidraulica = CalculadoraHidraulica(base, CONSTANTES, nucleo)
+    obtenido = hidraulica.calcular_curva_sistema(caudales)
+    for clave in esperado:
+        assert_paridad(esperado[clave], obtenido[clave])
+    # La función escalar de los resolvedores usa las mismas expresiones
+    carga = hidraulica.funcion_carga_sistema()
+    assert_paridad(obtenido['carga_total_bomba'], [carga(q) for q in caudales])
+
+
+def test_comparar_alternativas(seleccionado):
+    base = sistema(AGUA, 0.05)
+    alternativas = [replace(base, tramos=[replace(t, diametro=d) for t in base.tramos])
+                    for d in (0.01, 0.05, 0.2)] + [replace(base, tramos=[])]
+    perfil = ([0.0] * 6 + [1e-5] * 6 + [0.01] * 12) * 365
+    tarifa = TarifaHoraria.por_periodos({'base': 0.1}, ['base'] * 24, ['base'] * 24)
+    obtenido = comparar_alternativas(alternativas, perfil, tarifa, CONSTANTES)
+    nucleos.seleccionar_nucleo('python')
+    esperado = comparar_alternativas(alternativas, perfil, tarifa, CONSTANTES)
+    for clave in esperado:
+        assert_paridad(esperado[clave], obtenido[clave])
+
+
+@pytest.mark.parametrize('tramos', [3, 0], ids=['con_tramos', 'sin_tramos'])
+def test_mapa_cavitacion(seleccionado, tramos):
+    base = sistema(AGUA, 0.08, tramos)  # el mapa por temperatura solo admite agua
+    bomba = CurvaBomba('B', [0.0, 0.01, 0.02], [30.0, 25.0, 15.0], npsh_requerido=[1.0, 2.0, 4.0])
+    caudales = [0.0, 0.005, 0.01, 0.015, 0.02]
+    obtenido = CalculadoraCavitacion(base, bomba, CONSTANTES).calcular_mapa(caudales, [-2.0, 1.0],
+                                                                            [10.0, 60.0])
+    nucleos.seleccionar_nucleo('python')
+    esperado = CalculadoraCavitacion(base, bomba, CONSTANTES).calcular_mapa(caudales, [-2.0, 1.0],
+                                                                            [10.0, 60.0])
+    for filas_esperadas, filas_obtenidas in zip(esperado.NPSHa, obtenido.NPSHa):
+        for a, b in zip(filas_esperadas, filas_obtenidas):
+            assert_paridad(a, b)